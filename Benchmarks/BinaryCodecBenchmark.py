@@ -0,0 +1,61 @@
+"""
+Zachary Cook
+
+Benchmarks the size and speed of the binary codec against raw
+and gzip compressed XML.
+"""
+
+from Parser.XMLTools import BinaryCodec, RequestGenerator
+from Parser.XSDParser import XSDLoader
+import gzip
+import io
+import timeit
+
+MESSAGE_COUNT = 2000
+ITERATIONS = 3
+
+
+
+"""
+Prints the size of the messages compared to the raw XML.
+"""
+def printSize(name,size,rawSize):
+    print(name.ljust(40) + str(round(size / MESSAGE_COUNT,1)).rjust(10) + " bytes/message" + str(round(rawSize / max(size,1),2)).rjust(10) + "x smaller")
+
+"""
+Prints the messages processed per second.
+"""
+def printSpeed(name,seconds):
+    print(name.ljust(40) + str(round(MESSAGE_COUNT * ITERATIONS / seconds)).rjust(10) + " messages/s")
+
+
+
+if __name__ == '__main__':
+    # Load the schema and generate the messages.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(verbose=False)
+    codec = BinaryCodec.BinaryCodec(versionedXSD,versions,versions[len(versions) - 1])
+    generator = RequestGenerator.RequestGenerator(codec.compiledVersion)
+    messages = [generator.generateRequest().encode("utf8") for i in range(0,MESSAGE_COUNT)]
+    encodedMessages = [codec.encodeMessage(message) for message in messages]
+    compressedMessages = [gzip.compress(message) for message in messages]
+
+    # Assert the messages are decoded the same.
+    for message,encodedMessage in zip(messages,encodedMessages):
+        if codec.encodeMessage(codec.decodeMessage(encodedMessage)) != encodedMessage:
+            raise AssertionError("Decoded message doesn't match the original message")
+
+    # Print the sizes of the messages and of a log of the messages.
+    rawSize = sum(len(message) for message in messages)
+    encodedLog = io.BytesIO()
+    codec.writeMessages(messages,encodedLog)
+    printSize("Raw XML",rawSize,rawSize)
+    printSize("Gzip XML (per message)",sum(len(message) for message in compressedMessages),rawSize)
+    printSize("Binary (per message)",sum(len(message) for message in encodedMessages),rawSize)
+    printSize("Gzip XML (log)",len(gzip.compress(b"\n".join(messages))),rawSize)
+    printSize("Gzip binary (log)",len(gzip.compress(encodedLog.getvalue())),rawSize)
+
+    # Print the speed of encoding and decoding.
+    printSpeed("Gzip compress",timeit.timeit(lambda: [gzip.compress(message) for message in messages],number=ITERATIONS))
+    printSpeed("Gzip decompress",timeit.timeit(lambda: [gzip.decompress(message) for message in compressedMessages],number=ITERATIONS))
+    printSpeed("Binary encode",timeit.timeit(lambda: [codec.encodeMessage(message) for message in messages],number=ITERATIONS))
+    printSpeed("Binary decode",timeit.timeit(lambda: [codec.decodeMessage(message) for message in encodedMessages],number=ITERATIONS))
@@ -0,0 +1,43 @@
+"""
+Zachary Cook
+
+Benchmarks converting JSON objects to XML documents and back.
+"""
+
+from Parser.XMLTools import JSONTranscoder, RequestGenerator
+from Parser.XSDParser import XSDLoader
+from xml.etree import ElementTree
+import json
+import timeit
+
+MESSAGE_COUNT = 2000
+ITERATIONS = 3
+
+
+
+"""
+Prints the messages converted per second.
+"""
+def printSpeed(name,seconds):
+    print(name.ljust(40) + str(round(MESSAGE_COUNT * ITERATIONS / seconds)).rjust(10) + " messages/s")
+
+
+
+if __name__ == '__main__':
+    # Load the schema and generate the messages.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(verbose=False)
+    transcoder = JSONTranscoder.JSONTranscoder(versionedXSD,versions,versions[len(versions) - 1])
+    generator = RequestGenerator.RequestGenerator(transcoder.compiledVersion)
+    xmlMessages = [generator.generateRequest() for i in range(0,MESSAGE_COUNT)]
+    jsonMessages = [json.dumps(transcoder.toJSON(message)) for message in xmlMessages]
+
+    # Assert the messages are converted back to the same objects.
+    for jsonMessage in jsonMessages:
+        if transcoder.toJSON(transcoder.toXML(json.loads(jsonMessage))) != json.loads(jsonMessage):
+            raise AssertionError("Converted message doesn't match the original message")
+
+    # Print the speed of parsing alone and of converting the messages.
+    printSpeed("Parse JSON",timeit.timeit(lambda: [json.loads(message) for message in jsonMessages],number=ITERATIONS))
+    printSpeed("Parse XML",timeit.timeit(lambda: [ElementTree.fromstring(message) for message in xmlMessages],number=ITERATIONS))
+    printSpeed("JSON to XML",timeit.timeit(lambda: [transcoder.toXML(json.loads(message)) for message in jsonMessages],number=ITERATIONS))
+    printSpeed("XML to JSON",timeit.timeit(lambda: [json.dumps(transcoder.toJSON(message)) for message in xmlMessages],number=ITERATIONS))
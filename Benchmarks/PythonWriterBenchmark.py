@@ -0,0 +1,85 @@
+"""
+Zachary Cook
+
+Benchmarks the generated Python classes against building
+and reading the same request with ElementTree directly.
+"""
+
+from Parser.FieldWriter import PythonWriter
+from Parser.XSDParser import XSDLoader
+from xml.etree import ElementTree
+import importlib.util
+import tempfile
+import timeit
+
+ITERATIONS = 20000
+VERSION = "12.10"
+NAMESPACE = "http://www.vantivcnp.com/schema"
+
+
+
+"""
+Creates a request with ElementTree.
+"""
+def createElementTreeRequest():
+    root = ElementTree.Element("{" + NAMESPACE + "}cnpOnlineRequest",{"version": VERSION,"merchantId": "123"})
+    authentication = ElementTree.SubElement(root,"{" + NAMESPACE + "}authentication")
+    ElementTree.SubElement(authentication,"{" + NAMESPACE + "}user").text = "user"
+    ElementTree.SubElement(authentication,"{" + NAMESPACE + "}password").text = "password"
+    authorization = ElementTree.SubElement(root,"{" + NAMESPACE + "}authorization",{"id": "1","reportGroup": "Default Report Group"})
+    ElementTree.SubElement(authorization,"{" + NAMESPACE + "}orderId").text = "12344"
+    ElementTree.SubElement(authorization,"{" + NAMESPACE + "}amount").text = str(106)
+    ElementTree.SubElement(authorization,"{" + NAMESPACE + "}orderSource").text = "ecommerce"
+    card = ElementTree.SubElement(authorization,"{" + NAMESPACE + "}card")
+    ElementTree.SubElement(card,"{" + NAMESPACE + "}type").text = "VI"
+    ElementTree.SubElement(card,"{" + NAMESPACE + "}number").text = "4100000000000000"
+    ElementTree.SubElement(card,"{" + NAMESPACE + "}expDate").text = "1210"
+    return root
+
+"""
+Reads an ElementTree element to nested dictionaries.
+"""
+def readElementTree(element):
+    values = dict(element.attrib)
+    for child in element:
+        tag = child.tag[child.tag.find("}") + 1:]
+        if len(child) > 0 or len(child.attrib) > 0:
+            values[tag] = readElementTree(child)
+        else:
+            values[tag] = child.text
+
+    return values
+
+"""
+Creates a request with the generated classes.
+"""
+def createGeneratedRequest(XmlFields):
+    return XmlFields.cnpOnlineRequest(version=VERSION,merchantId="123",
+        authentication=XmlFields.authentication(user="user",password="password"),
+        transaction=XmlFields.authorization(id="1",reportGroup="Default Report Group",orderId="12344",amount=106,orderSource="ecommerce",
+            card=XmlFields.cardType(type="VI",number="4100000000000000",expDate="1210")))
+
+"""
+Prints the time per operation.
+"""
+def printResult(name,seconds):
+    print(name.ljust(40) + str(round(seconds / ITERATIONS * 1000000,2)) + " us")
+
+
+
+if __name__ == '__main__':
+    # Generate and load the classes.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(verbose=False)
+    with tempfile.TemporaryDirectory() as directory:
+        writer = PythonWriter.PythonWriter(versionedXSD,versions,directory + "/")
+        writer.write()
+        spec = importlib.util.spec_from_file_location("XmlFields",directory + "/" + writer.getFileName())
+        XmlFields = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(XmlFields)
+
+    # Run the benchmarks.
+    xml = XmlFields.serialize(createGeneratedRequest(XmlFields),VERSION)
+    printResult("ElementTree build + tostring",timeit.timeit(lambda: ElementTree.tostring(createElementTreeRequest()),number=ITERATIONS))
+    printResult("Generated create + serialize",timeit.timeit(lambda: XmlFields.serialize(createGeneratedRequest(XmlFields),VERSION),number=ITERATIONS))
+    printResult("ElementTree fromstring + read",timeit.timeit(lambda: readElementTree(ElementTree.fromstring(xml)),number=ITERATIONS))
+    printResult("Generated parse",timeit.timeit(lambda: XmlFields.parse(xml,VERSION),number=ITERATIONS))
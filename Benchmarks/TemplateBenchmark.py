@@ -0,0 +1,137 @@
+"""
+Zachary Cook
+
+Benchmarks the compiled templates of the .NET writer against
+creating the same code with string concatenation.
+"""
+
+from Parser.FieldWriter import DOTNETWriter
+from Parser.XSDParser import XSDLoader
+import timeit
+
+ITERATIONS = 20
+
+
+
+"""
+Creates an enum with string concatenation.
+"""
+def createEnum(writer,enumName,enum):
+    generatedEnum = "\tpublic enum " + writer.transformClassName(enumName) + "\n\t{\n"
+    for enumItemName in enum.childItems.keys():
+        enumItem = enum.childItems[enumItemName]
+        for name in enumItem.names:
+            generatedEnum += "\t\t" + writer.createAttribute("XMLEnum",name) + "\n"
+        generatedEnum += "\t\t" + writer.convertToEnum(enumItemName) + ",\n\n"
+
+    return generatedEnum + "\t}\n\n"
+
+"""
+Creates the conversion methods of an enum with string concatenation.
+"""
+def createEnumConversion(writer,enumName,enum):
+    className = writer.transformClassName(enumName)
+    generatedConversion = "\t\tprivate static readonly string[] " + className + "Values = new string[]\n\t\t{\n"
+    for enumItemName in enum.childItems.keys():
+        generatedConversion += "\t\t\t\"" + DOTNETWriter.escapeString(enumItemName) + "\",\n"
+    generatedConversion += "\t\t};\n\n"
+    generatedConversion += "\t\tpublic static string ToXMLString(this " + className + " value)\n\t\t{\n"
+    generatedConversion += "\t\t\tvar index = (int) value;\n"
+    generatedConversion += "\t\t\treturn index >= 0 && index < " + className + "Values.Length ? " + className + "Values[index] : null;\n"
+    generatedConversion += "\t\t}\n\n"
+    generatedConversion += "\t\tpublic static bool TryParse(string value,out " + className + " result)\n\t\t{\n"
+    generatedConversion += "\t\t\tswitch (value)\n\t\t\t{\n"
+    for enumItemName in enum.childItems.keys():
+        enumItem = enum.childItems[enumItemName]
+        addedNames = []
+        for name in enumItem.names:
+            if name.name not in addedNames:
+                addedNames.append(name.name)
+                generatedConversion += "\t\t\t\tcase \"" + DOTNETWriter.escapeString(name.name) + "\":\n"
+        generatedConversion += "\t\t\t\t\tresult = " + className + "." + writer.convertToEnum(enumItemName) + ";\n"
+        generatedConversion += "\t\t\t\t\treturn true;\n"
+    generatedConversion += "\t\t\t}\n\n"
+    generatedConversion += "\t\t\tresult = default(" + className + ");\n"
+    generatedConversion += "\t\t\treturn false;\n"
+    generatedConversion += "\t\t}\n\n"
+
+    return generatedConversion
+
+"""
+Creates the declaration of a class with string concatenation.
+"""
+def createClassHeader(writer,className,type):
+    generatedClass = ""
+    for name in type.names:
+        generatedClass += "\t" + writer.createAttribute("XMLElement",name) + "\n"
+    base = type.type
+    if base is None:
+        base = "VersionedXMLElement"
+
+    return generatedClass + "\tpublic partial class " + writer.transformClassName(className) + " : " + base + "\n\t{\n"
+
+"""
+Creates a property with string concatenation.
+"""
+def createProperty(writer,childName,child):
+    childType = writer.getClassString(child.type,child.maxOccurences)
+    generatedLine = ""
+    for name in child.names:
+        generatedLine += "\t\t" + writer.createAttribute("XML" + name.type,name) + "\n"
+    generatedLine += "\t\tpublic " + childType + " " + childName + " { get; set; }"
+    if child.default is not None:
+        generatedLine += " = " + writer.getObjectString(child.type,child.default) + ";"
+    elif child.maxOccurences is not None and child.maxOccurences > 1:
+        generatedLine += " = new " + childType + "();"
+
+    return generatedLine + "\n\n"
+
+"""
+Creates the class of a complex type with string concatenation.
+"""
+def createComplexType(writer,className,type):
+    generatedClass = createClassHeader(writer,className,type)
+    for childName in DOTNETWriter.PRIORITIZED_COMPLEX_TYPE_CHILDREN:
+        if childName in type.childItems.keys():
+            generatedClass += createProperty(writer,childName,type.childItems[childName])
+    for childName in type.childItems.keys():
+        if childName not in DOTNETWriter.PRIORITIZED_COMPLEX_TYPE_CHILDREN:
+            generatedClass += createProperty(writer,childName,type.childItems[childName])
+
+    return generatedClass + "\t}\n\n"
+
+"""
+Creates the code of all of the items with the given functions.
+"""
+def createAll(writer,items,createFunction):
+    generatedCode = ""
+    for name in items.keys():
+        generatedCode += createFunction(writer,name,items[name])
+
+    return generatedCode
+
+"""
+Prints the time per run.
+"""
+def printResult(name,seconds):
+    print(name.ljust(40) + str(round(seconds / ITERATIONS * 1000,2)) + " ms")
+
+
+
+if __name__ == '__main__':
+    # Load the schema and create the writer.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(verbose=False)
+    writer = DOTNETWriter.DOTNETWriter(versionedXSD,versions,"output/")
+
+    # Run the benchmarks and assert the templates create the same code.
+    benchmarks = [
+        ("Enums",versionedXSD.enums,createEnum,DOTNETWriter.ENUM_TEMPLATE),
+        ("Enum conversions",versionedXSD.enums,createEnumConversion,DOTNETWriter.ENUM_CONVERSION_TEMPLATE),
+        ("Simple types",versionedXSD.simpleTypes,lambda writer,className,type: createClassHeader(writer,className,type) + "\t}\n\n",DOTNETWriter.SIMPLE_TYPE_TEMPLATE),
+        ("Complex types",versionedXSD.complexTypes,createComplexType,DOTNETWriter.COMPLEX_TYPE_TEMPLATE),
+    ]
+    for name,items,createFunction,template in benchmarks:
+        if createAll(writer,items,createFunction) != createAll(writer,items,template.render):
+            raise AssertionError(name + " templates don't match the concatenated code")
+        printResult(name + " (concatenation)",timeit.timeit(lambda: createAll(writer,items,createFunction),number=ITERATIONS))
+        printResult(name + " (template)",timeit.timeit(lambda: createAll(writer,items,template.render),number=ITERATIONS))
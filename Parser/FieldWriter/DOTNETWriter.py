@@ -4,7 +4,7 @@ Zachary Cook
 Writer for the C# / .NET SDK.
 """
 
-from Parser.FieldWriter import FieldWriter
+from Parser.FieldWriter import FieldTemplate, FieldWriter
 
 FILE_HEADER = "/*\n" \
     " * Fields for XML requests and responses. Refer to the XML\n" \
@@ -43,14 +43,103 @@ PRIORITIZED_COMPLEX_TYPE_CHILDREN = [
     "orderId" # Special case: schema error if orderId is before amount
 ]
 
+DECLARATION_HEADER_TEMPLATE = FieldTemplate.Template("\t/*\n" \
+    "\t * {{text}}\n" \
+    "\t */\n",
+    ["text"],globals())
+
+ENUM_TEMPLATE = FieldTemplate.Template("\tpublic enum {{writer.transformClassName(enumName)}}\n\t{\n" \
+    "{% for enumItemName,enumItem in enum.childItems.items() %}\n" \
+    "{% for name in enumItem.names %}\n" \
+    "\t\t{{writer.createAttribute(\"XMLEnum\",name)}}\n" \
+    "{% end %}\n" \
+    "\t\t{{writer.convertToEnum(enumItemName)}},\n\n" \
+    "{% end %}\n" \
+    "\t}\n\n",
+    ["writer","enumName","enum"],globals())
+
+ENUM_CONVERSION_TEMPLATE = FieldTemplate.Template("{% set className = writer.transformClassName(enumName) %}\n" \
+    "\t\tprivate static readonly string[] {{className}}Values = new string[]\n\t\t{\n" \
+    "{% for enumItemName in enum.childItems.keys() %}\n" \
+    "\t\t\t\"{{escapeString(enumItemName)}}\",\n" \
+    "{% end %}\n" \
+    "\t\t};\n\n" \
+    "\t\tpublic static string ToXMLString(this {{className}} value)\n\t\t{\n" \
+    "\t\t\tvar index = (int) value;\n" \
+    "\t\t\treturn index >= 0 && index < {{className}}Values.Length ? {{className}}Values[index] : null;\n" \
+    "\t\t}\n\n" \
+    "\t\tpublic static bool TryParse(string value,out {{className}} result)\n\t\t{\n" \
+    "\t\t\tswitch (value)\n\t\t\t{\n" \
+    "{% for enumItemName,enumItem in enum.childItems.items() %}\n" \
+    "{% for wireName in getUniqueNames(enumItem.names) %}\n" \
+    "\t\t\t\tcase \"{{escapeString(wireName)}}\":\n" \
+    "{% end %}\n" \
+    "\t\t\t\t\tresult = {{className}}.{{writer.convertToEnum(enumItemName)}};\n" \
+    "\t\t\t\t\treturn true;\n" \
+    "{% end %}\n" \
+    "\t\t\t}\n\n" \
+    "\t\t\tresult = default({{className}});\n" \
+    "\t\t\treturn false;\n" \
+    "\t\t}\n\n",
+    ["writer","enumName","enum"],globals())
+
+CLASS_HEADER_TEMPLATE = FieldTemplate.Template("{% for name in type.names %}\n" \
+    "\t{{writer.createAttribute(\"XMLElement\",name)}}\n" \
+    "{% end %}\n" \
+    "\tpublic partial class {{writer.transformClassName(className)}} : {{type.type if type.type is not None else \"VersionedXMLElement\"}}\n\t{\n",
+    ["writer","className","type"],globals())
+
+SIMPLE_TYPE_TEMPLATE = FieldTemplate.Template("{% render CLASS_HEADER_TEMPLATE(writer,className,type) %}" \
+    "\t}\n\n",
+    ["writer","className","type"],globals())
+
+PROPERTY_TEMPLATE = FieldTemplate.Template("{% set childType = writer.getClassString(child.type,child.maxOccurences) %}\n" \
+    "{% for name in child.names %}\n" \
+    "\t\t{{writer.createAttribute(\"XML\" + name.type,name)}}\n" \
+    "{% end %}\n" \
+    "\t\tpublic {{childType}} {{childName}} { get; set; }" \
+    "{% if child.default is not None %} = {{writer.getObjectString(child.type,child.default)}};" \
+    "{% elif child.maxOccurences is not None and child.maxOccurences > 1 %} = new {{childType}}();" \
+    "{% end %}\n\n",
+    ["writer","childName","child"],globals())
+
+COMPLEX_TYPE_TEMPLATE = FieldTemplate.Template("{% render CLASS_HEADER_TEMPLATE(writer,className,type) %}" \
+    "{% for childName in PRIORITIZED_COMPLEX_TYPE_CHILDREN %}\n" \
+    "{% if childName in type.childItems %}\n" \
+    "{% render PROPERTY_TEMPLATE(writer,childName,type.childItems[childName]) %}" \
+    "{% end %}\n" \
+    "{% end %}\n" \
+    "{% for childName,child in type.childItems.items() %}\n" \
+    "{% if childName not in PRIORITIZED_COMPLEX_TYPE_CHILDREN %}\n" \
+    "{% render PROPERTY_TEMPLATE(writer,childName,child) %}" \
+    "{% end %}\n" \
+    "{% end %}\n" \
+    "\t}\n\n",
+    ["writer","className","type"],globals())
+
 
 """
 Creates a declaration header.
 """
 def createDeclarationHeader(text):
-    return "\t/*\n" \
-           "\t * " + text + "\n" \
-           "\t */\n"
+    return DECLARATION_HEADER_TEMPLATE.render(text)
+
+"""
+Returns the names of a list of name versions without duplicates.
+"""
+def getUniqueNames(names):
+    uniqueNames = []
+    for name in names:
+        if name.name not in uniqueNames:
+            uniqueNames.append(name.name)
+
+    return uniqueNames
+
+"""
+Escapes a string for use in a C# string literal.
+"""
+def escapeString(text):
+    return text.replace("\\","\\\\").replace("\"","\\\"")
 
 """
 Class representing a .NET writer.
@@ -160,95 +249,78 @@ class DOTNETWriter(FieldWriter.FieldWriter):
         return value
 
     """
-    Returns the file contents as a string.
+    Creates the conversion methods of an enum. Each enum gets a value-to-string
+    array indexed by the enum value and a string switch for parsing, which
+    avoids reading the XMLEnum attributes with reflection.
     """
-    def getContents(self):
-        generatedFile = FILE_HEADER
+    def createEnumConversion(self,enumName):
+        return ENUM_CONVERSION_TEMPLATE.render(self,enumName,self.xsd.enums[enumName])
 
-        # Add the enums.
-        generatedFile += createDeclarationHeader("Enum declarations.")
+    """
+    Creates the enum conversion methods.
+    """
+    def createEnumConversions(self):
+        generatedConversions = "\tpublic static partial class XMLEnumConverter\n\t{\n"
         for enumName in self.xsd.enums.keys():
-            enum = self.xsd.enums[enumName]
-            generatedFile += "\tpublic enum " + self.transformClassName(enumName) + "\n\t{\n"
+            generatedConversions += self.getItemFragment("enumConversion","enum",enumName,self.createEnumConversion)
 
-            # Add the enum items.
-            for enumItemName in enum.childItems.keys():
-                enumItem = enum.childItems[enumItemName]
+        # Return the conversions.
+        return generatedConversions + "\t}\n\n"
 
-                # Create the attributes.
-                for name in enumItem.names:
-                    generatedFile += "\t\t" + self.createAttribute("XMLEnum",name) + "\n"
+    """
+    Creates the declaration of an enum.
+    """
+    def createEnum(self,enumName):
+        return ENUM_TEMPLATE.render(self,enumName,self.xsd.enums[enumName])
+
+    """
+    Creates the class of a simple type.
+    """
+    def createSimpleType(self,className):
+        return SIMPLE_TYPE_TEMPLATE.render(self,className,self.xsd.simpleTypes[className])
 
-                # Add the enum item.
-                generatedFile += "\t\t" + self.convertToEnum(enumItemName) + ",\n\n"
+    """
+    Creates a property of a complex type.
+    """
+    def createProperty(self,childName,child):
+        return PROPERTY_TEMPLATE.render(self,childName,child)
 
-            generatedFile += "\t}\n\n"
+    """
+    Creates the class of a complex type.
+    """
+    def createComplexType(self,className):
+        return COMPLEX_TYPE_TEMPLATE.render(self,className,self.xsd.complexTypes[className])
 
-        # Add the classes.
-        generatedFile += "\n\n" + createDeclarationHeader("Type declarations.")
-        for className in self.xsd.simpleTypes.keys():
-            type = self.xsd.simpleTypes[className]
+    """
+    Returns the values outside of the items that the fragments depend on.
+    The class names depend on the names of all of the types.
+    """
+    def getFragmentContext(self):
+        return (tuple(self.versions),tuple(self.xsd.enums.keys()),tuple(self.xsd.simpleTypes.keys()),tuple(self.xsd.complexTypes.keys()))
 
-            # Write the attributes.
-            for name in type.names:
-                generatedFile += "\t" + self.createAttribute("XMLElement",name) + "\n"
+    """
+    Returns the file contents as a string. Only the enums and types
+    that changed since the last file are created again.
+    """
+    def getContents(self):
+        self.startFragments()
+        generatedFile = FILE_HEADER
 
-            # Write the class name.
-            base = type.type
-            if base is None:
-                base = "VersionedXMLElement"
-            generatedFile += "\tpublic partial class " + self.transformClassName(className) + " : " + base + "\n\t{\n"
+        # Add the enums.
+        generatedFile += createDeclarationHeader("Enum declarations.")
+        for enumName in self.xsd.enums.keys():
+            generatedFile += self.getItemFragment("enum","enum",enumName,self.createEnum)
 
-            generatedFile += "\t}\n\n"
+        # Add the enum conversions.
+        generatedFile += "\n\n" + createDeclarationHeader("Enum conversions.")
+        generatedFile += self.createEnumConversions()
 
+        # Add the classes.
+        generatedFile += "\n\n" + createDeclarationHeader("Type declarations.")
+        for className in self.xsd.simpleTypes.keys():
+            generatedFile += self.getItemFragment("simpleType","simpleType",className,self.createSimpleType)
         for className in self.xsd.complexTypes.keys():
-            type = self.xsd.complexTypes[className]
-
-            # Write the attributes.
-            for name in type.names:
-                generatedFile += "\t" + self.createAttribute("XMLElement",name) + "\n"
-
-            # Write the class name.
-            base = type.type
-            if base is None:
-                base = "VersionedXMLElement"
-            generatedFile += "\tpublic partial class " + self.transformClassName(className) + " : " + base + "\n\t{\n"
-
-            """
-            Writes a property.
-            """
-            def writeProperty(childName):
-                child = type.childItems[childName]
-                childType = self.getClassString(child.type, child.maxOccurences)
-
-                # Write the property attributes.
-                generatedLine = ""
-                for name in child.names:
-                    generatedLine += "\t\t" + self.createAttribute("XML" + name.type, name) + "\n"
-
-                # Write the property.
-                generatedLine += "\t\tpublic " + childType + " " + childName + " { get; set; }"
-                if child.default is not None:
-                    generatedLine += " = " + self.getObjectString(child.type, child.default) + ";"
-                elif child.maxOccurences is not None and child.maxOccurences > 1:
-                    generatedLine += " = new " + childType + "();"
-                generatedLine += "\n\n"
-
-                # Return the property.
-                return generatedLine
-
-            # Write the priorizied children.
-            for childName in PRIORITIZED_COMPLEX_TYPE_CHILDREN:
-                if childName in type.childItems.keys():
-                    generatedFile += writeProperty(childName)
-
-            # Write the properties.
-            for childName in type.childItems.keys():
-                if childName not in PRIORITIZED_COMPLEX_TYPE_CHILDREN:
-                    generatedFile += writeProperty(childName)
-
-
-            generatedFile += "\t}\n\n"
+            generatedFile += self.getItemFragment("complexType","complexType",className,self.createComplexType)
 
         # Return the file.
-        return generatedFile + "}"
\ No newline at end of file
+        return generatedFile + "}"
@@ -0,0 +1,130 @@
+"""
+Zachary Cook
+
+Templates for the writers that are compiled into Python functions.
+"""
+
+import re
+
+# Expressions, control tags, and control tags that are alone on a line.
+TAG_PATTERN = re.compile(r"(\{\{.*?\}\}|\{%.*?%\})",re.DOTALL)
+LINE_TAG_PATTERN = re.compile(r"^[ \t]*(\{%.*?%\})[ \t]*\n",re.MULTILINE | re.DOTALL)
+RENDER_PATTERN = re.compile(r"^(.+?)\((.*)\)$",re.DOTALL)
+
+
+
+"""
+Splits a template into the literal text and the tags. Control tags
+that are alone on a line are stripped of the line, so the templates
+can have a tag on each line without adding empty lines to the output.
+"""
+def tokenize(text):
+    text = LINE_TAG_PATTERN.sub(r"\1",text)
+    tokens = []
+    for token in TAG_PATTERN.split(text):
+        if token != "":
+            tokens.append(token)
+
+    return tokens
+
+"""
+Compiles the source of a template into the source of a Python function.
+The function appends the output to the given function instead of
+returning it, so the output can be streamed.
+"""
+def compileSource(text,parameters):
+    lines = ["def render(" + ",".join(["append"] + list(parameters)) + "):"]
+    indent = "    "
+    openBlocks = []
+    literal = ""
+
+    # Add the tokens. The literal text between the tags is joined into a single append.
+    def addLiteral():
+        if literal != "":
+            lines.append(indent + "append(" + repr(literal) + ")")
+    for token in tokenize(text):
+        if token.startswith("{{"):
+            addLiteral()
+            literal = ""
+            lines.append(indent + "append(str(" + token[2:-2].strip() + "))")
+        elif token.startswith("{%"):
+            addLiteral()
+            literal = ""
+            statement = token[2:-2].strip()
+            keyword = statement.split(None,1)[0] if statement != "" else ""
+
+            # Add the statement.
+            if keyword == "for" or keyword == "if":
+                lines.append(indent + statement + ":")
+                indent += "    "
+                openBlocks.append(keyword)
+            elif keyword == "elif" or keyword == "else":
+                if len(openBlocks) == 0 or openBlocks[-1] != "if":
+                    raise ValueError("Unexpected " + keyword + " in template: " + token)
+                lines.append(indent[4:] + statement + ":")
+            elif keyword == "end":
+                if len(openBlocks) == 0:
+                    raise ValueError("Unexpected end in template: " + token)
+                lines.append(indent + "pass")
+                indent = indent[4:]
+                openBlocks.pop()
+            elif keyword == "set":
+                lines.append(indent + statement[3:].strip())
+            elif keyword == "render":
+                match = RENDER_PATTERN.match(statement[6:].strip())
+                if match is None:
+                    raise ValueError("Invalid render in template: " + token)
+                lines.append(indent + match.group(1) + ".function(" + ",".join(["append"] + ([match.group(2)] if match.group(2).strip() != "" else [])) + ")")
+            else:
+                raise ValueError("Unknown tag in template: " + token)
+        else:
+            literal += token
+    addLiteral()
+
+    # Return the source.
+    if len(openBlocks) > 0:
+        raise ValueError("Template has " + str(len(openBlocks)) + " unclosed blocks")
+    lines.append(indent + "pass")
+    return "\n".join(lines) + "\n"
+
+
+
+"""
+Class representing a compiled template. Templates have expressions
+({{expression}}) and control tags ({% for %}, {% if %}, {% elif %},
+{% else %}, {% end %}, {% set name = expression %}, and
+{% render template(arguments) %} for rendering another template).
+The expressions are evaluated with the parameters of the template
+and the names of the given namespace, like the globals of a module.
+"""
+class Template:
+    """
+    Creates and compiles a template.
+    """
+    def __init__(self,text,parameters=(),namespace=None):
+        self.text = text
+        self.parameters = tuple(parameters)
+        self.source = compileSource(text,self.parameters)
+
+        # Compile the function with the namespace as the globals.
+        if namespace is None:
+            namespace = {}
+        code = compile(self.source,"<template>","exec")
+        functions = {}
+        exec(code,namespace,functions)
+        self.function = functions["render"]
+
+    """
+    Renders the template to a string.
+    """
+    def render(self,*arguments):
+        parts = []
+        self.function(parts.append,*arguments)
+        return "".join(parts)
+
+    """
+    Renders the template to a function that is called with each part
+    of the output, like the write method of a file.
+    """
+    def stream(self,write,*arguments):
+        self.function(write,*arguments)
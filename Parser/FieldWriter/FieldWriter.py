@@ -8,6 +8,58 @@ import os
 
 
 
+"""
+Class representing the fragments of the last generated file of a writer.
+The fragments are stored with the fingerprints of the items they were
+created from, and are cleared when the context of the writer changes.
+"""
+class FragmentCache:
+    """
+    Creates a fragment cache.
+    """
+
+    def __init__(self):
+        self.context = None
+        self.fingerprints = {}
+        self.fragments = {}
+        self.createdCount = 0
+        self.reusedCount = 0
+
+    """
+    Prepares the cache for generating a file. Returns the items that
+    changed since the last generated file.
+    """
+
+    def start(self, xsd, context):
+        # Clear the fragments if the context changed.
+        if self.context != context:
+            self.context = context
+            self.fragments = {}
+
+        # Store the new fingerprints.
+        fingerprints = xsd.getFingerprints()
+        changedItems = xsd.getChangedItems(self.fingerprints, fingerprints)
+        self.fingerprints = fingerprints
+        self.createdCount = 0
+        self.reusedCount = 0
+        return changedItems
+
+    """
+    Returns a fragment, creating it if the items it depends on changed.
+    """
+
+    def getFragment(self, fragmentKey, itemKeys, createFragment):
+        fingerprint = tuple(self.fingerprints[itemKey] for itemKey in itemKeys)
+        if fragmentKey in self.fragments.keys() and self.fragments[fragmentKey][0] == fingerprint:
+            self.reusedCount += 1
+            return self.fragments[fragmentKey][1]
+
+        # Create the fragment.
+        fragment = createFragment()
+        self.fragments[fragmentKey] = (fingerprint, fragment)
+        self.createdCount += 1
+        return fragment
+
 """
 Class representing a writer.
 """
@@ -20,6 +72,8 @@ class FieldWriter:
         self.xsd = xsd
         self.versions = version
         self.outputDirectory = outputDirectory
+        self.fragmentCache = None
+        self.changedItems = None
 
     """
     Returns the display name of the writer.
@@ -42,18 +96,62 @@ class FieldWriter:
     def getContents(self):
         return ""
 
+    """
+    Returns the values outside of the items that the fragments depend on.
+    """
+
+    def getFragmentContext(self):
+        return tuple(self.versions)
+
+    """
+    Starts using the fragment cache of the writer, creating it if the writer
+    doesn't have one. Fragments are only created again for the items that
+    changed since the last file was generated with the cache. The cache
+    belongs to the writer instance, so it only helps when the same writer
+    generates the file again or the cache is given to the next writer, like
+    the watcher does. Writers run in separate processes start without one.
+    """
+
+    def startFragments(self):
+        if self.fragmentCache is None:
+            self.fragmentCache = FragmentCache()
+        self.changedItems = self.fragmentCache.start(self.xsd, self.getFragmentContext())
+
+    """
+    Returns a fragment of the file from the fragment cache.
+    """
+
+    def getFragment(self, fragmentKey, itemKeys, createFragment):
+        if self.fragmentCache is None:
+            return createFragment()
+
+        return self.fragmentCache.getFragment(fragmentKey, itemKeys, createFragment)
+
+    """
+    Returns the fragment of a single item, creating it if the item changed.
+    """
+
+    def getItemFragment(self, fragmentName, category, name, createFragment):
+        return self.getFragment((fragmentName, name), [(category, name)], lambda: createFragment(name))
+
     """
     Writes the file.
     """
 
     def write(self):
-        # Get the contents and destination.
-        contents = self.getContents()
+        self.writeContents(self.getContents())
+
+    """
+    Writes the contents to the file.
+    """
+
+    def writeContents(self, contents):
+        # Get the destination.
         location = self.outputDirectory + self.getFileName()
 
-        # Create the output directory if it doesn't exist.
-        if not os.path.exists(self.outputDirectory):
-            os.mkdir(self.outputDirectory)
+        # Create the output directory if it doesn't exist. Other writers
+        # may create it at the same time from other processes.
+        os.makedirs(self.outputDirectory, exist_ok=True)
 
         # Write the file.
         with open(location, "w") as file:
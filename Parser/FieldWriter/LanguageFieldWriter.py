@@ -4,7 +4,11 @@ Zachary Cook
 Writes field files for all supported languages.
 """
 
-from Parser.FieldWriter import DOTNETWriter
+from Parser.FieldWriter import DOTNETWriter, PythonWriter
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+import time
+import traceback
 
 
 
@@ -12,18 +16,106 @@ FILE_OUTPUT_LOCATION = "output/"
 
 SUPPORTED_LANGUAGES = [
     DOTNETWriter.DOTNETWriter,
+    PythonWriter.PythonWriter,
 ]
 
+# Root types of the SDK flavours that only use some of the types.
+ROOT_TYPE_SETS = {
+    "online": ["cnpOnlineRequest","cnpOnlineResponse"],
+    "batch": ["cnpRequest","cnpResponse"],
+}
 
 
+
+"""
+Class representing the result of running a writer.
+"""
+class WriterResult:
+    """
+    Creates a writer result.
+    """
+    def __init__(self,displayName,duration,error=None):
+        self.displayName = displayName
+        self.duration = duration
+        self.error = error
+
+    """
+    Returns if the writer succeeded.
+    """
+    def succeeded(self):
+        return self.error is None
+
+"""
+Returns the root type names for a list of root type names and
+names of root type sets, like "online".
+"""
+def getRootTypeNames(names):
+    rootTypeNames = []
+    for name in names:
+        for rootTypeName in ROOT_TYPE_SETS.get(name,[name]):
+            if rootTypeName not in rootTypeNames:
+                rootTypeNames.append(rootTypeName)
+
+    return rootTypeNames
+
+"""
+Runs a single writer and returns the result.
+The XSD can be given as a pickled snapshot, which is loaded first.
+"""
+def runWriter(writerClass,xsd,versions,outputDirectory):
+    startTime = time.perf_counter()
+    displayName = writerClass.__name__
+
+    try:
+        # Load the snapshot if the XSD is pickled.
+        if isinstance(xsd,bytes):
+            xsd = pickle.loads(xsd)
+
+        # Create the writer and write the field file.
+        writer = writerClass(xsd,versions,outputDirectory)
+        displayName = writer.getDisplayName()
+        writer.write()
+    except Exception:
+        return WriterResult(displayName,time.perf_counter() - startTime,traceback.format_exc())
+
+    # Return the result.
+    return WriterResult(displayName,time.perf_counter() - startTime)
+
 """
 Writes the versioned XSD for all languages.
+When there is more than one writer, the writers are run
+concurrently in separate processes against a snapshot
+of the XSD. If root types are given, only the types that can be
+reached from them are written. Returns the results of the writers.
 """
-def writeFieldFiles(xsd,versions):
-    for writerClass in SUPPORTED_LANGUAGES:
-        # Create the writer.
-        writer = writerClass(xsd,versions,FILE_OUTPUT_LOCATION)
+def writeFieldFiles(xsd,versions,writerClasses=None,outputDirectory=FILE_OUTPUT_LOCATION,maxWorkers=None,rootNames=None):
+    if writerClasses is None:
+        writerClasses = SUPPORTED_LANGUAGES
+    if rootNames is not None:
+        xsd = xsd.createPrunedXSD(getRootTypeNames(rootNames))
+
+    # Run the writers.
+    startTime = time.perf_counter()
+    if len(writerClasses) <= 1 or maxWorkers == 1:
+        results = []
+        for writerClass in writerClasses:
+            results.append(runWriter(writerClass,xsd,versions,outputDirectory))
+    else:
+        # Create the snapshot once so each process only has to load it.
+        snapshot = pickle.dumps(xsd,protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(max_workers=maxWorkers) as executor:
+            futures = []
+            for writerClass in writerClasses:
+                futures.append(executor.submit(runWriter,writerClass,snapshot,versions,outputDirectory))
+            results = [future.result() for future in futures]
+
+    # Report the results.
+    for result in results:
+        if result.succeeded():
+            print("Wrote XML fields for " + result.displayName + " in " + str(round(result.duration,3)) + "s")
+        else:
+            print("Failed to write XML fields for " + result.displayName + " after " + str(round(result.duration,3)) + "s:\n" + result.error)
+    print("Wrote XML fields in " + str(round(time.perf_counter() - startTime,3)) + "s")
 
-        # Write the field file.
-        print("Writing XML fields for " + writer.getDisplayName())
-        writer.write()
\ No newline at end of file
+    # Return the results.
+    return results
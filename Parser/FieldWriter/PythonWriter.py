@@ -0,0 +1,518 @@
+"""
+Zachary Cook
+
+Writer for a Python SDK.
+"""
+
+from Parser.FieldWriter import FieldWriter
+import keyword
+
+FILE_HEADER = "\"\"\"\n" \
+    "Fields for XML requests and responses. Refer to the XML\n" \
+    "reference guides for further documentation.\n" \
+    "\n" \
+    "Generated by an external tool. Be careful if modifying.\n" \
+    "Repo: https://github.com/zxc8027/cnp-xml-fields-generator\n" \
+    "\"\"\"\n" \
+    "\n" \
+    "from xml.etree import ElementTree\n" \
+    "\n"
+
+RUNTIME = "LEGACY_NAMESPACE = \"http://www.litle.com/schema\"\n" \
+    "NAMESPACE = \"http://www.vantivcnp.com/schema\"\n" \
+    "\n" \
+    "\n" \
+    "\n" \
+    "def getNamespace(version):\n" \
+    "    if int(version.split(\".\")[0]) < 12:\n" \
+    "        return LEGACY_NAMESPACE\n" \
+    "    return NAMESPACE\n" \
+    "\n" \
+    "def _escapeText(value):\n" \
+    "    if \"&\" in value:\n" \
+    "        value = value.replace(\"&\",\"&amp;\")\n" \
+    "    if \"<\" in value:\n" \
+    "        value = value.replace(\"<\",\"&lt;\")\n" \
+    "    if \">\" in value:\n" \
+    "        value = value.replace(\">\",\"&gt;\")\n" \
+    "    return value\n" \
+    "\n" \
+    "def _escapeAttribute(value):\n" \
+    "    value = _escapeText(value)\n" \
+    "    if \"\\\"\" in value:\n" \
+    "        value = value.replace(\"\\\"\",\"&quot;\")\n" \
+    "    return value\n" \
+    "\n" \
+    "def _dateText(value):\n" \
+    "    if value.__class__ is str:\n" \
+    "        return _escapeText(value)\n" \
+    "    return value.isoformat()\n" \
+    "\n" \
+    "def _text(element):\n" \
+    "    text = element.text\n" \
+    "    if text is None:\n" \
+    "        return \"\"\n" \
+    "    return text\n" \
+    "\n" \
+    "def _resolve(ranges,index):\n" \
+    "    for start,end,name in ranges:\n" \
+    "        if start <= index <= end:\n" \
+    "            return name\n" \
+    "\n" \
+    "def _substituteName(value,declaredClass,name,index):\n" \
+    "    if value.__class__ is declaredClass:\n" \
+    "        return name\n" \
+    "    return _resolve(value._NAMES,index)\n" \
+    "\n" \
+    "def _getSubstitutes(declaredClass):\n" \
+    "    substitutes = {}\n" \
+    "    classesToCheck = list(declaredClass.__subclasses__())\n" \
+    "    while len(classesToCheck) > 0:\n" \
+    "        subclass = classesToCheck.pop()\n" \
+    "        for start,end,name in subclass._NAMES:\n" \
+    "            substitutes.setdefault(name,subclass)\n" \
+    "        classesToCheck.extend(subclass.__subclasses__())\n" \
+    "    return substitutes\n" \
+    "\n" \
+    "\n" \
+    "\n" \
+    "class VersionedXMLElement:\n" \
+    "    __slots__ = ()\n" \
+    "    _NAMES = ()\n" \
+    "    _FIELDS = ()\n" \
+    "\n" \
+    "    @classmethod\n" \
+    "    def getName(cls,version):\n" \
+    "        return _resolve(cls._NAMES,VERSION_INDEXES[version])\n" \
+    "\n" \
+    "    @classmethod\n" \
+    "    def getFields(cls,version):\n" \
+    "        index = VERSION_INDEXES[version]\n" \
+    "        fields = []\n" \
+    "        for field,fieldType,ranges in cls._FIELDS:\n" \
+    "            name = _resolve(ranges,index)\n" \
+    "            if name is not None:\n" \
+    "                fields.append((field,fieldType,name))\n" \
+    "        return fields\n" \
+    "\n" \
+    "    def __repr__(self):\n" \
+    "        values = []\n" \
+    "        for field,fieldType,ranges in self._FIELDS:\n" \
+    "            value = getattr(self,field)\n" \
+    "            if value is not None and value != []:\n" \
+    "                values.append(field + \"=\" + repr(value))\n" \
+    "        return self.__class__.__name__ + \"(\" + \",\".join(values) + \")\"\n" \
+    "\n" \
+    "\n" \
+    "\n" \
+    "def serialize(element,version):\n" \
+    "    index = VERSION_INDEXES[version]\n" \
+    "    tag = _resolve(element._NAMES,index)\n" \
+    "    if tag is None:\n" \
+    "        raise ValueError(element.__class__.__name__ + \" does not exist in version \" + version)\n" \
+    "    out = []\n" \
+    "    element._serialize(out,index,tag,\" xmlns=\\\"\" + getNamespace(version) + \"\\\"\")\n" \
+    "    return \"\".join(out)\n" \
+    "\n" \
+    "def parse(xml,version):\n" \
+    "    root = ElementTree.fromstring(xml)\n" \
+    "    tag = root.tag\n" \
+    "    tag = tag[tag.find(\"}\") + 1:]\n" \
+    "    elementClass = _ELEMENT_CLASSES.get(tag)\n" \
+    "    if elementClass is None:\n" \
+    "        raise ValueError(\"Unknown root element: \" + tag)\n" \
+    "    return elementClass._parse(root,VERSION_INDEXES[version])\n" \
+    "\n" \
+    "\n" \
+    "\n"
+
+FILE_FOOTER = "\n\n" \
+    "_ELEMENT_CLASSES = {}\n" \
+    "for _elementClass in _CLASSES:\n" \
+    "    for _start,_end,_name in _elementClass._NAMES:\n" \
+    "        _ELEMENT_CLASSES.setdefault(_name,_elementClass)\n"
+
+INTEGER_TYPES = [
+    "int","integer","short","long",
+]
+
+DATE_TYPES = [
+    "date","dateTime",
+]
+
+PRIORITIZED_COMPLEX_TYPE_CHILDREN = [
+    "orderId" # Special case: schema error if orderId is before amount
+]
+
+
+
+"""
+Class representing a Python writer.
+"""
+class PythonWriter(FieldWriter.FieldWriter):
+    """
+    Creates a Python writer object.
+    """
+    def __init__(self,xsd,version,outputDirectory):
+        super().__init__(xsd,version,outputDirectory)
+
+        # Store the complex types by their lowercase names, since children can use a different case than the type.
+        self.complexTypeNames = {}
+        for typeName in xsd.complexTypes.keys():
+            self.complexTypeNames.setdefault(typeName.lower(),typeName)
+
+    """
+    Returns the display name of the writer.
+    """
+    def getDisplayName(self):
+        return "Python"
+
+    """
+    Returns the file name of the writer.
+    """
+    def getFileName(self):
+        return "XmlFields.py"
+
+    """
+    Makes a name usable as a Python identifier.
+    """
+    def transformName(self,name):
+        if keyword.iskeyword(name):
+            return name + "_"
+
+        return name
+
+    """
+    Returns the version index ranges for a list of names.
+    """
+    def getRanges(self,names):
+        ranges = []
+        for name in names:
+            ranges.append((self.versions.index(name.start),self.versions.index(name.end),name.name))
+
+        return tuple(ranges)
+
+    """
+    Returns if the ranges cover all of the versions.
+    """
+    def coversAllVersions(self,ranges):
+        return len(ranges) == 1 and ranges[0][0] == 0 and ranges[0][1] == len(self.versions) - 1
+
+    """
+    Returns the name of the complex type for a type name, ignoring the
+    case. Returns None if the type isn't a complex type.
+    """
+    def getComplexTypeName(self,typeName):
+        if typeName is None or typeName in self.xsd.complexTypes.keys():
+            return typeName
+
+        return self.complexTypeNames.get(typeName.lower())
+
+    """
+    Returns the fields of a complex type, including the fields of the bases.
+    Each field is a tuple of the field name and the child item.
+    """
+    def getFields(self,typeName):
+        fields = []
+        if typeName is None or typeName not in self.xsd.complexTypes.keys():
+            return fields
+
+        # Add the base fields.
+        complexType = self.xsd.complexTypes[typeName]
+        fields.extend(self.getFields(complexType.type))
+
+        # Add the prioritized fields and then the remaining fields.
+        for childName in PRIORITIZED_COMPLEX_TYPE_CHILDREN:
+            if childName in complexType.childItems.keys():
+                fields.append((childName,complexType.childItems[childName]))
+        for childName in complexType.childItems.keys():
+            if childName not in PRIORITIZED_COMPLEX_TYPE_CHILDREN:
+                fields.append((childName,complexType.childItems[childName]))
+
+        # Return the fields.
+        return fields
+
+    """
+    Returns if a field is an attribute. Fields that are attributes in
+    some versions and elements in others aren't supported.
+    """
+    def isAttribute(self,child):
+        isAttribute = child.names[0].type == "Attribute"
+        for name in child.names:
+            if (name.type == "Attribute") != isAttribute:
+                raise ValueError("Field " + name.name + " is an attribute in some versions and an element in others")
+
+        return isAttribute
+
+    """
+    Returns if a field can have more than one value.
+    """
+    def isList(self,child):
+        return child.maxOccurences is not None and child.maxOccurences > 1
+
+    """
+    Returns the expression for converting a value to text.
+    """
+    def getToTextExpression(self,childType,valueName,isAttribute):
+        if childType in INTEGER_TYPES:
+            return "str(" + valueName + ")"
+        elif childType == "boolean":
+            return "(\"true\" if " + valueName + " else \"false\")"
+        elif childType in DATE_TYPES:
+            return "_dateText(" + valueName + ")"
+        elif isAttribute:
+            return "_escapeAttribute(" + valueName + ")"
+
+        return "_escapeText(" + valueName + ")"
+
+    """
+    Returns the expression for converting text to a value.
+    """
+    def getFromTextExpression(self,childType,textExpression):
+        if childType in INTEGER_TYPES:
+            return "int(" + textExpression + ")"
+        elif childType == "boolean":
+            return "(" + textExpression + ".strip() in (\"true\",\"1\"))"
+
+        return textExpression
+
+    """
+    Creates the code for serializing a field.
+    """
+    def createSerializeField(self,fieldName,child):
+        ranges = self.getRanges(child.names)
+        generatedCode = "        value = self." + self.transformName(fieldName) + "\n"
+
+        # Determine the condition and name for the version.
+        if self.coversAllVersions(ranges):
+            condition = "value is not None"
+            nameExpression = "\"" + ranges[0][2] + "\""
+            indent = "            "
+            generatedCode += "        if " + condition + ":\n"
+        elif len(ranges) == 1:
+            nameExpression = "\"" + ranges[0][2] + "\""
+            indent = "            "
+            generatedCode += "        if value is not None and " + str(ranges[0][0]) + " <= index <= " + str(ranges[0][1]) + ":\n"
+        else:
+            nameExpression = "name"
+            indent = "                "
+            generatedCode += "        if value is not None:\n"
+            generatedCode += "            name = _resolve(" + repr(ranges) + ",index)\n"
+            generatedCode += "            if name is not None:\n"
+
+        # Write the attribute.
+        if self.isAttribute(child):
+            toText = self.getToTextExpression(child.type,"value",True)
+            if nameExpression == "name":
+                return generatedCode + indent + "append(\" \" + name + \"=\\\"\" + " + toText + " + \"\\\"\")\n"
+            return generatedCode + indent + "append(\" " + ranges[0][2] + "=\\\"\" + " + toText + " + \"\\\"\")\n"
+
+        # Write the element.
+        itemName = "value"
+        if self.isList(child):
+            generatedCode += indent + "for item in value:\n"
+            indent += "    "
+            itemName = "item"
+        complexTypeName = self.getComplexTypeName(child.type)
+        if complexTypeName is not None:
+            className = self.transformName(complexTypeName)
+            if self.xsd.isSubstitutionHead(fieldName,child):
+                nameExpression = "_substituteName(" + itemName + "," + className + "," + nameExpression + ",index)"
+            generatedCode += indent + itemName + "._serialize(out,index," + nameExpression + ")\n"
+        else:
+            toText = self.getToTextExpression(child.type,itemName,False)
+            if nameExpression == "name":
+                generatedCode += indent + "append(\"<\" + name + \">\" + " + toText + " + \"</\" + name + \">\")\n"
+            else:
+                generatedCode += indent + "append(\"<" + ranges[0][2] + ">\" + " + toText + " + \"</" + ranges[0][2] + ">\")\n"
+
+        # Return the code.
+        return generatedCode
+
+    """
+    Creates the code for parsing a child element. Returns the statement
+    that stores the parsed value.
+    """
+    def createParseStatement(self,fieldName,child,valueExpression):
+        if self.isList(child):
+            return "self." + self.transformName(fieldName) + ".append(" + valueExpression + ")"
+
+        return "self." + self.transformName(fieldName) + " = " + valueExpression
+
+    """
+    Creates a class for a complex type.
+    """
+    def createClass(self,className,complexType):
+        fields = self.getFields(className)
+        attributeFields = [field for field in fields if self.isAttribute(field[1])]
+        elementFields = [field for field in fields if not self.isAttribute(field[1])]
+
+        # Write the class and the tables.
+        base = "VersionedXMLElement"
+        if complexType.type is not None and complexType.type in self.xsd.complexTypes.keys():
+            base = self.transformName(complexType.type)
+        generatedClass = "class " + self.transformName(className) + "(" + base + "):\n"
+        slots = ""
+        for childName in complexType.childItems.keys():
+            slots += "\"" + self.transformName(childName) + "\","
+        generatedClass += "    __slots__ = (" + slots + ")\n"
+        generatedClass += "    _NAMES = " + repr(self.getRanges(complexType.names)) + "\n"
+        generatedClass += "    _FIELDS = (\n"
+        for fieldName,child in fields:
+            generatedClass += "        (\"" + self.transformName(fieldName) + "\",\"" + child.names[0].type + "\"," + repr(self.getRanges(child.names)) + "),\n"
+        generatedClass += "    )\n\n"
+
+        # Write the constructor.
+        generatedClass += "    def __init__(self"
+        for fieldName,child in fields:
+            generatedClass += "," + self.transformName(fieldName) + "=None"
+        generatedClass += "):\n"
+        for fieldName,child in fields:
+            if self.isList(child):
+                generatedClass += "        self." + self.transformName(fieldName) + " = [] if " + self.transformName(fieldName) + " is None else " + self.transformName(fieldName) + "\n"
+            else:
+                generatedClass += "        self." + self.transformName(fieldName) + " = " + self.transformName(fieldName) + "\n"
+        if len(fields) == 0:
+            generatedClass += "        pass\n"
+        generatedClass += "\n"
+
+        # Write the serializer.
+        generatedClass += "    def _serialize(self,out,index,tag,attributes=\"\"):\n"
+        generatedClass += "        append = out.append\n"
+        generatedClass += "        append(\"<\" + tag + attributes)\n"
+        for fieldName,child in attributeFields:
+            generatedClass += self.createSerializeField(fieldName,child)
+        generatedClass += "        append(\">\")\n"
+        for fieldName,child in elementFields:
+            generatedClass += self.createSerializeField(fieldName,child)
+        generatedClass += "        append(\"</\" + tag + \">\")\n\n"
+
+        # Write the parser.
+        generatedClass += "    @classmethod\n"
+        generatedClass += "    def _parse(cls,element,index):\n"
+        generatedClass += "        self = cls.__new__(cls)\n"
+        if len(attributeFields) > 0:
+            generatedClass += "        attributes = element.attrib\n"
+        for fieldName,child in attributeFields:
+            names = []
+            for name in child.names:
+                if name.name not in names:
+                    names.append(name.name)
+            generatedClass += "        value = attributes.get(\"" + names[0] + "\")\n"
+            for name in names[1:]:
+                generatedClass += "        if value is None:\n"
+                generatedClass += "            value = attributes.get(\"" + name + "\")\n"
+            generatedClass += "        self." + self.transformName(fieldName) + " = None if value is None else " + self.getFromTextExpression(child.type,"value") + "\n"
+        for fieldName,child in elementFields:
+            generatedClass += "        self." + self.transformName(fieldName) + " = " + ("[]" if self.isList(child) else "None") + "\n"
+        if len(elementFields) > 0:
+            generatedClass += "        for child in element:\n"
+            generatedClass += "            tag = child.tag\n"
+            generatedClass += "            tag = tag[tag.find(\"}\") + 1:]\n"
+            condition = "if"
+
+            # Write the exact names first so substitution groups don't take elements with their own fields.
+            for fieldName,child in elementFields:
+                names = []
+                for name in child.names:
+                    if name.name not in names:
+                        names.append(name.name)
+                complexTypeName = self.getComplexTypeName(child.type)
+                if complexTypeName is not None:
+                    valueExpression = self.transformName(complexTypeName) + "._parse(child,index)"
+                else:
+                    valueExpression = self.getFromTextExpression(child.type,"_text(child)")
+                if len(names) == 1:
+                    generatedClass += "            " + condition + " tag == \"" + names[0] + "\":\n"
+                else:
+                    generatedClass += "            " + condition + " tag in " + repr(tuple(names)) + ":\n"
+                generatedClass += "                " + self.createParseStatement(fieldName,child,valueExpression) + "\n"
+                condition = "elif"
+
+            # Write the substitution groups.
+            for fieldName,child in elementFields:
+                if self.xsd.isSubstitutionHead(fieldName,child):
+                    substitutes = "_" + self.transformName(child.type) + "_SUBSTITUTES"
+                    generatedClass += "            elif tag in " + substitutes + ":\n"
+                    generatedClass += "                " + self.createParseStatement(fieldName,child,substitutes + "[tag]._parse(child,index)") + "\n"
+        generatedClass += "        return self\n\n"
+
+        # Return the class.
+        return generatedClass
+
+    """
+    Returns the items a class depends on. The fields include the fields
+    of the bases, and the substitution groups depend on the types with
+    the names of the children.
+    """
+    def getClassDependencies(self,className):
+        dependencies = []
+        typeName = className
+        while typeName is not None and typeName in self.xsd.complexTypes.keys() and ("complexType",typeName) not in dependencies:
+            complexType = self.xsd.complexTypes[typeName]
+            dependencies.append(("complexType",typeName))
+            for childName in complexType.childItems.keys():
+                if childName in self.xsd.complexTypes.keys():
+                    dependencies.append(("complexType",childName))
+            typeName = complexType.type
+
+        return dependencies
+
+    """
+    Returns the values outside of the items that the fragments depend on.
+    """
+    def getFragmentContext(self):
+        return (tuple(self.versions),tuple(self.xsd.complexTypes.keys()))
+
+    """
+    Returns the file contents as a string. Only the classes
+    that changed since the last file are created again.
+    """
+    def getContents(self):
+        self.startFragments()
+        generatedFile = FILE_HEADER
+
+        # Add the versions.
+        generatedFile += "VERSIONS = (\n"
+        for version in self.versions:
+            generatedFile += "    \"" + version + "\",\n"
+        generatedFile += ")\n"
+        generatedFile += "VERSION_INDEXES = {version: index for index,version in enumerate(VERSIONS)}\n\n"
+        generatedFile += RUNTIME
+
+        # Add the classes with the bases before the classes that extend them.
+        addedClasses = []
+        substitutionTypes = []
+        def addClass(className):
+            if className in addedClasses:
+                return ""
+            addedClasses.append(className)
+
+            # Add the base.
+            complexType = self.xsd.complexTypes[className]
+            generatedClass = ""
+            if complexType.type is not None and complexType.type in self.xsd.complexTypes.keys():
+                generatedClass += addClass(complexType.type)
+
+            # Store the substitution groups that are used.
+            for childName in complexType.childItems.keys():
+                child = complexType.childItems[childName]
+                if self.xsd.isSubstitutionHead(childName,child) and child.type not in substitutionTypes:
+                    substitutionTypes.append(child.type)
+
+            # Add the class.
+            return generatedClass + self.getFragment(("class",className),self.getClassDependencies(className),lambda: self.createClass(className,complexType)) + "\n"
+
+        for className in self.xsd.complexTypes.keys():
+            generatedFile += addClass(className)
+
+        # Add the class and substitution tables.
+        generatedFile += "_CLASSES = (\n"
+        for className in addedClasses:
+            generatedFile += "    " + self.transformName(className) + ",\n"
+        generatedFile += ")\n"
+        for typeName in substitutionTypes:
+            generatedFile += "_" + self.transformName(typeName) + "_SUBSTITUTES = _getSubstitutes(" + self.transformName(typeName) + ")\n"
+
+        # Return the file.
+        return generatedFile + FILE_FOOTER
@@ -0,0 +1,240 @@
+"""
+Zachary Cook
+
+Reads the transactions of batch request files in a streaming pass.
+"""
+
+from Parser.XMLTools import BatchTotals, CompiledVersion
+from Parser.XSDParser import XSDLoader
+from xml.etree import ElementTree
+import argparse
+import sys
+import time
+
+ROOT_COUNT_ATTRIBUTE = "numBatchRequests"
+
+
+
+"""
+Class representing a transaction read from a batch.
+"""
+class TransactionRecord:
+    __slots__ = ("batchIndex","name","values")
+
+    """
+    Creates a transaction record.
+    """
+    def __init__(self,batchIndex,name,values):
+        self.batchIndex = batchIndex
+        self.name = name
+        self.values = values
+
+"""
+Class representing the totals of a batch that was read.
+"""
+class BatchSummary:
+    """
+    Creates a batch summary.
+    """
+    def __init__(self,batchIndex,id,declaredTotals):
+        self.batchIndex = batchIndex
+        self.id = id
+        self.declaredTotals = declaredTotals
+        self.actualTotals = {}
+        self.transactionCount = 0
+        for attributeName in declaredTotals.keys():
+            self.actualTotals[attributeName] = 0
+
+    """
+    Returns the totals that don't match as a list of
+    attribute names, declared totals, and actual totals.
+    """
+    def getMismatches(self):
+        mismatches = []
+        for attributeName in self.declaredTotals.keys():
+            if self.declaredTotals[attributeName] != self.actualTotals[attributeName]:
+                mismatches.append((attributeName,self.declaredTotals[attributeName],self.actualTotals[attributeName]))
+
+        return mismatches
+
+"""
+Class representing a reader of batch files for a version.
+"""
+class BatchReader:
+    """
+    Creates a batch reader.
+    """
+    def __init__(self,compiledVersion):
+        self.compiledVersion = compiledVersion
+        self.transactionElements = BatchTotals.getTransactionElements(compiledVersion)
+        self.totals = BatchTotals.getBatchTotals(compiledVersion)
+        self.totalsByElement = {}
+        for total in self.totals:
+            if total.elementName not in self.totalsByElement.keys():
+                self.totalsByElement[total.elementName] = []
+            self.totalsByElement[total.elementName].append(total)
+
+        # Get the wire name of the batch.
+        batchType = compiledVersion.types.get(BatchTotals.BATCH_TYPE_NAME)
+        self.batchName = batchType.wireName if batchType is not None else None
+
+        # Store the results of the last read.
+        self.batches = []
+        self.declaredBatchCount = None
+
+    """
+    Converts the text of a field to a value.
+    """
+    def convertValue(self,field,text):
+        if text is None:
+            text = ""
+        if field is None:
+            return text
+
+        # Convert the text.
+        if field.type in CompiledVersion.INTEGER_TYPES:
+            try:
+                return int(text)
+            except ValueError:
+                return text
+        elif field.type == "boolean":
+            return text.strip() in ("true","1")
+        return text
+
+    """
+    Converts an element to a dictionary of values keyed by the wire names.
+    """
+    def convertElement(self,compiledType,element):
+        values = {}
+
+        # Add the attributes.
+        for attributeName in element.attrib.keys():
+            field = compiledType.attributes.get(attributeName) if compiledType is not None else None
+            values[attributeName] = self.convertValue(field,element.attrib[attributeName])
+
+        # Add the child elements.
+        for child in element:
+            tag = CompiledVersion.removeNamespace(child.tag)
+            field = compiledType.children.get(tag) if compiledType is not None else None
+            childType = self.compiledVersion.types.get(field.type) if field is not None else None
+            if childType is not None:
+                value = self.convertElement(childType,child)
+            else:
+                value = self.convertValue(field,child.text)
+
+            # Store the value, using a list if there can be more than one.
+            if field is not None and field.maxOccurences is not None and field.maxOccurences > 1:
+                if tag not in values.keys():
+                    values[tag] = []
+                values[tag].append(value)
+            else:
+                values[tag] = value
+
+        # Return the values.
+        return values
+
+    """
+    Creates the summary of a batch from the declared totals.
+    """
+    def createBatchSummary(self,element):
+        declaredTotals = {}
+        for total in self.totals:
+            value = element.attrib.get(total.attributeName,total.default)
+            try:
+                declaredTotals[total.attributeName] = int(value) if value is not None else 0
+            except ValueError:
+                declaredTotals[total.attributeName] = value
+
+        return BatchSummary(len(self.batches),element.attrib.get("id"),declaredTotals)
+
+    """
+    Reads the transactions of a batch file, one at a time.
+    Elements are removed once they are read, so the memory stays
+    flat regardless of the size of the file. The totals of the
+    batches are stored in batches once the file is read.
+    The source can be a file name or a file object.
+    """
+    def read(self,source):
+        self.batches = []
+        self.declaredBatchCount = None
+        depth = 0
+        root = None
+        batchElement = None
+        batchSummary = None
+
+        for event,element in ElementTree.iterparse(source,events=("start","end")):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    root = element
+                    if ROOT_COUNT_ATTRIBUTE in element.attrib.keys():
+                        self.declaredBatchCount = int(element.attrib[ROOT_COUNT_ATTRIBUTE])
+                elif depth == 2 and CompiledVersion.removeNamespace(element.tag) == self.batchName:
+                    batchElement = element
+                    batchSummary = self.createBatchSummary(element)
+                continue
+
+            # Read the transaction.
+            if depth == 3 and batchSummary is not None:
+                tag = CompiledVersion.removeNamespace(element.tag)
+                values = self.convertElement(self.transactionElements.get(tag),element)
+                batchSummary.transactionCount += 1
+                for total in self.totalsByElement.get(tag,[]):
+                    batchSummary.actualTotals[total.attributeName] += total.getValue(values)
+                del batchElement[:]
+                yield TransactionRecord(batchSummary.batchIndex,tag,values)
+            elif depth == 2:
+                if batchSummary is not None and element is batchElement:
+                    self.batches.append(batchSummary)
+                    batchSummary = None
+                    batchElement = None
+                del root[:]
+            depth += -1
+
+    """
+    Returns the errors of the totals from the last read.
+    """
+    def getErrors(self):
+        errors = []
+        if self.declaredBatchCount is not None and self.declaredBatchCount != len(self.batches):
+            errors.append(ROOT_COUNT_ATTRIBUTE + " is " + str(self.declaredBatchCount) + " but " + str(len(self.batches)) + " batches were read")
+        for batch in self.batches:
+            for attributeName,declaredTotal,actualTotal in batch.getMismatches():
+                errors.append("Batch " + str(batch.batchIndex) + " (id " + str(batch.id) + "): " + attributeName + " is " + str(declaredTotal) + " but the transactions total " + str(actualTotal))
+
+        return errors
+
+
+
+if __name__ == '__main__':
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Reads a batch request file and checks the batch totals.")
+    parser.add_argument("file",help="Batch request file to read.")
+    parser.add_argument("--version",help="Schema version of the file. Defaults to the newest version.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    arguments = parser.parse_args()
+
+    # Load the schema and compile the version.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    version = arguments.version or versions[len(versions) - 1]
+    if version not in versions:
+        print("Unknown version " + version)
+        sys.exit(2)
+    reader = BatchReader(CompiledVersion.CompiledVersion(versionedXSD,versions,version))
+
+    # Read the file.
+    startTime = time.perf_counter()
+    counts = {}
+    for record in reader.read(arguments.file):
+        counts[record.name] = counts.get(record.name,0) + 1
+    duration = time.perf_counter() - startTime
+
+    # Print the results.
+    transactionCount = sum(counts.values())
+    print("Read " + str(transactionCount) + " transactions in " + str(len(reader.batches)) + " batches in " + str(round(duration,3)) + "s (" + str(round(transactionCount / max(duration,0.000001),1)) + " transactions/s)")
+    for name in sorted(counts.keys()):
+        print("\t" + name + ": " + str(counts[name]))
+    errors = reader.getErrors()
+    for error in errors:
+        print(error)
+    sys.exit(0 if len(errors) == 0 else 1)
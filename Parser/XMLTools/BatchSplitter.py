@@ -0,0 +1,417 @@
+"""
+Zachary Cook
+
+Splits and merges batch request files in a streaming pass,
+recomputing the totals of the batches.
+"""
+
+from Parser.XMLTools import BatchTotals, CompiledVersion
+from Parser.XSDParser import XSDLoader
+from xml.etree import ElementTree
+from xml.sax import saxutils
+import argparse
+import queue
+import sys
+import tempfile
+import threading
+
+ROOT_COUNT_ATTRIBUTE = "numBatchRequests"
+MERGE_KEY_ATTRIBUTE = "merchantId"
+QUEUE_SIZE = 1024
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+
+"""
+Serializes an element without namespaces. The elements inherit the
+namespace of the root element of the output file.
+"""
+def serializeElement(element,parts):
+    tag = CompiledVersion.removeNamespace(element.tag)
+    parts.append("<" + tag)
+    for attributeName in element.attrib.keys():
+        if attributeName[0:1] != "{":
+            parts.append(" " + attributeName + "=" + saxutils.quoteattr(element.attrib[attributeName]))
+
+    # Write the children.
+    if len(element) == 0 and not element.text:
+        parts.append("/>")
+    else:
+        parts.append(">")
+        if element.text:
+            parts.append(saxutils.escape(element.text))
+        for child in element:
+            serializeElement(child,parts)
+            if child.tail:
+                parts.append(saxutils.escape(child.tail))
+        parts.append("</" + tag + ">")
+
+"""
+Returns an element as bytes.
+"""
+def elementToBytes(element):
+    parts = []
+    serializeElement(element,parts)
+    return "".join(parts).encode("utf8")
+
+"""
+Creates a start tag.
+"""
+def createStartTag(name,attributes):
+    tag = "<" + name
+    for attributeName in attributes.keys():
+        tag += " " + attributeName + "=" + saxutils.quoteattr(str(attributes[attributeName]))
+
+    return tag + ">"
+
+
+
+"""
+Class representing a batch in an output file. The transactions are
+stored as chunks of the body of the output file, so the number of
+open files doesn't grow with the number of batches.
+"""
+class OutputBatch:
+    """
+    Creates an output batch.
+    """
+    def __init__(self,attributes):
+        self.attributes = attributes
+        self.totals = {}
+        self.chunks = []
+
+    """
+    Adds the position and length of a transaction in the body.
+    Transactions written after the last chunk extend it.
+    """
+    def addChunk(self,start,length):
+        if len(self.chunks) > 0 and self.chunks[-1][0] + self.chunks[-1][1] == start:
+            self.chunks[-1][1] += length
+        else:
+            self.chunks.append([start,length])
+
+"""
+Class representing an output file. The writes are done on a separate
+thread so several output files are written concurrently.
+"""
+class BatchFileWriter:
+    """
+    Creates a batch file writer.
+    """
+    def __init__(self,fileName,batchName,totalAttributeNames,directory=None):
+        self.fileName = fileName
+        self.batchName = batchName
+        self.totalAttributeNames = totalAttributeNames
+        self.directory = directory
+        self.batches = []
+        self.batchesByKey = {}
+        self.body = None
+        self.bodySize = 0
+        self.error = None
+        self.queue = queue.Queue(QUEUE_SIZE)
+        self.thread = threading.Thread(target=self.run,daemon=True)
+        self.thread.start()
+
+    """
+    Adds a transaction to the batch with the given key.
+    """
+    def addTransaction(self,batchKey,batchAttributes,transaction,totals):
+        self.queue.put((batchKey,batchAttributes,transaction,totals))
+
+    """
+    Starts writing the file once the queued transactions are written.
+    """
+    def finish(self,rootName,rootAttributes,headerElements):
+        self.queue.put((rootName,rootAttributes,headerElements))
+
+    """
+    Stops the writer without writing the file once the queued
+    transactions are written.
+    """
+    def stop(self):
+        self.queue.put(None)
+
+    """
+    Waits for the file to be written. Returns the error of the writer, if any.
+    """
+    def wait(self):
+        self.thread.join()
+        return self.error
+
+    """
+    Writes the queued transactions and the file.
+    """
+    def run(self):
+        try:
+            while True:
+                message = self.queue.get()
+                if message is None:
+                    return
+                if len(message) == 3:
+                    self.writeFile(*message)
+                    return
+                self.writeTransaction(*message)
+        except Exception as error:
+            self.error = error
+
+            # Empty the queue so the reader isn't blocked.
+            message = self.queue.get()
+            while message is not None and len(message) != 3:
+                message = self.queue.get()
+        finally:
+            if self.body is not None:
+                self.body.close()
+
+    """
+    Writes a transaction to the body of the batch.
+    """
+    def writeTransaction(self,batchKey,batchAttributes,transaction,totals):
+        batch = self.batchesByKey.get(batchKey)
+        if batch is None:
+            batch = OutputBatch(batchAttributes)
+            self.batches.append(batch)
+            self.batchesByKey[batchKey] = batch
+
+        # Write the transaction and add the totals.
+        if self.body is None:
+            self.body = tempfile.TemporaryFile(dir=self.directory)
+        self.body.write(transaction)
+        batch.addChunk(self.bodySize,len(transaction))
+        self.bodySize += len(transaction)
+        for attributeName,value in totals:
+            batch.totals[attributeName] = batch.totals.get(attributeName,0) + value
+
+    """
+    Writes the file with the batches and their totals.
+    """
+    def writeFile(self,rootName,rootAttributes,headerElements):
+        rootAttributes = dict(rootAttributes)
+        rootAttributes[ROOT_COUNT_ATTRIBUTE] = str(len(self.batches))
+
+        with open(self.fileName,"wb") as file:
+            file.write(b"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n")
+            file.write(createStartTag(rootName,rootAttributes).encode("utf8"))
+            for headerElement in headerElements:
+                file.write(headerElement)
+
+            # Write the batches.
+            for batch in self.batches:
+                batchAttributes = {}
+                for attributeName in batch.attributes.keys():
+                    if attributeName not in self.totalAttributeNames:
+                        batchAttributes[attributeName] = batch.attributes[attributeName]
+                for attributeName in self.totalAttributeNames:
+                    if batch.totals.get(attributeName,0) != 0:
+                        batchAttributes[attributeName] = batch.totals[attributeName]
+                file.write(createStartTag(self.batchName,batchAttributes).encode("utf8"))
+
+                # Copy the transactions from the body.
+                for start,length in batch.chunks:
+                    self.body.seek(start)
+                    while length > 0:
+                        data = self.body.read(min(length,COPY_BUFFER_SIZE))
+                        file.write(data)
+                        length += -len(data)
+                file.write(("</" + self.batchName + ">").encode("utf8"))
+
+            file.write(("</" + rootName + ">").encode("utf8"))
+
+"""
+Class representing a splitter and merger of batch files for a version.
+"""
+class BatchSplitter:
+    """
+    Creates a batch splitter.
+    """
+    def __init__(self,compiledVersion):
+        self.compiledVersion = compiledVersion
+        self.totals = BatchTotals.getBatchTotals(compiledVersion)
+        self.totalAttributeNames = [total.attributeName for total in self.totals]
+        self.totalsByElement = {}
+        for total in self.totals:
+            if total.elementName not in self.totalsByElement.keys():
+                self.totalsByElement[total.elementName] = []
+            self.totalsByElement[total.elementName].append(total)
+        batchType = compiledVersion.types.get(BatchTotals.BATCH_TYPE_NAME)
+        self.batchName = batchType.wireName if batchType is not None else "batchRequest"
+
+    """
+    Returns the totals of a transaction element as a list of attribute names and values.
+    """
+    def getTransactionTotals(self,tag,element):
+        totals = self.totalsByElement.get(tag)
+        if totals is None:
+            return []
+
+        # Read the amounts of the transaction.
+        values = {}
+        for total in totals:
+            if not total.isCount():
+                for child in element:
+                    if CompiledVersion.removeNamespace(child.tag) == total.amountField:
+                        values[total.amountField] = child.text
+                        break
+
+        # Return the totals.
+        transactionTotals = []
+        for total in totals:
+            try:
+                transactionTotals.append((total.attributeName,total.getValue(values)))
+            except ValueError:
+                transactionTotals.append((total.attributeName,0))
+        return transactionTotals
+
+    """
+    Reads the transactions of a file. Calls the header callback with the
+    root name, root attributes, and elements before the batches, and the
+    transaction callback with the batch index, batch attributes, tag,
+    and element of each transaction.
+    """
+    def readFile(self,source,headerCallback,transactionCallback):
+        depth = 0
+        root = None
+        batchElement = None
+        batchAttributes = None
+        batchIndex = -1
+        headerElements = []
+        headerSent = False
+
+        for event,element in ElementTree.iterparse(source,events=("start","end")):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    root = element
+                elif depth == 2 and CompiledVersion.removeNamespace(element.tag) == self.batchName:
+                    if not headerSent:
+                        headerCallback(root.tag,dict(root.attrib),headerElements)
+                        headerSent = True
+                    batchElement = element
+                    batchIndex += 1
+                    batchAttributes = dict(element.attrib)
+                continue
+
+            # Handle the end of the element.
+            if depth == 3 and batchElement is not None:
+                transactionCallback(batchIndex,batchAttributes,CompiledVersion.removeNamespace(element.tag),element)
+                del batchElement[:]
+            elif depth == 2:
+                if element is batchElement:
+                    batchElement = None
+                else:
+                    headerElements.append(elementToBytes(element))
+                del root[:]
+            depth += -1
+
+        # Send the header if there were no batches.
+        if not headerSent and root is not None:
+            headerCallback(root.tag,dict(root.attrib),headerElements)
+
+    """
+    Splits a batch file into several files. The transactions of each
+    batch are spread evenly across the files.
+    """
+    def split(self,source,outputFileNames,directory=None):
+        writers = [BatchFileWriter(fileName,self.batchName,self.totalAttributeNames,directory) for fileName in outputFileNames]
+        header = []
+        transactionIndex = [0]
+
+        # Read the file.
+        def headerCallback(rootTag,rootAttributes,headerElements):
+            header.extend([rootTag,rootAttributes,headerElements])
+        def transactionCallback(batchIndex,batchAttributes,tag,element):
+            writer = writers[transactionIndex[0] % len(writers)]
+            transactionIndex[0] += 1
+            writer.addTransaction(batchIndex,batchAttributes,elementToBytes(element),self.getTransactionTotals(tag,element))
+        try:
+            self.readFile(source,headerCallback,transactionCallback)
+        except BaseException:
+            self.stopWriters(writers)
+            raise
+
+        # Finish the files.
+        self.finishWriters(writers,header)
+
+    """
+    Merges several batch files into one. Batches with the same
+    merchantId are merged into a single batch.
+    """
+    def merge(self,sources,outputFileName,directory=None):
+        writer = BatchFileWriter(outputFileName,self.batchName,self.totalAttributeNames,directory)
+        header = []
+
+        # Read the files.
+        def headerCallback(rootTag,rootAttributes,headerElements):
+            if len(header) == 0:
+                header.extend([rootTag,rootAttributes,headerElements])
+        def transactionCallback(batchIndex,batchAttributes,tag,element):
+            writer.addTransaction(batchAttributes.get(MERGE_KEY_ATTRIBUTE),batchAttributes,elementToBytes(element),self.getTransactionTotals(tag,element))
+        try:
+            for source in sources:
+                self.readFile(source,headerCallback,transactionCallback)
+        except BaseException:
+            self.stopWriters([writer])
+            raise
+
+        # Finish the file.
+        self.finishWriters([writer],header)
+
+    """
+    Stops the writers without writing their files, which is done if
+    the input can't be read so the writer threads don't wait forever.
+    """
+    def stopWriters(self,writers):
+        for writer in writers:
+            writer.stop()
+        for writer in writers:
+            writer.wait()
+
+    """
+    Finishes the writers. The writers finish their files concurrently.
+    """
+    def finishWriters(self,writers,header):
+        if len(header) == 0:
+            header = ["cnpRequest",{},[]]
+        rootName = CompiledVersion.removeNamespace(header[0])
+        rootAttributes = header[1]
+        if header[0][0:1] == "{":
+            rootAttributes = dict(rootAttributes)
+            rootAttributes["xmlns"] = header[0][1:header[0].find("}")]
+
+        # Start finishing all of the writers before waiting for them.
+        for writer in writers:
+            writer.finish(rootName,rootAttributes,header[2])
+        errors = [writer.wait() for writer in writers]
+        for error in errors:
+            if error is not None:
+                raise error
+
+
+
+if __name__ == '__main__':
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Splits or merges batch request files, recomputing the batch totals.")
+    parser.add_argument("--version",help="Schema version of the files. Defaults to the newest version.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    subparsers = parser.add_subparsers(dest="command",required=True)
+    splitParser = subparsers.add_parser("split",help="Splits a batch file into several files.")
+    splitParser.add_argument("input",help="Batch file to split.")
+    splitParser.add_argument("--parts",type=int,required=True,help="Number of files to split into.")
+    splitParser.add_argument("--output-prefix",required=True,help="Prefix of the output files. The files are named <prefix>_<number>.xml.")
+    mergeParser = subparsers.add_parser("merge",help="Merges several batch files into one.")
+    mergeParser.add_argument("output",help="File to write.")
+    mergeParser.add_argument("inputs",nargs="+",help="Batch files to merge.")
+    arguments = parser.parse_args()
+
+    # Load the schema and compile the version.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    version = arguments.version or versions[len(versions) - 1]
+    if version not in versions:
+        print("Unknown version " + version)
+        sys.exit(2)
+    splitter = BatchSplitter(CompiledVersion.CompiledVersion(versionedXSD,versions,version))
+
+    # Split or merge the files.
+    if arguments.command == "split":
+        splitter.split(arguments.input,[arguments.output_prefix + "_" + str(i + 1) + ".xml" for i in range(0,arguments.parts)])
+    else:
+        splitter.merge(arguments.inputs,arguments.output)
@@ -0,0 +1,167 @@
+"""
+Zachary Cook
+
+Determines the count and amount attributes of batch requests.
+"""
+
+from Parser.XMLTools import CompiledVersion
+
+BATCH_TYPE_NAME = "batchRequest"
+TRANSACTION_FIELD_NAMES = [
+    "transaction","recurringTransaction",
+]
+
+# Total names that can't be matched to elements by name.
+TOTAL_NAME_OVERRIDES = {
+    "tokenregistration": "registerTokenRequest",
+}
+
+
+
+"""
+Class representing a total attribute of a batch.
+"""
+class BatchTotal:
+    """
+    Creates a batch total. The amount field is None for counts.
+    """
+    def __init__(self,attributeName,elementName,amountField=None,default=None):
+        self.attributeName = attributeName
+        self.elementName = elementName
+        self.amountField = amountField
+        self.default = default
+
+    """
+    Returns if the total is a count of elements.
+    """
+    def isCount(self):
+        return self.amountField is None
+
+    """
+    Returns the value of the total for a transaction element.
+    The amount is read from the values of the transaction.
+    """
+    def getValue(self,values):
+        if self.isCount():
+            return 1
+
+        amount = values.get(self.amountField)
+        if amount is None:
+            return 0
+        return int(amount)
+
+"""
+Returns the name of the element that matches the total name.
+Elements that start with the name are only matched if partial
+matches are allowed. Returns None if no element matches.
+"""
+def matchElementName(totalName,elementNames,matchedElementNames,allowPartial=False):
+    totalName = totalName.lower()
+    lowerElementNames = {}
+    for elementName in elementNames:
+        lowerElementNames[elementName.lower()] = elementName
+
+    # Return the overridden name.
+    for name in [totalName,totalName[0:-1]]:
+        if name in TOTAL_NAME_OVERRIDES.keys() and TOTAL_NAME_OVERRIDES[name] in elementNames:
+            return TOTAL_NAME_OVERRIDES[name]
+
+    # Return an exact match, allowing a plural.
+    for name in [totalName,totalName[0:-1]]:
+        if name in lowerElementNames.keys():
+            return lowerElementNames[name]
+
+    # Return the longest element that starts the name, like giftCardAuthReversal for giftCardAuthReversalOriginal.
+    longestName = None
+    for name in lowerElementNames.keys():
+        if totalName.startswith(name) and (longestName is None or len(name) > len(longestName)):
+            longestName = name
+    if longestName is not None:
+        return lowerElementNames[longestName]
+
+    # Return the shortest unmatched element that starts with the name, like authorization for auth.
+    if not allowPartial:
+        return None
+    shortestName = None
+    for name in lowerElementNames.keys():
+        if (name.startswith(totalName) or name.startswith(totalName[0:-1])) and lowerElementNames[name] not in matchedElementNames and (shortestName is None or len(name) < len(shortestName)):
+            shortestName = name
+    if shortestName is not None:
+        return lowerElementNames[shortestName]
+
+"""
+Returns the wire names of the transaction elements of a batch and their types.
+Other types with transactions, like online requests, can be given.
+"""
+def getTransactionElements(compiledVersion,typeName=BATCH_TYPE_NAME):
+    batchType = compiledVersion.types.get(typeName)
+    transactionElements = {}
+    if batchType is None:
+        return transactionElements
+
+    # Add the elements that can be in the batch.
+    for wireName in batchType.children.keys():
+        field = batchType.children[wireName]
+        if field.name in TRANSACTION_FIELD_NAMES and field.type in compiledVersion.types.keys() and not wireName.endswith("Response"):
+            transactionElements[wireName] = compiledVersion.types[field.type]
+
+    return transactionElements
+
+"""
+Returns the totals of a batch request for a compiled version.
+Totals that can't be matched to elements are not returned.
+"""
+def getBatchTotals(compiledVersion):
+    batchType = compiledVersion.types.get(BATCH_TYPE_NAME)
+    if batchType is None:
+        return []
+    transactionElements = getTransactionElements(compiledVersion)
+    elementNames = list(transactionElements.keys())
+
+    # Get the count and amount attributes.
+    countAttributes = []
+    amountAttributes = []
+    for field in batchType.fields:
+        if not field.isAttribute or field.type not in CompiledVersion.INTEGER_TYPES:
+            continue
+        if field.wireName.startswith("num") and len(field.wireName) > 3:
+            countAttributes.append(field)
+        elif field.wireName.endswith("Amount") and len(field.wireName) > 6:
+            amountAttributes.append(field)
+
+    # Match the counts first since the names are closer to the element names.
+    # The partial matches are done last so they don't take elements with exact matches.
+    totals = []
+    matchedElementNames = []
+    countElementNames = {}
+    for allowPartial in [False,True]:
+        for field in countAttributes:
+            if field.wireName[3:].lower() in countElementNames.keys():
+                continue
+            elementName = matchElementName(field.wireName[3:],elementNames,matchedElementNames,allowPartial)
+            if elementName is not None:
+                matchedElementNames.append(elementName)
+                countElementNames[field.wireName[3:].lower()] = elementName
+                totals.append(BatchTotal(field.wireName,elementName,None,field.default))
+
+    # Match the amounts, using the element of the count with the same name if there is one.
+    for field in amountAttributes:
+        totalName = field.wireName[0:-6].lower()
+        elementName = countElementNames.get(totalName,countElementNames.get(totalName + "s"))
+        if elementName is None:
+            elementName = matchElementName(totalName,elementNames,matchedElementNames,True)
+        if elementName is None:
+            continue
+
+        # Use the longest amount field that ends the attribute name, like originalAmount for giftCardAuthReversalOriginalAmount.
+        amountField = None
+        for transactionField in transactionElements[elementName].fields:
+            if transactionField.isAttribute or not transactionField.wireName.lower().endswith("amount"):
+                continue
+            if field.wireName.lower().endswith(transactionField.wireName.lower()) and (amountField is None or len(transactionField.wireName) > len(amountField)):
+                amountField = transactionField.wireName
+        if amountField is not None:
+            totals.append(BatchTotal(field.wireName,elementName,amountField,field.default))
+
+    # Return the totals.
+    return totals
@@ -0,0 +1,725 @@
+"""
+Zachary Cook
+
+Encodes requests and responses to a compact tagged binary form
+using numeric tags from the versioned XSD, and decodes them back.
+"""
+
+from Parser.XMLTools import CompiledVersion
+from Parser.XSDParser import XSDLoader, XSDVersionDiffer
+from functools import cmp_to_key
+from xml.etree import ElementTree
+from xml.sax import saxutils
+import argparse
+import io
+import json
+import os
+import sys
+import uuid
+
+MAGIC = b"\xc7"
+FORMAT_VERSION = 3
+FLAG_NAMESPACE = 1
+DEFAULT_TAG_TABLE_ID = "default"
+VERSION_KEY = cmp_to_key(XSDVersionDiffer.compareVersionNames)
+
+# Tokens of an element. The tags of the fields start after the tokens.
+END_TOKEN = 0
+TEXT_TOKEN = 1
+NAMESPACE_TOKEN = 2
+LITERAL_ATTRIBUTE_TOKEN = 3
+FIRST_FIELD_TOKEN = 4
+
+KIND_STRING = 0
+KIND_INTEGER = 1
+KIND_VALUES = 2
+KIND_COMPLEX = 3
+
+BOOLEAN_VALUES = ["false","true"]
+ATTRIBUTE_ENTITIES = {"\"": "&quot;"}
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+READ_SIZE = 64 * 1024
+WRITE_SIZE = 64 * 1024
+
+
+
+"""
+Adds an unsigned integer as a variable length integer.
+"""
+def writeVarint(data,value):
+    while value > 0x7F:
+        data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    data.append(value)
+
+"""
+Adds a string with its length.
+"""
+def writeString(data,value):
+    encodedValue = value.encode("utf8")
+    writeVarint(data,len(encodedValue))
+    data += encodedValue
+
+"""
+Adds a string that isn't one of the known values, stored with an odd
+prefix so it can't be confused with the tags of the values.
+"""
+def writeLiteral(data,value):
+    encodedValue = value.encode("utf8")
+    writeVarint(data,(len(encodedValue) << 1) | 1)
+    data += encodedValue
+
+"""
+Adds the value of an attribute or simple element.
+"""
+def writeValue(data,kind,valueTags,value):
+    if kind == KIND_STRING:
+        writeString(data,value)
+    elif kind == KIND_INTEGER:
+        # Only integers that are written the same way when decoded are stored as numbers.
+        try:
+            number = int(value)
+        except ValueError:
+            number = None
+        if number is None or str(number) != value:
+            writeLiteral(data,value)
+        elif number >= 0:
+            writeVarint(data,number << 2)
+        else:
+            writeVarint(data,((-number << 1) - 1) << 1)
+    else:
+        valueTag = valueTags.get(value)
+        if valueTag is None:
+            writeLiteral(data,value)
+        else:
+            writeVarint(data,valueTag << 1)
+
+
+
+"""
+Class representing the input of the decoder. The data is read in
+blocks so large documents don't need to be in memory.
+"""
+class DecoderInput:
+    """
+    Creates the decoder input from a file object.
+    """
+    def __init__(self,file):
+        self.file = file
+        self.buffer = b""
+        self.position = 0
+
+    """
+    Reads more data into the buffer. Returns if there was more data.
+    """
+    def fill(self,size):
+        data = self.file.read(max(size,READ_SIZE))
+        if len(data) == 0:
+            return False
+        self.buffer = self.buffer[self.position:] + data
+        self.position = 0
+        return True
+
+    """
+    Reads a variable length integer.
+    """
+    def readVarint(self):
+        buffer = self.buffer
+        position = self.position
+        if position + 10 > len(buffer):
+            self.fill(10)
+            buffer = self.buffer
+            position = self.position
+
+        # Read the bytes of the integer.
+        value = 0
+        shift = 0
+        while True:
+            if position >= len(buffer):
+                raise ValueError("Unexpected end of the encoded data")
+            byte = buffer[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        self.position = position
+        return value
+
+    """
+    Reads a number of bytes.
+    """
+    def readBytes(self,length):
+        while self.position + length > len(self.buffer):
+            if not self.fill(length):
+                raise ValueError("Unexpected end of the encoded data")
+        data = self.buffer[self.position:self.position + length]
+        self.position += length
+        return data
+
+    """
+    Reads a string with its length.
+    """
+    def readString(self):
+        return self.readBytes(self.readVarint()).decode("utf8")
+
+    """
+    Reads the value of an attribute or simple element.
+    """
+    def readValue(self,kind,values):
+        if kind == KIND_STRING:
+            return self.readString()
+
+        # Read the number or value tag, or the literal string if the value is odd.
+        value = self.readVarint()
+        if value & 1:
+            return self.readBytes(value >> 1).decode("utf8")
+        value >>= 1
+        if kind == KIND_INTEGER:
+            return str(value >> 1) if value & 1 == 0 else str(-((value + 1) >> 1))
+        if value >= len(values) or values[value] is None:
+            raise ValueError("Unknown value tag " + str(value))
+        return values[value]
+
+"""
+Returns the sort key of the first version of a versioned item.
+"""
+def getFirstVersion(item):
+    return min(VERSION_KEY(name.start) for name in item.names)
+
+"""
+Class representing the tags of the types, fields, and enum values.
+Tags are only ever added, so documents encoded with a table can be
+decoded with the same table after more versions are added to it.
+Tags that don't exist are added in the order of the version the
+names were added in and then the names, so the tags of a table
+created in memory also stay the same when newer versions are added.
+Tables that are saved also keep their tags when older versions are
+added or items are renamed.
+"""
+class TagTable:
+    """
+    Creates a tag table.
+    """
+    def __init__(self,tableId=DEFAULT_TAG_TABLE_ID):
+        self.tableId = tableId
+        self.typeTags = {}
+        self.fieldTags = {}
+        self.valueTags = {}
+        self.size = 0
+        self.changed = False
+
+    """
+    Returns the tag of a key, adding it if it doesn't exist.
+    """
+    def getTag(self,tags,key):
+        tag = tags.get(key)
+        if tag is None:
+            tag = len(tags)
+            tags[key] = tag
+            self.size += 1
+            self.changed = True
+
+        return tag
+
+    """
+    Returns the tag of a complex type.
+    """
+    def getTypeTag(self,typeName):
+        return self.getTag(self.typeTags,typeName)
+
+    """
+    Returns the tag of a field of a complex type. The keys of the
+    fields are the names of the children, or the names of the children
+    and the types of the elements that can be substituted for them.
+    """
+    def getFieldTag(self,typeName,fieldKey):
+        if typeName not in self.fieldTags.keys():
+            self.fieldTags[typeName] = {}
+
+        return self.getTag(self.fieldTags[typeName],fieldKey)
+
+    """
+    Returns the tag of a value of an enum.
+    """
+    def getValueTag(self,enumName,value):
+        if enumName not in self.valueTags.keys():
+            self.valueTags[enumName] = {}
+
+        return self.getTag(self.valueTags[enumName],value)
+
+    """
+    Adds the tags of the types, fields, and enum values of a versioned
+    XSD that don't exist. The elements that can be substituted for a
+    child are the elements of derived types and the elements of the
+    substitution groups of the child in any version.
+    """
+    def addXSD(self,xsd):
+        derivedTypes = {}
+        substitutes = {}
+        typeKeys = []
+        for typeName in xsd.complexTypes.keys():
+            complexType = xsd.complexTypes[typeName]
+            typeKeys.append((getFirstVersion(complexType),typeName))
+            if complexType.substitutionGroupVersions is not None:
+                for name in complexType.substitutionGroupVersions.names:
+                    if name.name not in substitutes.keys():
+                        substitutes[name.name] = []
+                    if typeName not in substitutes[name.name]:
+                        substitutes[name.name].append(typeName)
+        for typeVersion,typeName in sorted(typeKeys):
+            self.getTypeTag(typeName)
+            if typeName not in self.fieldTags.keys():
+                self.fieldTags[typeName] = {}
+
+            # Add the fields, including the fields of the bases.
+            fieldKeys = []
+            baseName = typeName
+            while baseName is not None and baseName in xsd.complexTypes.keys():
+                complexType = xsd.complexTypes[baseName]
+                for childName in complexType.childItems.keys():
+                    child = complexType.childItems[childName]
+                    childVersion = getFirstVersion(child)
+                    fieldKeys.append((childVersion,childName))
+                    substituteNames = []
+                    if xsd.isSubstitutionHead(childName,child):
+                        if child.type not in derivedTypes.keys():
+                            derivedTypes[child.type] = xsd.getDerivedTypes(child.type)
+                        substituteNames.extend(derivedTypes[child.type])
+
+                    # Add the substitution groups, including the substitutes of substitutes.
+                    stack = list(substitutes.get(childName,[]))
+                    while len(stack) > 0:
+                        substituteName = stack.pop()
+                        if substituteName not in substituteNames:
+                            substituteNames.append(substituteName)
+                            stack.extend(substitutes.get(substituteName,[]))
+                    for substituteName in substituteNames:
+                        fieldKeys.append((max(childVersion,getFirstVersion(xsd.complexTypes[substituteName])),childName + "/" + substituteName))
+                baseName = complexType.type
+            for fieldVersion,fieldKey in sorted(fieldKeys):
+                self.getFieldTag(typeName,fieldKey)
+
+        # Add the enum values.
+        for enumName in sorted(xsd.enums.keys()):
+            enum = xsd.enums[enumName]
+            valueKeys = [(getFirstVersion(enum.childItems[valueName]),valueName) for valueName in enum.childItems.keys()]
+            for valueVersion,valueName in sorted(valueKeys):
+                self.getValueTag(enumName,valueName)
+
+    """
+    Saves the table to a JSON file.
+    """
+    def save(self,fileName):
+        temporaryFileName = fileName + ".tmp"
+        with open(temporaryFileName,"w") as file:
+            json.dump({"id": self.tableId,"types": self.typeTags,"fields": self.fieldTags,"values": self.valueTags},file,indent=1,sort_keys=True)
+        os.replace(temporaryFileName,fileName)
+        self.changed = False
+
+"""
+Loads a tag table from a JSON file. A table with a new id is
+created if the file doesn't exist.
+"""
+def loadTagTable(fileName):
+    if not os.path.exists(fileName):
+        tagTable = TagTable(uuid.uuid4().hex[0:8])
+        tagTable.changed = True
+        return tagTable
+
+    # Read the table.
+    with open(fileName) as file:
+        data = json.load(file)
+    tagTable = TagTable(data["id"])
+    tagTable.typeTags = data["types"]
+    tagTable.fieldTags = data["fields"]
+    tagTable.valueTags = data["values"]
+    tagTable.size = len(tagTable.typeTags) + sum(len(tags) for tags in tagTable.fieldTags.values()) + sum(len(tags) for tags in tagTable.valueTags.values())
+    return tagTable
+
+"""
+Class representing the tags of a complex type.
+"""
+class CodecType:
+    """
+    Creates a codec type.
+    """
+    def __init__(self,compiledType,typeTag):
+        self.compiledType = compiledType
+        self.typeTag = typeTag
+        self.attributes = {}
+        self.children = {}
+        self.fields = []
+
+    """
+    Adds a field with its tag. Fields are stored as the tag, wire name,
+    if it is an attribute, kind, value tags, values, and codec type.
+    """
+    def addField(self,tag,field,kind,valueTags,values,codecType):
+        entry = (tag + FIRST_FIELD_TOKEN,field.wireName,field.isAttribute,kind,valueTags,values,codecType)
+        while len(self.fields) <= tag:
+            self.fields.append(None)
+        self.fields[tag] = entry
+        if field.isAttribute:
+            self.attributes[field.wireName] = entry
+        else:
+            self.children[field.wireName] = entry
+
+"""
+Class representing a codec for a version. The tags are taken from a
+tag table, so they are the same for every version of the versioned
+XSD and when versions are added. The id and size of the table are
+stored in the header so data encoded with another table isn't decoded.
+"""
+class BinaryCodec:
+    """
+    Creates a binary codec. The tags that don't exist in the tag table
+    are added to it, and a table is created in memory if none is given.
+    """
+    def __init__(self,xsd,versions,version,tagTable=None):
+        self.xsd = xsd
+        self.compiledVersion = CompiledVersion.CompiledVersion(xsd,versions,version)
+        self.version = version
+        self.tagTable = tagTable if tagTable is not None else TagTable()
+        self.tagTable.addXSD(xsd)
+        self.codecTypes = {}
+        self.enumValues = {}
+
+        # Create the types of the root elements.
+        self.rootTypes = {}
+        self.rootTypesByTag = {}
+        for wireName in self.compiledVersion.elements.keys():
+            codecType = self.getCodecType(self.compiledVersion.elements[wireName])
+            self.rootTypes[wireName] = codecType
+            self.rootTypesByTag[codecType.typeTag] = codecType
+
+    """
+    Returns the values of an enum as a dictionary of the tags and a
+    list of the values of the tags. Values of other versions are None.
+    """
+    def getEnumValues(self,enumName):
+        enumValues = self.enumValues.get(enumName)
+        if enumValues is None:
+            tags = self.tagTable.valueTags[enumName]
+            valueTags = {}
+            values = [None] * len(tags)
+            enum = self.xsd.enums[enumName]
+            for valueName in enum.childItems.keys():
+                name = self.compiledVersion.getName(enum.childItems[valueName])
+                if name is not None:
+                    valueTags[name.name] = tags[valueName]
+                    values[tags[valueName]] = name.name
+            enumValues = (valueTags,values)
+            self.enumValues[enumName] = enumValues
+
+        return enumValues
+
+    """
+    Returns the codec type of a complex type.
+    """
+    def getCodecType(self,typeName):
+        codecType = self.codecTypes.get(typeName)
+        if codecType is not None:
+            return codecType
+
+        # Store the type before adding the fields since types can contain themselves.
+        compiledType = self.compiledVersion.types[typeName]
+        codecType = CodecType(compiledType,self.tagTable.typeTags[typeName])
+        self.codecTypes[typeName] = codecType
+
+        # Add the fields of the version with their tags.
+        fieldTags = self.tagTable.fieldTags[typeName]
+        fields = list(compiledType.attributes.values()) + list(compiledType.children.values())
+        for field in fields:
+            if compiledType.fieldNames.get(field.name) is field:
+                tag = fieldTags[field.name]
+            else:
+                tag = fieldTags[field.name + "/" + field.type]
+
+            # Determine how the value is stored.
+            valueTags,values,childType = None,None,None
+            if field.type in self.compiledVersion.types.keys():
+                kind = KIND_COMPLEX
+                childType = self.getCodecType(field.type)
+            elif field.enumValues is not None:
+                kind = KIND_VALUES
+                valueTags,values = self.getEnumValues(field.type)
+            elif field.type == "boolean":
+                kind = KIND_VALUES
+                valueTags,values = {"false": 0,"true": 1},BOOLEAN_VALUES
+            elif field.type in CompiledVersion.INTEGER_TYPES:
+                kind = KIND_INTEGER
+            else:
+                kind = KIND_STRING
+            codecType.addField(tag,field,kind,valueTags,values,childType)
+
+        # Return the type.
+        return codecType
+
+    """
+    Encodes a document to a file object in a streaming pass. The
+    source can be a file name or a file object. The prefixed namespace
+    declarations and the attributes of other namespaces, like
+    xsi:schemaLocation, of complex elements are stored as literal
+    entries. Whitespace-only text and the text after child elements
+    aren't stored since the complex types only contain elements, so
+    the decoded documents aren't indented.
+    """
+    def encode(self,source,output):
+        data = bytearray()
+        stack = []
+        namespaces = []
+        prefixes = {XML_NAMESPACE: "xml"}
+        for event,element in ElementTree.iterparse(source,events=("start-ns","start","end")):
+            if event == "start-ns":
+                # Store the prefixed namespaces to add to the next element.
+                prefix,namespace = element
+                if prefix != "":
+                    namespaces.append((prefix,namespace))
+                    prefixes[namespace] = prefix
+            elif event == "start":
+                tag = element.tag
+                if tag[0:1] == "{":
+                    tag = tag[tag.find("}") + 1:]
+                if len(stack) == 0:
+                    # Add the header with the root type.
+                    codecType = self.rootTypes.get(tag)
+                    if codecType is None:
+                        raise ValueError("Unknown root element " + tag + " for version " + self.version)
+                    data += MAGIC
+                    data.append(FORMAT_VERSION)
+                    writeString(data,self.version)
+                    writeString(data,self.tagTable.tableId)
+                    writeVarint(data,self.tagTable.size)
+                    flags = 0
+                    if element.tag[0:1] == "{":
+                        if element.tag[1:element.tag.find("}")] != self.compiledVersion.namespace:
+                            raise ValueError("Unexpected namespace " + element.tag[1:element.tag.find("}")])
+                        flags |= FLAG_NAMESPACE
+                    data.append(flags)
+                    writeVarint(data,codecType.typeTag)
+                else:
+                    # Add the tag of the child.
+                    parentType = stack[-1][0]
+                    if parentType is None:
+                        raise ValueError("Unexpected element " + tag + " in a simple element")
+                    entry = parentType.children.get(tag)
+                    if entry is None:
+                        raise ValueError("Unknown element " + tag + " in " + parentType.compiledType.wireName)
+                    writeVarint(data,entry[0])
+                    if entry[3] != KIND_COMPLEX:
+                        if len(element.attrib) > 0:
+                            raise ValueError("Unexpected attributes of simple element " + tag)
+                        if len(namespaces) > 0:
+                            raise ValueError("Unexpected namespace declarations of simple element " + tag)
+                        stack.append((None,element))
+                        continue
+                    codecType = entry[6]
+
+                # Add the namespace declarations.
+                for prefix,namespace in namespaces:
+                    data.append(NAMESPACE_TOKEN)
+                    writeString(data,prefix)
+                    writeString(data,namespace)
+                del namespaces[:]
+
+                # Add the attributes.
+                for attributeName in element.attrib.keys():
+                    if attributeName[0:1] == "{":
+                        namespace = attributeName[1:attributeName.find("}")]
+                        if namespace not in prefixes.keys():
+                            raise ValueError("Unknown namespace " + namespace + " of attribute " + attributeName)
+                        data.append(LITERAL_ATTRIBUTE_TOKEN)
+                        writeString(data,prefixes[namespace] + ":" + attributeName[attributeName.find("}") + 1:])
+                        writeString(data,element.attrib[attributeName])
+                        continue
+                    entry = codecType.attributes.get(attributeName)
+                    if entry is None:
+                        raise ValueError("Unknown attribute " + attributeName + " of " + codecType.compiledType.wireName)
+                    writeVarint(data,entry[0])
+                    writeValue(data,entry[3],entry[4],element.attrib[attributeName])
+                stack.append((codecType,element))
+            else:
+                codecType,element = stack.pop()
+                if codecType is None:
+                    # Add the value of the simple element.
+                    parentEntry = stack[-1][0].children[element.tag[element.tag.find("}") + 1:]]
+                    writeValue(data,parentEntry[3],parentEntry[4],element.text or "")
+                else:
+                    # Add the text of the complex element, if any, and the end.
+                    if element.text is not None and element.text.strip() != "":
+                        data.append(TEXT_TOKEN)
+                        writeString(data,element.text)
+                    data.append(END_TOKEN)
+
+                # Remove the element from the parent to keep the memory flat.
+                element.clear()
+                if len(stack) > 0:
+                    del stack[-1][1][:]
+                if len(data) >= WRITE_SIZE:
+                    output.write(bytes(data))
+                    del data[:]
+
+        # Write the remaining data.
+        output.write(bytes(data))
+
+    """
+    Decodes a document from a file object and writes the XML to
+    another file object in a streaming pass.
+    """
+    def decode(self,source,output):
+        decoderInput = DecoderInput(source)
+        if decoderInput.readBytes(1) != MAGIC or decoderInput.readBytes(1)[0] != FORMAT_VERSION:
+            raise ValueError("Data isn't in the binary format")
+        version = decoderInput.readString()
+        if version != self.version:
+            raise ValueError("Data is encoded for version " + version + " instead of " + self.version)
+        tableId = decoderInput.readString()
+        if tableId != self.tagTable.tableId:
+            raise ValueError("Data is encoded with tag table " + tableId + " instead of " + self.tagTable.tableId)
+        tableSize = decoderInput.readVarint()
+        if tableSize > self.tagTable.size:
+            raise ValueError("Data is encoded with " + str(tableSize) + " tags, but the tag table only has " + str(self.tagTable.size))
+        flags = decoderInput.readBytes(1)[0]
+        codecType = self.rootTypesByTag.get(decoderInput.readVarint())
+        if codecType is None:
+            raise ValueError("Unknown root type")
+
+        # Write the root element.
+        parts = ["<" + codecType.compiledType.wireName]
+        if flags & FLAG_NAMESPACE:
+            parts.append(" xmlns=\"" + self.compiledVersion.namespace + "\"")
+        stack = [(codecType.compiledType.wireName,codecType)]
+        startTagOpen = True
+        while len(stack) > 0:
+            wireName,codecType = stack[-1]
+            token = decoderInput.readVarint()
+            if token == END_TOKEN:
+                stack.pop()
+                if startTagOpen:
+                    parts.append("/>")
+                    startTagOpen = False
+                else:
+                    parts.append("</" + wireName + ">")
+                continue
+
+            # Read the text of the element.
+            if token == TEXT_TOKEN:
+                if startTagOpen:
+                    parts.append(">")
+                    startTagOpen = False
+                parts.append(saxutils.escape(decoderInput.readString()))
+                continue
+
+            # Read the literal namespace declarations and attributes.
+            if token == NAMESPACE_TOKEN:
+                prefix = decoderInput.readString()
+                parts.append(" xmlns:" + prefix + "=\"" + saxutils.escape(decoderInput.readString(),ATTRIBUTE_ENTITIES) + "\"")
+                continue
+            if token == LITERAL_ATTRIBUTE_TOKEN:
+                attributeName = decoderInput.readString()
+                parts.append(" " + attributeName + "=\"" + saxutils.escape(decoderInput.readString(),ATTRIBUTE_ENTITIES) + "\"")
+                continue
+
+            # Read the field.
+            fieldIndex = token - FIRST_FIELD_TOKEN
+            entry = codecType.fields[fieldIndex] if fieldIndex < len(codecType.fields) else None
+            if entry is None:
+                raise ValueError("Unknown tag " + str(token) + " in " + codecType.compiledType.wireName)
+            fieldTag,fieldName,isAttribute,kind,valueTags,values,childType = entry
+            if isAttribute:
+                parts.append(" " + fieldName + "=\"" + saxutils.escape(decoderInput.readValue(kind,values),ATTRIBUTE_ENTITIES) + "\"")
+                continue
+            if startTagOpen:
+                parts.append(">")
+            if kind == KIND_COMPLEX:
+                parts.append("<" + fieldName)
+                stack.append((fieldName,childType))
+                startTagOpen = True
+            else:
+                value = decoderInput.readValue(kind,values)
+                if value == "":
+                    parts.append("<" + fieldName + "/>")
+                else:
+                    parts.append("<" + fieldName + ">" + saxutils.escape(value) + "</" + fieldName + ">")
+                startTagOpen = False
+
+            # Write the parts if there are enough of them.
+            if len(parts) >= 1024:
+                output.write("".join(parts).encode("utf8"))
+                del parts[:]
+
+        # Write the remaining parts.
+        output.write("".join(parts).encode("utf8"))
+
+    """
+    Encodes a document in bytes.
+    """
+    def encodeMessage(self,message):
+        output = io.BytesIO()
+        self.encode(io.BytesIO(message),output)
+        return output.getvalue()
+
+    """
+    Decodes a document in bytes.
+    """
+    def decodeMessage(self,message):
+        output = io.BytesIO()
+        self.decode(io.BytesIO(message),output)
+        return output.getvalue()
+
+    """
+    Writes several documents to a file object, each prefixed by
+    the length of the encoded document.
+    """
+    def writeMessages(self,messages,output):
+        for message in messages:
+            encodedMessage = self.encodeMessage(message)
+            length = bytearray()
+            writeVarint(length,len(encodedMessage))
+            output.write(bytes(length) + encodedMessage)
+
+    """
+    Reads the documents written by writeMessages from a file object.
+    """
+    def readMessages(self,source):
+        decoderInput = DecoderInput(source)
+        while True:
+            if decoderInput.position >= len(decoderInput.buffer) and not decoderInput.fill(0):
+                return
+            yield self.decodeMessage(decoderInput.readBytes(decoderInput.readVarint()))
+
+
+
+if __name__ == '__main__':
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Encodes an XML document to the binary form, or decodes it back.")
+    parser.add_argument("mode",choices=["encode","decode"],help="Whether to encode or decode the document.")
+    parser.add_argument("input",help="File to read.")
+    parser.add_argument("output",help="File to write.")
+    parser.add_argument("--version",help="Schema version of the document. Defaults to the newest version.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    parser.add_argument("--tag-table",help="JSON file of the tags to use, which is created if it doesn't exist and updated with new tags. Use the same file for data that is stored.")
+    arguments = parser.parse_args()
+
+    # Load the schema and create the codec.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    version = arguments.version or versions[len(versions) - 1]
+    if version not in versions:
+        print("Unknown version " + version)
+        sys.exit(2)
+    tagTable = loadTagTable(arguments.tag_table) if arguments.tag_table is not None else None
+    codec = BinaryCodec(versionedXSD,versions,version,tagTable)
+    if tagTable is not None and tagTable.changed:
+        tagTable.save(arguments.tag_table)
+
+    # Encode or decode the file.
+    try:
+        with open(arguments.input,"rb") as inputFile,open(arguments.output,"wb") as outputFile:
+            if arguments.mode == "encode":
+                codec.encode(inputFile,outputFile)
+            else:
+                codec.decode(inputFile,outputFile)
+    except (ValueError,ElementTree.ParseError) as error:
+        print(str(error))
+        sys.exit(1)
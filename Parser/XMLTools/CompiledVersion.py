@@ -0,0 +1,236 @@
+"""
+Zachary Cook
+
+Compiles a versioned XSD into lookup tables for a single version.
+"""
+
+INTEGER_TYPES = [
+    "int","integer","short","long",
+]
+
+LEGACY_NAMESPACE = "http://www.litle.com/schema"
+NAMESPACE = "http://www.vantivcnp.com/schema"
+
+
+
+"""
+Returns the namespace used by a version.
+"""
+def getNamespace(version):
+    if int(version.split(".")[0]) < 12:
+        return LEGACY_NAMESPACE
+
+    return NAMESPACE
+
+"""
+Removes the namespace from a tag.
+"""
+def removeNamespace(tag):
+    return tag[tag.find("}") + 1:]
+
+
+
+"""
+Class representing a field (attribute or child element) for a version.
+"""
+class CompiledField:
+    """
+    Creates a compiled field. The choices are the tuples of the index
+    of each choice of the complex type the field is in, the index of
+    the child of the choice, and the position of the element in the
+    complex type, so elements in choices are only required
+    if their child of the choice is used. The parent name is the name
+    of the type that declares the field, and the position is the
+    position of the element in the type if it was stored. Types that
+    are declared with names that only differ in case are merged, so the
+    declarations are the names of the merged types that declare the
+    field, or empty if all of them do, and the declared type is the
+    name of the type of the field as it was declared.
+    """
+    def __init__(self,name,wireName,type,isAttribute,minOccurences,maxOccurences,default,enumValues=None,facets=None,choices=(),parentName=None,position=None,declarations=(),declaredType=None):
+        self.name = name
+        self.wireName = wireName
+        self.type = type
+        self.isAttribute = isAttribute
+        self.minOccurences = minOccurences
+        self.maxOccurences = maxOccurences
+        self.default = default
+        self.enumValues = enumValues
+        self.facets = facets if facets is not None else {}
+        self.choices = choices
+        self.parentName = parentName
+        self.position = position
+        self.declarations = declarations
+        self.declaredType = declaredType if declaredType is not None else type
+
+"""
+Class representing a complex type for a version.
+"""
+class CompiledType:
+    """
+    Creates a compiled type. Types that are declared as elements,
+    instead of only as complex types, are elements, and the substitution
+    group is the name of the element they can be substituted for.
+    Abstract elements can only be used through their substitutes.
+    """
+    def __init__(self,name,wireName,isElement=False,isAbstract=False,substitutionGroup=None):
+        self.name = name
+        self.wireName = wireName
+        self.isElement = isElement
+        self.isAbstract = isAbstract
+        self.substitutionGroup = substitutionGroup
+        self.baseName = None
+        self.attributes = {}
+        self.children = {}
+        self.fields = []
+        self.fieldNames = {}
+
+"""
+Class representing the lookup tables of a single version.
+"""
+class CompiledVersion:
+    """
+    Creates the compiled version from a versioned XSD.
+    """
+    def __init__(self,xsd,versions,version):
+        self.version = version
+        self.versions = versions
+        self.versionIndexes = xsd.versionIndexes
+        if list(versions) != xsd.versions:
+            self.versionIndexes = {}
+            for i in range(0,len(versions)):
+                self.versionIndexes[versions[i]] = i
+        self.index = self.versionIndexes[version]
+        self.namespace = getNamespace(version)
+        self.enums = {}
+        self.types = {}
+        self.elements = {}
+        self.typeNames = {}
+        self.substitutes = {}
+
+        # Compile the enums.
+        for enumName in xsd.enums.keys():
+            enum = xsd.enums[enumName]
+            if self.getName(enum) is None:
+                continue
+            values = set()
+            for enumItem in enum.childItems.values():
+                name = self.getName(enumItem)
+                if name is not None:
+                    values.add(name.name)
+            self.enums[enumName] = frozenset(values)
+
+        # Compile the complex types.
+        for typeName in xsd.complexTypes.keys():
+            complexType = xsd.complexTypes[typeName]
+            name = self.getName(complexType)
+            if name is not None:
+                self.types[typeName] = CompiledType(typeName,name.name,name.type == "Element" or name.type == "AbstractElement",name.type == "AbstractElement")
+                self.elements[name.name] = typeName
+
+        # Store the names of the enums and types without case, since the parser merges types without case.
+        for typeName in list(self.enums.keys()) + list(self.types.keys()):
+            self.typeNames[typeName.lower()] = typeName
+
+        # Store the elements that can be substituted for each element.
+        for typeName in self.types.keys():
+            substitutionGroup = self.getTypeName(xsd.complexTypes[typeName].getSubstitutionGroupForVersion(self.index,self.versionIndexes))
+            if substitutionGroup is not None:
+                self.types[typeName].substitutionGroup = substitutionGroup
+                if substitutionGroup not in self.substitutes.keys():
+                    self.substitutes[substitutionGroup] = []
+                self.substitutes[substitutionGroup].append(typeName)
+
+        # Add the fields, including the fields of the bases that the type doesn't declare again.
+        # The children that are declared again are stored in the type with the child in the base.
+        for typeName in self.types.keys():
+            compiledType = self.types[typeName]
+            baseName = self.getTypeName(xsd.complexTypes[typeName].type)
+            if baseName in self.types.keys():
+                compiledType.baseName = baseName
+            baseName = typeName
+            while baseName is not None and baseName in xsd.complexTypes.keys():
+                complexType = xsd.complexTypes[baseName]
+                for childItems in (complexType.redeclaredChildItems,complexType.childItems):
+                    for childName in childItems.keys():
+                        if childName not in compiledType.fieldNames.keys():
+                            self.addField(xsd,compiledType,baseName,childName,childItems[childName])
+                baseName = self.getTypeName(complexType.type)
+
+    """
+    Returns the name of a versioned item for the version, or None if
+    the item doesn't exist in the version.
+    """
+    def getName(self,item):
+        return item.getNameForVersion(self.index,self.versionIndexes)
+
+    """
+    Returns the name of the compiled enum or type of a type name, which
+    can have a different case than the compiled type. Other type names,
+    like primitive types, are returned unchanged.
+    """
+    def getTypeName(self,typeName):
+        if typeName is None or typeName in self.types.keys() or typeName in self.enums.keys():
+            return typeName
+
+        return self.typeNames.get(typeName.lower(),typeName)
+
+    """
+    Returns the names of the types of the elements that aren't abstract
+    that can be substituted for an element, including the substitutes
+    of substitutes.
+    """
+    def getSubstitutes(self,elementName):
+        substituteNames = []
+        stack = list(reversed(self.substitutes.get(elementName,[])))
+        while len(stack) > 0:
+            substituteName = stack.pop()
+            if not self.types[substituteName].isAbstract:
+                substituteNames.append(substituteName)
+            stack.extend(reversed(self.substitutes.get(substituteName,[])))
+        return substituteNames
+
+    """
+    Adds a field declared by a type to a compiled type.
+    """
+    def addField(self,xsd,compiledType,parentName,childName,child):
+        name = self.getName(child)
+        if name is None:
+            return
+
+        # Create the field with the compiled type of the version.
+        declaredType = child.getTypeForVersion(self.index,self.versionIndexes)
+        type = self.getTypeName(declaredType)
+        enumValues = self.enums.get(type)
+        facets = child.getFacetsForVersion(self.index,self.versionIndexes)
+        choices = child.getChoicesForVersion(self.index,self.versionIndexes)
+        position = child.getPositionForVersion(self.index,self.versionIndexes)
+        declarations = child.getDeclarationsForVersion(self.index,self.versionIndexes)
+        minOccurences = child.getMinOccurencesForVersion(self.index,self.versionIndexes)
+        field = CompiledField(childName,name.name,type,name.type == "Attribute",minOccurences,child.maxOccurences,child.default,enumValues,facets,choices,parentName,position,declarations,declaredType)
+        compiledType.fields.append(field)
+        compiledType.fieldNames[childName] = field
+        if field.isAttribute:
+            compiledType.attributes[field.wireName] = field
+            return
+        compiledType.children[field.wireName] = field
+
+        # Add the elements that can be substituted for the child.
+        # The elements of the substitution groups are added with the elements of derived types.
+        substituteNames = []
+        if xsd.isSubstitutionHead(childName,child):
+            substituteNames = [derivedType for derivedType in xsd.getDerivedTypes(child.type) if derivedType in self.types.keys()]
+        for substituteName in substituteNames + self.getSubstitutes(childName):
+            wireName = self.types[substituteName].wireName
+            if wireName not in compiledType.children.keys():
+                compiledType.children[wireName] = CompiledField(childName,wireName,substituteName,False,minOccurences,child.maxOccurences,child.default,choices=choices,parentName=parentName,declarations=declarations)
+
+    """
+    Returns the compiled type for a root element name.
+    """
+    def getElementType(self,wireName):
+        typeName = self.elements.get(wireName)
+        if typeName is None:
+            return None
+
+        return self.types[typeName]
@@ -0,0 +1,212 @@
+"""
+Zachary Cook
+
+Compiles the facets of fields (the restrictions of their simple types
+and their fixed values) into functions that check values without a
+full XSD validator.
+"""
+
+from decimal import Decimal, InvalidOperation
+import re
+
+WHITESPACE_PATTERN = re.compile(r"[\t\n\r ]+")
+REPLACED_WHITESPACE = str.maketrans("\t\n\r","   ")
+NUMBER_PATTERN = re.compile(r"[+-]?(\d*)(?:\.(\d*))?")
+
+LENGTH_FACETS = [
+    ("length","!="),("minLength","<"),("maxLength",">"),
+]
+DIGIT_FACETS = [
+    ("totalDigits",0),("fractionDigits",1),
+]
+RANGE_FACETS = [
+    ("minInclusive","<"),("minExclusive","<="),("maxInclusive",">"),("maxExclusive",">="),
+]
+
+# Checkers that were compiled, stored by the type and facets.
+compiledCheckers = {}
+
+
+
+"""
+Returns the total and fraction digits of a number, or None if
+the value isn't a number. Leading and trailing zeros aren't counted.
+"""
+def getDigitCounts(value):
+    match = NUMBER_PATTERN.fullmatch(value)
+    if match is None or (match.group(1) == "" and not match.group(2)):
+        return None
+    integerDigits = match.group(1).lstrip("0")
+    fractionDigits = (match.group(2) or "").rstrip("0")
+    return (max(1,len(integerDigits) + len(fractionDigits)),len(fractionDigits))
+
+"""
+Returns the value of a number, or None if the value isn't a number.
+"""
+def getNumber(value):
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        return None
+    if not number.is_finite():
+        return None
+    return number
+
+"""
+Returns the compiled pattern of an XSD pattern, or None if the pattern
+uses syntax Python doesn't support. XSD patterns always match the
+whole value, so the patterns are matched with fullmatch.
+"""
+def compilePattern(pattern):
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+"""
+Returns the source of a function that checks the facets, and the
+names the function uses. The function returns the name of the first
+facet the value doesn't satisfy, or None if the value is valid.
+"""
+def createCheckerSource(type,facets):
+    lines = ["def check(value):"]
+    names = {"WHITESPACE_PATTERN": WHITESPACE_PATTERN,"REPLACED_WHITESPACE": REPLACED_WHITESPACE,"getDigitCounts": getDigitCounts,"getNumber": getNumber}
+
+    # Normalize the whitespace. Types other than strings always collapse it.
+    whiteSpace = facets.get("whiteSpace","preserve") if type == "string" else "collapse"
+    if whiteSpace == "collapse":
+        lines.append("    value = WHITESPACE_PATTERN.sub(\" \",value).strip(\" \")")
+    elif whiteSpace == "replace":
+        lines.append("    value = value.translate(REPLACED_WHITESPACE)")
+
+    # Add the fixed value check.
+    if "fixed" in facets.keys():
+        names["FIXED"] = facets["fixed"]
+        lines.append("    if value != FIXED: return \"fixed\"")
+
+    # Add the length checks.
+    for facetName,operator in LENGTH_FACETS:
+        if facetName in facets.keys():
+            lines.append("    if len(value) " + operator + " " + str(int(facets[facetName])) + ": return \"" + facetName + "\"")
+
+    # Add the pattern check.
+    if "pattern" in facets.keys():
+        pattern = compilePattern(facets["pattern"])
+        if pattern is not None:
+            names["PATTERN"] = pattern
+            lines.append("    if PATTERN.fullmatch(value) is None: return \"pattern\"")
+
+    # Add the digit checks.
+    digitFacets = [(facetName,index) for facetName,index in DIGIT_FACETS if facetName in facets.keys()]
+    if len(digitFacets) > 0:
+        lines.append("    digits = getDigitCounts(value)")
+        for facetName,index in digitFacets:
+            lines.append("    if digits is None or digits[" + str(index) + "] > " + str(int(facets[facetName])) + ": return \"" + facetName + "\"")
+
+    # Add the range checks.
+    rangeFacets = [(facetName,operator) for facetName,operator in RANGE_FACETS if facetName in facets.keys()]
+    if len(rangeFacets) > 0:
+        lines.append("    number = getNumber(value)")
+        for facetName,operator in rangeFacets:
+            names[facetName.upper()] = Decimal(facets[facetName])
+            lines.append("    if number is None or number " + operator + " " + facetName.upper() + ": return \"" + facetName + "\"")
+
+    # Return the source.
+    lines.append("    return None")
+    return "\n".join(lines),names
+
+"""
+Returns the function that checks the facets for a type, or None if
+there are no facets to check. The functions are compiled once for
+each type and facets and shared.
+"""
+def getChecker(type,facets):
+    if len(facets) == 0:
+        return None
+
+    # Return the checker if it was compiled.
+    key = (type,tuple(sorted(facets.items())))
+    if key in compiledCheckers.keys():
+        return compiledCheckers[key]
+
+    # Compile the checker.
+    source,names = createCheckerSource(type,facets)
+    exec(compile(source,"<facets of " + str(type) + ">","exec"),names)
+    compiledCheckers[key] = names["check"]
+    return names["check"]
+
+
+
+"""
+Class representing the facet checks of a version.
+"""
+class FacetChecker:
+    """
+    Creates a facet checker.
+    """
+    def __init__(self,compiledVersion):
+        self.compiledVersion = compiledVersion
+
+    """
+    Returns the error message for a value of a field, or None if the
+    value satisfies the facets of the field.
+    """
+    def checkValue(self,field,value):
+        checker = getChecker(field.type,field.facets)
+        if checker is None:
+            return None
+        facetName = checker(value)
+        if facetName is None:
+            return None
+
+        return "Invalid value \"" + value + "\" for " + field.wireName + " (" + facetName + " " + field.facets[facetName] + ")"
+
+    """
+    Checks several values of a field with a single lookup of the
+    checker. Returns the indexes and failed facets of the invalid values.
+    """
+    def checkValues(self,field,values):
+        invalidValues = []
+        checker = getChecker(field.type,field.facets)
+        if checker is None:
+            return invalidValues
+        for i in range(0,len(values)):
+            facetName = checker(values[i])
+            if facetName is not None:
+                invalidValues.append((i,facetName))
+
+        return invalidValues
+
+    """
+    Checks the values of a JSON object of a complex type, using the
+    names of the versioned XSD as the keys. Returns the error messages
+    with the paths of the invalid values.
+    """
+    def checkObject(self,typeName,value,path=None):
+        errors = []
+        compiledType = self.compiledVersion.types.get(typeName)
+        if compiledType is None:
+            raise ValueError("Unknown type " + str(typeName) + " for version " + self.compiledVersion.version)
+        if path is None:
+            path = "/" + compiledType.wireName
+
+        # Check the fields.
+        for key in value.keys():
+            field = compiledType.fieldNames.get(key)
+            fieldValues = value[key]
+            if not isinstance(fieldValues,list):
+                fieldValues = [fieldValues]
+            for fieldValue in fieldValues:
+                if isinstance(fieldValue,dict):
+                    # Elements substituted for a child use the name of their type.
+                    if field is not None and field.type in self.compiledVersion.types.keys():
+                        errors.extend(self.checkObject(field.type,fieldValue,path + "/" + field.wireName))
+                    elif field is None and key in self.compiledVersion.types.keys():
+                        errors.extend(self.checkObject(key,fieldValue,path + "/" + self.compiledVersion.types[key].wireName))
+                elif field is not None and fieldValue is not None and not isinstance(fieldValue,bool):
+                    message = self.checkValue(field,str(fieldValue))
+                    if message is not None:
+                        errors.append(path + ": " + message)
+
+        # Return the errors.
+        return errors
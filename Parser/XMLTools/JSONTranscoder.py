@@ -0,0 +1,395 @@
+"""
+Zachary Cook
+
+Converts JSON objects to ordered XML documents for a version of the
+versioned XSD, and converts the documents back to JSON.
+"""
+
+from Parser.FieldWriter import PythonWriter
+from Parser.XMLTools import CompiledVersion
+from Parser.XSDParser import XSDLoader
+from xml.etree import ElementTree
+from xml.sax import saxutils
+import argparse
+import json
+import sys
+import time
+
+KIND_STRING = 0
+KIND_INTEGER = 1
+KIND_BOOLEAN = 2
+KIND_COMPLEX = 3
+KIND_SUBSTITUTION = 4
+
+ATTRIBUTE_ENTITIES = {"\"": "&quot;"}
+
+
+
+"""
+Class representing how the fields of a complex type are converted.
+Fields are stored as the order, JSON key, wire name, if it is an
+attribute, if it is a list, kind, and plan of the child type. The
+elements that can be substituted for a child are stored under the
+JSON key of the child with the types and wire names of the elements.
+"""
+class TranscoderPlan:
+    """
+    Creates a transcoder plan.
+    """
+    def __init__(self,compiledType):
+        self.compiledType = compiledType
+        self.fieldsByKey = {}
+        self.attributes = {}
+        self.children = {}
+
+    """
+    Adds a field.
+    """
+    def addField(self,order,jsonKey,field,isList,kind,childPlan):
+        entry = (order,jsonKey,field.wireName,field.isAttribute,isList,kind,childPlan)
+        if jsonKey not in self.fieldsByKey.keys():
+            self.fieldsByKey[jsonKey] = entry
+        if field.isAttribute:
+            self.attributes[field.wireName] = entry
+        else:
+            self.children[field.wireName] = entry
+
+    """
+    Adds an element that can be substituted for a child.
+    """
+    def addSubstitution(self,order,jsonKey,isList,typeName,wireName,childPlan):
+        if jsonKey not in self.fieldsByKey.keys():
+            self.fieldsByKey[jsonKey] = (order,jsonKey,None,False,isList,KIND_SUBSTITUTION,{})
+        self.fieldsByKey[jsonKey][6][typeName] = (wireName,childPlan)
+        self.children[wireName] = (order,jsonKey,wireName,False,isList,KIND_SUBSTITUTION,(typeName,childPlan))
+
+"""
+Class representing a transcoder for a version. The JSON keys are the
+names of the versioned XSD, so they are the same for every version.
+Children that elements can be substituted for, like transactions,
+are lists of objects with the type of the element as the only key,
+so the order of the elements is kept.
+"""
+class JSONTranscoder:
+    """
+    Creates a JSON transcoder.
+    """
+    def __init__(self,xsd,versions,version):
+        self.xsd = xsd
+        self.compiledVersion = CompiledVersion.CompiledVersion(xsd,versions,version)
+        self.version = version
+        self.plans = {}
+
+    """
+    Returns the names of the children of a complex type in the order
+    of the XSD, with the fields of the bases first.
+    """
+    def getOrderedChildNames(self,typeName):
+        childNames = []
+        if typeName is None or typeName not in self.xsd.complexTypes.keys():
+            return childNames
+
+        # Add the base children.
+        complexType = self.xsd.complexTypes[typeName]
+        childNames.extend(self.getOrderedChildNames(complexType.type))
+
+        # Add the prioritized children and then the remaining children.
+        for childName in PythonWriter.PRIORITIZED_COMPLEX_TYPE_CHILDREN:
+            if childName in complexType.childItems.keys():
+                childNames.append(childName)
+        for childName in complexType.childItems.keys():
+            if childName not in PythonWriter.PRIORITIZED_COMPLEX_TYPE_CHILDREN and childName not in childNames:
+                childNames.append(childName)
+
+        # Return the children.
+        return childNames
+
+    """
+    Returns the plan of a complex type.
+    """
+    def getPlan(self,typeName):
+        plan = self.plans.get(typeName)
+        if plan is not None:
+            return plan
+
+        # Store the plan before adding the fields since types can contain themselves.
+        compiledType = self.compiledVersion.types.get(typeName)
+        if compiledType is None:
+            raise ValueError("Unknown type " + typeName + " for version " + self.version)
+        plan = TranscoderPlan(compiledType)
+        self.plans[typeName] = plan
+
+        # Group the elements that can be substituted for the children.
+        substitutedFields = {}
+        for field in compiledType.children.values():
+            if compiledType.fieldNames.get(field.name) is not field:
+                if field.name not in substitutedFields.keys():
+                    substitutedFields[field.name] = []
+                substitutedFields[field.name].append(field)
+
+        # Add the fields that exist in the version.
+        order = 0
+        for childName in self.getOrderedChildNames(typeName):
+            field = compiledType.fieldNames.get(childName)
+            if field is None:
+                continue
+            isList = field.maxOccurences is not None and field.maxOccurences > 1
+            if childName not in substitutedFields.keys():
+                plan.addField(order,childName,field,isList,self.getKind(field),self.getChildPlan(field))
+            else:
+                for substitutedField in [field] + substitutedFields[childName]:
+                    childPlan = self.getChildPlan(substitutedField)
+                    if childPlan is not None:
+                        plan.addSubstitution(order,childName,isList,substitutedField.type,substitutedField.wireName,childPlan)
+            order += 1
+
+        # Return the plan.
+        return plan
+
+    """
+    Returns how the value of a field is converted.
+    """
+    def getKind(self,field):
+        if field.type in self.compiledVersion.types.keys():
+            return KIND_COMPLEX
+        elif field.enumValues is not None:
+            return KIND_STRING
+        elif field.type in CompiledVersion.INTEGER_TYPES:
+            return KIND_INTEGER
+        elif field.type == "boolean":
+            return KIND_BOOLEAN
+
+        return KIND_STRING
+
+    """
+    Returns the plan of the type of a field, or None if the field isn't
+    a complex type.
+    """
+    def getChildPlan(self,field):
+        if field.type not in self.compiledVersion.types.keys():
+            return None
+
+        return self.getPlan(field.type)
+
+    """
+    Adds the XML of an object of a complex type.
+    """
+    def addElement(self,parts,wireName,plan,value):
+        if not isinstance(value,dict):
+            raise ValueError("Expected an object for " + wireName)
+
+        # Sort the fields into the order of the XSD.
+        entries = []
+        fieldsByKey = plan.fieldsByKey
+        for jsonKey in value.keys():
+            entry = fieldsByKey.get(jsonKey)
+            if entry is None:
+                raise ValueError("Unknown field " + jsonKey + " of " + wireName)
+            entries.append(entry)
+        entries.sort(key=lambda entry: entry[0])
+
+        # Add the attributes.
+        parts.append("<" + wireName)
+        for order,jsonKey,fieldName,isAttribute,isList,kind,childPlan in entries:
+            if isAttribute:
+                fieldValue = value[jsonKey]
+                if fieldValue is not None:
+                    parts.append(" " + fieldName + "=\"" + saxutils.escape(self.convertToText(fieldName,kind,fieldValue),ATTRIBUTE_ENTITIES) + "\"")
+        startIndex = len(parts)
+        parts.append(">")
+
+        # Add the children.
+        for order,jsonKey,fieldName,isAttribute,isList,kind,childPlan in entries:
+            if isAttribute:
+                continue
+            fieldValues = value[jsonKey]
+            if fieldValues is None:
+                continue
+            if isinstance(fieldValues,list):
+                if not isList:
+                    raise ValueError("Expected a single value for " + fieldName)
+            else:
+                fieldValues = [fieldValues]
+            for fieldValue in fieldValues:
+                if kind == KIND_SUBSTITUTION:
+                    if not isinstance(fieldValue,dict) or len(fieldValue) != 1:
+                        raise ValueError("Expected an object with the type as the only key for " + jsonKey)
+                    typeName = next(iter(fieldValue.keys()))
+                    substitution = childPlan.get(typeName)
+                    if substitution is None:
+                        raise ValueError("Unknown type " + typeName + " for " + jsonKey)
+                    self.addElement(parts,substitution[0],substitution[1],fieldValue[typeName])
+                elif kind == KIND_COMPLEX:
+                    self.addElement(parts,fieldName,childPlan,fieldValue)
+                else:
+                    parts.append("<" + fieldName + ">" + saxutils.escape(self.convertToText(fieldName,kind,fieldValue)) + "</" + fieldName + ">")
+
+        # Close the element.
+        if len(parts) == startIndex + 1:
+            parts[startIndex] = "/>"
+        else:
+            parts.append("</" + wireName + ">")
+
+    """
+    Returns the text of a JSON value.
+    """
+    def convertToText(self,fieldName,kind,value):
+        if isinstance(value,bool):
+            return "true" if value else "false"
+        elif isinstance(value,(str,int,float)):
+            return str(value)
+
+        raise ValueError("Expected a value for " + fieldName)
+
+    """
+    Returns the XML of a JSON object with the root type name as the only key.
+    """
+    def toXML(self,document):
+        if not isinstance(document,dict) or len(document) != 1:
+            raise ValueError("Expected an object with the root type as the only key")
+        typeName = next(iter(document.keys()))
+        plan = self.getPlan(typeName)
+
+        # Add the namespace to the root element.
+        value = document[typeName]
+        parts = []
+        self.addElement(parts,plan.compiledType.wireName,plan,value)
+        parts[0] += " xmlns=\"" + self.compiledVersion.namespace + "\""
+        return "".join(parts)
+
+    """
+    Returns the JSON object of an element of a complex type.
+    """
+    def convertElement(self,plan,element):
+        value = {}
+        for attributeName in element.attrib.keys():
+            if attributeName[0:1] == "{":
+                continue
+            entry = plan.attributes.get(attributeName)
+            if entry is None:
+                raise ValueError("Unknown attribute " + attributeName + " of " + plan.compiledType.wireName)
+            value[entry[1]] = self.convertFromText(entry[5],element.attrib[attributeName])
+
+        # Add the children.
+        for child in element:
+            tag = child.tag
+            if tag[0:1] == "{":
+                tag = tag[tag.find("}") + 1:]
+            entry = plan.children.get(tag)
+            if entry is None:
+                raise ValueError("Unknown element " + tag + " in " + plan.compiledType.wireName)
+            order,jsonKey,fieldName,isAttribute,isList,kind,childPlan = entry
+            if kind == KIND_SUBSTITUTION:
+                childValue = {childPlan[0]: self.convertElement(childPlan[1],child)}
+            elif kind == KIND_COMPLEX:
+                childValue = self.convertElement(childPlan,child)
+            else:
+                childValue = self.convertFromText(kind,child.text or "")
+            if not isList:
+                value[jsonKey] = childValue
+            elif jsonKey in value.keys():
+                value[jsonKey].append(childValue)
+            else:
+                value[jsonKey] = [childValue]
+
+        # Return the object.
+        return value
+
+    """
+    Returns the JSON value of the text of an attribute or element.
+    """
+    def convertFromText(self,kind,text):
+        if kind == KIND_INTEGER:
+            try:
+                return int(text)
+            except ValueError:
+                return text
+        elif kind == KIND_BOOLEAN:
+            strippedText = text.strip()
+            if strippedText == "true" or strippedText == "1":
+                return True
+            elif strippedText == "false" or strippedText == "0":
+                return False
+
+        return text
+
+    """
+    Returns the JSON object of an XML document. The source can be a
+    string, bytes, or a parsed element.
+    """
+    def toJSON(self,source):
+        root = source
+        if isinstance(source,(str,bytes)):
+            root = ElementTree.fromstring(source)
+        tag = CompiledVersion.removeNamespace(root.tag)
+        typeName = self.compiledVersion.elements.get(tag)
+        if typeName is None:
+            raise ValueError("Unknown root element " + tag + " for version " + self.version)
+
+        return {typeName: self.convertElement(self.getPlan(typeName),root)}
+
+    """
+    Converts JSON objects to XML documents with one per line. Returns
+    the number of converted documents.
+    """
+    def transcodeJSONLines(self,lines,output):
+        count = 0
+        for line in lines:
+            if line.strip() == "":
+                continue
+            output.write(self.toXML(json.loads(line)) + "\n")
+            count += 1
+
+        return count
+
+    """
+    Converts XML documents to JSON objects with one per line. Returns
+    the number of converted documents.
+    """
+    def transcodeXMLLines(self,lines,output):
+        count = 0
+        for line in lines:
+            if line.strip() == "":
+                continue
+            output.write(json.dumps(self.toJSON(line),separators=(",",":")) + "\n")
+            count += 1
+
+        return count
+
+
+
+if __name__ == '__main__':
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Converts JSON objects to XML documents, or XML documents to JSON objects, with one per line.")
+    parser.add_argument("mode",choices=["to-xml","to-json"],help="Whether to convert JSON to XML or XML to JSON.")
+    parser.add_argument("--input",help="File to read. Defaults to the standard input.")
+    parser.add_argument("--output",help="File to write. Defaults to the standard output.")
+    parser.add_argument("--version",help="Schema version of the documents. Defaults to the newest version.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    arguments = parser.parse_args()
+
+    # Load the schema and create the transcoder.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    version = arguments.version or versions[len(versions) - 1]
+    if version not in versions:
+        print("Unknown version " + version)
+        sys.exit(2)
+    transcoder = JSONTranscoder(versionedXSD,versions,version)
+
+    # Convert the documents.
+    inputFile = open(arguments.input,encoding="utf8") if arguments.input is not None else sys.stdin
+    outputFile = open(arguments.output,"w",encoding="utf8") if arguments.output is not None else sys.stdout
+    startTime = time.perf_counter()
+    try:
+        if arguments.mode == "to-xml":
+            count = transcoder.transcodeJSONLines(inputFile,outputFile)
+        else:
+            count = transcoder.transcodeXMLLines(inputFile,outputFile)
+    except (ValueError,ElementTree.ParseError) as error:
+        print(str(error))
+        sys.exit(1)
+    finally:
+        inputFile.close()
+        outputFile.close()
+    duration = time.perf_counter() - startTime
+    sys.stderr.write("Converted " + str(count) + " documents in " + str(round(duration,3)) + "s (" + str(round(count / max(duration,0.000001),1)) + " documents/s)\n")
@@ -0,0 +1,804 @@
+"""
+Zachary Cook
+
+Generates random online and batch requests for a version of the
+versioned XSD for load testing.
+"""
+
+from Parser.FieldWriter import PythonWriter
+from Parser.XMLTools import BatchSplitter, BatchTotals, CompiledVersion, FacetChecker
+from Parser.XSDParser import XSDLoader
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from xml.sax import saxutils
+import argparse
+import base64
+import collections
+import math
+import os
+import random
+import string
+import sys
+import time
+
+ONLINE_REQUEST_NAME = "cnpOnlineRequest"
+BATCH_REQUEST_NAME = "cnpRequest"
+AUTHENTICATION_NAME = "authentication"
+VERSION_ATTRIBUTE = "version"
+
+OPTIONAL_PROBABILITY = 0.25
+MAX_DEPTH = 4
+MAX_REPEATS = 2
+POOL_SIZE = 256
+CHUNK_SIZE = 500
+CHUNKS_PER_PROCESS = 4
+POOL_ATTEMPTS = 4
+MAX_PATTERN_REPEATS = 20
+STRING_CHARACTERS = string.ascii_letters + string.digits
+CATEGORY_CHARACTERS = {
+    "d": string.digits,
+    "D": string.ascii_letters,
+    "w": string.ascii_letters + string.digits,
+    "W": "-.",
+    "s": " ",
+    "S": STRING_CHARACTERS,
+    "i": string.ascii_letters + "_:",
+    "I": string.digits + "-.",
+    "c": string.ascii_letters + string.digits + "-._:",
+    "C": " ",
+}
+PATTERN_ESCAPES = {
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+# Generator used by the worker processes.
+workerGenerator = None
+
+
+
+"""
+Returns the characters of an escape of a pattern that starts after
+the backslash, and the index after the escape.
+"""
+def parsePatternEscape(pattern,index):
+    if index >= len(pattern):
+        raise ValueError("Incomplete escape in pattern " + pattern)
+    character = pattern[index]
+    if character in CATEGORY_CHARACTERS.keys():
+        return CATEGORY_CHARACTERS[character],index + 1
+    elif character == "p" or character == "P":
+        raise ValueError("Unsupported character property in pattern " + pattern)
+
+    return PATTERN_ESCAPES.get(character,character),index + 1
+
+"""
+Returns the characters of a character class of a pattern that starts
+after the opening bracket, and the index after the class.
+"""
+def parsePatternCharacterClass(pattern,index):
+    characters = []
+    negate = index < len(pattern) and pattern[index] == "^"
+    if negate:
+        index += 1
+    while index < len(pattern) and pattern[index] != "]":
+        # Add the characters of a category.
+        # Nested classes are only used for subtractions, which aren't supported.
+        if pattern[index] == "[" or pattern[index:index + 2] == "-[":
+            raise ValueError("Unsupported character class subtraction in pattern " + pattern)
+        elif pattern[index] == "\\" and index + 1 < len(pattern) and pattern[index + 1] in CATEGORY_CHARACTERS.keys():
+            characters.extend(CATEGORY_CHARACTERS[pattern[index + 1]])
+            index += 2
+            continue
+
+        # Add the character or the range of characters.
+        if pattern[index] == "\\":
+            first,index = parsePatternEscape(pattern,index + 1)
+        else:
+            first,index = pattern[index],index + 1
+        if pattern[index:index + 1] == "-" and index + 1 < len(pattern) and pattern[index + 1] != "]":
+            if pattern[index + 1] == "\\":
+                last,index = parsePatternEscape(pattern,index + 2)
+            else:
+                last,index = pattern[index + 1],index + 2
+            characters.extend(chr(character) for character in range(ord(first),ord(last) + 1))
+        else:
+            characters.append(first)
+    if index >= len(pattern):
+        raise ValueError("Unterminated character class in pattern " + pattern)
+
+    # Return the characters.
+    if negate:
+        characters = [character for character in STRING_CHARACTERS if character not in characters]
+    if len(characters) == 0:
+        raise ValueError("Character class without characters in pattern " + pattern)
+    return "".join(characters),index + 1
+
+"""
+Returns the minimum and maximum repeats of the quantifier at an index
+of a pattern, and the index after the quantifier. The maximum is None
+if the repeats are unbounded.
+"""
+def parsePatternQuantifier(pattern,index):
+    character = pattern[index:index + 1]
+    if character == "?":
+        return 0,1,index + 1
+    elif character == "*":
+        return 0,None,index + 1
+    elif character == "+":
+        return 1,None,index + 1
+    elif character == "{":
+        end = pattern.find("}",index)
+        bounds = pattern[index + 1:end].split(",")
+        if end == -1 or len(bounds) > 2 or not bounds[0].isdigit() or (len(bounds) == 2 and bounds[1] != "" and not bounds[1].isdigit()):
+            raise ValueError("Invalid quantifier in pattern " + pattern)
+        minimum = int(bounds[0])
+        if len(bounds) == 1:
+            return minimum,minimum,end + 1
+        return minimum,int(bounds[1]) if bounds[1] != "" else None,end + 1
+
+    return 1,1,index
+
+"""
+Parses an XSD pattern. The items of the parsed pattern are the
+characters to pick one from, the repeats of an item, or the branches
+of a group. The groups are parsed with an explicit stack. Raises a
+ValueError if the pattern uses syntax that isn't supported.
+"""
+def parsePattern(pattern):
+    # Each entry of the stack has the branches of a group, with the items added to the last branch.
+    stack = [[[]]]
+    index = 0
+    while index < len(pattern):
+        character = pattern[index]
+        index += 1
+        if character == "(":
+            stack.append([[]])
+            continue
+        elif character == "|":
+            stack[-1].append([])
+            continue
+        elif character == ")":
+            if len(stack) == 1:
+                raise ValueError("Unbalanced parenthesis in pattern " + pattern)
+            item = ("group",tuple(tuple(branch) for branch in stack.pop()))
+        elif character == "[":
+            characters,index = parsePatternCharacterClass(pattern,index)
+            item = ("characters",characters)
+        elif character == "\\":
+            characters,index = parsePatternEscape(pattern,index)
+            item = ("characters",characters)
+        elif character == ".":
+            item = ("characters",STRING_CHARACTERS)
+        elif character in "?*+{":
+            raise ValueError("Quantifier without an item in pattern " + pattern)
+        else:
+            item = ("characters",character)
+
+        # Add the item with its quantifier.
+        minimum,maximum,index = parsePatternQuantifier(pattern,index)
+        if minimum != 1 or maximum != 1:
+            item = ("repeat",minimum,maximum,item)
+        stack[-1][-1].append(item)
+    if len(stack) != 1:
+        raise ValueError("Unbalanced parenthesis in pattern " + pattern)
+
+    # Return the group of the pattern.
+    return ("group",tuple(tuple(branch) for branch in stack[0]))
+
+"""
+Adds the characters of a random value matching an item of a parsed pattern.
+"""
+def addPatternValue(generatorRandom,parts,item):
+    if item[0] == "characters":
+        parts.append(item[1] if len(item[1]) == 1 else generatorRandom.choice(item[1]))
+    elif item[0] == "repeat":
+        minimum,maximum,subitem = item[1:]
+        maximum = MAX_PATTERN_REPEATS if maximum is None else min(maximum,MAX_PATTERN_REPEATS)
+        for i in range(0,generatorRandom.randint(minimum,max(minimum,maximum))):
+            addPatternValue(generatorRandom,parts,subitem)
+    else:
+        for subitem in generatorRandom.choice(item[1]):
+            addPatternValue(generatorRandom,parts,subitem)
+
+"""
+Returns a random number of a type within the digits and ranges of the facets.
+"""
+def createNumber(generatorRandom,type,facets):
+    fractionDigits = 0 if type in CompiledVersion.INTEGER_TYPES else min(2,int(facets.get("fractionDigits",2)))
+    totalDigits = int(facets.get("totalDigits",0))
+    if totalDigits > 0:
+        fractionDigits = min(fractionDigits,totalDigits - 1)
+
+    # Determine the range of the integer part.
+    minimum = 0
+    maximum = 100000 if fractionDigits == 0 else 10000
+    if totalDigits > 0:
+        maximum = min(maximum,(10 ** (totalDigits - fractionDigits)) - 1)
+    if "minInclusive" in facets.keys():
+        minimum = max(minimum,math.ceil(Decimal(facets["minInclusive"])))
+    if "minExclusive" in facets.keys():
+        minimum = max(minimum,math.floor(Decimal(facets["minExclusive"])) + 1)
+    if "maxInclusive" in facets.keys():
+        maximum = min(maximum,math.floor(Decimal(facets["maxInclusive"])))
+    if "maxExclusive" in facets.keys():
+        maximum = min(maximum,math.ceil(Decimal(facets["maxExclusive"])) - 1)
+
+    # Create the number.
+    value = str(generatorRandom.randint(minimum,max(minimum,maximum)))
+    if fractionDigits > 0 and int(value) < maximum:
+        value += "." + str(generatorRandom.randint(0,(10 ** fractionDigits) - 1)).zfill(fractionDigits)
+    return value
+
+"""
+Returns a random value of a type. Numbers and strings are created
+within the facets, but other facets, like patterns combined with
+lengths, may not be satisfied.
+"""
+def createValue(generatorRandom,type,facets,pattern=None):
+    if type in CompiledVersion.INTEGER_TYPES or type == "decimal":
+        return createNumber(generatorRandom,type,facets)
+    elif type == "boolean":
+        return generatorRandom.choice(["true","false"])
+    elif type == "date" or type == "dateTime":
+        value = str(generatorRandom.randint(2020,2029)) + "-" + str(generatorRandom.randint(1,12)).zfill(2) + "-" + str(generatorRandom.randint(1,28)).zfill(2)
+        if type == "dateTime":
+            value += "T" + str(generatorRandom.randint(0,23)).zfill(2) + ":" + str(generatorRandom.randint(0,59)).zfill(2) + ":" + str(generatorRandom.randint(0,59)).zfill(2)
+        return value
+    elif type == "base64Binary":
+        return base64.b64encode(bytes(generatorRandom.getrandbits(8) for j in range(0,12))).decode("ascii")
+    elif pattern is not None:
+        parts = []
+        addPatternValue(generatorRandom,parts,pattern)
+        return "".join(parts)
+
+    # Create a string within the lengths.
+    minimum = int(facets.get("minLength",1))
+    maximum = int(facets.get("maxLength",max(minimum,20)))
+    if "length" in facets.keys():
+        minimum = int(facets["length"])
+        maximum = minimum
+    maximum = min(maximum,max(minimum,20))
+    return "".join(generatorRandom.choice(STRING_CHARACTERS) for j in range(0,generatorRandom.randint(min(minimum,maximum),maximum)))
+
+"""
+Creates the pool of random values for a type that satisfy the facets.
+Values that don't satisfy the facets are only used if no value does.
+"""
+def createValuePool(generatorRandom,type,facets=None):
+    if facets is None:
+        facets = {}
+    pattern = None
+    if "pattern" in facets.keys() and type not in CompiledVersion.INTEGER_TYPES and type != "decimal":
+        try:
+            pattern = parsePattern(facets["pattern"])
+        except ValueError:
+            pattern = None
+    checker = FacetChecker.getChecker(type,facets)
+
+    # Create the values.
+    values = []
+    invalidValues = []
+    for i in range(0,POOL_SIZE * POOL_ATTEMPTS):
+        try:
+            value = createValue(generatorRandom,type,facets,pattern)
+        except ValueError:
+            pattern = None
+            continue
+        if checker is None or checker(value) is None:
+            values.append(value)
+            if len(values) == POOL_SIZE:
+                break
+        elif len(invalidValues) < POOL_SIZE:
+            invalidValues.append(value)
+    if len(values) == 0:
+        values = invalidValues
+
+    return tuple(saxutils.escape(value,{"\"": "&quot;"}) for value in values)
+
+"""
+Parses a transaction mix like "authorization=5,sale=3". Names
+without a weight have a weight of 1.
+"""
+def parseMix(mixText):
+    mix = collections.OrderedDict()
+    for entry in mixText.split(","):
+        entry = entry.strip()
+        if entry == "":
+            continue
+        if "=" in entry:
+            name,weight = entry.split("=",1)
+            mix[name.strip()] = float(weight)
+        else:
+            mix[entry] = 1.0
+
+    return mix
+
+
+
+"""
+Class representing how the attributes and children of a complex
+type are generated. The choices are stored by the name of the type
+that has the choice and the index of the choice, with the indexes of
+the children of the choice that have fields. The children are stored
+as the choices they are in, or None, with the children of each child
+of the choice in the order of the XSD.
+"""
+class TypePlan:
+    """
+    Creates a type plan.
+    """
+    def __init__(self,compiledType):
+        self.compiledType = compiledType
+        self.attributes = []
+        self.children = []
+        self.choices = {}
+
+"""
+Class representing a generator of random requests for a version. A
+child of each choice of the XSD is picked for each element, and the
+children in the other children of the choice aren't added. Elements
+are only substituted with the elements of their substitution groups.
+"""
+class RequestGenerator:
+    """
+    Creates a request generator. The mix is a dictionary of the
+    transaction element names and their weights.
+    """
+    def __init__(self,compiledVersion,seed=0,mix=None,batch=False,batchCount=1,batchSize=100,optionalProbability=OPTIONAL_PROBABILITY):
+        self.compiledVersion = compiledVersion
+        self.seed = seed
+        self.batch = batch
+        self.batchCount = batchCount
+        self.batchSize = batchSize
+        self.optionalProbability = optionalProbability
+        self.random = random.Random(seed)
+        self.pools = {}
+        self.plans = {}
+
+        # Get the root type and the types with the transactions.
+        # The type names are the same for the legacy root elements, like litleOnlineRequest.
+        rootName = BATCH_REQUEST_NAME if batch else ONLINE_REQUEST_NAME
+        self.rootType = compiledVersion.types.get(rootName)
+        if self.rootType is None:
+            raise ValueError("Unknown root type " + rootName + " for version " + compiledVersion.version)
+        transactionParentName = BatchTotals.BATCH_TYPE_NAME if batch else self.rootType.name
+        if transactionParentName not in compiledVersion.types.keys():
+            raise ValueError("Unknown type " + transactionParentName + " for version " + compiledVersion.version)
+        self.batchType = compiledVersion.types.get(BatchTotals.BATCH_TYPE_NAME)
+        transactionElements = BatchTotals.getTransactionElements(compiledVersion,transactionParentName)
+
+        # Set up the transaction mix. Only the elements that can be substituted for the transactions are included by default.
+        if mix is None:
+            substituteNames = set()
+            for fieldName in BatchTotals.TRANSACTION_FIELD_NAMES:
+                substituteNames.update(compiledVersion.getSubstitutes(fieldName))
+            mix = collections.OrderedDict()
+            for wireName in transactionElements.keys():
+                if transactionElements[wireName].name in substituteNames:
+                    mix[wireName] = 1.0
+        self.transactionNames = []
+        self.transactionPlans = []
+        self.cumulativeWeights = []
+        totalWeight = 0
+        for wireName in mix.keys():
+            if wireName not in transactionElements.keys():
+                raise ValueError("Unknown transaction element " + wireName + " for " + rootName)
+            if mix[wireName] <= 0:
+                continue
+            totalWeight += mix[wireName]
+            self.transactionNames.append(wireName)
+            self.transactionPlans.append(self.getPlan(transactionElements[wireName].name))
+            self.cumulativeWeights.append(totalWeight)
+        if len(self.transactionNames) == 0:
+            raise ValueError("No transaction elements to generate for " + rootName)
+
+        # Get the totals of the batches.
+        self.totalsByElement = {}
+        self.totalAttributeNames = []
+        if batch:
+            for total in BatchTotals.getBatchTotals(compiledVersion):
+                if total.elementName not in self.totalsByElement.keys():
+                    self.totalsByElement[total.elementName] = []
+                self.totalsByElement[total.elementName].append(total)
+                self.totalAttributeNames.append(total.attributeName)
+
+    """
+    Returns the pool of random values for a field. Fields with a fixed
+    value only use the fixed value.
+    """
+    def getPool(self,field):
+        if "fixed" in field.facets.keys():
+            return (saxutils.escape(field.facets["fixed"],{"\"": "&quot;"}),)
+        if field.enumValues is not None and len(field.enumValues) > 0:
+            return tuple(saxutils.escape(value) for value in sorted(field.enumValues))
+
+        # Create the pool of the type and facets.
+        poolKey = str(field.type) + ":" + repr(sorted(field.facets.items()))
+        pool = self.pools.get(poolKey)
+        if pool is None:
+            pool = createValuePool(random.Random(str(self.seed) + ":" + poolKey),field.type,field.facets)
+            self.pools[poolKey] = pool
+        return pool
+
+    """
+    Returns the fields of a type in the order of the XSD with the names
+    of the types that declare them. The fields of the bases are first,
+    and the fields of each type are ordered by their positions, or with
+    the prioritized children first if the positions weren't stored.
+    Types that declare elements of their base again are restrictions,
+    so the other elements of their bases aren't included.
+    """
+    def getOrderedFields(self,compiledType):
+        # Get the names of the types that declare the fields, starting with the base.
+        typeNames = []
+        for field in compiledType.fields:
+            if field.parentName not in typeNames:
+                typeNames.insert(0,field.parentName)
+
+        # Get the first type with the elements.
+        firstElementIndex = 0
+        for i in range(1,len(typeNames)):
+            baseType = self.compiledVersion.types.get(typeNames[i - 1])
+            for field in compiledType.fields:
+                if field.parentName == typeNames[i] and not field.isAttribute and baseType is not None and field.name in baseType.fieldNames.keys():
+                    firstElementIndex = i
+                    break
+
+        # Add the fields of each type.
+        fields = []
+        for i in range(0,len(typeNames)):
+            typeFields = [field for field in compiledType.fields if field.parentName == typeNames[i] and (field.isAttribute or i >= firstElementIndex)]
+            orderedFields = []
+            for childName in PythonWriter.PRIORITIZED_COMPLEX_TYPE_CHILDREN:
+                if childName in compiledType.fieldNames.keys() and compiledType.fieldNames[childName] in typeFields:
+                    orderedFields.append(compiledType.fieldNames[childName])
+            for field in typeFields:
+                if field.name not in PythonWriter.PRIORITIZED_COMPLEX_TYPE_CHILDREN:
+                    orderedFields.append(field)
+            orderedFields.sort(key=lambda field: field.position if field.position is not None else -1)
+            fields.extend((typeNames[i],field) for field in orderedFields)
+        return fields
+
+    """
+    Returns the plan of a complex type. Types declared with names that
+    only differ in case are merged, so the plan only has the fields of
+    the type the element was declared with, or of the type with the
+    name of the merged type if it isn't given.
+    """
+    def getPlan(self,typeName,declaredType=None):
+        if declaredType is None:
+            declaredType = typeName
+        plan = self.plans.get((typeName,declaredType))
+        if plan is not None:
+            return plan
+
+        # Store the plan before adding the children since types can contain themselves.
+        compiledType = self.compiledVersion.types[typeName]
+        plan = TypePlan(compiledType)
+        self.plans[(typeName,declaredType)] = plan
+
+        # Add the attributes and children.
+        children = []
+        for typeName,field in self.getOrderedFields(compiledType):
+            if len(field.declarations) > 0 and declaredType not in field.declarations:
+                continue
+            minOccurences = field.minOccurences or 0
+            if field.isAttribute:
+                plan.attributes.append((field.wireName,minOccurences > 0,self.getPool(field)))
+                continue
+
+            # Add the element if it isn't abstract and the elements that can be substituted for it.
+            childAlternatives = []
+            headType = self.compiledVersion.types.get(field.name)
+            if headType is None or not headType.isAbstract:
+                if field.type in self.compiledVersion.types.keys():
+                    childAlternatives.append((field.wireName,self.getPlan(field.type,field.declaredType),None))
+                else:
+                    childAlternatives.append((field.wireName,None,self.getPool(field)))
+            for substituteName in self.compiledVersion.getSubstitutes(field.name):
+                childAlternatives.append((self.compiledVersion.types[substituteName].wireName,self.getPlan(substituteName),None))
+
+            # Add the child to the choices it is in.
+            choiceIndexes = {}
+            for choiceIndex,childIndex,position in field.choices:
+                choiceKey = (typeName,choiceIndex)
+                if choiceKey not in plan.choices.keys():
+                    plan.choices[choiceKey] = []
+                if childIndex not in plan.choices[choiceKey]:
+                    plan.choices[choiceKey].append(childIndex)
+                if choiceKey not in choiceIndexes.keys():
+                    choiceIndexes[choiceKey] = set()
+                choiceIndexes[choiceKey].add(childIndex)
+            maxOccurences = field.maxOccurences if field.maxOccurences is not None else MAX_REPEATS
+            children.append(((field.name,tuple(childAlternatives),minOccurences,min(max(minOccurences,1),maxOccurences),max(minOccurences,min(maxOccurences,MAX_REPEATS)),choiceIndexes),typeName,field.choices))
+
+        # Group the children of each choice by the child of the choice they are in.
+        # Elements can be in several children of a choice at different positions.
+        choiceChildren = {}
+        for child,typeName,choices in children:
+            if len(choices) == 0:
+                plan.children.append((None,{None: (child,)}))
+                continue
+            choiceKey = (typeName,choices[0][0])
+            if choiceKey not in choiceChildren.keys():
+                choiceChildren[choiceKey] = {}
+                plan.children.append((choiceKey,choiceChildren[choiceKey]))
+            for choiceIndex,childIndex,position in choices:
+                if choiceIndex == choiceKey[1]:
+                    if childIndex not in choiceChildren[choiceKey].keys():
+                        choiceChildren[choiceKey][childIndex] = []
+                    choiceChildren[choiceKey][childIndex].append((position,child))
+        for choiceKey in choiceChildren.keys():
+            for childIndex in choiceChildren[choiceKey].keys():
+                choiceChildren[choiceKey][childIndex] = tuple(child for position,child in sorted(choiceChildren[choiceKey][childIndex],key=lambda entry: entry[0]))
+
+        # Return the plan.
+        return plan
+
+    """
+    Adds the start tag of an element. Attributes in the overrides are
+    written with the given values, or skipped if the value is None.
+    """
+    def addStartTag(self,parts,wireName,plan,overrides=None):
+        parts.append("<" + wireName)
+        if overrides is not None:
+            for attributeName in overrides.keys():
+                if overrides[attributeName] is not None and attributeName not in plan.compiledType.attributes.keys():
+                    parts.append(" " + attributeName + "=\"" + saxutils.escape(str(overrides[attributeName]),{"\"": "&quot;"}) + "\"")
+
+        # Add the attributes of the plan.
+        generatorRandom = self.random
+        for attributeName,required,pool in plan.attributes:
+            if overrides is not None and attributeName in overrides.keys():
+                if overrides[attributeName] is not None:
+                    parts.append(" " + attributeName + "=\"" + saxutils.escape(str(overrides[attributeName]),{"\"": "&quot;"}) + "\"")
+            elif required or generatorRandom.random() < self.optionalProbability:
+                parts.append(" " + attributeName + "=\"" + generatorRandom.choice(pool) + "\"")
+
+    """
+    Adds the children of an element. The values of the simple children
+    are stored in the values if they are given.
+    """
+    def addChildren(self,parts,plan,depth,values=None,optionalProbability=None):
+        generatorRandom = self.random
+        if optionalProbability is None:
+            optionalProbability = self.optionalProbability
+        chosenChildren = {}
+        for choiceKey in plan.choices.keys():
+            childIndexes = plan.choices[choiceKey]
+            chosenChildren[choiceKey] = childIndexes[0] if len(childIndexes) == 1 else generatorRandom.choice(childIndexes)
+        for choiceKey,choiceChildren in plan.children:
+            for fieldName,alternatives,minOccurences,minRepeats,maxRepeats,choiceIndexes in choiceChildren.get(None if choiceKey is None else chosenChildren[choiceKey],()):
+                self.addChild(parts,alternatives,minOccurences,minRepeats,maxRepeats,choiceIndexes,chosenChildren,depth,values,optionalProbability)
+
+    """
+    Adds the elements of a child. Children in the choices that weren't
+    picked aren't added.
+    """
+    def addChild(self,parts,alternatives,minOccurences,minRepeats,maxRepeats,choiceIndexes,chosenChildren,depth,values,optionalProbability):
+        if len(alternatives) == 0:
+            return
+        for choiceKey in choiceIndexes.keys():
+            if chosenChildren[choiceKey] not in choiceIndexes[choiceKey]:
+                return
+        generatorRandom = self.random
+
+        # Determine the number of elements.
+        count = minOccurences
+        if minOccurences == 0 and generatorRandom.random() < optionalProbability:
+            count = minRepeats if minRepeats == maxRepeats else generatorRandom.randint(minRepeats,maxRepeats)
+
+        # Add the elements.
+        for i in range(0,count):
+            wireName,childPlan,pool = alternatives[0] if len(alternatives) == 1 else generatorRandom.choice(alternatives)
+            if childPlan is None:
+                value = generatorRandom.choice(pool)
+                parts.append("<" + wireName + ">" + value + "</" + wireName + ">")
+                if values is not None:
+                    values[wireName] = value
+            elif minOccurences > 0 or depth < MAX_DEPTH:
+                self.addElement(parts,wireName,childPlan,depth + 1)
+
+    """
+    Adds an element of a complex type. The probability of adding the
+    optional children can be changed for the element.
+    """
+    def addElement(self,parts,wireName,plan,depth,values=None,overrides=None,optionalProbability=None):
+        self.addStartTag(parts,wireName,plan,overrides)
+        startIndex = len(parts)
+        parts.append(">")
+        self.addChildren(parts,plan,depth,values,optionalProbability)
+        if len(parts) == startIndex + 1:
+            parts[startIndex] = "/>"
+        else:
+            parts.append("</" + wireName + ">")
+
+    """
+    Adds the authentication of a request with all of its children.
+    """
+    def addAuthentication(self,parts):
+        field = self.rootType.children.get(AUTHENTICATION_NAME)
+        if field is not None and field.type in self.compiledVersion.types.keys():
+            self.addElement(parts,field.wireName,self.getPlan(field.type,field.declaredType),1,optionalProbability=1)
+
+    """
+    Adds a transaction chosen with the mix. Returns the name of the
+    transaction and the values of its simple children.
+    """
+    def addTransaction(self,parts,depth):
+        index = 0
+        if len(self.transactionNames) > 1:
+            index = self.random.choices(range(0,len(self.transactionNames)),cum_weights=self.cumulativeWeights)[0]
+        wireName = self.transactionNames[index]
+        values = {}
+        self.addElement(parts,wireName,self.transactionPlans[index],depth,values)
+        return wireName,values
+
+    """
+    Returns the attributes of the root element.
+    """
+    def getRootOverrides(self):
+        overrides = collections.OrderedDict()
+        overrides["xmlns"] = self.compiledVersion.namespace
+        if VERSION_ATTRIBUTE in self.rootType.attributes.keys():
+            overrides[VERSION_ATTRIBUTE] = self.compiledVersion.version
+        if self.batch and BatchSplitter.ROOT_COUNT_ATTRIBUTE in self.rootType.attributes.keys():
+            overrides[BatchSplitter.ROOT_COUNT_ATTRIBUTE] = self.batchCount
+        return overrides
+
+    """
+    Returns a random online request.
+    """
+    def generateOnlineRequest(self):
+        parts = []
+        rootPlan = self.getPlan(self.rootType.name)
+        self.addStartTag(parts,self.rootType.wireName,rootPlan,self.getRootOverrides())
+        parts.append(">")
+        self.addAuthentication(parts)
+        self.addTransaction(parts,1)
+        parts.append("</" + self.rootType.wireName + ">")
+        return "".join(parts)
+
+    """
+    Returns a random batch request. The totals of each batch are
+    calculated from its transactions.
+    """
+    def generateBatchRequest(self):
+        parts = []
+        rootPlan = self.getPlan(self.rootType.name)
+        batchPlan = self.getPlan(self.batchType.name)
+        self.addStartTag(parts,self.rootType.wireName,rootPlan,self.getRootOverrides())
+        parts.append(">")
+        self.addAuthentication(parts)
+
+        # Add the batches.
+        for i in range(0,self.batchCount):
+            bodyParts = []
+            totals = dict.fromkeys(self.totalAttributeNames,0)
+            for j in range(0,self.batchSize):
+                wireName,values = self.addTransaction(bodyParts,2)
+                for total in self.totalsByElement.get(wireName,[]):
+                    totals[total.attributeName] += total.getValue(values)
+
+            # Add the batch with the totals.
+            overrides = collections.OrderedDict()
+            for attributeName in self.totalAttributeNames:
+                overrides[attributeName] = totals[attributeName] if totals[attributeName] != 0 else None
+            self.addStartTag(parts,self.batchType.wireName,batchPlan,overrides)
+            parts.append(">")
+            parts.extend(bodyParts)
+            parts.append("</" + self.batchType.wireName + ">")
+
+        parts.append("</" + self.rootType.wireName + ">")
+        return "".join(parts)
+
+    """
+    Returns a random request.
+    """
+    def generateRequest(self):
+        if self.batch:
+            return self.generateBatchRequest()
+
+        return self.generateOnlineRequest()
+
+    """
+    Returns a chunk of requests as bytes with one request per line.
+    The random values only depend on the seed and chunk index, so the
+    output is the same for any number of processes.
+    """
+    def generateChunk(self,chunkIndex,count):
+        self.random = random.Random(str(self.seed) + ":" + str(chunkIndex))
+        return ("\n".join(self.generateRequest() for i in range(0,count)) + "\n").encode("utf8")
+
+
+
+"""
+Initializes a worker process with the generator.
+"""
+def initializeWorker(compiledVersion,settings):
+    global workerGenerator
+    workerGenerator = RequestGenerator(compiledVersion,**settings)
+
+"""
+Generates a chunk of requests in a worker process.
+"""
+def generateInWorker(chunk):
+    return workerGenerator.generateChunk(*chunk)
+
+"""
+Generates requests and writes them to a binary file with one request
+per line. Returns the number of seconds it took.
+"""
+def generateRequests(compiledVersion,count,output,processes=None,chunkSize=CHUNK_SIZE,**settings):
+    startTime = time.perf_counter()
+    chunks = [(chunkIndex,min(chunkSize,count - (chunkIndex * chunkSize))) for chunkIndex in range(0,(count + chunkSize - 1) // chunkSize)]
+    if processes == 1:
+        generator = RequestGenerator(compiledVersion,**settings)
+        for chunk in chunks:
+            output.write(generator.generateChunk(*chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=processes,initializer=initializeWorker,initargs=(compiledVersion,settings)) as executor:
+            # Limit the pending chunks so the memory doesn't grow when the output is slow.
+            pendingChunks = collections.deque()
+            maxPendingChunks = (processes or os.cpu_count() or 1) * CHUNKS_PER_PROCESS
+            for chunk in chunks:
+                pendingChunks.append(executor.submit(generateInWorker,chunk))
+                if len(pendingChunks) >= maxPendingChunks:
+                    output.write(pendingChunks.popleft().result())
+            while len(pendingChunks) > 0:
+                output.write(pendingChunks.popleft().result())
+
+    # Return the duration.
+    output.flush()
+    return time.perf_counter() - startTime
+
+
+
+if __name__ == '__main__':
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Generates random requests for a schema version, one request per line.")
+    parser.add_argument("--version",help="Schema version of the requests. Defaults to the newest version.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    parser.add_argument("--count",type=int,default=1000,help="Number of requests to generate.")
+    parser.add_argument("--seed",type=int,default=0,help="Seed of the random values.")
+    parser.add_argument("--mix",help="Weights of the transactions, like \"authorization=5,sale=3\". Defaults to every transaction.")
+    parser.add_argument("--batch",action="store_true",help="Generate batch requests instead of online requests.")
+    parser.add_argument("--batches",type=int,default=1,help="Number of batches in each batch request.")
+    parser.add_argument("--batch-size",type=int,default=100,help="Number of transactions in each batch.")
+    parser.add_argument("--optional",type=float,default=OPTIONAL_PROBABILITY,help="Probability of adding each optional attribute and element.")
+    parser.add_argument("--processes",type=int,default=None,help="Number of processes to use.")
+    parser.add_argument("--output",help="File to write the requests to. Defaults to the standard output.")
+    arguments = parser.parse_args()
+
+    # Load the schema and compile the version.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    version = arguments.version or versions[len(versions) - 1]
+    if version not in versions:
+        print("Unknown version " + version)
+        sys.exit(2)
+    compiledVersion = CompiledVersion.CompiledVersion(versionedXSD,versions,version)
+
+    # Create a generator to check the settings before starting the processes.
+    settings = {
+        "seed": arguments.seed,
+        "mix": parseMix(arguments.mix) if arguments.mix is not None else None,
+        "batch": arguments.batch,
+        "batchCount": arguments.batches,
+        "batchSize": arguments.batch_size,
+        "optionalProbability": arguments.optional,
+    }
+    try:
+        RequestGenerator(compiledVersion,**settings)
+    except ValueError as error:
+        print(str(error))
+        sys.exit(2)
+
+    # Generate the requests.
+    if arguments.output is None:
+        duration = generateRequests(compiledVersion,arguments.count,sys.stdout.buffer,arguments.processes,**settings)
+    else:
+        with open(arguments.output,"wb") as output:
+            duration = generateRequests(compiledVersion,arguments.count,output,arguments.processes,**settings)
+    sys.stderr.write("Generated " + str(arguments.count) + " requests in " + str(round(duration,3)) + "s (" + str(round(arguments.count / max(duration,0.000001),1)) + " requests/s)\n")
@@ -0,0 +1,336 @@
+"""
+Zachary Cook
+
+Answers queries about the versioned XSD over HTTP.
+"""
+
+from Parser.XSDParser import XSDLoader
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+
+CACHE_SIZE = 1024
+
+
+
+"""
+Class representing a field of a complex type for a range of versions.
+"""
+class FieldEntry:
+    __slots__ = ("typeName","name","wireName","type","isAttribute","minOccurences","maxOccurences","default","start","end")
+
+    """
+    Creates a field entry.
+    """
+    def __init__(self,typeName,name,wireName,type,isAttribute,minOccurences,maxOccurences,default,start,end):
+        self.typeName = typeName
+        self.name = name
+        self.wireName = wireName
+        self.type = type
+        self.isAttribute = isAttribute
+        self.minOccurences = minOccurences
+        self.maxOccurences = maxOccurences
+        self.default = default
+        self.start = start
+        self.end = end
+
+    """
+    Returns the entry as a dictionary.
+    """
+    def toDictionary(self):
+        return {
+            "type": self.typeName,
+            "name": self.name,
+            "wireName": self.wireName,
+            "fieldType": self.type,
+            "isAttribute": self.isAttribute,
+            "minOccurs": self.minOccurences,
+            "maxOccurs": self.maxOccurences,
+            "default": self.default,
+            "versions": [self.start,self.end],
+        }
+
+"""
+Class representing the indexes of a versioned XSD.
+Each field is indexed for every version it exists in,
+including the fields inherited from the bases.
+"""
+class SchemaIndex:
+    """
+    Creates the indexes for a versioned XSD.
+    """
+    def __init__(self,xsd,versions):
+        self.xsd = xsd
+        self.versions = versions
+        self.versionIndexes = {}
+        for i in range(0,len(versions)):
+            self.versionIndexes[versions[i]] = i
+        self.fields = {}
+        self.wireNames = {}
+        self.typeNames = {}
+        self.enumValues = set()
+        self.typeFields = {}
+        self.responses = {}
+        self.responsesLock = threading.Lock()
+
+        # Index the complex types and their fields.
+        for typeName in xsd.complexTypes.keys():
+            complexType = xsd.complexTypes[typeName]
+            for name in complexType.names:
+                for version in self.getVersionRange(name.start,name.end):
+                    self.typeNames[(typeName,version)] = name.name
+            baseName = typeName
+            while baseName is not None and baseName in xsd.complexTypes.keys():
+                baseType = xsd.complexTypes[baseName]
+                for childName in baseType.childItems.keys():
+                    self.addField(typeName,childName,baseType.childItems[childName])
+                baseName = baseType.type
+
+        # Index the enums.
+        for enumName in xsd.enums.keys():
+            for enumItem in xsd.enums[enumName].childItems.values():
+                for name in enumItem.names:
+                    for version in self.getVersionRange(name.start,name.end):
+                        self.enumValues.add((enumName,name.name,version))
+
+    """
+    Returns the versions from the start to the end version.
+    """
+    def getVersionRange(self,start,end):
+        return self.versions[self.versionIndexes[start]:self.versionIndexes[end] + 1]
+
+    """
+    Adds a child of a complex type to the indexes.
+    """
+    def addField(self,typeName,childName,child):
+        for name in child.names:
+            entry = FieldEntry(typeName,childName,name.name,child.type,name.type == "Attribute",child.minOccurences,child.maxOccurences,child.default,name.start,name.end)
+            for version in self.getVersionRange(name.start,name.end):
+                self.fields[(typeName,childName,version)] = entry
+                self.wireNames[(typeName,name.name,version)] = entry
+                if (typeName,version) not in self.typeFields.keys():
+                    self.typeFields[(typeName,version)] = []
+                self.typeFields[(typeName,version)].append(entry)
+
+    """
+    Returns the field of a type for a version, or None if it doesn't exist.
+    The child can be the common name or the wire name of the field.
+    """
+    def getField(self,typeName,childName,version):
+        entry = self.fields.get((typeName,childName,version))
+        if entry is None:
+            entry = self.wireNames.get((typeName,childName,version))
+
+        return entry
+
+    """
+    Returns if a value is in an enum for a version.
+    """
+    def isEnumValue(self,enumName,value,version):
+        return (enumName,value,version) in self.enumValues
+
+    """
+    Returns the wire name of a type for a version, or None if it doesn't exist.
+    """
+    def getTypeName(self,typeName,version):
+        return self.typeNames.get((typeName,version))
+
+    """
+    Returns the fields of a type for a version.
+    """
+    def getTypeFields(self,typeName,version):
+        return [entry.toDictionary() for entry in self.typeFields.get((typeName,version),[])]
+
+    """
+    Returns the changes of the types from one version to another
+    as a dictionary of type names to the added, removed, and changed
+    fields. Types that were added or removed are listed separately.
+    """
+    def getChanges(self,fromVersion,toVersion):
+        addedTypes = []
+        removedTypes = []
+        changedTypes = {}
+        for typeName in sorted(self.xsd.complexTypes.keys()):
+            fromName = self.typeNames.get((typeName,fromVersion))
+            toName = self.typeNames.get((typeName,toVersion))
+            if fromName is None and toName is None:
+                continue
+            elif fromName is None:
+                addedTypes.append(typeName)
+                continue
+            elif toName is None:
+                removedTypes.append(typeName)
+                continue
+
+            # Compare the fields.
+            fromFields = {}
+            for entry in self.typeFields.get((typeName,fromVersion),[]):
+                fromFields[entry.name] = entry
+            toFields = {}
+            for entry in self.typeFields.get((typeName,toVersion),[]):
+                toFields[entry.name] = entry
+            changes = {
+                "added": sorted(name for name in toFields.keys() if name not in fromFields.keys()),
+                "removed": sorted(name for name in fromFields.keys() if name not in toFields.keys()),
+                "renamed": {},
+            }
+            for name in fromFields.keys():
+                if name in toFields.keys() and fromFields[name].wireName != toFields[name].wireName:
+                    changes["renamed"][name] = [fromFields[name].wireName,toFields[name].wireName]
+            if fromName != toName:
+                changes["wireName"] = [fromName,toName]
+            if len(changes["added"]) > 0 or len(changes["removed"]) > 0 or len(changes["renamed"]) > 0 or fromName != toName:
+                changedTypes[typeName] = changes
+
+        # Return the changes.
+        return {
+            "from": fromVersion,
+            "to": toVersion,
+            "addedTypes": addedTypes,
+            "removedTypes": removedTypes,
+            "changedTypes": changedTypes,
+        }
+
+    """
+    Runs a query from the path and parameters of a request.
+    Returns the HTTP status and the response.
+    """
+    def query(self,path,parameters):
+        # Check the versions.
+        for parameterName in ["version","from","to"]:
+            if parameterName in parameters.keys() and parameters[parameterName] not in self.versionIndexes.keys():
+                return 404,{"error": "Unknown version " + parameters[parameterName]}
+
+        # Run the query.
+        try:
+            if path == "/field":
+                entry = self.getField(parameters["type"],parameters["child"],parameters["version"])
+                if entry is None:
+                    return 200,{"exists": False}
+                response = entry.toDictionary()
+                response["exists"] = True
+                return 200,response
+            elif path == "/enum":
+                return 200,{"valid": self.isEnumValue(parameters["enum"],parameters["value"],parameters["version"])}
+            elif path == "/type":
+                wireName = self.getTypeName(parameters["type"],parameters["version"])
+                if wireName is None:
+                    return 200,{"exists": False}
+                return 200,{"exists": True,"wireName": wireName,"fields": self.getTypeFields(parameters["type"],parameters["version"])}
+            elif path == "/diff":
+                return 200,self.getChanges(parameters["from"],parameters["to"])
+            elif path == "/versions":
+                return 200,{"versions": self.versions}
+        except KeyError as error:
+            return 400,{"error": "Missing parameter " + str(error)}
+        return 404,{"error": "Unknown query " + path}
+
+    """
+    Returns the HTTP status and the JSON body of the response of a
+    request. The bodies are cached as bytes so the responses can't be
+    changed by the callers, and the oldest response is removed when
+    the cache is full.
+    """
+    def getResponse(self,path,parameters):
+        key = (path,tuple(sorted(parameters.items())))
+        with self.responsesLock:
+            if key in self.responses.keys():
+                return self.responses[key]
+
+        # Run the query and cache the response.
+        status,response = self.query(path,parameters)
+        body = json.dumps(response).encode("utf8")
+        with self.responsesLock:
+            if key not in self.responses.keys() and len(self.responses) >= CACHE_SIZE:
+                self.responses.pop(next(iter(self.responses)))
+            self.responses[key] = (status,body)
+        return status,body
+
+
+
+"""
+Class representing the handler of the HTTP requests.
+"""
+class SchemaQueryHandler(BaseHTTPRequestHandler):
+    """
+    Handles a GET request.
+    """
+    def do_GET(self):
+        url = urlparse(self.path)
+        parameters = {}
+        values = parse_qs(url.query)
+        for parameterName in values.keys():
+            parameters[parameterName] = values[parameterName][0]
+        status,body = self.server.schemaIndex.getResponse(url.path,parameters)
+
+        # Send the response.
+        self.send_response(status)
+        self.send_header("Content-Type","application/json")
+        self.send_header("Content-Length",str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    """
+    Returns the address of the client. Unix sockets don't have one.
+    """
+    def address_string(self):
+        if isinstance(self.client_address,tuple):
+            return self.client_address[0]
+        return "unix"
+
+    """
+    Logs a request if the server is verbose.
+    """
+    def log_message(self,format,*args):
+        if self.server.verbose:
+            super().log_message(format,*args)
+
+"""
+Class representing an HTTP server on a Unix socket.
+"""
+class UnixHTTPServer(socketserver.ThreadingMixIn,socketserver.UnixStreamServer):
+    daemon_threads = True
+
+"""
+Creates the server for a schema index. The server listens on
+the Unix socket if a path is given, and the host and port otherwise.
+"""
+def createServer(schemaIndex,host="127.0.0.1",port=8080,socketPath=None,verbose=False):
+    if socketPath is not None:
+        if os.path.exists(socketPath):
+            os.remove(socketPath)
+        server = UnixHTTPServer(socketPath,SchemaQueryHandler)
+    else:
+        server = ThreadingHTTPServer((host,port),SchemaQueryHandler)
+    server.schemaIndex = schemaIndex
+    server.verbose = verbose
+    return server
+
+
+
+if __name__ == '__main__':
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Serves queries about the versioned XSD over HTTP.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    parser.add_argument("--host",default="127.0.0.1",help="Host to listen on.")
+    parser.add_argument("--port",type=int,default=8080,help="Port to listen on.")
+    parser.add_argument("--socket",help="Unix socket to listen on instead of the host and port.")
+    parser.add_argument("--verbose",action="store_true",help="Log the requests.")
+    arguments = parser.parse_args()
+
+    # Load the schema and create the indexes.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    server = createServer(SchemaIndex(versionedXSD,versions),arguments.host,arguments.port,arguments.socket,arguments.verbose)
+    print("Serving " + str(len(versions)) + " versions on " + (arguments.socket or arguments.host + ":" + str(arguments.port)),file=sys.stderr)
+
+    # Serve the queries.
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
@@ -0,0 +1,286 @@
+"""
+Zachary Cook
+
+Converts request XML to an older version in a streaming pass.
+"""
+
+from Parser.XMLTools import CompiledVersion
+from Parser.XSDParser import XSDLoader
+from xml.sax import handler, saxutils
+import argparse
+import sys
+import xml.sax
+
+SCHEMA_NAMESPACES = [CompiledVersion.LEGACY_NAMESPACE,CompiledVersion.NAMESPACE]
+
+
+
+"""
+Splits a qualified name into the prefix (with the colon) and the local name.
+"""
+def splitQualifiedName(qualifiedName):
+    separator = qualifiedName.find(":")
+    if separator == -1:
+        return "",qualifiedName
+
+    return qualifiedName[0:separator + 1],qualifiedName[separator + 1:]
+
+
+
+"""
+Class representing a SAX handler that writes a document for an older version.
+Only the open elements are stored, so the memory doesn't grow with the document.
+"""
+class XMLDownConverter(handler.ContentHandler):
+    """
+    Creates a down converter.
+    """
+    def __init__(self,sourceVersion,targetVersion,output,encoding="utf-8"):
+        super().__init__()
+        self.sourceVersion = sourceVersion
+        self.targetVersion = targetVersion
+        self.writer = saxutils.XMLGenerator(output,encoding,short_empty_elements=True)
+
+        # Each entry of the stack is the source type, target type, output name, and field for simple elements.
+        self.stack = []
+        self.namespaceStack = [{"xml": "http://www.w3.org/XML/1998/namespace"}]
+        self.skipDepth = 0
+        self.text = None
+        self.droppedElements = 0
+        self.droppedAttributes = 0
+        self.droppedValues = 0
+
+    """
+    Returns the name of a field in the target version, or None
+    if the field doesn't exist in the target version.
+    """
+    def getTargetFieldName(self,sourceField,targetType):
+        if targetType is None:
+            return None
+
+        # Return the name of the field.
+        targetField = targetType.fieldNames.get(sourceField.name)
+        if targetField is None:
+            return None
+        if sourceField.type == targetField.type or sourceField.type not in self.sourceVersion.types.keys() or targetField.type not in self.targetVersion.types.keys():
+            return targetField.wireName
+
+        # Return the name of the substituted element.
+        substitutedType = self.targetVersion.types.get(sourceField.type)
+        if substitutedType is None or targetType.children.get(substitutedType.wireName) is None:
+            return None
+        return substitutedType.wireName
+
+    """
+    Returns if a value is valid for a field in the target version.
+    """
+    def isValueValid(self,sourceField,value):
+        enumValues = self.targetVersion.enums.get(sourceField.type)
+        if enumValues is None:
+            return sourceField.type not in self.sourceVersion.enums.keys()
+
+        return value in enumValues
+
+    """
+    Returns if an attribute with a prefix (with the colon) is from the
+    schema. Attributes without a prefix are from the schema, and other
+    attributes are from the schema if the prefix is bound to its namespace.
+    """
+    def isSchemaAttribute(self,prefix):
+        if prefix == "":
+            return True
+
+        return self.namespaceStack[-1].get(prefix[0:-1]) in SCHEMA_NAMESPACES
+
+    """
+    Converts the attributes of an element. Attributes from other
+    namespaces, like xsi:schemaLocation, are kept unchanged.
+    """
+    def convertAttributes(self,attributes,sourceType,targetType,isRoot):
+        newAttributes = {}
+        for attributeName in attributes.getNames():
+            value = attributes.getValue(attributeName)
+
+            # Replace the namespaces.
+            if attributeName == "xmlns" or attributeName.startswith("xmlns:"):
+                if value == CompiledVersion.LEGACY_NAMESPACE or value == CompiledVersion.NAMESPACE:
+                    value = self.targetVersion.namespace
+                newAttributes[attributeName] = value
+                continue
+
+            # Replace the version of the root element.
+            if isRoot and attributeName == "version":
+                newAttributes[attributeName] = self.targetVersion.version
+                continue
+
+            # Keep the attributes from other namespaces.
+            prefix,localName = splitQualifiedName(attributeName)
+            if not self.isSchemaAttribute(prefix):
+                newAttributes[attributeName] = value
+                continue
+
+            # Add the attribute if it exists in the target version.
+            sourceField = sourceType.attributes.get(localName) if sourceType is not None else None
+            if sourceField is None:
+                self.droppedAttributes += 1
+                continue
+            targetName = self.getTargetFieldName(sourceField,targetType)
+            if targetName is None:
+                self.droppedAttributes += 1
+            elif not self.isValueValid(sourceField,value):
+                self.droppedValues += 1
+            else:
+                newAttributes[prefix + targetName] = value
+
+        # Return the attributes.
+        return newAttributes
+
+    """
+    Handles the start of an element.
+    """
+    def startElement(self,name,attributes):
+        if self.skipDepth > 0:
+            self.skipDepth += 1
+            return
+        prefix,localName = splitQualifiedName(name)
+
+        # Determine the types and output name.
+        sourceField = None
+        if len(self.stack) == 0:
+            sourceType = self.sourceVersion.getElementType(localName)
+            targetType = self.targetVersion.types.get(sourceType.name) if sourceType is not None else None
+            targetName = targetType.wireName if targetType is not None else None
+        else:
+            parentSourceType,parentTargetType,parentName,parentField = self.stack[-1]
+            sourceField = parentSourceType.children.get(localName) if parentSourceType is not None else None
+            if sourceField is None:
+                targetName = None
+            else:
+                targetName = self.getTargetFieldName(sourceField,parentTargetType)
+            sourceType = self.sourceVersion.types.get(sourceField.type) if sourceField is not None else None
+            targetType = self.targetVersion.types.get(sourceField.type) if sourceField is not None else None
+
+        # Skip the element if it doesn't exist in the target version.
+        if targetName is None:
+            self.droppedElements += 1
+            self.skipDepth = 1
+            return
+
+        # Add the namespaces declared by the element.
+        namespaces = self.namespaceStack[-1]
+        for attributeName in attributes.getNames():
+            if attributeName.startswith("xmlns:"):
+                if namespaces is self.namespaceStack[-1]:
+                    namespaces = dict(namespaces)
+                namespaces[attributeName[6:]] = attributes.getValue(attributeName)
+        self.namespaceStack.append(namespaces)
+
+        # Start the element. Elements with values are written when they end so the value can be checked.
+        newAttributes = self.convertAttributes(attributes,sourceType,targetType,len(self.stack) == 0)
+        if sourceType is None and sourceField is not None:
+            self.stack.append((sourceType,targetType,(prefix + targetName,newAttributes),sourceField))
+            self.text = []
+        else:
+            self.stack.append((sourceType,targetType,prefix + targetName,None))
+            self.writer.startElement(prefix + targetName,newAttributes)
+
+    """
+    Handles the end of an element.
+    """
+    def endElement(self,name):
+        if self.skipDepth > 0:
+            self.skipDepth += -1
+            return
+
+        # End the element.
+        sourceType,targetType,targetName,sourceField = self.stack.pop()
+        self.namespaceStack.pop()
+        if sourceField is None:
+            self.writer.endElement(targetName)
+            return
+
+        # Write the element with the value if the value is valid.
+        value = "".join(self.text)
+        self.text = None
+        if not self.isValueValid(sourceField,value):
+            self.droppedValues += 1
+            return
+        self.writer.startElement(targetName[0],targetName[1])
+        self.writer.characters(value)
+        self.writer.endElement(targetName[0])
+
+    """
+    Handles text.
+    """
+    def characters(self,content):
+        if self.skipDepth > 0:
+            return
+
+        if self.text is not None:
+            self.text.append(content)
+        else:
+            self.writer.characters(content)
+
+    """
+    Handles whitespace.
+    """
+    def ignorableWhitespace(self,whitespace):
+        self.characters(whitespace)
+
+    """
+    Handles the start of the document.
+    """
+    def startDocument(self):
+        self.writer.startDocument()
+
+    """
+    Handles the end of the document.
+    """
+    def endDocument(self):
+        self.writer.endDocument()
+
+
+
+"""
+Converts a document to the target version.
+The source and output can be file names or file objects.
+Returns the converter with the counts of the dropped items.
+"""
+def convert(source,output,sourceVersion,targetVersion):
+    if isinstance(output,str):
+        with open(output,"wb") as file:
+            return convert(source,file,sourceVersion,targetVersion)
+
+    # Parse the document without namespace processing so the prefixes are kept.
+    converter = XMLDownConverter(sourceVersion,targetVersion,output)
+    parser = xml.sax.make_parser()
+    parser.setFeature(handler.feature_namespaces,False)
+    parser.setContentHandler(converter)
+    parser.parse(source)
+    return converter
+
+
+
+if __name__ == '__main__':
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Converts request XML to an older schema version.")
+    parser.add_argument("input",help="XML document to convert. Use - for stdin.")
+    parser.add_argument("output",help="File to write the converted document to. Use - for stdout.")
+    parser.add_argument("--to",required=True,help="Version to convert to.")
+    parser.add_argument("--from",dest="source",help="Version of the document. Defaults to the newest version.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    arguments = parser.parse_args()
+
+    # Load the schema and compile the versions.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    sourceVersion = arguments.source or versions[len(versions) - 1]
+    for version in [sourceVersion,arguments.to]:
+        if version not in versions:
+            print("Unknown version " + version,file=sys.stderr)
+            sys.exit(2)
+
+    # Convert the document.
+    source = sys.stdin.buffer if arguments.input == "-" else arguments.input
+    output = sys.stdout.buffer if arguments.output == "-" else arguments.output
+    converter = convert(source,output,CompiledVersion.CompiledVersion(versionedXSD,versions,sourceVersion),CompiledVersion.CompiledVersion(versionedXSD,versions,arguments.to))
+    print("Dropped " + str(converter.droppedElements) + " elements, " + str(converter.droppedAttributes) + " attributes, and " + str(converter.droppedValues) + " values",file=sys.stderr)
@@ -0,0 +1,304 @@
+"""
+Zachary Cook
+
+Validates XML documents against a version of the versioned XSD.
+"""
+
+from Parser.XMLTools import CompiledVersion, FacetChecker
+from Parser.XSDParser import XSDLoader
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+import argparse
+import os
+import re
+import sys
+import time
+
+INTEGER_PATTERN = re.compile(r"^\s*[+-]?\d+\s*$")
+DECIMAL_PATTERN = re.compile(r"^\s*[+-]?(\d+(\.\d*)?|\.\d+)\s*$")
+BOOLEAN_VALUES = frozenset(["true","false","1","0"])
+
+MAX_ERRORS_PER_DOCUMENT = 100
+MAX_ERRORS_IN_REPORT = 10
+
+# Validator used by the worker processes.
+workerValidator = None
+
+
+
+"""
+Class representing the result of validating a document.
+"""
+class ValidationResult:
+    """
+    Creates a validation result.
+    """
+    def __init__(self,fileName):
+        self.fileName = fileName
+        self.errors = []
+        self.elementCount = 0
+
+    """
+    Adds an error.
+    """
+    def addError(self,path,message):
+        if len(self.errors) < MAX_ERRORS_PER_DOCUMENT:
+            self.errors.append(path + ": " + message)
+
+    """
+    Returns if the document is valid.
+    """
+    def isValid(self):
+        return len(self.errors) == 0
+
+"""
+Class representing the results of validating several documents.
+"""
+class ValidationSummary:
+    """
+    Creates a validation summary.
+    """
+    def __init__(self,results,duration):
+        self.results = results
+        self.duration = duration
+
+    """
+    Returns the results of the invalid documents.
+    """
+    def getInvalidResults(self):
+        return [result for result in self.results if not result.isValid()]
+
+    """
+    Returns the documents validated per second.
+    """
+    def getDocumentsPerSecond(self):
+        if self.duration <= 0:
+            return 0
+
+        return len(self.results) / self.duration
+
+    """
+    Returns the report as a string.
+    """
+    def getReport(self):
+        invalidResults = self.getInvalidResults()
+        report = "Validated " + str(len(self.results)) + " documents in " + str(round(self.duration,3)) + "s (" + str(round(self.getDocumentsPerSecond(),1)) + " documents/s)\n"
+        report += "Valid: " + str(len(self.results) - len(invalidResults)) + "\n"
+        report += "Invalid: " + str(len(invalidResults)) + "\n"
+        for result in invalidResults:
+            report += "\n" + result.fileName + "\n"
+            for error in result.errors[0:MAX_ERRORS_IN_REPORT]:
+                report += "\t" + error + "\n"
+            if len(result.errors) > MAX_ERRORS_IN_REPORT:
+                report += "\t(" + str(len(result.errors) - MAX_ERRORS_IN_REPORT) + " more errors)\n"
+
+        return report
+
+"""
+Class representing a validator for a single version.
+"""
+class XMLValidator:
+    """
+    Creates a validator.
+    Minimum occurrences aren't checked by default, and aren't checked
+    for elements in choices since they are only required if their child
+    of the choice is used. Facets (lengths, patterns, digits, and
+    ranges) are only checked if enabled.
+    """
+    def __init__(self,compiledVersion,checkMinOccurences=False,checkFacets=False):
+        self.compiledVersion = compiledVersion
+        self.checkMinOccurences = checkMinOccurences
+        self.facetChecker = FacetChecker.FacetChecker(compiledVersion) if checkFacets else None
+
+    """
+    Checks a value of an attribute or element.
+    """
+    def checkValue(self,result,path,field,value):
+        if value is None:
+            value = ""
+
+        if field.enumValues is not None:
+            if value not in field.enumValues:
+                result.addError(path,"Invalid value \"" + value + "\" for " + field.wireName + " (" + field.type + ")")
+        elif field.type in CompiledVersion.INTEGER_TYPES:
+            if INTEGER_PATTERN.match(value) is None:
+                result.addError(path,"Invalid integer \"" + value + "\" for " + field.wireName)
+        elif field.type == "decimal":
+            if DECIMAL_PATTERN.match(value) is None:
+                result.addError(path,"Invalid decimal \"" + value + "\" for " + field.wireName)
+        elif field.type == "boolean":
+            if value.strip() not in BOOLEAN_VALUES:
+                result.addError(path,"Invalid boolean \"" + value + "\" for " + field.wireName)
+
+        # Check the facets.
+        if self.facetChecker is not None and len(field.facets) > 0:
+            message = self.facetChecker.checkValue(field,value)
+            if message is not None:
+                result.addError(path,message)
+
+    """
+    Checks the attributes of an element.
+    """
+    def checkAttributes(self,result,path,compiledType,element):
+        attributes = element.attrib
+        for attributeName in attributes.keys():
+            # Ignore attributes of other namespaces, like xsi.
+            if attributeName[0:1] == "{":
+                continue
+
+            field = compiledType.attributes.get(attributeName)
+            if field is None:
+                result.addError(path,"Unknown attribute " + attributeName)
+            else:
+                self.checkValue(result,path,field,attributes[attributeName])
+
+        # Check the required attributes.
+        for field in compiledType.attributes.values():
+            if field.minOccurences and field.wireName not in attributes:
+                result.addError(path,"Missing required attribute " + field.wireName)
+
+    """
+    Checks the number of child elements of an element.
+    """
+    def checkOccurences(self,result,path,compiledType,counts):
+        for field in compiledType.fields:
+            if field.isAttribute:
+                continue
+
+            count = counts.get(field.name,0)
+            if field.maxOccurences is not None and count > field.maxOccurences:
+                result.addError(path,"Too many " + field.wireName + " elements (" + str(count) + " > " + str(field.maxOccurences) + ")")
+            if self.checkMinOccurences and field.minOccurences is not None and count < field.minOccurences and len(field.choices) == 0:
+                result.addError(path,"Too few " + field.wireName + " elements (" + str(count) + " < " + str(field.minOccurences) + ")")
+
+    """
+    Validates a document in a single streaming pass.
+    The source can be a file name or a file object.
+    """
+    def validate(self,source,fileName=None):
+        if fileName is None:
+            fileName = str(source)
+        result = ValidationResult(fileName)
+
+        # Each entry of the stack is the compiled type, child counts, field, path, and element.
+        stack = []
+        try:
+            for event,element in ElementTree.iterparse(source,events=("start","end")):
+                if event == "start":
+                    tag = CompiledVersion.removeNamespace(element.tag)
+                    result.elementCount += 1
+                    field = None
+                    compiledType = None
+
+                    if len(stack) == 0:
+                        # Check the root element.
+                        path = "/" + tag
+                        compiledType = self.compiledVersion.getElementType(tag)
+                        if compiledType is None:
+                            result.addError(path,"Unknown root element " + tag + " for version " + self.compiledVersion.version)
+                        if element.tag[0:1] == "{" and element.tag[1:element.tag.find("}")] != self.compiledVersion.namespace:
+                            result.addError(path,"Unexpected namespace " + element.tag[1:element.tag.find("}")])
+                    else:
+                        # Check the child element.
+                        parentType,counts,parentField,parentPath,parentElement = stack[-1]
+                        path = parentPath + "/" + tag
+                        if parentType is not None:
+                            field = parentType.children.get(tag)
+                            if field is None:
+                                result.addError(path,"Unknown element " + tag + " in " + parentType.wireName)
+                            else:
+                                counts[field.name] = counts.get(field.name,0) + 1
+                                compiledType = self.compiledVersion.types.get(field.type)
+
+                    # Check the attributes.
+                    if compiledType is not None:
+                        self.checkAttributes(result,path,compiledType,element)
+                    stack.append((compiledType,{},field,path,element))
+                else:
+                    compiledType,counts,field,path,element = stack.pop()
+
+                    # Check the children or value.
+                    if compiledType is not None:
+                        self.checkOccurences(result,path,compiledType,counts)
+                    elif field is not None:
+                        self.checkValue(result,path,field,element.text)
+
+                    # Remove the element from the parent to keep the memory flat.
+                    element.clear()
+                    if len(stack) > 0:
+                        del stack[-1][4][:]
+        except ElementTree.ParseError as error:
+            result.addError("/","Unable to parse document: " + str(error))
+
+        # Return the result.
+        return result
+
+
+
+"""
+Initializes a worker process with the validator.
+"""
+def initializeWorker(compiledVersion,checkMinOccurences,checkFacets):
+    global workerValidator
+    workerValidator = XMLValidator(compiledVersion,checkMinOccurences,checkFacets)
+
+"""
+Validates a file in a worker process.
+"""
+def validateInWorker(fileName):
+    return workerValidator.validate(fileName)
+
+"""
+Returns the XML file names in a directory and its subdirectories.
+"""
+def getXMLFileNames(directory):
+    fileNames = []
+    for root,directories,files in os.walk(directory):
+        for fileName in sorted(files):
+            if fileName.lower().endswith(".xml"):
+                fileNames.append(os.path.join(root,fileName))
+
+    return sorted(fileNames)
+
+"""
+Validates several files using a pool of processes.
+Returns the summary of the validation.
+"""
+def validateFiles(fileNames,compiledVersion,processes=None,checkMinOccurences=False,checkFacets=False):
+    startTime = time.perf_counter()
+    if processes == 1:
+        validator = XMLValidator(compiledVersion,checkMinOccurences,checkFacets)
+        results = [validator.validate(fileName) for fileName in fileNames]
+    else:
+        with ProcessPoolExecutor(max_workers=processes,initializer=initializeWorker,initargs=(compiledVersion,checkMinOccurences,checkFacets)) as executor:
+            chunkSize = max(1,len(fileNames) // ((processes or os.cpu_count() or 1) * 8))
+            results = list(executor.map(validateInWorker,fileNames,chunksize=chunkSize))
+
+    # Return the summary.
+    return ValidationSummary(results,time.perf_counter() - startTime)
+
+
+
+if __name__ == '__main__':
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Validates XML documents against a schema version.")
+    parser.add_argument("directory",help="Directory of XML documents to validate.")
+    parser.add_argument("--version",help="Schema version to validate against. Defaults to the newest version.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    parser.add_argument("--processes",type=int,default=None,help="Number of processes to use.")
+    parser.add_argument("--check-min-occurs",action="store_true",help="Also check the minimum occurrences of elements.")
+    parser.add_argument("--check-facets",action="store_true",help="Also check the lengths, patterns, digits, and ranges of values.")
+    arguments = parser.parse_args()
+
+    # Load the schema and compile the version.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    version = arguments.version or versions[len(versions) - 1]
+    if version not in versions:
+        print("Unknown version " + version)
+        sys.exit(2)
+    compiledVersion = CompiledVersion.CompiledVersion(versionedXSD,versions,version)
+
+    # Validate the files.
+    summary = validateFiles(getXMLFileNames(arguments.directory),compiledVersion,arguments.processes,arguments.check_min_occurs,arguments.check_facets)
+    print(summary.getReport())
+    sys.exit(0 if len(summary.getInvalidResults()) == 0 else 1)
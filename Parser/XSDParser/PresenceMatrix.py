@@ -0,0 +1,256 @@
+"""
+Zachary Cook
+
+Stores which items of a versioned XSD exist in each version as columns.
+"""
+
+from Parser.XSDParser import SymbolTable, XSDLoader
+import argparse
+
+KINDS = [
+    "complexType","child","enum","enumValue","simpleType",
+]
+
+
+
+"""
+Returns the indexes of the set bits of a mask.
+"""
+def getBitIndexes(mask):
+    indexes = []
+    while mask != 0:
+        lowestBit = mask & -mask
+        indexes.append(lowestBit.bit_length() - 1)
+        mask ^= lowestBit
+
+    return indexes
+
+
+
+"""
+Class representing the presence of the items of a versioned XSD in
+each version. Each version has a column stored as a bit mask of the
+rows that exist in it, so the queries are done with bitwise operations
+over all of the rows instead of loops over the items.
+"""
+class PresenceMatrix:
+    """
+    Creates a presence matrix from a versioned XSD.
+    """
+    def __init__(self,xsd,versions):
+        self.versions = list(versions)
+        self.versionIndexes = {}
+        for i in range(0,len(versions)):
+            self.versionIndexes[versions[i]] = i
+
+        # Each row is an item, stored as columns of the kinds, owning types, names, and types of the items.
+        self.kinds = []
+        self.typeNames = []
+        self.childNames = []
+        self.itemTypes = []
+        self.rowMasks = []
+        self.kindMasks = {}
+        for kind in KINDS:
+            self.kindMasks[kind] = 0
+
+        # Each version has a column of the rows that exist and the symbol ids of the names of the rows.
+        self.symbols = SymbolTable.SymbolTable()
+        self.versionColumns = [0] * len(versions)
+        self.nameColumns = [[] for version in versions]
+
+        # Add the items.
+        for typeName in xsd.complexTypes.keys():
+            complexType = xsd.complexTypes[typeName]
+            self.addRow("complexType",typeName,None,complexType)
+            for childName in complexType.childItems.keys():
+                self.addRow("child",typeName,childName,complexType.childItems[childName])
+        for enumName in xsd.enums.keys():
+            enum = xsd.enums[enumName]
+            self.addRow("enum",enumName,None,enum)
+            for value in enum.childItems.keys():
+                self.addRow("enumValue",enumName,value,enum.childItems[value])
+        for typeName in xsd.simpleTypes.keys():
+            self.addRow("simpleType",typeName,None,xsd.simpleTypes[typeName])
+
+    """
+    Returns the symbol id of a name.
+    """
+    def getNameId(self,name):
+        return self.symbols.getId(name)
+
+    """
+    Adds a row for a versioned item.
+    """
+    def addRow(self,kind,typeName,childName,item):
+        row = len(self.kinds)
+        rowBit = 1 << row
+        self.kinds.append(kind)
+        self.typeNames.append(typeName)
+        self.childNames.append(childName)
+        self.itemTypes.append(item.type)
+        self.kindMasks[kind] |= rowBit
+
+        # Add the row to the columns of the versions it exists in.
+        rowMask = 0
+        for nameColumn in self.nameColumns:
+            nameColumn.append(-1)
+        for name in item.names:
+            nameId = self.getNameId(name.name)
+            for versionIndex in range(self.versionIndexes[name.start],self.versionIndexes[name.end] + 1):
+                rowMask |= 1 << versionIndex
+                self.versionColumns[versionIndex] |= rowBit
+                self.nameColumns[versionIndex][row] = nameId
+        self.rowMasks.append(rowMask)
+
+    """
+    Returns a mask of the rows of a kind, or all of the rows if the kind is None.
+    """
+    def getKindMask(self,kind=None):
+        if kind is None:
+            return (1 << len(self.kinds)) - 1
+
+        return self.kindMasks[kind]
+
+    """
+    Returns a mask of the versions from the start version to the end version.
+    """
+    def getVersionMask(self,startVersion,endVersion):
+        startIndex = self.versionIndexes[startVersion]
+        endIndex = self.versionIndexes[endVersion]
+        return ((1 << (endIndex + 1)) - 1) ^ ((1 << startIndex) - 1)
+
+    """
+    Returns the column of the rows that exist in a version.
+    """
+    def getColumn(self,version):
+        return self.versionColumns[self.versionIndexes[version]]
+
+    """
+    Returns the item of a row as the kind, type name, and child name.
+    """
+    def getItem(self,row):
+        return self.kinds[row],self.typeNames[row],self.childNames[row]
+
+    """
+    Returns the items of the rows in a mask.
+    """
+    def getItems(self,mask):
+        return [self.getItem(row) for row in getBitIndexes(mask)]
+
+    """
+    Returns the name of a row in a version, or None if the row doesn't exist in the version.
+    """
+    def getName(self,row,version):
+        nameId = self.nameColumns[self.versionIndexes[version]][row]
+        if nameId == -1:
+            return None
+
+        return self.symbols.getName(nameId)
+
+    """
+    Returns the items that exist in the second version but not the first.
+    """
+    def getAdded(self,fromVersion,toVersion,kind=None):
+        return self.getItems(self.getColumn(toVersion) & ~self.getColumn(fromVersion) & self.getKindMask(kind))
+
+    """
+    Returns the items that exist in the first version but not the second.
+    """
+    def getRemoved(self,fromVersion,toVersion,kind=None):
+        return self.getItems(self.getColumn(fromVersion) & ~self.getColumn(toVersion) & self.getKindMask(kind))
+
+    """
+    Returns the items that exist in both versions with different names,
+    with the old and new names.
+    """
+    def getRenamed(self,fromVersion,toVersion,kind=None):
+        fromNames = self.nameColumns[self.versionIndexes[fromVersion]]
+        toNames = self.nameColumns[self.versionIndexes[toVersion]]
+        renamed = []
+        for row in getBitIndexes(self.getColumn(fromVersion) & self.getColumn(toVersion) & self.getKindMask(kind)):
+            if fromNames[row] != toNames[row]:
+                renamed.append((self.getItem(row),self.symbols.getName(fromNames[row]),self.symbols.getName(toNames[row])))
+
+        return renamed
+
+    """
+    Returns the number of items that exist in each version.
+    """
+    def getCounts(self,kind=None):
+        kindMask = self.getKindMask(kind)
+        counts = {}
+        for i in range(0,len(self.versions)):
+            counts[self.versions[i]] = (self.versionColumns[i] & kindMask).bit_count()
+
+        return counts
+
+    """
+    Returns the number of items added and removed in each version
+    compared to the previous version.
+    """
+    def getChangeCounts(self,kind=None):
+        kindMask = self.getKindMask(kind)
+        changeCounts = []
+        for i in range(1,len(self.versions)):
+            previousColumn = self.versionColumns[i - 1] & kindMask
+            column = self.versionColumns[i] & kindMask
+            changeCounts.append((self.versions[i],(column & ~previousColumn).bit_count(),(previousColumn & ~column).bit_count()))
+
+        return changeCounts
+
+    """
+    Returns the items that exist in all of the versions of a range.
+    """
+    def getPresentInAll(self,startVersion,endVersion,kind=None):
+        versionMask = self.getVersionMask(startVersion,endVersion)
+        mask = self.getKindMask(kind)
+        for versionIndex in getBitIndexes(versionMask):
+            mask &= self.versionColumns[versionIndex]
+
+        return self.getItems(mask)
+
+    """
+    Returns the items that exist in any of the versions of a range.
+    """
+    def getPresentInAny(self,startVersion,endVersion,kind=None):
+        versionMask = self.getVersionMask(startVersion,endVersion)
+        mask = 0
+        for versionIndex in getBitIndexes(versionMask):
+            mask |= self.versionColumns[versionIndex]
+
+        return self.getItems(mask & self.getKindMask(kind))
+
+    """
+    Returns the presence matrix as a NumPy array of booleans with a row
+    for each item and a column for each version. NumPy is only required
+    for this export.
+    """
+    def toNumpy(self):
+        import numpy
+
+        # Unpack the bits of the version columns into a matrix.
+        rowCount = len(self.kinds)
+        byteCount = (rowCount + 7) // 8
+        matrix = numpy.zeros((rowCount,len(self.versions)),dtype=bool)
+        for i in range(0,len(self.versions)):
+            columnBytes = numpy.frombuffer(self.versionColumns[i].to_bytes(byteCount,"little"),dtype=numpy.uint8)
+            matrix[:,i] = numpy.unpackbits(columnBytes,bitorder="little")[0:rowCount].astype(bool)
+
+        return matrix
+
+
+
+if __name__ == '__main__':
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Prints the items added and removed in each version.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    parser.add_argument("--kind",choices=KINDS,help="Kind of items to count. Defaults to all of the items.")
+    arguments = parser.parse_args()
+
+    # Load the schema and print the changes.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    presenceMatrix = PresenceMatrix(versionedXSD,versions)
+    counts = presenceMatrix.getCounts(arguments.kind)
+    print(versions[0] + ": " + str(counts[versions[0]]) + " items")
+    for version,addedCount,removedCount in presenceMatrix.getChangeCounts(arguments.kind):
+        print(version + ": " + str(counts[version]) + " items, " + str(addedCount) + " added, " + str(removedCount) + " removed")
@@ -0,0 +1,64 @@
+"""
+Zachary Cook
+
+Table of the names used by the XSDs.
+"""
+
+
+
+"""
+Class representing a table of symbols. Each name is stored once and
+given an integer id, so the names of every version parsed with the
+table share the same string objects and can be looked up by their ids.
+A table is created for each load so it doesn't grow between loads.
+"""
+class SymbolTable:
+    """
+    Creates a symbol table.
+    """
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+        self.foldedIds = {}
+
+    """
+    Returns the id of a name, adding the name if it doesn't exist.
+    """
+    def getId(self,name):
+        symbolId = self.ids.get(name)
+        if symbolId is None:
+            symbolId = len(self.names)
+            self.ids[name] = symbolId
+            self.names.append(name)
+
+        return symbolId
+
+    """
+    Returns the stored string of a name, adding the name if it doesn't exist.
+    """
+    def intern(self,name):
+        return self.names[self.getId(name)]
+
+    """
+    Returns the name of an id.
+    """
+    def getName(self,symbolId):
+        return self.names[symbolId]
+
+    """
+    Returns the id of the lowercase version of a name, which is the
+    same for names that only differ by case.
+    """
+    def getFoldedId(self,name):
+        foldedId = self.foldedIds.get(name)
+        if foldedId is None:
+            foldedId = self.getId(name.lower())
+            self.foldedIds[name] = foldedId
+
+        return foldedId
+
+    """
+    Returns the number of symbols.
+    """
+    def __len__(self):
+        return len(self.names)
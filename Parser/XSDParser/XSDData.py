@@ -4,6 +4,10 @@ Zachary Cook
 Classes for storing XML schema data.
 """
 
+import itertools
+
+
+
 """
 Class representing a simple type.
 """
@@ -40,11 +44,14 @@ Class representing a complex type or element.
 """
 class XSDComplexType:
     """
-    Creates and complex XSD type.
+    Creates and complex XSD type. Elements store the element they can
+    be substituted for and if they are abstract.
     """
     def __init__(self,name,base):
         self.name = name
         self.base = base
+        self.substitutionGroup = None
+        self.abstract = False
         self.childItems = []
 
     """
@@ -52,13 +59,53 @@ class XSDComplexType:
     """
     def addItem(self,item):
         # Return if the item already exists.
+        # Items declared by several merged types are stored with all of the declarations.
+        # Elements in several children of the same choices are stored with all of the choices, and
+        # the most occurrences any of the children of the choices requires.
         for type in self.childItems:
             if (isinstance(type,XSDAttribute) or isinstance(type,XSDChildElement)) and (isinstance(item,XSDAttribute) or isinstance(item,XSDChildElement)) and type.name == item.name:
+                if len(type.declarations) > 0 and len(item.declarations) > 0:
+                    type.declarations = type.declarations + tuple(declaration for declaration in item.declarations if declaration not in type.declarations)
+                if isinstance(type,XSDChildElement) and isinstance(item,XSDChildElement) and len(type.choices) > 0 and len(item.choices) > 0:
+                    type.choices = type.choices + item.choices
+                    type.minOccurrences = max(type.minOccurrences,item.minOccurrences)
                 return
 
         # Add the item.
         self.childItems.append(item)
 
+    """
+    Returns the attributes and elements of the complex type, including
+    the children of groups.
+    """
+    def getDeclaredItems(self):
+        stack = [iter(self.childItems)]
+        while len(stack) > 0:
+            item = next(stack[-1],None)
+            if item is None:
+                stack.pop()
+            elif isinstance(item,XSDGroup):
+                stack.append(iter(item.childItems))
+            else:
+                yield item
+
+    """
+    Returns if the items of the complex type store the names of the
+    types they were declared in.
+    """
+    def hasDeclarations(self):
+        return any(len(item.declarations) > 0 for item in self.getDeclaredItems())
+
+    """
+    Stores the name of the type the items were declared in for the items
+    that don't have it. Used when types with different names are merged
+    so the items can be told apart.
+    """
+    def addDeclarations(self,name):
+        for item in self.getDeclaredItems():
+            if len(item.declarations) == 0:
+                item.declarations = (name,)
+
     """
     "Flattens" the complex type.
     """
@@ -67,9 +114,11 @@ class XSDComplexType:
         newComplexType = XSDComplexType(self.name,self.base)
 
         # Add the child items.
+        choiceCounter = itertools.count()
+        positionCounter = itertools.count()
         for type in self.childItems:
             if isinstance(type,XSDGroup):
-                for subType in type.getAllChildren():
+                for subType in type.getAllChildren(choiceCounter,positionCounter):
                     newComplexType.addItem(subType)
             else:
                 newComplexType.addItem(type)
@@ -90,6 +139,20 @@ class XSDChildElement:
         self.default = default
         self.minOccurrences = minOccurrences
         self.maxOccurrences = maxOccurrences
+        self.restrictions = {}
+        self.choices = ()
+        self.declarations = ()
+
+    """
+    Returns a copy of the child element in the choices of a flattened
+    complex type, optionally without a minimum number of occurrences.
+    """
+    def createFlattened(self,optional,choices):
+        childElement = XSDChildElement(self.name,self.type,self.default,0 if optional else self.minOccurrences,self.maxOccurrences)
+        childElement.restrictions = self.restrictions
+        childElement.choices = choices
+        childElement.declarations = self.declarations
+        return childElement
 
 """
 Class representing an attribute.
@@ -103,6 +166,8 @@ class XSDAttribute:
         self.type = type
         self.required = required
         self.default = default
+        self.restrictions = {}
+        self.declarations = ()
 
 """
 Class representing a group.
@@ -111,8 +176,9 @@ class XSDGroup:
     """
     Creates and complex XSD group.
     """
-    def __init__(self,type):
+    def __init__(self,type,minOccurrences=1):
         self.type = type
+        self.minOccurrences = minOccurrences
         self.childItems = []
 
     """
@@ -122,19 +188,42 @@ class XSDGroup:
         self.childItems.append(item)
 
     """
-    Returns all the child attributes and elements.
-    """
-    def getAllChildren(self):
-        # Create a list.
-        children = []
-
-        # Add the child items.
-        for type in self.childItems:
+    Returns if the group is a choice between several children.
+    """
+    def isChoice(self):
+        return self.type == "choice" and len(self.childItems) > 1
+
+    """
+    Returns all the child attributes and elements, including the
+    children of nested groups. The nested groups are iterated with
+    an explicit stack instead of recursion. Elements in optional
+    groups are returned as optional copies, and elements in choices
+    are returned as copies with the choices as tuples of the index of
+    the choice, the index of the child of the choice they are in, and
+    the position of the element. The choices and the positions are
+    numbered from the given counters.
+    """
+    def getAllChildren(self,choiceCounter=None,positionCounter=None):
+        if choiceCounter is None:
+            choiceCounter = itertools.count()
+        if positionCounter is None:
+            positionCounter = itertools.count()
+        choiceIndex = next(choiceCounter) if self.isChoice() else None
+        stack = [(enumerate(self.childItems),self.minOccurrences == 0,(),choiceIndex)]
+        while len(stack) > 0:
+            children,optional,choices,choiceIndex = stack[-1]
+            index,type = next(children,(None,None))
+            if type is None:
+                stack.pop()
+                continue
+
+            # Add the choice of the child.
+            if choiceIndex is not None:
+                choices = choices + ((choiceIndex,index),)
             if isinstance(type, XSDGroup):
-                for subType in type.getAllChildren():
-                    children.append(subType)
+                stack.append((enumerate(type.childItems),optional or type.minOccurrences == 0,choices,next(choiceCounter) if type.isChoice() else None))
+            elif isinstance(type,XSDChildElement) and ((optional and type.minOccurrences > 0) or len(choices) > 0):
+                position = next(positionCounter)
+                yield type.createFlattened(optional,tuple((choiceIndex,childIndex,position) for choiceIndex,childIndex in choices))
             else:
-                children.append(type)
-
-        # Return the list.
-        return children
\ No newline at end of file
+                yield type
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Zachary Cook
+
+Collects the problems found while parsing XSDs.
+"""
+
+from xml.etree import ElementTree
+
+LEVELS = [
+    "info","warning","error",
+]
+
+DIAGNOSTIC_MESSAGES = {
+    "mergedType": "Basic type already exists; merging {name}",
+    "unknownAttributeUse": "Unknown use attribute: {use}",
+    "unknownElementSubtype": "Unable to determine subtype of element",
+    "unknownElementType": "Unable to determine type of element",
+    "unsupportedTag": "Unable to process \"{tagName}\"",
+    "unsupportedElementChild": "Unsupported child tag of {name}: {tagName}",
+    "unsupportedSchemaTag": "Unsupported tag of {tagName}",
+}
+
+
+
+"""
+Class representing a diagnostic. The message and the XML of the
+element are only created when the diagnostic is rendered.
+"""
+class Diagnostic:
+    __slots__ = ("level","code","source","typeName","element","arguments")
+
+    """
+    Creates a diagnostic.
+    """
+    def __init__(self,level,code,source=None,typeName=None,element=None,arguments=None):
+        self.level = level
+        self.code = code
+        self.source = source
+        self.typeName = typeName
+        self.element = element
+        self.arguments = arguments
+
+    """
+    Returns the location of the diagnostic as the source and type name.
+    """
+    def getLocation(self):
+        location = self.source if self.source is not None else "<string>"
+        if self.typeName is not None:
+            location += " (" + self.typeName + ")"
+
+        return location
+
+    """
+    Returns the message of the diagnostic.
+    """
+    def getMessage(self):
+        message = DIAGNOSTIC_MESSAGES.get(self.code,self.code).format(**(self.arguments or {}))
+        if self.element is not None:
+            message += ": " + ElementTree.tostring(self.element,encoding="utf8",method="xml").decode("utf8")
+
+        return message
+
+    """
+    Returns the diagnostic as a line of text.
+    """
+    def render(self):
+        return self.level + " [" + self.code + "] " + self.getLocation() + ": " + self.getMessage()
+
+"""
+Class representing a collector of diagnostics.
+"""
+class DiagnosticCollector:
+    """
+    Creates a diagnostic collector.
+    """
+    def __init__(self):
+        self.diagnostics = []
+        self.counts = {}
+
+    """
+    Adds a diagnostic.
+    """
+    def add(self,level,code,source=None,typeName=None,element=None,**arguments):
+        self.diagnostics.append(Diagnostic(level,code,source,typeName,element,arguments))
+        self.counts[(level,code)] = self.counts.get((level,code),0) + 1
+
+    """
+    Adds the diagnostics of another collector.
+    """
+    def extend(self,collector):
+        self.diagnostics.extend(collector.diagnostics)
+        for key in collector.counts.keys():
+            self.counts[key] = self.counts.get(key,0) + collector.counts[key]
+
+    """
+    Returns the number of diagnostics of each level.
+    """
+    def getLevelCounts(self):
+        levelCounts = {}
+        for level,code in self.counts.keys():
+            levelCounts[level] = levelCounts.get(level,0) + self.counts[(level,code)]
+
+        return levelCounts
+
+    """
+    Returns the diagnostics of a level and above.
+    """
+    def getDiagnostics(self,minimumLevel="info"):
+        minimumIndex = LEVELS.index(minimumLevel)
+        return [diagnostic for diagnostic in self.diagnostics if LEVELS.index(diagnostic.level) >= minimumIndex]
+
+    """
+    Returns the diagnostics of a level and above as text.
+    """
+    def render(self,minimumLevel="info"):
+        return "\n".join(diagnostic.render() for diagnostic in self.getDiagnostics(minimumLevel))
+
+    """
+    Returns a summary of the number of diagnostics of each level and code.
+    """
+    def getSummary(self):
+        if len(self.diagnostics) == 0:
+            return "No parser diagnostics"
+
+        # Add the counts of the levels and codes.
+        levelCounts = self.getLevelCounts()
+        summary = str(len(self.diagnostics)) + " parser diagnostics ("
+        summary += ", ".join(str(levelCounts[level]) + " " + level for level in LEVELS if level in levelCounts.keys()) + "): "
+        summary += ", ".join(code + " x" + str(self.counts[(level,code)]) for level,code in sorted(self.counts.keys(),key=lambda key: (-LEVELS.index(key[0]),key[1])))
+        return summary
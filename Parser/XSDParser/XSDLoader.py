@@ -0,0 +1,173 @@
+"""
+Zachary Cook
+
+Loads a directory or archive of XSD versions into a versioned XSD.
+"""
+
+from Parser.XSDParser import SymbolTable, XSDParser, XSDVersionDiffer
+from functools import cmp_to_key
+import gzip
+import os
+import posixpath
+import tarfile
+import zipfile
+
+XSD_DIRECTORY = "xsd/"
+XSD_EXTENSIONS = [
+    ".xsd",".xsd.gz",
+]
+TAR_EXTENSIONS = [
+    ".tar",".tar.gz",".tgz",".tar.bz2",".tar.xz",
+]
+ZSTANDARD_TAR_EXTENSIONS = [
+    ".tar.zst",".tar.zstd",".tzst",
+]
+
+
+
+"""
+Returns if a file name is an XSD file, compressed or not.
+"""
+def isXSDFileName(fileName):
+    for extension in XSD_EXTENSIONS:
+        if fileName.lower().endswith(extension):
+            return True
+
+    return False
+
+"""
+Returns if a file name ends with one of the extensions.
+"""
+def hasExtension(fileName,extensions):
+    for extension in extensions:
+        if fileName.lower().endswith(extension):
+            return True
+
+    return False
+
+"""
+Returns the XSD file names in a directory, sorted by version.
+"""
+def getSortedFileNames(directory=XSD_DIRECTORY):
+    return sorted([fileName for fileName in os.listdir(directory) if isXSDFileName(fileName)],key=cmp_to_key(XSDVersionDiffer.compareVersionNames))
+
+"""
+Returns the version string for a file name.
+"""
+def getVersionString(fileName):
+    majorVersion,minorVersion = XSDVersionDiffer.getVersionFromName(fileName)
+    return str(majorVersion) + "." + str(minorVersion)
+
+"""
+Returns the contents of an XSD file, decompressing it if it is gzipped.
+"""
+def decompressContents(fileName,contents):
+    if fileName.lower().endswith(".gz"):
+        return gzip.decompress(contents)
+
+    return contents
+
+"""
+Reads the XSD files of a tar archive in a single streaming pass.
+"""
+def readTarFiles(fileObject):
+    with tarfile.open(fileobj=fileObject,mode="r|*") as archive:
+        for member in archive:
+            fileName = posixpath.basename(member.name)
+            if member.isfile() and isXSDFileName(fileName):
+                yield fileName,decompressContents(fileName,archive.extractfile(member).read())
+
+"""
+Reads the XSD files of a directory, archive, or single file without
+extracting them. Returns an iterator of the file names and contents
+in the order they are stored, not the order of the versions.
+Zstandard archives require the zstandard module.
+"""
+def readSchemaFiles(source=XSD_DIRECTORY):
+    # Read a directory.
+    if os.path.isdir(source):
+        for fileName in getSortedFileNames(source):
+            with open(os.path.join(source,fileName),"rb") as file:
+                yield fileName,decompressContents(fileName,file.read())
+        return
+
+    # Read a zip archive.
+    if source.lower().endswith(".zip"):
+        with zipfile.ZipFile(source) as archive:
+            for member in archive.infolist():
+                fileName = posixpath.basename(member.filename)
+                if not member.is_dir() and isXSDFileName(fileName):
+                    yield fileName,decompressContents(fileName,archive.read(member))
+        return
+
+    # Read a tar archive.
+    if hasExtension(source,TAR_EXTENSIONS):
+        with open(source,"rb") as file:
+            yield from readTarFiles(file)
+        return
+    if hasExtension(source,ZSTANDARD_TAR_EXTENSIONS):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("The zstandard module is required to read " + source + " (pip install zstandard)")
+        with open(source,"rb") as file:
+            with zstandard.ZstdDecompressor().stream_reader(file) as reader:
+                yield from readTarFiles(reader)
+        return
+
+    # Read a single file.
+    if isXSDFileName(source):
+        with open(source,"rb") as file:
+            yield os.path.basename(source),decompressContents(source,file.read())
+        return
+    raise ValueError("Unsupported schema source: " + source)
+
+"""
+Merges a list of parsed XSDs (in version order) into a versioned XSD.
+If a rename detector is given, the renames between each version and
+the next version are detected, and the renames it applies are merged.
+"""
+def mergeXSDs(baseXSDs,versions,verbose=True,renameDetector=None):
+    versionedXSD = XSDVersionDiffer.VersionedXSD()
+    renames = None
+    for i in range(0,len(versions)):
+        i = len(versions) - 1 - i
+        version = versions[i]
+        xsd = baseXSDs[i]
+
+        # Detect the renames to the next version.
+        if renameDetector is not None and i < len(versions) - 1:
+            renames = renameDetector.detectRenames(xsd,baseXSDs[i + 1],version,versions[i + 1],renames)
+
+        if verbose:
+            print("Merging version " + version)
+        versionedXSD.populateFromXSD(xsd,version,renames)
+
+    # Merge the versions.
+    versionedXSD.mergeNameVersions(versions)
+
+    # Return the versioned XSD.
+    return versionedXSD
+
+"""
+Reads and merges all of the XSDs in a directory or archive.
+The problems found while parsing are added to the diagnostics.
+Returns the versioned XSD and the list of versions.
+"""
+def loadVersionedXSD(source=XSD_DIRECTORY,verbose=True,diagnostics=None,renameDetector=None):
+    # Parse the XSD objects in the order they are read.
+    # The XSDs share a symbol table that is created for the load.
+    parsedXSDs = []
+    symbols = SymbolTable.SymbolTable()
+    for fileName,contents in readSchemaFiles(source):
+        if verbose:
+            print("Reading " + fileName)
+        parsedXSDs.append((fileName,XSDParser.createFromString(contents,diagnostics,fileName,symbols)))
+
+    # Sort the XSDs by version.
+    parsedXSDs = sorted(parsedXSDs,key=cmp_to_key(lambda xsd1,xsd2: XSDVersionDiffer.compareVersionNames(xsd1[0],xsd2[0])))
+    versions = [getVersionString(fileName) for fileName,xsd in parsedXSDs]
+    baseXSDs = [xsd for fileName,xsd in parsedXSDs]
+
+    # Merge the XSDs together.
+    return mergeXSDs(baseXSDs,versions,verbose,renameDetector),versions
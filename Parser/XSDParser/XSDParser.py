@@ -5,7 +5,7 @@ Parses XSD files.
 """
 
 from xml.etree import ElementTree
-from Parser.XSDParser import XSDData
+from Parser.XSDParser import SymbolTable, XSDData, XSDDiagnostics
 
 
 
@@ -24,20 +24,21 @@ XSD_SIMPLE_TYPE_ENUM_OVERRIDES = {
 
 """
 Removes the schema information from a string.
+The name is returned from the given symbol table.
 """
-def removeSchemaInformation(string):
+def removeSchemaInformation(string,symbols):
     # Remove the schema if it exists.
     schemaEnd = string.find("}")
     if schemaEnd != -1:
-        return string[schemaEnd + 1:]
+        return symbols.intern(string[schemaEnd + 1:])
 
     # Remove the pre-colon if it exists.
     schemaEnd = string.find(":")
     if schemaEnd != -1:
-        return string[schemaEnd + 1:]
+        return symbols.intern(string[schemaEnd + 1:])
 
     # Return the base string.
-    return string
+    return symbols.intern(string)
 
 
 
@@ -46,12 +47,27 @@ Class representing a parsed XSD.
 """
 class XSD:
     """
-    Creates an XSD object.
+    Creates an XSD object. The problems found while parsing are added
+    to the diagnostics with the source name as the location. The types
+    and elements are indexed by the ids of their lowercase names in the
+    symbol table, which is shared by the XSDs loaded together.
     """
-    def __init__(self):
+    def __init__(self,diagnostics=None,sourceName=None,symbols=None):
         self.namespace = None
         self.types = []
         self.elements = []
+        self.symbols = symbols if symbols is not None else SymbolTable.SymbolTable()
+        self.typeIndexes = {}
+        self.elementIndexes = {}
+        self.diagnostics = diagnostics if diagnostics is not None else XSDDiagnostics.DiagnosticCollector()
+        self.sourceName = sourceName
+        self.typeName = None
+
+    """
+    Adds a diagnostic for the type being processed.
+    """
+    def addDiagnostic(self,level,code,element=None,**arguments):
+        self.diagnostics.add(level,code,self.sourceName,self.typeName,element,**arguments)
 
     """
     Adds a type.
@@ -62,7 +78,7 @@ class XSD:
 
         if existingType is not None:
             if isinstance(existingType,XSDData.XSDSimpleType) and isinstance(xsdType,XSDData.XSDSimpleType):
-                print("Basic type already exists; merging " + xsdType.name)
+                self.addDiagnostic("info","mergedType",name=xsdType.name)
 
                 # Merge the restrictions.
                 for restrictionName in xsdType.restrictions.keys():
@@ -73,7 +89,12 @@ class XSD:
                     if enum not in existingType.enums:
                         existingType.addEnumeration(enum)
             elif isinstance(existingType,XSDData.XSDComplexType) and isinstance(xsdType,XSDData.XSDComplexType):
-                print("Basic type already exists; merging " + xsdType.name)
+                self.addDiagnostic("info","mergedType",name=xsdType.name)
+
+                # Store the names the children were declared in if the types have different names.
+                if existingType.name != xsdType.name or existingType.hasDeclarations():
+                    existingType.addDeclarations(existingType.name)
+                    xsdType.addDeclarations(xsdType.name)
 
                 # Add the children.
                 for childItem in xsdType.childItems:
@@ -83,6 +104,16 @@ class XSD:
         else:
             # Add the type.
             self.types.append(xsdType)
+            self.typeIndexes[self.symbols.getFoldedId(xsdType.name)] = xsdType
+
+    """
+    Removes a type.
+    """
+    def removeType(self,xsdType):
+        self.types.remove(xsdType)
+        foldedId = self.symbols.getFoldedId(xsdType.name)
+        if self.typeIndexes.get(foldedId) is xsdType:
+            self.typeIndexes.pop(foldedId)
 
     """
     Adds an element.
@@ -94,6 +125,7 @@ class XSD:
 
         # Add the type.
         self.elements.append(xsdElement)
+        self.elementIndexes[self.symbols.getFoldedId(xsdElement.name)] = xsdElement
 
     """
     Returns if a type is valid (is a base or links to another).
@@ -140,6 +172,34 @@ class XSD:
         else:
             return self.getRootBaseType(nextElement.base)
 
+    """
+    Returns the restrictions of the simple types between a type and
+    its root base type. The restrictions of the types closest to the
+    type are used over the restrictions of their bases. Enums don't
+    have restrictions since their values are checked instead.
+    """
+    def getRestrictions(self,typeName):
+        restrictions = {}
+        while typeName is not None and typeName not in XSD_PRIMITIVE_TYPES:
+            nextType = self.getType(typeName)
+            if nextType is None:
+                nextElement = self.getElement(typeName)
+                if nextElement is None:
+                    break
+                typeName = nextElement.base
+                continue
+            if not isinstance(nextType,XSDData.XSDSimpleType) or nextType.isEnum():
+                return {}
+
+            # Add the restrictions that aren't overridden.
+            for restrictionName in nextType.restrictions.keys():
+                if restrictionName not in restrictions.keys():
+                    restrictions[restrictionName] = nextType.restrictions[restrictionName]
+            typeName = nextType.base
+
+        # Return the restrictions.
+        return restrictions
+
     """
     Returns the next type for a given name.
     """
@@ -160,124 +220,163 @@ class XSD:
     Returns an XSD type for the given name.
     """
     def getType(self,typeName):
-        for xsdType in self.types:
-            if xsdType.name.lower() == typeName.lower():
-                return xsdType
+        return self.typeIndexes.get(self.symbols.getFoldedId(typeName))
 
     """
     Returns an XSD element for the given name.
     """
     def getElement(self,elementName):
-        for xsdElement in self.elements:
-            if xsdElement.name.lower() == elementName.lower():
-                return xsdElement
+        return self.elementIndexes.get(self.symbols.getFoldedId(elementName))
+
+    """
+    Returns the descendants of an element in document order, stopping at types.
+    The descendants are found with an explicit stack instead of recursion.
+    """
+    def iterateDescendants(self,element):
+        stack = [iter(element)]
+        while len(stack) > 0:
+            child = next(stack[-1],None)
+            if child is None:
+                stack.pop()
+                continue
+            yield child
+
+            # Check the children.
+            tagName = removeSchemaInformation(child.tag,self.symbols)
+            if tagName != "complexType" and tagName != "simpleType":
+                stack.append(iter(child))
 
     """
     Returns the element of a given tag, stopping at types.
     """
     def getChildElementOfName(self,element,expectedTagName):
-        # Return a child if a child is valid.
-        for child in element:
-            tagName = removeSchemaInformation(child.tag)
-
-            # Return if the tag name matches.
-            if tagName == expectedTagName:
+        for child in self.iterateDescendants(element):
+            if removeSchemaInformation(child.tag,self.symbols) == expectedTagName:
                 return child
 
-            # Check the children.
-            if tagName != "complexType" and tagName != "simpleType":
-                subElement = self.getChildElementOfName(child,expectedTagName)
-                if subElement is not None:
-                    return subElement
-
-    """
-    Processes a child element in a complex type.
-    Returns the elements to add as a list.
-    """
-    def processComplexElementChild(self,element):
-        elements = []
-
-        # Get the tag name.
-        tagName = removeSchemaInformation(element.tag)
-
-        # Process the element.
-        if tagName == "sequence" or tagName == "all" or tagName == "choice":
-            # Create the group.
-            group = XSDData.XSDGroup(tagName)
-            elements.append(group)
-
-            # Add the children.
-            for child in element:
-                for subChild in self.processComplexElementChild(child):
-                    group.addItem(subChild)
-        elif tagName == "attribute":
-            # Get the attribute data.
-            name = element.attrib["name"]
-            type = removeSchemaInformation(element.attrib["type"])
-            required = False
-            default = None
-            if "use" in element.attrib:
-                if element.attrib["use"] == "required":
-                    required = True
-                elif element.attrib["use"] == "optional":
-                    required = False
-                else:
-                    print("Unknown use attribute: " + element.attrib["use"])
-            if "default" in element.attrib:
-                default = element.attrib["default"]
-
-            # Create and add the attribute.
-            attribute = XSDData.XSDAttribute(name,type,required,default)
-            elements.append(attribute)
-        elif tagName == "element":
-            # Get the element data.
-            type = None
-            minOccurrences = 0
-            maxOccurrences = 1
-            default = None
-            if "ref" in element.attrib:
-                name = removeSchemaInformation(element.attrib["ref"])
-                type = name
+    """
+    Processes an attribute in a complex type.
+    """
+    def processAttribute(self,element):
+        # Get the attribute data.
+        name = self.symbols.intern(element.attrib["name"])
+        type = removeSchemaInformation(element.attrib["type"],self.symbols)
+        required = False
+        default = None
+        if "use" in element.attrib:
+            if element.attrib["use"] == "required":
+                required = True
+            elif element.attrib["use"] == "optional":
+                required = False
             else:
-                name = element.attrib["name"]
-            if "minOccurs" in element.attrib:
-                minOccurrences = int(element.attrib["minOccurs"])
-            if "maxOccurs" in element.attrib:
-                if element.attrib["maxOccurs"] == "unbounded":
-                    maxOccurrences = (2 ** 31) - 1
-                else:
-                    maxOccurrences = int(element.attrib["maxOccurs"])
-            if "default" in element.attrib:
-                default = element.attrib["default"]
-
-            # Get the type.
-            if "type" in element.attrib:
-                type = removeSchemaInformation(element.attrib["type"])
-            elif len(element) == 1:
-                typeElement = element[0]
-                typeTagName = removeSchemaInformation(typeElement.tag)
-                type = removeSchemaInformation(name)
-                if typeTagName == "simpleType":
-                    type = self.processSimpleType(typeElement,name)
-                elif typeTagName == "complexType":
-                    self.processComplexType(typeElement,name)
-                else:
-                    print("Unable to determine subtype of element: " + ElementTree.tostring(element,encoding="utf8",method="xml").decode("utf8"))
-            elif type is None:
-                print("Unable to determine type of element: " + ElementTree.tostring(element,encoding="utf8",method="xml").decode("utf8"))
-
-            # Create and add the element.
-            element = XSDData.XSDChildElement(name,type,default,minOccurrences,maxOccurrences)
-            elements.append(element)
-        elif tagName == "complexContent" or tagName == "extension" or tagName == "restriction":
-            for child in element:
-                for subChild in self.processComplexElementChild(child):
-                    elements.append(subChild)
+                self.addDiagnostic("warning","unknownAttributeUse",use=element.attrib["use"])
+        if "default" in element.attrib:
+            default = element.attrib["default"]
+
+        # Create the attribute with the fixed value as a restriction.
+        attribute = XSDData.XSDAttribute(name,type,required,default)
+        if "fixed" in element.attrib:
+            attribute.restrictions["fixed"] = element.attrib["fixed"]
+        return attribute
+
+    """
+    Processes an element in a complex type.
+    """
+    def processElement(self,element):
+        # Get the element data.
+        type = None
+        minOccurrences = 1
+        maxOccurrences = 1
+        default = None
+        if "ref" in element.attrib:
+            name = removeSchemaInformation(element.attrib["ref"],self.symbols)
+            type = name
         else:
-            print("Unable to process \"" + str(tagName) + "\": " + ElementTree.tostring(element,encoding="utf8",method="xml").decode("utf8"))
+            name = self.symbols.intern(element.attrib["name"])
+        if "minOccurs" in element.attrib:
+            minOccurrences = int(element.attrib["minOccurs"])
+        if "maxOccurs" in element.attrib:
+            if element.attrib["maxOccurs"] == "unbounded":
+                maxOccurrences = (2 ** 31) - 1
+            else:
+                maxOccurrences = int(element.attrib["maxOccurs"])
+        if "default" in element.attrib:
+            default = element.attrib["default"]
+
+        # Get the type.
+        if "type" in element.attrib:
+            type = removeSchemaInformation(element.attrib["type"],self.symbols)
+        elif len(element) == 1:
+            typeElement = element[0]
+            typeTagName = removeSchemaInformation(typeElement.tag,self.symbols)
+            type = removeSchemaInformation(name,self.symbols)
+            if typeTagName == "simpleType":
+                type = self.processSimpleType(typeElement,name)
+            elif typeTagName == "complexType":
+                self.processComplexType(typeElement,name)
+            else:
+                self.addDiagnostic("warning","unknownElementSubtype",element)
+        elif type is None:
+            self.addDiagnostic("warning","unknownElementType",element)
+
+        # Create the element with the fixed value as a restriction.
+        childElement = XSDData.XSDChildElement(name,type,default,minOccurrences,maxOccurrences)
+        if "fixed" in element.attrib:
+            childElement.restrictions["fixed"] = element.attrib["fixed"]
+        return childElement
+
+    """
+    Processes the children of a complex type in a single pass with an
+    explicit stack. Yields the items to add to the complex type, with the
+    groups filled in as their children are processed. The first extension
+    and restriction elements are stored in the base elements.
+    """
+    def processComplexElementChildren(self,element,baseElements):
+        # Each entry of the stack has the remaining children and the list to add
+        # the items to, or None if the children are only searched for the base.
+        topLevelItems = []
+        stack = [(iter(element),topLevelItems)]
+        while len(stack) > 0:
+            children,items = stack[-1]
+            child = next(children,None)
+            if child is None:
+                stack.pop()
+                continue
+            tagName = removeSchemaInformation(child.tag,self.symbols)
+
+            # Store the base element.
+            if (tagName == "extension" or tagName == "restriction") and tagName not in baseElements.keys():
+                baseElements[tagName] = child
+
+            # Search the children for the base if the items aren't being added.
+            if items is None:
+                if tagName != "complexType" and tagName != "simpleType":
+                    stack.append((iter(child),None))
+                continue
+
+            # Process the child.
+            item = None
+            if tagName == "sequence" or tagName == "all" or tagName == "choice":
+                item = XSDData.XSDGroup(tagName,int(child.attrib.get("minOccurs","1")))
+                stack.append((iter(child),item.childItems))
+            elif tagName == "attribute":
+                item = self.processAttribute(child)
+                stack.append((iter(child),None))
+            elif tagName == "element":
+                item = self.processElement(child)
+                stack.append((iter(child),None))
+            elif tagName == "complexContent" or tagName == "extension" or tagName == "restriction":
+                stack.append((iter(child),items))
+            else:
+                self.addDiagnostic("warning","unsupportedTag",child,tagName=str(tagName))
+                stack.append((iter(child),None))
 
-        # Return the elements.
-        return elements
+            # Add the item.
+            if item is not None:
+                if items is topLevelItems:
+                    yield item
+                else:
+                    items.append(item)
 
     """
     Processes a simple type.
@@ -286,16 +385,16 @@ class XSD:
         # Parse a simple type (basic type with limits).
         restrictionElement = element[0]
         if "name" in element.attrib:
-            name = removeSchemaInformation(element.attrib["name"])
-        type = removeSchemaInformation(restrictionElement.attrib["base"])
+            name = removeSchemaInformation(element.attrib["name"],self.symbols)
+        type = removeSchemaInformation(restrictionElement.attrib["base"],self.symbols)
         schemaObject = XSDData.XSDSimpleType(name,type)
 
         # Add the restrictions.
         for restriction in restrictionElement:
-            restrictionName = removeSchemaInformation(restriction.tag)
+            restrictionName = removeSchemaInformation(restriction.tag,self.symbols)
 
             if restrictionName == "enumeration":
-                schemaObject.addEnumeration(restriction.attrib["value"])
+                schemaObject.addEnumeration(self.symbols.intern(restriction.attrib["value"]))
             else:
                 schemaObject.addRestriction(restrictionName,restriction.attrib["value"])
 
@@ -314,26 +413,25 @@ class XSD:
     Processes a complex type.
     """
     def processComplexType(self,element,name,type=None):
-        # Override the base type.
-        extensionElement = self.getChildElementOfName(element,"extension")
-        if extensionElement is not None:
-            type = removeSchemaInformation(extensionElement.attrib["base"])
-        else:
-            extensionElement = self.getChildElementOfName(element,"restriction")
-            if extensionElement is not None:
-                type = removeSchemaInformation(extensionElement.attrib["base"])
-
         # Create the complex type.
         schemaObject = XSDData.XSDComplexType(name,type)
+        parentTypeName = self.typeName
+        self.typeName = name
 
         # Process the child elements.
-        for child in element:
-            elementsToAdd = self.processComplexElementChild(child)
-            for childItem in elementsToAdd:
-                schemaObject.addItem(childItem)
+        baseElements = {}
+        for childItem in self.processComplexElementChildren(element,baseElements):
+            schemaObject.addItem(childItem)
+
+        # Override the base type with the extension, or the restriction if there is no extension.
+        for baseTagName in ["extension","restriction"]:
+            if baseTagName in baseElements.keys():
+                schemaObject.base = removeSchemaInformation(baseElements[baseTagName].attrib["base"],self.symbols)
+                break
 
         # Add the object.
         self.addType(schemaObject)
+        self.typeName = parentTypeName
 
     """
     Populates the object from a string.
@@ -346,48 +444,52 @@ class XSD:
         # Read the child elements.
         for child in root:
             # Get the tag name.
-            tagName = removeSchemaInformation(child.tag)
+            tagName = removeSchemaInformation(child.tag,self.symbols)
 
             # Parse the element.
             if tagName == "simpleType":
                 self.processSimpleType(child)
             elif tagName == "element":
-                name = removeSchemaInformation(child.attrib["name"])
+                name = removeSchemaInformation(child.attrib["name"],self.symbols)
 
                 # Determine the base type.
                 baseType = None
                 if "substitutionGroup" in child.attrib:
-                    baseType = removeSchemaInformation(child.attrib["substitutionGroup"])
+                    baseType = removeSchemaInformation(child.attrib["substitutionGroup"],self.symbols)
                 if "type" in child.attrib:
-                    baseType = removeSchemaInformation(child.attrib["type"])
+                    baseType = removeSchemaInformation(child.attrib["type"],self.symbols)
 
                 # Add the element.
-                self.addElement(XSDData.XSDComplexType(name,baseType))
+                xsdElement = XSDData.XSDComplexType(name,baseType)
+                if "substitutionGroup" in child.attrib:
+                    xsdElement.substitutionGroup = removeSchemaInformation(child.attrib["substitutionGroup"],self.symbols)
+                xsdElement.abstract = child.attrib.get("abstract") == "true"
+                self.addElement(xsdElement)
 
                 # Parse the complex type.
                 if len(child) != 0:
                     firstChild = child[0]
-                    firstChildTag = removeSchemaInformation(firstChild.tag)
+                    firstChildTag = removeSchemaInformation(firstChild.tag,self.symbols)
                     if firstChildTag == "complexType":
                         self.processComplexType(firstChild,name,baseType)
                     elif firstChildTag == "simpleType":
                         self.processSimpleType(firstChild,name)
                     else:
-                        print("Unsupported child tag of " + str(name) + ": " + str(firstChildTag))
+                        self.addDiagnostic("warning","unsupportedElementChild",name=str(name),tagName=str(firstChildTag))
             elif tagName == "complexType":
-                name = removeSchemaInformation(child.attrib["name"])
+                name = removeSchemaInformation(child.attrib["name"],self.symbols)
                 self.processComplexType(child,name)
             else:
-                print("Unsupported tag of " + str(tagName))
+                self.addDiagnostic("warning","unsupportedSchemaTag",tagName=str(tagName))
 
 
 
 """
 Processes an XSD file to a set of schema objects.
 """
-def processXSD(xsdContents):
+def processXSD(xsdContents,diagnostics=None,sourceName=None,symbols=None):
     # Parse the XSD.
-    xsd = XSD()
+    xsd = XSD(diagnostics,sourceName,symbols)
     xsd.fromString(xsdContents)
 
     # Return the XSD.
@@ -398,7 +500,7 @@ def processXSD(xsdContents):
 """
 def flattenXSD(existingXSD):
     # Create a new XSD.
-    newXSD = XSD()
+    newXSD = XSD(existingXSD.diagnostics,existingXSD.sourceName,existingXSD.symbols)
     newXSD.namespace = existingXSD.namespace
 
     # Flatten the types.
@@ -427,8 +529,12 @@ def compressXSD(existingXSD):
         if isinstance(type,XSDData.XSDComplexType):
             for item in type.childItems:
                 # Replace primitive type extensions and elements.
+                # The restrictions of the removed simple types are stored in the item with the fixed value.
                 rootBase = str(existingXSD.getRootBaseType(item.type))
                 if rootBase in XSD_PRIMITIVE_TYPES:
+                    restrictions = existingXSD.getRestrictions(item.type)
+                    restrictions.update(item.restrictions)
+                    item.restrictions = restrictions
                     item.type = rootBase
                 else:
                     nextComplexType = existingXSD.getNextType(item.type)
@@ -444,7 +550,7 @@ def compressXSD(existingXSD):
 
     # Remove the non-enum simple types.
     for type in simpleTypesToRemove:
-        existingXSD.types.remove(type)
+        existingXSD.removeType(type)
 
     # Return the original XSD.
     return existingXSD
@@ -478,13 +584,21 @@ def validateXSDTypes(xsd):
 Creates a flattened and compressed XSD object
 from a file.
 """
-def createFromFile(fileName):
+def createFromFile(fileName,diagnostics=None,symbols=None):
     # Get the contents of the file.
     with open(fileName) as file:
         contents = file.read()
 
+    # Create the XSD.
+    return createFromString(contents,diagnostics,fileName,symbols)
+
+"""
+Creates a flattened and compressed XSD object
+from the contents of a file, as a string or bytes.
+"""
+def createFromString(contents,diagnostics=None,sourceName=None,symbols=None):
     # Create and process the XSD.
-    xsd = processXSD(contents)
+    xsd = processXSD(contents,diagnostics,sourceName,symbols)
     xsd = flattenXSD(xsd)
     xsd = compressXSD(xsd)
 
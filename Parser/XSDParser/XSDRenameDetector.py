@@ -0,0 +1,300 @@
+"""
+Zachary Cook
+
+Detects the types, children, and enum values that were likely renamed
+between consecutive versions by comparing their structure. Only the
+items that were removed are compared to the items that were added,
+and the candidates are found by bucketing MinHash signatures of the
+features of the items instead of comparing every pair.
+"""
+
+from Parser.XSDParser import XSDData, XSDVersionDiffer
+import random
+import zlib
+
+SIGNATURE_SIZE = 32
+BAND_SIZE = 2
+HASH_PRIME = (1 << 61) - 1
+
+DEFAULT_SUGGESTION_THRESHOLD = 0.5
+
+# Coefficients of the hash functions of the signatures. They are
+# created from a fixed seed so the signatures are the same every run.
+hashRandom = random.Random(0)
+HASH_COEFFICIENTS = [(hashRandom.randrange(1,HASH_PRIME),hashRandom.randrange(0,HASH_PRIME)) for i in range(0,SIGNATURE_SIZE)]
+
+
+
+"""
+Returns the features of a name, which are the trigrams of the
+lowercase name so names that differ by a prefix share features.
+"""
+def getNameFeatures(name):
+    name = "^" + str(name).lower() + "$"
+    return set("name:" + name[i:i + 3] for i in range(0,len(name) - 2))
+
+"""
+Returns the features of a complex type from its children.
+"""
+def getComplexTypeFeatures(name,childItems,baseName,renames):
+    features = getNameFeatures(name)
+    features.add("base:" + str(renames.getTypeName(baseName)))
+    for child in childItems.values():
+        features.add("child:" + child.name)
+        features.add("child:" + child.name + ":" + str(renames.getTypeName(child.type)))
+
+    return features
+
+"""
+Returns the features of a child of a complex type.
+"""
+def getChildFeatures(child,renames):
+    features = getNameFeatures(child.name)
+    features.add("type:" + str(renames.getTypeName(child.type)))
+    if isinstance(child,XSDData.XSDChildElement):
+        features.add("kind:Element")
+        features.add("occurrences:" + str(child.minOccurrences) + ":" + str(child.maxOccurrences))
+    else:
+        features.add("kind:Attribute")
+        features.add("required:" + str(child.required))
+
+    return features
+
+"""
+Returns the Jaccard similarity of two sets of features.
+"""
+def getSimilarity(features1,features2):
+    if len(features1) == 0 and len(features2) == 0:
+        return 1.0
+
+    return len(features1 & features2) / len(features1 | features2)
+
+"""
+Returns the MinHash signature of a set of features. The signatures
+of two sets are equal at each position with the probability of
+the similarity of the sets.
+"""
+def getSignature(features):
+    hashes = [zlib.crc32(feature.encode("utf8")) for feature in features]
+    if len(hashes) == 0:
+        return (0,) * SIGNATURE_SIZE
+
+    return tuple(min((a * hash + b) % HASH_PRIME for hash in hashes) for a,b in HASH_COEFFICIENTS)
+
+"""
+Returns the names of the complex types and enums of a parsed XSD.
+Complex types are stored by their transformed name, and the
+children of types and elements with the same name are combined.
+"""
+def getXSDTypes(xsd):
+    complexTypes = {}
+    enums = {}
+    for xsdType in xsd.types + xsd.elements:
+        if isinstance(xsdType,XSDData.XSDSimpleType):
+            if xsdType.isEnum():
+                enums[xsdType.name] = xsdType
+            continue
+
+        # Add the complex type and its children.
+        name = XSDVersionDiffer.transformName(xsdType.name)
+        if name not in complexTypes.keys():
+            complexTypes[name] = (xsdType.base,{})
+        childItems = complexTypes[name][1]
+        for child in xsdType.childItems:
+            if child.name not in childItems.keys():
+                childItems[child.name] = child
+
+    return complexTypes,enums
+
+
+
+"""
+Class representing a rename that was detected.
+"""
+class RenameSuggestion:
+    """
+    Creates a rename suggestion.
+    """
+    def __init__(self,fromVersion,toVersion,kind,typeName,oldName,newName,similarity,applied):
+        self.fromVersion = fromVersion
+        self.toVersion = toVersion
+        self.kind = kind
+        self.typeName = typeName
+        self.oldName = oldName
+        self.newName = newName
+        self.similarity = similarity
+        self.applied = applied
+
+    """
+    Returns the description of the suggestion.
+    """
+    def getDescription(self):
+        description = self.fromVersion + " -> " + self.toVersion + ": " + self.kind + " "
+        if self.typeName is not None:
+            description += self.typeName + "."
+        description += self.oldName + " -> " + self.newName + " (" + str(round(self.similarity,2)) + ")"
+        if self.applied:
+            description += " (applied)"
+
+        return description
+
+"""
+Class representing the detection of renames between versions.
+Renames with a similarity of at least the suggestion threshold are
+suggested, and they are applied if they are at least the apply
+threshold. Renames are only suggested if no apply threshold is given.
+"""
+class RenameDetector:
+    """
+    Creates a rename detector.
+    """
+    def __init__(self,suggestionThreshold=DEFAULT_SUGGESTION_THRESHOLD,applyThreshold=None):
+        self.suggestionThreshold = suggestionThreshold
+        self.applyThreshold = applyThreshold
+        if applyThreshold is not None:
+            self.suggestionThreshold = min(suggestionThreshold,applyThreshold)
+        self.suggestions = []
+
+    """
+    Returns the matches between removed and added items as a list of
+    the group, old name, new name, and similarity. The items are given
+    as lists of the group, name, and features, and only items in the
+    same group are matched. Each item is matched at most once, with
+    the most similar pairs matched first.
+    """
+    def findMatches(self,removedItems,addedItems):
+        if len(removedItems) == 0 or len(addedItems) == 0:
+            return []
+
+        # Bucket the added items by each band of their signatures.
+        buckets = {}
+        for i in range(0,len(addedItems)):
+            group,name,features = addedItems[i]
+            signature = getSignature(features)
+            for bandStart in range(0,SIGNATURE_SIZE,BAND_SIZE):
+                key = (group,bandStart,signature[bandStart:bandStart + BAND_SIZE])
+                if key not in buckets.keys():
+                    buckets[key] = []
+                buckets[key].append(i)
+
+        # Compare the removed items to the added items in the same buckets.
+        pairs = []
+        for group,name,features in removedItems:
+            signature = getSignature(features)
+            candidates = set()
+            for bandStart in range(0,SIGNATURE_SIZE,BAND_SIZE):
+                candidates.update(buckets.get((group,bandStart,signature[bandStart:bandStart + BAND_SIZE]),[]))
+            for i in candidates:
+                similarity = getSimilarity(features,addedItems[i][2])
+                if similarity >= self.suggestionThreshold:
+                    pairs.append((-similarity,group,name,addedItems[i][1]))
+
+        # Match the most similar pairs first.
+        matches = []
+        matchedNames = set()
+        for negativeSimilarity,group,oldName,newName in sorted(pairs):
+            if (group,"old",oldName) in matchedNames or (group,"new",newName) in matchedNames:
+                continue
+            matchedNames.add((group,"old",oldName))
+            matchedNames.add((group,"new",newName))
+            matches.append((group,oldName,newName,-negativeSimilarity))
+
+        return matches
+
+    """
+    Adds the suggestions of matches and returns the matches to apply.
+    The groups of the matches are the types of children and enum values.
+    """
+    def addSuggestions(self,matches,fromVersion,toVersion,kind,groupIsType=False):
+        appliedMatches = []
+        for group,oldName,newName,similarity in matches:
+            applied = self.applyThreshold is not None and similarity >= self.applyThreshold
+            self.suggestions.append(RenameSuggestion(fromVersion,toVersion,kind,group if groupIsType else None,oldName,newName,similarity,applied))
+            if applied:
+                appliedMatches.append((group,oldName,newName))
+
+        return appliedMatches
+
+    """
+    Detects the renames between a parsed XSD and the parsed XSD of the
+    next version. The renames of the newer version are used for the
+    names that weren't renamed. Returns the renames of the older version.
+    """
+    def detectRenames(self,olderXSD,newerXSD,fromVersion,toVersion,newerRenames=None):
+        if newerRenames is None:
+            newerRenames = XSDVersionDiffer.RenameMap()
+        renames = XSDVersionDiffer.RenameMap()
+        olderComplexTypes,olderEnums = getXSDTypes(olderXSD)
+        newerComplexTypes,newerEnums = getXSDTypes(newerXSD)
+
+        # Match the types that were removed to the types that were added.
+        typeMatches = {}
+        for kind,olderTypes,newerTypes in (("complexType",olderComplexTypes,newerComplexTypes),("enum",olderEnums,newerEnums)):
+            removedItems = []
+            addedItems = []
+            for items,otherItems,itemsToCompare in ((olderTypes,newerTypes,removedItems),(newerTypes,olderTypes,addedItems)):
+                for name in items.keys():
+                    if name in otherItems.keys():
+                        continue
+                    if kind == "complexType":
+                        itemsToCompare.append((kind,name,getComplexTypeFeatures(name,items[name][1],items[name][0],newerRenames)))
+                    else:
+                        itemsToCompare.append((kind,name,getNameFeatures(name) | set("value:" + value for value in items[name].enums)))
+            for group,oldName,newName in self.addSuggestions(self.findMatches(removedItems,addedItems),fromVersion,toVersion,kind):
+                typeMatches[oldName] = newName
+
+        # Store the types with the names of the newer version.
+        for olderTypes,newerTypes in ((olderComplexTypes,newerComplexTypes),(olderEnums,newerEnums)):
+            for name in olderTypes.keys():
+                storeName = newerRenames.getTypeName(typeMatches.get(name,name)) if name in newerTypes.keys() or name in typeMatches.keys() else name
+                if storeName != name:
+                    renames.typeNames[name] = storeName
+
+        # Match the children that were removed to the children that were added.
+        removedItems = []
+        addedItems = []
+        for name in olderComplexTypes.keys():
+            newerName = typeMatches.get(name,name)
+            if newerName not in newerComplexTypes.keys():
+                continue
+            storeName = renames.getTypeName(name)
+            olderChildItems = olderComplexTypes[name][1]
+            newerChildItems = newerComplexTypes[newerName][1]
+            for childName in olderChildItems.keys():
+                if childName in newerChildItems.keys():
+                    newerChildName = newerRenames.getChildName(storeName,childName)
+                    if newerChildName != childName:
+                        renames.childNames[(storeName,childName)] = newerChildName
+                else:
+                    removedItems.append((storeName,childName,getChildFeatures(olderChildItems[childName],renames)))
+            for childName in newerChildItems.keys():
+                if childName not in olderChildItems.keys():
+                    addedItems.append((storeName,childName,getChildFeatures(newerChildItems[childName],newerRenames)))
+        for storeName,oldName,newName in self.addSuggestions(self.findMatches(removedItems,addedItems),fromVersion,toVersion,"child",True):
+            renames.childNames[(storeName,oldName)] = newerRenames.getChildName(storeName,newName)
+
+        # Match the enum values that were removed to the enum values that were added.
+        removedItems = []
+        addedItems = []
+        for name in olderEnums.keys():
+            newerName = typeMatches.get(name,name)
+            if newerName not in newerEnums.keys():
+                continue
+            storeName = renames.getTypeName(name)
+            olderValues = olderEnums[name].enums
+            newerValues = newerEnums[newerName].enums
+            for value in olderValues:
+                if value in newerValues:
+                    newerValue = newerRenames.getEnumValue(storeName,value)
+                    if newerValue != value:
+                        renames.enumValues[(storeName,value)] = newerValue
+                else:
+                    removedItems.append((storeName,value,getNameFeatures(value)))
+            for value in newerValues:
+                if value not in olderValues:
+                    addedItems.append((storeName,value,getNameFeatures(value)))
+        for storeName,oldValue,newValue in self.addSuggestions(self.findMatches(removedItems,addedItems),fromVersion,toVersion,"enumValue",True):
+            renames.enumValues[(storeName,oldValue)] = newerRenames.getEnumValue(storeName,newValue)
+
+        # Return the renames.
+        return renames
@@ -0,0 +1,437 @@
+"""
+Zachary Cook
+
+Stores versioned XSDs in an indexed SQLite database so the merged model
+doesn't have to be merged again on every run. The items are loaded when
+they are first accessed, only the items that changed are written again,
+and the database can be read by several processes at once.
+"""
+
+from Parser.XSDParser import XSDVersionDiffer
+from collections.abc import Mapping
+from urllib.request import pathname2url
+import hashlib
+import json
+import os
+import sqlite3
+
+SCHEMA_VERSION = "3"
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY,value TEXT)",
+    "CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY,category TEXT NOT NULL,name TEXT NOT NULL,parentId INTEGER,position INTEGER NOT NULL,type TEXT,defaultValue TEXT,minOccurences INTEGER,maxOccurences INTEGER,fingerprint TEXT,stateHash TEXT)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS itemNames ON items (category,name) WHERE parentId IS NULL",
+    "CREATE INDEX IF NOT EXISTS itemParents ON items (parentId,position)",
+    "CREATE TABLE IF NOT EXISTS names (itemId INTEGER NOT NULL,kind TEXT NOT NULL,position INTEGER NOT NULL,name TEXT,start TEXT NOT NULL,end TEXT NOT NULL,type TEXT)",
+    "CREATE INDEX IF NOT EXISTS nameItems ON names (itemId,kind,position)",
+    "CREATE INDEX IF NOT EXISTS nameNames ON names (name)",
+]
+
+# Categories of the top level items and the classes they are loaded as.
+CATEGORY_CLASSES = {
+    "enum": XSDVersionDiffer.VersionedComposite,
+    "simpleType": XSDVersionDiffer.VersionedItem,
+    "complexType": XSDVersionDiffer.VersionedComposite,
+}
+
+
+
+"""
+Returns the items of a category of a versioned XSD.
+"""
+def getCategoryItems(xsd,category):
+    if category == "enum":
+        return xsd.enums
+    elif category == "simpleType":
+        return xsd.simpleTypes
+
+    return xsd.complexTypes
+
+"""
+Returns the state of an item that is stored, which is the state of the
+item with the facets, choices, positions, declarations, minimum
+occurrences, and substitution groups of the item and its children, and
+the children that are declared again. They aren't part of the
+fingerprint since the generated code doesn't use them.
+"""
+def getStoredState(item):
+    items = [item]
+    redeclaredStates = []
+    if isinstance(item,XSDVersionDiffer.VersionedComposite):
+        items.extend(item.childItems.values())
+        items.extend(item.redeclaredChildItems.values())
+        redeclaredStates = [(childName,item.redeclaredChildItems[childName].getState()) for childName in item.redeclaredChildItems.keys()]
+    facetStates = []
+    for versionedItem in items:
+        facetStates.append(versionedItem.facetVersions.getState() if versionedItem.facetVersions is not None else None)
+        facetStates.append(versionedItem.choiceVersions.getState() if versionedItem.choiceVersions is not None else None)
+        facetStates.append(versionedItem.positionVersions.getState() if versionedItem.positionVersions is not None else None)
+        facetStates.append(versionedItem.declarationVersions.getState() if versionedItem.declarationVersions is not None else None)
+        facetStates.append(versionedItem.minOccurenceVersions.getState() if versionedItem.minOccurenceVersions is not None else None)
+        facetStates.append(versionedItem.substitutionGroupVersions.getState() if versionedItem.substitutionGroupVersions is not None else None)
+
+    return hashlib.blake2b(repr((item.getState(),redeclaredStates,facetStates)).encode("utf8"),digest_size=16).hexdigest()
+
+"""
+Returns the stored value of a name. Facets, choices, positions,
+declarations, and minimum occurrences are stored as JSON.
+"""
+def encodeName(kind,name):
+    if kind == "facets" or kind == "choices" or kind == "position" or kind == "declarations" or kind == "minOccurences":
+        return json.dumps(name)
+
+    return name
+
+"""
+Returns the name of a stored value.
+"""
+def decodeName(kind,value):
+    if kind == "facets" or kind == "choices":
+        return tuple(tuple(pair) for pair in json.loads(value))
+    elif kind == "declarations":
+        return tuple(json.loads(value))
+    elif kind == "position" or kind == "minOccurences":
+        return json.loads(value)
+
+    return value
+
+"""
+Opens a database for reading and writing. The database uses a
+write-ahead log so readers aren't blocked while it is written.
+"""
+def openDatabase(fileName):
+    connection = sqlite3.connect(fileName)
+    connection.execute("PRAGMA journal_mode=WAL")
+    for statement in SCHEMA:
+        connection.execute(statement)
+
+    # Throw an exception if the database is from another schema version.
+    row = connection.execute("SELECT value FROM metadata WHERE key='schemaVersion'").fetchone()
+    if row is None:
+        with connection:
+            connection.execute("INSERT INTO metadata (key,value) VALUES ('schemaVersion',?)",(SCHEMA_VERSION,))
+    elif row[0] != SCHEMA_VERSION:
+        connection.close()
+        raise ValueError("Unsupported store schema version " + str(row[0]) + " in " + fileName)
+
+    return connection
+
+"""
+Inserts the names of an item.
+"""
+def insertNames(connection,itemId,item):
+    rows = []
+    for kind,versionedItem in (("name",item),("type",item.typeVersions),("facets",item.facetVersions),("choices",item.choiceVersions),("position",item.positionVersions),("declarations",item.declarationVersions),("minOccurences",item.minOccurenceVersions),("substitutionGroup",item.substitutionGroupVersions)):
+        if versionedItem is None:
+            continue
+        for i in range(0,len(versionedItem.names)):
+            name = versionedItem.names[i]
+            rows.append((itemId,kind,i,encodeName(kind,name.name),name.start,name.end,name.type))
+    connection.executemany("INSERT INTO names (itemId,kind,position,name,start,end,type) VALUES (?,?,?,?,?,?,?)",rows)
+
+"""
+Inserts an item and its children.
+"""
+def insertItem(connection,category,name,position,item,stateHash):
+    itemId = connection.execute("INSERT INTO items (category,name,parentId,position,type,defaultValue,minOccurences,maxOccurences,fingerprint,stateHash) VALUES (?,?,NULL,?,?,?,?,?,?,?)",(category,name,position,item.type,item.default,item.minOccurences,item.maxOccurences,item.getFingerprint(),stateHash)).lastrowid
+    insertNames(connection,itemId,item)
+
+    # Insert the children and the children that are declared again.
+    if isinstance(item,XSDVersionDiffer.VersionedComposite):
+        childPosition = 0
+        for childCategory,childItems in (("child",item.childItems),("redeclared",item.redeclaredChildItems)):
+            for childName in childItems.keys():
+                child = childItems[childName]
+                childId = connection.execute("INSERT INTO items (category,name,parentId,position,type,defaultValue,minOccurences,maxOccurences) VALUES (?,?,?,?,?,?,?,?)",(childCategory,childName,itemId,childPosition,child.type,child.default,child.minOccurences,child.maxOccurences)).lastrowid
+                insertNames(connection,childId,child)
+                childPosition += 1
+
+"""
+Deletes an item and its children.
+"""
+def deleteItem(connection,itemId):
+    connection.execute("DELETE FROM names WHERE itemId IN (SELECT id FROM items WHERE id=? OR parentId=?)",(itemId,itemId))
+    connection.execute("DELETE FROM items WHERE id=? OR parentId=?",(itemId,itemId))
+
+"""
+Writes a versioned XSD to a database. Only the items that were added,
+changed, or removed since the last write are written. Returns the
+number of items that were written and removed.
+"""
+def saveVersionedXSD(xsd,fileName):
+    connection = openDatabase(fileName)
+    writtenCount = 0
+    removedCount = 0
+    try:
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO metadata (key,value) VALUES ('versions',?)",(json.dumps(list(xsd.versions)),))
+
+            # Get the stored items.
+            storedItems = {}
+            for itemId,category,name,position,stateHash in connection.execute("SELECT id,category,name,position,stateHash FROM items WHERE parentId IS NULL"):
+                storedItems[(category,name)] = (itemId,position,stateHash)
+
+            # Write the items that changed.
+            for category in CATEGORY_CLASSES.keys():
+                items = getCategoryItems(xsd,category)
+                position = 0
+                for name in items.keys():
+                    item = items[name]
+                    stateHash = getStoredState(item)
+                    storedItem = storedItems.pop((category,name),None)
+                    if storedItem is not None and storedItem[2] == stateHash:
+                        if storedItem[1] != position:
+                            connection.execute("UPDATE items SET position=? WHERE id=?",(position,storedItem[0]))
+                    else:
+                        if storedItem is not None:
+                            deleteItem(connection,storedItem[0])
+                        insertItem(connection,category,name,position,item,stateHash)
+                        writtenCount += 1
+                    position += 1
+
+            # Delete the items that were removed.
+            for itemId,position,stateHash in storedItems.values():
+                deleteItem(connection,itemId)
+                removedCount += 1
+    finally:
+        connection.close()
+
+    return writtenCount,removedCount
+
+
+
+"""
+Class representing the items of a category in a database. The names
+are read when first needed and the items are loaded when accessed.
+"""
+class StoredItems(Mapping):
+    """
+    Creates the stored items.
+    """
+    def __init__(self,xsd,category):
+        self.xsd = xsd
+        self.category = category
+        self.names = None
+        self.nameSet = None
+        self.items = {}
+
+    """
+    Returns the names of the items in the order they were stored.
+    """
+    def getNames(self):
+        if self.names is None:
+            self.names = [row[0] for row in self.xsd.connection.execute("SELECT name FROM items WHERE category=? AND parentId IS NULL ORDER BY position",(self.category,))]
+            self.nameSet = set(self.names)
+
+        return self.names
+
+    """
+    Returns an item, loading it if it wasn't loaded.
+    """
+    def __getitem__(self,name):
+        if name in self.items.keys():
+            return self.items[name]
+
+        # Load the item.
+        item = self.xsd.loadItem(self.category,name)
+        if item is None:
+            raise KeyError(name)
+        self.items[name] = item
+        return item
+
+    """
+    Returns if an item exists.
+    """
+    def __contains__(self,name):
+        self.getNames()
+        return name in self.nameSet
+
+    """
+    Iterates the names of the items.
+    """
+    def __iter__(self):
+        return iter(self.getNames())
+
+    """
+    Returns the number of items.
+    """
+    def __len__(self):
+        return len(self.getNames())
+
+"""
+Class representing a read-only versioned XSD stored in a database. It
+has the same read API as the versioned XSD, but only the items that are
+accessed are loaded. When pickled, only the file name is stored, so
+other processes open the database and load the items they use.
+"""
+class StoredVersionedXSD(XSDVersionDiffer.VersionedXSD):
+    """
+    Opens a stored versioned XSD.
+    """
+    def __init__(self,fileName):
+        super().__init__()
+        if not os.path.isfile(fileName):
+            raise ValueError("Store not found: " + fileName)
+        self.fileName = fileName
+        self.connection = sqlite3.connect("file:" + pathname2url(os.path.abspath(fileName)) + "?mode=ro",uri=True)
+
+        # Read the versions.
+        row = self.connection.execute("SELECT value FROM metadata WHERE key='schemaVersion'").fetchone()
+        if row is None or row[0] != SCHEMA_VERSION:
+            self.connection.close()
+            raise ValueError("Unsupported store schema version " + str(row[0] if row is not None else None) + " in " + fileName)
+        row = self.connection.execute("SELECT value FROM metadata WHERE key='versions'").fetchone()
+        self.versions = json.loads(row[0]) if row is not None else []
+        for i in range(0,len(self.versions)):
+            self.versionIndexes[self.versions[i]] = i
+
+        # Create the items.
+        self.enums = StoredItems(self,"enum")
+        self.simpleTypes = StoredItems(self,"simpleType")
+        self.complexTypes = StoredItems(self,"complexType")
+
+    """
+    Returns the state to pickle.
+    """
+    def __getstate__(self):
+        return {"fileName": self.fileName}
+
+    """
+    Opens the database of a pickled state.
+    """
+    def __setstate__(self,state):
+        self.__init__(state["fileName"])
+
+    """
+    Closes the database.
+    """
+    def close(self):
+        self.connection.close()
+
+    """
+    Adds the stored names of an item.
+    """
+    def addNames(self,item,kind,nameRows):
+        versionedItem = item
+        if kind == "type":
+            item.typeVersions = XSDVersionDiffer.VersionedItem(None)
+            versionedItem = item.typeVersions
+        elif kind == "facets":
+            item.facetVersions = XSDVersionDiffer.VersionedItem(None)
+            versionedItem = item.facetVersions
+        elif kind == "choices":
+            item.choiceVersions = XSDVersionDiffer.VersionedItem(None)
+            versionedItem = item.choiceVersions
+        elif kind == "position":
+            item.positionVersions = XSDVersionDiffer.VersionedItem(None)
+            versionedItem = item.positionVersions
+        elif kind == "declarations":
+            item.declarationVersions = XSDVersionDiffer.VersionedItem(None)
+            versionedItem = item.declarationVersions
+        elif kind == "minOccurences":
+            item.minOccurenceVersions = XSDVersionDiffer.VersionedItem(None)
+            versionedItem = item.minOccurenceVersions
+        elif kind == "substitutionGroup":
+            item.substitutionGroupVersions = XSDVersionDiffer.VersionedItem(None)
+            versionedItem = item.substitutionGroupVersions
+        for value,start,end,type in nameRows:
+            name = XSDVersionDiffer.NameVersion(decodeName(kind,value),start,end,type)
+            versionedItem.names.append(name)
+            versionedItem.nameRefs[start] = name
+
+    """
+    Loads an item and its children. Returns None if the item isn't stored.
+    """
+    def loadItem(self,category,name):
+        row = self.connection.execute("SELECT id,type,defaultValue,minOccurences,maxOccurences FROM items WHERE category=? AND name=? AND parentId IS NULL",(category,name)).fetchone()
+        if row is None:
+            return None
+        itemId = row[0]
+
+        # Create the item and its children.
+        itemClass = CATEGORY_CLASSES[category]
+        if itemClass is XSDVersionDiffer.VersionedComposite:
+            item = itemClass(row[1])
+        else:
+            item = itemClass(row[1],row[2],row[3],row[4])
+        itemsById = {itemId: item}
+        for childId,childCategory,childName,type,default,minOccurences,maxOccurences in self.connection.execute("SELECT id,category,name,type,defaultValue,minOccurences,maxOccurences FROM items WHERE parentId=? ORDER BY position",(itemId,)):
+            child = XSDVersionDiffer.VersionedItem(type,default,minOccurences,maxOccurences)
+            if childCategory == "redeclared":
+                item.redeclaredChildItems[childName] = child
+            else:
+                item.childItems[childName] = child
+            itemsById[childId] = child
+
+        # Add the names.
+        nameRows = {}
+        for nameItemId,kind,value,start,end,type in self.connection.execute("SELECT itemId,kind,name,start,end,type FROM names WHERE itemId IN (SELECT id FROM items WHERE id=? OR parentId=?) ORDER BY itemId,kind,position",(itemId,itemId)):
+            key = (nameItemId,kind)
+            if key not in nameRows.keys():
+                nameRows[key] = []
+            nameRows[key].append((value,start,end,type))
+        for nameItemId,kind in nameRows.keys():
+            self.addNames(itemsById[nameItemId],kind,nameRows[(nameItemId,kind)])
+
+        # Return the item.
+        return item
+
+    """
+    Returns the fingerprints of the items. The stored fingerprints
+    are used so the items don't have to be loaded.
+    """
+    def getFingerprints(self):
+        fingerprints = {}
+        for category in CATEGORY_CLASSES.keys():
+            for name,fingerprint in self.connection.execute("SELECT name,fingerprint FROM items WHERE category=? AND parentId IS NULL ORDER BY position",(category,)):
+                fingerprints[(category,name)] = fingerprint
+
+        return fingerprints
+
+    """
+    Returns the items with a name in any version as a list of the
+    category, type name, and child name (None for types), without
+    loading the items.
+    """
+    def findItemsWithName(self,name):
+        rows = self.connection.execute("SELECT DISTINCT items.category,items.name,parents.name FROM names JOIN items ON items.id=names.itemId LEFT JOIN items AS parents ON parents.id=items.parentId WHERE names.kind='name' AND names.name=? AND items.category!='redeclared' ORDER BY items.category,parents.name,items.name",(name,))
+        foundItems = []
+        for category,itemName,parentName in rows:
+            if parentName is None:
+                foundItems.append((category,itemName,None))
+            else:
+                foundItems.append((category,parentName,itemName))
+
+        return foundItems
+
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+    import time
+    from Parser.XSDParser import XSDLoader
+
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Writes the merged versioned XSD to a SQLite database, or finds items in it.")
+    parser.add_argument("database",help="Database file to write or read.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory or archive of the XSD files to write.")
+    parser.add_argument("--find",help="Print the items with this name in any version instead of writing the database.")
+    arguments = parser.parse_args()
+
+    # Find the items.
+    if arguments.find is not None:
+        try:
+            xsd = StoredVersionedXSD(arguments.database)
+        except ValueError as error:
+            print(str(error))
+            sys.exit(2)
+        for category,typeName,childName in xsd.findItemsWithName(arguments.find):
+            print(category + " " + typeName + ("." + childName if childName is not None else ""))
+        xsd.close()
+        sys.exit(0)
+
+    # Merge the XSDs and write the database.
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False)
+    startTime = time.perf_counter()
+    writtenCount,removedCount = saveVersionedXSD(versionedXSD,arguments.database)
+    print("Wrote " + str(writtenCount) + " items and removed " + str(removedCount) + " items in " + str(round(time.perf_counter() - startTime,3)) + "s")
@@ -5,8 +5,11 @@ Processes the differences between XSDs.
 """
 
 from Parser.XSDParser import XSDData
-from functools import cmp_to_key
+from collections.abc import Mapping
+import bisect
+import hashlib
 import re
+import sys
 
 # Names of objects to merge.
 NAMES_TO_MERGE = {
@@ -58,10 +61,56 @@ def sortNameVersions(version1,version2):
 
 
 
+"""
+Class representing the renames applied to the names of a version
+when it is added, in addition to the names to merge. Types are stored
+by their transformed name, children by the stored name of their type
+and their name, and enum values by the stored name of their enum and
+their value.
+"""
+class RenameMap:
+    """
+    Creates a rename map.
+    """
+    def __init__(self):
+        self.typeNames = {}
+        self.childNames = {}
+        self.enumValues = {}
+
+    """
+    Returns the stored name of a type.
+    """
+    def getTypeName(self,name):
+        name = transformName(name)
+        return self.typeNames.get(name,name)
+
+    """
+    Returns the stored name of a child of a stored type.
+    """
+    def getChildName(self,typeName,childName):
+        return self.childNames.get((typeName,childName),childName)
+
+    """
+    Returns the stored name of a value of a stored enum.
+    """
+    def getEnumValue(self,enumName,value):
+        return self.enumValues.get((enumName,value),value)
+
+"""
+Returns the value added to the versions of an item for a version
+before the names are merged, or the default if it wasn't added.
+"""
+def getAddedValue(versionedItem,version,default=None):
+    if versionedItem is None or version not in versionedItem.nameRefs.keys():
+        return default
+    return versionedItem.nameRefs[version].name
+
 """
 Class representing a name version.
 """
 class NameVersion:
+    __slots__ = ("name","start","end","type")
+
     """
     Creates a name version object.
     """
@@ -85,6 +134,14 @@ class VersionedItem:
         self.default = default
         self.minOccurences = minOccurences
         self.maxOccurences = maxOccurences
+        self.nameIndex = None
+        self.typeVersions = None
+        self.facetVersions = None
+        self.choiceVersions = None
+        self.positionVersions = None
+        self.minOccurenceVersions = None
+        self.substitutionGroupVersions = None
+        self.declarationVersions = None
 
     """
     Adds a name for a version.
@@ -98,69 +155,507 @@ class VersionedItem:
         versionTag = NameVersion(name,version,version,type)
         self.nameRefs[version] = versionTag
         self.names.append(versionTag)
+        self.nameIndex = None
+
+    """
+    Returns the name for a version index, or None if the item doesn't
+    exist in the version. The names are searched with a bisect of the
+    start indexes, which are stored until the names change.
+    """
+    def getNameForVersion(self,versionIndex,versionIndexes):
+        if self.nameIndex is None or self.nameIndex[0] is not versionIndexes:
+            names = sorted(self.names,key=lambda name: versionIndexes[name.start])
+            self.nameIndex = (versionIndexes,[versionIndexes[name.start] for name in names],names)
+
+        # Return the last name that starts before the version if it hasn't ended.
+        position = bisect.bisect_right(self.nameIndex[1],versionIndex) - 1
+        if position < 0:
+            return None
+        name = self.nameIndex[2][position]
+        if versionIndexes[name.end] < versionIndex:
+            return None
+        return name
+
+    """
+    Adds the type of the item for a version. Only types that are
+    different from the type of the item are stored, and they are
+    stored as the names of another versioned item so they are merged
+    into ranges the same way as the names. Must be called before the
+    name of the version is added.
+    """
+    def addTypeForVersion(self,type,version):
+        if type == self.type or version in self.nameRefs.keys():
+            return
+        if self.typeVersions is None:
+            self.typeVersions = VersionedItem(None)
+        self.typeVersions.addNameForVersion(type,version)
+
+    """
+    Returns the type of the item for a version index. Returns the
+    type of the item if the types of the versions weren't added.
+    """
+    def getTypeForVersion(self,versionIndex,versionIndexes):
+        if self.typeVersions is None:
+            return self.type
+        typeVersion = self.typeVersions.getNameForVersion(versionIndex,versionIndexes)
+        if typeVersion is None:
+            return self.type
+        return typeVersion.name
+
+    """
+    Adds the facets (restrictions of the simple type) of the item for
+    a version. The facets are stored as the sorted tuple of names and
+    values in the names of another versioned item, the same way as the
+    types. Must be called before the name of the version is added.
+    """
+    def addFacetsForVersion(self,facets,version):
+        if facets is None or len(facets) == 0 or version in self.nameRefs.keys():
+            return
+        if self.facetVersions is None:
+            self.facetVersions = VersionedItem(None)
+        self.facetVersions.addNameForVersion(tuple(sorted(facets.items())),version)
+
+    """
+    Returns the facets of the item for a version index as a dictionary.
+    """
+    def getFacetsForVersion(self,versionIndex,versionIndexes):
+        if self.facetVersions is None:
+            return {}
+        facetVersion = self.facetVersions.getNameForVersion(versionIndex,versionIndexes)
+        if facetVersion is None:
+            return {}
+        return dict(facetVersion.name)
+
+    """
+    Adds the choices of the item for a version, which are the tuples of
+    the index of each choice of the complex type the item is in, the
+    index of the child of the choice, and the position of the element
+    in the complex type. The choices are stored the same way as the
+    facets. Must be called before the name of the version is added.
+    """
+    def addChoicesForVersion(self,choices,version):
+        if choices is None or len(choices) == 0 or version in self.nameRefs.keys():
+            return
+        if self.choiceVersions is None:
+            self.choiceVersions = VersionedItem(None)
+        self.choiceVersions.addNameForVersion(tuple(choices),version)
+
+    """
+    Returns the choices of the item for a version index.
+    """
+    def getChoicesForVersion(self,versionIndex,versionIndexes):
+        if self.choiceVersions is None:
+            return ()
+        choiceVersion = self.choiceVersions.getNameForVersion(versionIndex,versionIndexes)
+        if choiceVersion is None:
+            return ()
+        return choiceVersion.name
+
+    """
+    Adds the position of the element in the complex type for a version.
+    The positions are stored the same way as the facets. Must be called
+    before the name of the version is added.
+    """
+    def addPositionForVersion(self,position,version):
+        if position is None or version in self.nameRefs.keys():
+            return
+        if self.positionVersions is None:
+            self.positionVersions = VersionedItem(None)
+        self.positionVersions.addNameForVersion(position,version)
+
+    """
+    Returns the position of the element for a version index, or None
+    if the position wasn't added.
+    """
+    def getPositionForVersion(self,versionIndex,versionIndexes):
+        if self.positionVersions is None:
+            return None
+        positionVersion = self.positionVersions.getNameForVersion(versionIndex,versionIndexes)
+        if positionVersion is None:
+            return None
+        return positionVersion.name
+
+    """
+    Adds the names of the merged types that declare the item for a
+    version. The declarations are stored the same way as the facets.
+    Must be called before the name of the version is added.
+    """
+    def addDeclarationsForVersion(self,declarations,version):
+        if declarations is None or len(declarations) == 0 or version in self.nameRefs.keys():
+            return
+        if self.declarationVersions is None:
+            self.declarationVersions = VersionedItem(None)
+        self.declarationVersions.addNameForVersion(tuple(declarations),version)
+
+    """
+    Returns the names of the merged types that declare the item for a
+    version index, or an empty tuple if the type wasn't merged.
+    """
+    def getDeclarationsForVersion(self,versionIndex,versionIndexes):
+        if self.declarationVersions is None:
+            return ()
+        declarationVersion = self.declarationVersions.getNameForVersion(versionIndex,versionIndexes)
+        if declarationVersion is None:
+            return ()
+        return declarationVersion.name
+
+    """
+    Adds the minimum occurrences of the item for a version. Only the
+    minimum occurrences that are different from the item's are stored,
+    the same way as the types. Must be called before the name of the
+    version is added.
+    """
+    def addMinOccurencesForVersion(self,minOccurences,version):
+        if minOccurences is None or minOccurences == self.minOccurences or version in self.nameRefs.keys():
+            return
+        if self.minOccurenceVersions is None:
+            self.minOccurenceVersions = VersionedItem(None)
+        self.minOccurenceVersions.addNameForVersion(minOccurences,version)
+
+    """
+    Returns the minimum occurrences of the item for a version index.
+    """
+    def getMinOccurencesForVersion(self,versionIndex,versionIndexes):
+        if self.minOccurenceVersions is None:
+            return self.minOccurences
+        minOccurenceVersion = self.minOccurenceVersions.getNameForVersion(versionIndex,versionIndexes)
+        if minOccurenceVersion is None:
+            return self.minOccurences
+        return minOccurenceVersion.name
+
+    """
+    Adds the element an element can be substituted for in a version.
+    The substitution groups are stored the same way as the types, but
+    can be added after the name since the elements are added after the
+    complex types with the same name.
+    """
+    def addSubstitutionGroupForVersion(self,substitutionGroup,version):
+        if substitutionGroup is None:
+            return
+        if self.substitutionGroupVersions is None:
+            self.substitutionGroupVersions = VersionedItem(None)
+        self.substitutionGroupVersions.addNameForVersion(substitutionGroup,version)
+
+    """
+    Returns the element an element can be substituted for in a version
+    index, or None if it can't be substituted.
+    """
+    def getSubstitutionGroupForVersion(self,versionIndex,versionIndexes):
+        if self.substitutionGroupVersions is None:
+            return None
+        substitutionGroupVersion = self.substitutionGroupVersions.getNameForVersion(versionIndex,versionIndexes)
+        if substitutionGroupVersion is None:
+            return None
+        return substitutionGroupVersion.name
 
     """
     Merges the names together.
-    Assumes the versions are in order.
+    Assumes the versions are in order. The indexes of the
+    versions are created if they aren't given.
     """
-    def mergeNameVersions(self,versions):
+    def mergeNameVersions(self,versions,versionIndexes=None):
+        if versionIndexes is None:
+            versionIndexes = {}
+            for i in range(0,len(versions)):
+                versionIndexes[versions[i]] = i
+
+        # Merge the types, facets, choices, positions, declarations, minimum occurrences, and substitution groups.
+        if self.typeVersions is not None:
+            self.typeVersions.mergeNameVersions(versions,versionIndexes)
+        if self.facetVersions is not None:
+            self.facetVersions.mergeNameVersions(versions,versionIndexes)
+        if self.choiceVersions is not None:
+            self.choiceVersions.mergeNameVersions(versions,versionIndexes)
+        if self.positionVersions is not None:
+            self.positionVersions.mergeNameVersions(versions,versionIndexes)
+        if self.declarationVersions is not None:
+            self.declarationVersions.mergeNameVersions(versions,versionIndexes)
+        if self.minOccurenceVersions is not None:
+            self.minOccurenceVersions.mergeNameVersions(versions,versionIndexes)
+        if self.substitutionGroupVersions is not None:
+            self.substitutionGroupVersions.mergeNameVersions(versions,versionIndexes)
+
         # Return if there aren't names to merge.
+        self.nameIndex = None
         if len(self.names) <= 1:
             return
 
         # Sort the names.
-        self.names = sorted(self.names,key=cmp_to_key(sortNameVersions))
+        self.names = sorted(self.names,key=lambda name: versionIndexes[name.start])
 
-        # Find the first version index:
-        currentVersionTag = 0
-        firstVersion = versions.index(self.names[0].start)
+        # Merge the names of consecutive versions.
+        mergedNames = [self.names[0]]
+        for versionToMerge in self.names[1:]:
+            currentNameVersion = mergedNames[-1]
+            if versionIndexes[versionToMerge.start] == versionIndexes[currentNameVersion.end] + 1 and currentNameVersion.name == versionToMerge.name and currentNameVersion.type == versionToMerge.type:
+                currentNameVersion.end = versionToMerge.end
+                self.nameRefs.pop(versionToMerge.start)
+            else:
+                mergedNames.append(versionToMerge)
+        self.names = mergedNames
 
-        # Go through the versions and merge consecutive ranges.
-        for i in range(firstVersion + 1,len(versions)):
-            currentNameVersion = self.names[currentVersionTag]
-            currentVersion = versions[i]
+    """
+    Returns the state of the item as a tuple of the values
+    the generated code is created from.
+    """
+    def getState(self):
+        names = tuple((name.name,name.start,name.end,name.type) for name in self.names)
+        typeVersions = None
+        if self.typeVersions is not None:
+            typeVersions = self.typeVersions.getState()
+        return (self.type,self.default,self.minOccurences,self.maxOccurences,names,typeVersions)
 
-            if currentVersion in self.nameRefs.keys():
-                versionToMerge = self.names[currentVersionTag + 1]
-                if currentNameVersion.end == versions[i - 1] and currentNameVersion.name == versionToMerge.name and currentNameVersion.type == versionToMerge.type:
-                    currentNameVersion.end = versionToMerge.end
-                    self.names.pop(currentVersionTag + 1)
-                    self.nameRefs.pop(currentVersion)
-                else:
-                    currentVersionTag += 1
+    """
+    Returns a fingerprint of the state of the item. The fingerprint
+    is the same for items with the same state, even between runs.
+    """
+    def getFingerprint(self):
+        return hashlib.blake2b(repr(self.getState()).encode("utf8"),digest_size=16).hexdigest()
 
 """
 Class representing a versioned composite.
 """
 class VersionedComposite(VersionedItem):
     """
-    Creates a versioned simple type.
+    Creates a versioned simple type. The children that are declared
+    again by the type, like the children of restrictions, are stored
+    in the type with the child in the base. They aren't part of the
+    state since the generated code only uses the child in the base.
     """
     def __init__(self,type):
         super().__init__(type)
         self.childItems = {}
+        self.redeclaredChildItems = {}
 
     """
     Adds a name for a child item.
     """
-    def addChildNameForVersion(self,commonName,encodeName,base,version,type=None,default=None,minOccurences=None,maxOccurences=None):
+    def addChildNameForVersion(self,commonName,encodeName,base,version,type=None,default=None,minOccurences=None,maxOccurences=None,facets=None,choices=None,position=None,declarations=None):
         # Create the child element if it doesn't exist.
         if commonName not in self.childItems.keys():
             self.childItems[commonName] = VersionedItem(base,default,minOccurences,maxOccurences)
 
         # Add the version.
+        self.childItems[commonName].addTypeForVersion(base,version)
+        self.childItems[commonName].addFacetsForVersion(facets,version)
+        self.childItems[commonName].addChoicesForVersion(choices,version)
+        self.childItems[commonName].addPositionForVersion(position,version)
+        self.childItems[commonName].addDeclarationsForVersion(declarations,version)
+        self.childItems[commonName].addMinOccurencesForVersion(minOccurences,version)
         self.childItems[commonName].addNameForVersion(encodeName,version,type)
 
     """
     Merges the names together.
     Assumes the versions are in order.
     """
-    def mergeNameVersions(self,versions):
-        super().mergeNameVersions(versions)
+    def mergeNameVersions(self,versions,versionIndexes=None):
+        if versionIndexes is None:
+            versionIndexes = {}
+            for i in range(0,len(versions)):
+                versionIndexes[versions[i]] = i
+        super().mergeNameVersions(versions,versionIndexes)
 
         # Merge the child items.
         for child in self.childItems.values():
-            child.mergeNameVersions(versions)
+            child.mergeNameVersions(versions,versionIndexes)
+        for child in self.redeclaredChildItems.values():
+            child.mergeNameVersions(versions,versionIndexes)
+
+    """
+    Returns the state of the item as a tuple of the values
+    the generated code is created from, including the children.
+    """
+    def getState(self):
+        return super().getState() + (tuple((childName,self.childItems[childName].getState()) for childName in self.childItems.keys()),)
+
+"""
+Class representing a read-only mapping of the versioned items
+that exist in a version. The views of the items are created
+when they are first accessed.
+"""
+class VersionedItemsView(Mapping):
+    """
+    Creates a versioned items view.
+    """
+    def __init__(self,items,versionView,viewClass):
+        self.items = items
+        self.versionView = versionView
+        self.viewClass = viewClass
+        self.views = {}
+        self.names = None
+
+    """
+    Returns the view of an item.
+    """
+    def __getitem__(self,name):
+        if name in self.views.keys():
+            return self.views[name]
+
+        # Create the view if the item exists in the version.
+        item = self.items[name]
+        versionName = self.versionView.getName(item)
+        if versionName is None:
+            raise KeyError(name)
+        view = self.viewClass(name,item,versionName,self.versionView)
+        self.views[name] = view
+        return view
+
+    """
+    Returns the names of the items that exist in the version.
+    """
+    def getNames(self):
+        if self.names is None:
+            self.names = [name for name in self.items.keys() if self.versionView.getName(self.items[name]) is not None]
+
+        return self.names
+
+    """
+    Returns if an item exists in the version.
+    """
+    def __contains__(self,name):
+        return name in self.views.keys() or (name in self.items.keys() and self.versionView.getName(self.items[name]) is not None)
+
+    """
+    Iterates the names of the items.
+    """
+    def __iter__(self):
+        return iter(self.getNames())
+
+    """
+    Returns the number of items.
+    """
+    def __len__(self):
+        return len(self.getNames())
+
+"""
+Class representing a read-only view of a versioned item in a version.
+"""
+class VersionedItemView:
+    """
+    Creates a versioned item view.
+    """
+    def __init__(self,commonName,item,versionName,versionView):
+        self.commonName = commonName
+        self.item = item
+        self.name = versionName.name
+        self.kind = versionName.type
+        self.versionView = versionView
+
+    """
+    Returns the type of the item in the version.
+    """
+    @property
+    def type(self):
+        return self.item.getTypeForVersion(self.versionView.versionIndex,self.versionView.xsd.versionIndexes)
+
+    """
+    Returns the default value of the item.
+    """
+    @property
+    def default(self):
+        return self.item.default
+
+    """
+    Returns the minimum occurrences of the item in the version.
+    """
+    @property
+    def minOccurences(self):
+        return self.item.getMinOccurencesForVersion(self.versionView.versionIndex,self.versionView.xsd.versionIndexes)
+
+    """
+    Returns the maximum occurrences of the item.
+    """
+    @property
+    def maxOccurences(self):
+        return self.item.maxOccurences
+
+    """
+    Returns the facets of the item in the version.
+    """
+    @property
+    def facets(self):
+        return self.item.getFacetsForVersion(self.versionView.versionIndex,self.versionView.xsd.versionIndexes)
+
+    """
+    Returns if the item is an attribute.
+    """
+    def isAttribute(self):
+        return self.kind == "Attribute"
+
+"""
+Class representing a read-only view of a versioned composite in a version.
+"""
+class VersionedCompositeView(VersionedItemView):
+    """
+    Creates a versioned composite view.
+    """
+    def __init__(self,commonName,item,versionName,versionView):
+        super().__init__(commonName,item,versionName,versionView)
+        self.childItems = VersionedItemsView(item.childItems,versionView,VersionedItemView)
+
+    """
+    Returns the wire names of the child items.
+    For enums, these are the values of the enum.
+    """
+    def getChildNames(self):
+        return [child.name for child in self.childItems.values()]
+
+"""
+Class representing a read-only view of a versioned XSD in a version.
+"""
+class VersionedXSDView:
+    """
+    Creates a versioned XSD view.
+    """
+    def __init__(self,xsd,version):
+        self.xsd = xsd
+        self.version = version
+        self.versionIndex = xsd.versionIndexes[version]
+        self.enums = VersionedItemsView(xsd.enums,self,VersionedCompositeView)
+        self.simpleTypes = VersionedItemsView(xsd.simpleTypes,self,VersionedItemView)
+        self.complexTypes = VersionedItemsView(xsd.complexTypes,self,VersionedCompositeView)
+
+    """
+    Returns the name of an item in the version, or None if the
+    item doesn't exist in the version.
+    """
+    def getName(self,item):
+        return item.getNameForVersion(self.versionIndex,self.xsd.versionIndexes)
+
+    """
+    Returns the values of an enum in the version.
+    """
+    def getEnumValues(self,enumName):
+        return frozenset(self.enums[enumName].getChildNames())
+
+"""
+Class representing a change to an item between two versions.
+"""
+class VersionChange:
+    """
+    Creates a version change.
+    """
+    def __init__(self,fromVersion,toVersion,kind,typeName,childName,change,oldValue=None,newValue=None):
+        self.fromVersion = fromVersion
+        self.toVersion = toVersion
+        self.kind = kind
+        self.typeName = typeName
+        self.childName = childName
+        self.change = change
+        self.oldValue = oldValue
+        self.newValue = newValue
+
+    """
+    Returns the description of the change.
+    """
+    def getDescription(self):
+        description = self.change + " " + self.kind + " " + self.typeName
+        if self.childName is not None:
+            description += "." + self.childName
+        if self.change == "renamed" or self.change == "retyped":
+            description += " (" + str(self.oldValue) + " -> " + str(self.newValue) + ")"
+
+        return description
 
 """
 Class for storing XSD objects.
@@ -173,6 +668,9 @@ class VersionedXSD:
         self.enums = {}
         self.simpleTypes = {}
         self.complexTypes = {}
+        self.versions = []
+        self.versionIndexes = {}
+        self.versionViews = {}
 
     """
     Returns the complex type that contains a child
@@ -192,70 +690,350 @@ class VersionedXSD:
         return self.getComplexTypeWithChild(complexType.type,itemName)
 
     """
-    Adds a simple type.
+    Returns if a child of a complex type can be replaced by elements
+    that extend its type (substitution groups). This is the case for
+    references to elements that have a named type, like "transaction"
+    of "transactionType".
+    """
+    def isSubstitutionHead(self,childName,child):
+        if child.type not in self.complexTypes.keys() or childName == child.type:
+            return False
+
+        return childName in self.complexTypes.keys() and self.complexTypes[childName].type == child.type
+
+    """
+    Returns the names of the complex types that extend a type,
+    directly or through other types.
+    """
+    def getDerivedTypes(self,type):
+        derivedTypes = []
+        typesToCheck = [type]
+        while len(typesToCheck) > 0:
+            baseType = typesToCheck.pop()
+            for typeName in self.complexTypes.keys():
+                if self.complexTypes[typeName].type == baseType and typeName not in derivedTypes:
+                    derivedTypes.append(typeName)
+                    typesToCheck.append(typeName)
+
+        return derivedTypes
+
     """
-    def addSimpleType(self,simpleType,version):
+    Returns the names of the enums, simple types, and complex types that
+    can be reached from the root types through the bases, the types of
+    the children in any version, and the substitution groups.
+    """
+    def getReachableTypes(self,rootNames):
+        # Store the types that extend each type.
+        derivedTypes = {}
+        for typeName in self.complexTypes.keys():
+            baseName = self.complexTypes[typeName].type
+            if baseName is not None:
+                if baseName not in derivedTypes.keys():
+                    derivedTypes[baseName] = []
+                derivedTypes[baseName].append(typeName)
+
+        # Add the types that can be reached.
+        # The derived types of each type of a substitution group are only added once.
+        reachableTypes = set()
+        substitutedTypes = set()
+        typesToCheck = []
+        for rootName in rootNames:
+            if rootName not in self.complexTypes.keys() and rootName not in self.simpleTypes.keys() and rootName not in self.enums.keys():
+                raise ValueError("Unknown root type " + str(rootName))
+            typesToCheck.append(rootName)
+        while len(typesToCheck) > 0:
+            typeName = typesToCheck.pop()
+            if typeName is None or typeName in reachableTypes:
+                continue
+            if typeName in self.enums.keys():
+                reachableTypes.add(typeName)
+                typesToCheck.append(self.enums[typeName].type)
+            elif typeName in self.simpleTypes.keys():
+                reachableTypes.add(typeName)
+                typesToCheck.append(self.simpleTypes[typeName].type)
+            elif typeName in self.complexTypes.keys():
+                reachableTypes.add(typeName)
+                complexType = self.complexTypes[typeName]
+                typesToCheck.append(complexType.type)
+                for childName in complexType.childItems.keys():
+                    child = complexType.childItems[childName]
+                    typesToCheck.append(child.type)
+                    if child.typeVersions is not None:
+                        typesToCheck.extend(name.name for name in child.typeVersions.names)
+
+                    # Add the elements that can be substituted for the child.
+                    if self.isSubstitutionHead(childName,child) and child.type not in substitutedTypes:
+                        substitutedTypes.add(child.type)
+                        derivedTypesToCheck = [child.type]
+                        checkedDerivedTypes = set(derivedTypesToCheck)
+                        while len(derivedTypesToCheck) > 0:
+                            for derivedType in derivedTypes.get(derivedTypesToCheck.pop(),[]):
+                                if derivedType not in checkedDerivedTypes:
+                                    checkedDerivedTypes.add(derivedType)
+                                    typesToCheck.append(derivedType)
+                                    derivedTypesToCheck.append(derivedType)
+
+        # Return the types.
+        return reachableTypes
+
+    """
+    Returns a copy of the versioned XSD with only the types that can be
+    reached from the root types. The items are shared with this XSD.
+    """
+    def createPrunedXSD(self,rootNames):
+        reachableTypes = self.getReachableTypes(rootNames)
+        prunedXSD = VersionedXSD()
+        prunedXSD.versions = self.versions
+        prunedXSD.versionIndexes = self.versionIndexes
+        for name in self.enums.keys():
+            if name in reachableTypes:
+                prunedXSD.enums[name] = self.enums[name]
+        for name in self.simpleTypes.keys():
+            if name in reachableTypes:
+                prunedXSD.simpleTypes[name] = self.simpleTypes[name]
+        for name in self.complexTypes.keys():
+            if name in reachableTypes:
+                prunedXSD.complexTypes[name] = self.complexTypes[name]
+
+        return prunedXSD
+
+    """
+    Returns a read-only view of the types, children, and enum values
+    that exist in a version. The views are shared and only created
+    for the items that are accessed, so the model isn't copied.
+    """
+    def at(self,version):
+        if version not in self.versionIndexes.keys():
+            raise ValueError("Unknown version " + str(version))
+        if version not in self.versionViews.keys():
+            self.versionViews[version] = VersionedXSDView(self,version)
+
+        return self.versionViews[version]
+
+    """
+    Returns the versioned items as the kind, type name, child name, and item.
+    """
+    def getVersionedItems(self):
+        items = []
+        for typeName in self.complexTypes.keys():
+            complexType = self.complexTypes[typeName]
+            items.append(("complexType",typeName,None,complexType))
+            for childName in complexType.childItems.keys():
+                items.append(("child",typeName,childName,complexType.childItems[childName]))
+        for enumName in self.enums.keys():
+            enum = self.enums[enumName]
+            items.append(("enum",enumName,None,enum))
+            for value in enum.childItems.keys():
+                items.append(("enumValue",enumName,value,enum.childItems[value]))
+        for typeName in self.simpleTypes.keys():
+            items.append(("simpleType",typeName,None,self.simpleTypes[typeName]))
+
+        return items
+
+    """
+    Returns the fingerprints of the enums, simple types, and complex types
+    as a dictionary of the category and name to the fingerprint.
+    """
+    def getFingerprints(self):
+        fingerprints = {}
+        for category,items in (("enum",self.enums),("simpleType",self.simpleTypes),("complexType",self.complexTypes)):
+            for name in items.keys():
+                fingerprints[(category,name)] = items[name].getFingerprint()
+
+        return fingerprints
+
+    """
+    Returns the categories and names of the items that were added, changed,
+    or removed since the fingerprints were stored with getFingerprints.
+    """
+    def getChangedItems(self,previousFingerprints,fingerprints=None):
+        if fingerprints is None:
+            fingerprints = self.getFingerprints()
+
+        # Add the changed and removed items.
+        changedItems = set()
+        for key in fingerprints.keys():
+            if previousFingerprints.get(key) != fingerprints[key]:
+                changedItems.add(key)
+        for key in previousFingerprints.keys():
+            if key not in fingerprints.keys():
+                changedItems.add(key)
+
+        return changedItems
+
+    """
+    Adds the changes of an item between two version indexes.
+    Children that change between elements and attributes are
+    removed as one kind and added as the other.
+    """
+    def addItemChanges(self,changes,kind,typeName,childName,item,fromIndex,toIndex):
+        fromName = item.getNameForVersion(fromIndex,self.versionIndexes)
+        toName = item.getNameForVersion(toIndex,self.versionIndexes)
+        if fromName is None and toName is None:
+            return
+        fromVersion = self.versions[fromIndex]
+        toVersion = self.versions[toIndex]
+
+        # Determine the kinds of the children.
+        fromKind = kind
+        toKind = kind
+        if kind == "child":
+            fromKind = (fromName.type or "Element").lower() if fromName is not None else None
+            toKind = (toName.type or "Element").lower() if toName is not None else None
+
+        # Add the changes.
+        if toName is None:
+            changes.append(VersionChange(fromVersion,toVersion,fromKind,typeName,childName,"removed",fromName.name))
+        elif fromName is None or fromKind != toKind:
+            if fromName is not None:
+                changes.append(VersionChange(fromVersion,toVersion,fromKind,typeName,childName,"removed",fromName.name))
+            changes.append(VersionChange(fromVersion,toVersion,toKind,typeName,childName,"added",None,toName.name))
+        else:
+            if fromName.name != toName.name:
+                changes.append(VersionChange(fromVersion,toVersion,toKind,typeName,childName,"renamed",fromName.name,toName.name))
+            fromType = item.getTypeForVersion(fromIndex,self.versionIndexes)
+            toType = item.getTypeForVersion(toIndex,self.versionIndexes)
+            if fromType != toType:
+                changes.append(VersionChange(fromVersion,toVersion,toKind,typeName,childName,"retyped",fromType,toType))
+
+    """
+    Returns the changes between two versions.
+    """
+    def getChanges(self,fromVersion,toVersion):
+        for version in [fromVersion,toVersion]:
+            if version not in self.versionIndexes.keys():
+                raise ValueError("Unknown version " + str(version))
+
+        # Compare the items.
+        changes = []
+        fromIndex = self.versionIndexes[fromVersion]
+        toIndex = self.versionIndexes[toVersion]
+        for kind,typeName,childName,item in self.getVersionedItems():
+            self.addItemChanges(changes,kind,typeName,childName,item,fromIndex,toIndex)
+
+        return changes
+
+    """
+    Returns the changes between each version and the previous
+    version as a list of versions and changes. Items are only
+    compared at the versions where their names or types start
+    or end, so the time is linear in the size of the model.
+    """
+    def getChangelog(self):
+        changesByVersion = [[] for version in self.versions]
+        for kind,typeName,childName,item in self.getVersionedItems():
+            ranges = list(item.names)
+            if item.typeVersions is not None:
+                ranges += item.typeVersions.names
+
+            # Find the versions where the item may change.
+            boundaries = set()
+            for versionRange in ranges:
+                startIndex = self.versionIndexes[versionRange.start]
+                endIndex = self.versionIndexes[versionRange.end]
+                if startIndex > 0:
+                    boundaries.add(startIndex)
+                if endIndex + 1 < len(self.versions):
+                    boundaries.add(endIndex + 1)
+
+            # Compare the item at the boundaries.
+            for versionIndex in boundaries:
+                self.addItemChanges(changesByVersion[versionIndex],kind,typeName,childName,item,versionIndex - 1,versionIndex)
+
+        # Return the changes.
+        return [(self.versions[i],changesByVersion[i]) for i in range(1,len(self.versions))]
+
+    """
+    Adds a simple type. The names are stored with the renames
+    if they are given.
+    """
+    def addSimpleType(self,simpleType,version,renames=None):
+        if renames is None:
+            renames = RenameMap()
+        storeName = renames.getTypeName(simpleType.name)
         if simpleType.isEnum():
             # Add the item if it doesn't exist.
-            if simpleType.name not in self.enums.keys():
-                self.enums[simpleType.name] = VersionedComposite(transformName(simpleType.base))
+            if storeName not in self.enums.keys():
+                self.enums[storeName] = VersionedComposite(renames.getTypeName(simpleType.base))
 
             # Add the name.
-            item = self.enums[simpleType.name]
+            item = self.enums[storeName]
+            item.addTypeForVersion(renames.getTypeName(simpleType.base),version)
             item.addNameForVersion(simpleType.name,version)
 
             # Add the enums.
             for enum in simpleType.enums:
-                item.addChildNameForVersion(enum,enum,transformName(simpleType.base),version)
+                item.addChildNameForVersion(renames.getEnumValue(storeName,enum),enum,renames.getTypeName(simpleType.base),version)
         else:
             # Add the item if it doesn't exist.
-            if simpleType.name not in self.simpleTypes.keys():
-                self.simpleTypes[simpleType.name] = VersionedItem(transformName(simpleType.base))
+            if storeName not in self.simpleTypes.keys():
+                self.simpleTypes[storeName] = VersionedItem(renames.getTypeName(simpleType.base))
 
             # Add the name.
-            self.simpleTypes[simpleType.name].addNameForVersion(simpleType.name,version)
+            self.simpleTypes[storeName].addTypeForVersion(renames.getTypeName(simpleType.base),version)
+            self.simpleTypes[storeName].addNameForVersion(simpleType.name,version)
 
     """
-    Adds a complex type.
+    Adds a complex type. The names are stored with the renames
+    if they are given, and with the kind if it is given, like
+    Element or AbstractElement for the complex types that are
+    declared as elements.
     """
-    def addComplexType(self,complexType,version):
-        storeName = transformName(complexType.name)
+    def addComplexType(self,complexType,version,renames=None,kind=None):
+        if renames is None:
+            renames = RenameMap()
+        storeName = renames.getTypeName(complexType.name)
 
         # Add the item if it doesn't exist.
         if storeName not in self.complexTypes.keys():
-            self.complexTypes[storeName] = VersionedComposite(transformName(complexType.base))
+            self.complexTypes[storeName] = VersionedComposite(renames.getTypeName(complexType.base))
 
         # Add the name.
         item = self.complexTypes[storeName]
+        item.addTypeForVersion(renames.getTypeName(complexType.base),version)
         item.addNameForVersion(complexType.name,version)
+        if kind is not None:
+            # Set the kind if the type of the element was added first.
+            item.nameRefs[version].type = kind
+        item.addSubstitutionGroupForVersion(renames.getTypeName(complexType.substitutionGroup),version)
 
         # Add the enums.
-        for child in complexType.childItems:
+        # The elements are stored with their positions in the complex type.
+        for position,child in enumerate(complexType.childItems):
+            childName = renames.getChildName(storeName,child.name)
             if isinstance(child,XSDData.XSDChildElement):
-                item.addChildNameForVersion(child.name,child.name,transformName(child.type),version,"Element",child.default,child.minOccurrences,child.maxOccurrences)
+                item.addChildNameForVersion(childName,child.name,renames.getTypeName(child.type),version,"Element",child.default,child.minOccurrences,child.maxOccurrences,child.restrictions,child.choices,position,child.declarations)
             else:
-                item.addChildNameForVersion(child.name,child.name,transformName(child.type),version,"Attribute",child.default)
+                item.addChildNameForVersion(childName,child.name,renames.getTypeName(child.type),version,"Attribute",child.default,1 if child.required else 0,1,child.restrictions,declarations=child.declarations)
 
     """
-    Populates the object from an XSD object.
+    Populates the object from an XSD object. The names are
+    stored with the renames if they are given.
     """
-    def populateFromXSD(self,xsd,version):
+    def populateFromXSD(self,xsd,version,renames=None):
         # Add the types.
         for type in xsd.types:
             if isinstance(type,XSDData.XSDSimpleType):
-                self.addSimpleType(type,version)
+                self.addSimpleType(type,version,renames)
             else:
-                self.addComplexType(type,version)
+                self.addComplexType(type,version,renames)
 
         # Add the elements.
         for element in xsd.elements:
-            self.addComplexType(element,version)
+            self.addComplexType(element,version,renames,"AbstractElement" if element.abstract else "Element")
 
     """
     Merges the names together.
     Assumes the versions are in order.
     """
     def mergeNameVersions(self,versions):
+        # Store the versions for the views.
+        self.versions = list(versions)
+        self.versionIndexes = {}
+        for i in range(0,len(versions)):
+            self.versionIndexes[versions[i]] = i
+        self.versionViews = {}
+
         # Remove the duplicate children of the complex types. Simple types, enums, and elements don't have this problem.
         for complexType in self.complexTypes.values():
             for childName in list(complexType.childItems.keys()):
@@ -266,18 +1044,68 @@ class VersionedXSD:
                 if parentWithChildName is not None:
                     parent = self.complexTypes[parentWithChildName]
                     for name in child.names:
-                        parent.addChildNameForVersion(childName,name.name,child.type,name.start,name.type,child.default)
+                        type = getAddedValue(child.typeVersions,name.start,child.type)
+                        facets = dict(getAddedValue(child.facetVersions,name.start,()))
+                        choices = getAddedValue(child.choiceVersions,name.start)
+                        position = getAddedValue(child.positionVersions,name.start)
+                        declarations = getAddedValue(child.declarationVersions,name.start)
+                        minOccurences = getAddedValue(child.minOccurenceVersions,name.start,child.minOccurences)
+                        parent.addChildNameForVersion(childName,name.name,type,name.start,name.type,child.default,minOccurences,child.maxOccurences,facets,choices,position,declarations)
 
                     del complexType.childItems[childName]
+                    complexType.redeclaredChildItems[childName] = child
 
         # Merge the simple types.
         for simpleType in self.simpleTypes.values():
-            simpleType.mergeNameVersions(versions)
+            simpleType.mergeNameVersions(versions,self.versionIndexes)
 
         # Merge the enums.
         for enum in self.enums.values():
-            enum.mergeNameVersions(versions)
+            enum.mergeNameVersions(versions,self.versionIndexes)
 
         # Merge the complex types.
         for complexType in self.complexTypes.values():
-            complexType.mergeNameVersions(versions)
\ No newline at end of file
+            complexType.mergeNameVersions(versions,self.versionIndexes)
+
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+    from Parser.XSDParser import XSDLoader, XSDRenameDetector
+
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Prints the changes between schema versions.")
+    parser.add_argument("--from",dest="fromVersion",help="Version to compare from. The changelog of all of the versions is printed if not given.")
+    parser.add_argument("--to",dest="toVersion",help="Version to compare to. Defaults to the newest version.")
+    parser.add_argument("--xsd",default=XSDLoader.XSD_DIRECTORY,help="Directory of the XSD files.")
+    parser.add_argument("--suggest-renames",action="store_true",help="Print the types, children, and enum values that were likely renamed instead of the changes.")
+    parser.add_argument("--rename-threshold",type=float,help="Merge the renames with a similarity of at least this (0 to 1) before comparing the versions.")
+    arguments = parser.parse_args()
+
+    # Load the schema.
+    renameDetector = None
+    if arguments.suggest_renames or arguments.rename_threshold is not None:
+        renameDetector = XSDRenameDetector.RenameDetector(applyThreshold=arguments.rename_threshold)
+    versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.xsd,False,None,renameDetector)
+
+    # Print the renames.
+    if arguments.suggest_renames:
+        for suggestion in sorted(renameDetector.suggestions,key=lambda suggestion: (versions.index(suggestion.toVersion),suggestion.kind,str(suggestion.typeName),suggestion.oldName)):
+            print(suggestion.getDescription())
+        sys.exit(0)
+
+    # Get the changes.
+    startTime = time.perf_counter()
+    if arguments.fromVersion is not None:
+        changelog = [(arguments.toVersion or versions[len(versions) - 1],versionedXSD.getChanges(arguments.fromVersion,arguments.toVersion or versions[len(versions) - 1]))]
+    else:
+        changelog = versionedXSD.getChangelog()
+    duration = time.perf_counter() - startTime
+
+    # Print the changes.
+    for version,changes in changelog:
+        print(version + " (" + str(len(changes)) + " changes)")
+        for change in changes:
+            print("\t" + change.getDescription())
+    print("Found " + str(sum(len(changes) for version,changes in changelog)) + " changes in " + str(round(duration,3)) + "s",file=sys.stderr)
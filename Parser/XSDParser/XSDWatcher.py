@@ -0,0 +1,167 @@
+"""
+Zachary Cook
+
+Watches a directory of XSD versions and regenerates the field files when they change.
+"""
+
+from Parser.XSDParser import XSDLoader, XSDParser, XSDRenameDetector, XSDVersionDiffer
+from functools import cmp_to_key
+import os
+import time
+import traceback
+
+POLL_INTERVAL = 0.25
+
+
+
+"""
+Class representing a watcher of a directory of XSDs. The parsed
+XSDs are kept in memory, so only the files that change are parsed
+again before the versions are merged and the files are written.
+"""
+class XSDWatcher:
+    """
+    Creates a watcher.
+    """
+    def __init__(self,directory,writerClasses,outputDirectory,rootNames=None,renameThreshold=None):
+        self.directory = directory
+        self.writerClasses = writerClasses
+        self.outputDirectory = outputDirectory
+        self.rootNames = rootNames
+        self.renameThreshold = renameThreshold
+        self.fileStates = {}
+        self.parsedXSDs = {}
+        self.writtenContents = {}
+        self.fragmentCaches = {}
+        self.versionedXSD = None
+        self.versions = []
+        self.fingerprints = {}
+
+    """
+    Returns the state of a file used to detect changes.
+    """
+    def getFileState(self,fileName):
+        fileStat = os.stat(os.path.join(self.directory,fileName))
+        return fileStat.st_mtime_ns,fileStat.st_size
+
+    """
+    Returns the files that were changed or added and the files that were removed.
+    """
+    def getChangedFiles(self):
+        fileNames = XSDLoader.getSortedFileNames(self.directory)
+        changedFileNames = []
+        for fileName in fileNames:
+            try:
+                if self.fileStates.get(fileName) != self.getFileState(fileName):
+                    changedFileNames.append(fileName)
+            except FileNotFoundError:
+                pass
+        removedFileNames = [fileName for fileName in self.parsedXSDs.keys() if fileName not in fileNames]
+
+        return changedFileNames,removedFileNames
+
+    """
+    Parses the changed files. Files that can't be parsed keep the
+    last parsed XSD and are parsed again when they change.
+    Returns the files that were parsed.
+    """
+    def parseFiles(self,fileNames):
+        parsedFileNames = []
+        for fileName in fileNames:
+            try:
+                self.fileStates[fileName] = self.getFileState(fileName)
+                with open(os.path.join(self.directory,fileName),"rb") as file:
+                    contents = XSDLoader.decompressContents(fileName,file.read())
+                self.parsedXSDs[fileName] = XSDParser.createFromString(contents,None,fileName)
+                parsedFileNames.append(fileName)
+            except Exception:
+                print("Unable to parse " + fileName + ":\n" + traceback.format_exc())
+
+        return parsedFileNames
+
+    """
+    Merges the parsed XSDs into the versioned XSD. Only the types that
+    can be reached from the root types are kept if there are root types,
+    and the detected renames are merged if there is a rename threshold.
+    Throws a ValueError if a root type doesn't exist, in which case the
+    last merged XSD is kept.
+    """
+    def mergeXSDs(self):
+        fileNames = sorted(self.parsedXSDs.keys(),key=cmp_to_key(XSDVersionDiffer.compareVersionNames))
+        versions = [XSDLoader.getVersionString(fileName) for fileName in fileNames]
+        renameDetector = XSDRenameDetector.RenameDetector(applyThreshold=self.renameThreshold) if self.renameThreshold is not None else None
+        versionedXSD = XSDLoader.mergeXSDs([self.parsedXSDs[fileName] for fileName in fileNames],versions,False,renameDetector)
+        if self.rootNames is not None:
+            versionedXSD = versionedXSD.createPrunedXSD(self.rootNames)
+        self.versions = versions
+        self.versionedXSD = versionedXSD
+
+    """
+    Writes the files of the writers. Files with the same contents
+    as the last write aren't written again. The fragment cache of each
+    writer is given to the next writer of the class, so only the
+    fragments of the changed items are created again.
+    Returns the display names of the writers that wrote files.
+    """
+    def writeFiles(self):
+        writtenDisplayNames = []
+        for writerClass in self.writerClasses:
+            writer = writerClass(self.versionedXSD,self.versions,self.outputDirectory)
+            writer.fragmentCache = self.fragmentCaches.get(writerClass)
+            try:
+                contents = writer.getContents()
+                self.fragmentCaches[writerClass] = writer.fragmentCache
+                if self.writtenContents.get(writerClass) != contents:
+                    writer.writeContents(contents)
+                    self.writtenContents[writerClass] = contents
+                    writtenDisplayNames.append(writer.getDisplayName())
+            except Exception:
+                print("Failed to write XML fields for " + writer.getDisplayName() + ":\n" + traceback.format_exc())
+
+        return writtenDisplayNames
+
+    """
+    Checks for changes and regenerates the files if there are any.
+    Returns if the files were regenerated.
+    """
+    def update(self):
+        changedFileNames,removedFileNames = self.getChangedFiles()
+        if len(changedFileNames) == 0 and len(removedFileNames) == 0:
+            return False
+        startTime = time.perf_counter()
+
+        # Parse the changed files and remove the removed files.
+        for fileName in removedFileNames:
+            self.parsedXSDs.pop(fileName)
+            self.fileStates.pop(fileName)
+        parsedFileNames = self.parseFiles(changedFileNames)
+        if len(parsedFileNames) == 0 and len(removedFileNames) == 0:
+            return False
+
+        # Merge the versions and write the files if any items changed.
+        previousVersions = self.versions
+        try:
+            self.mergeXSDs()
+        except ValueError as error:
+            print("Unable to merge the XSDs: " + str(error))
+            return False
+        fingerprints = self.versionedXSD.getFingerprints()
+        changedItems = self.versionedXSD.getChangedItems(self.fingerprints,fingerprints)
+        self.fingerprints = fingerprints
+        writtenDisplayNames = []
+        if len(changedItems) > 0 or self.versions != previousVersions:
+            writtenDisplayNames = self.writeFiles()
+        print("Parsed " + str(len(parsedFileNames)) + " files, removed " + str(len(removedFileNames)) + " files, changed " + str(len(changedItems)) + " items, and wrote " + (", ".join(writtenDisplayNames) if len(writtenDisplayNames) > 0 else "no files") + " in " + str(round(time.perf_counter() - startTime,3)) + "s")
+        return True
+
+    """
+    Watches the directory until interrupted.
+    """
+    def run(self,interval=POLL_INTERVAL):
+        print("Watching " + self.directory + " for changes")
+        try:
+            while True:
+                self.update()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
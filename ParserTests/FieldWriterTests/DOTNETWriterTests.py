@@ -0,0 +1,79 @@
+"""
+Zachary Cook
+
+Tests the .NET writer.
+"""
+
+import unittest
+from Parser.FieldWriter import DOTNETWriter
+from Parser.XSDParser import XSDData
+from ParserTests import TestSchemas
+
+
+
+class DOTNETWriterTests(unittest.TestCase):
+    """
+    Tests creating the enum conversions.
+    """
+    def testCreateEnumConversions(self):
+        # Create a versioned XSD with an enum.
+        simpleType = XSDData.XSDSimpleType("testEnum","string")
+        simpleType.addEnumeration("AUD")
+        simpleType.addEnumeration("self service")
+        simpleType.addEnumeration("1A")
+        versionedXSD = TestSchemas.createVersionedXSD([("8.0",[simpleType])])
+
+        # Create the conversions and assert they are correct.
+        writer = DOTNETWriter.DOTNETWriter(versionedXSD,["8.0"],"output/")
+        conversions = writer.createEnumConversions()
+        self.assertIn("private static readonly string[] testEnumValues = new string[]\n\t\t{\n\t\t\t\"AUD\",\n\t\t\t\"self service\",\n\t\t\t\"1A\",\n\t\t};",conversions)
+        self.assertIn("public static string ToXMLString(this testEnum value)",conversions)
+        self.assertIn("public static bool TryParse(string value,out testEnum result)",conversions)
+        self.assertIn("case \"AUD\":\n\t\t\t\t\tresult = testEnum.AUD;",conversions)
+        self.assertIn("case \"self service\":\n\t\t\t\t\tresult = testEnum.selfservice;",conversions)
+        self.assertIn("case \"1A\":\n\t\t\t\t\tresult = testEnum.item1A;",conversions)
+
+    """
+    Tests only the changed items are created again.
+    """
+    def testGetContentsFragments(self):
+        # Create a versioned XSD with an enum and 2 types.
+        simpleType = XSDData.XSDSimpleType("testEnum","string")
+        simpleType.addEnumeration("AUD")
+        complexType1 = XSDData.XSDComplexType("testType1",None)
+        complexType1.childItems = [XSDData.XSDChildElement("currency","testEnum")]
+        complexType2 = XSDData.XSDComplexType("testType2",None)
+        complexType2.childItems = [XSDData.XSDChildElement("amount","integer")]
+        versionedXSD = TestSchemas.createVersionedXSD([("8.0",[simpleType,complexType1,complexType2])])
+
+        # Generate the file and assert all of the fragments are reused the second time.
+        writer = DOTNETWriter.DOTNETWriter(versionedXSD,["8.0"],"output/")
+        contents = writer.getContents()
+        fragmentCache = writer.fragmentCache
+        self.assertEqual(fragmentCache.createdCount,4)
+        self.assertEqual(writer.getContents(),contents)
+        self.assertEqual(fragmentCache.createdCount,0)
+        self.assertEqual(fragmentCache.reusedCount,4)
+
+        # Change a type and assert only the type is created again by a writer given the cache.
+        versionedXSD.complexTypes["testType2"].childItems["amount"].default = "5"
+        writer = DOTNETWriter.DOTNETWriter(versionedXSD,["8.0"],"output/")
+        writer.fragmentCache = fragmentCache
+        contents = writer.getContents()
+        self.assertEqual(writer.changedItems,{("complexType","testType2")})
+        self.assertEqual(fragmentCache.createdCount,1)
+        self.assertIn("public int? amount { get; set; } = 5;",contents)
+
+        # Assert new writers don't share the cache and create the same file without it.
+        writer = DOTNETWriter.DOTNETWriter(versionedXSD,["8.0"],"output/")
+        self.assertEqual(writer.getContents(),contents)
+        self.assertIsNot(writer.fragmentCache,fragmentCache)
+        self.assertEqual(writer.fragmentCache.createdCount,4)
+
+    """
+    Tests escaping strings.
+    """
+    def testEscapeString(self):
+        self.assertEqual(DOTNETWriter.escapeString("test"),"test")
+        self.assertEqual(DOTNETWriter.escapeString("te\"st"),"te\\\"st")
+        self.assertEqual(DOTNETWriter.escapeString("te\\st"),"te\\\\st")
@@ -0,0 +1,61 @@
+"""
+Zachary Cook
+
+Tests the compiled templates.
+"""
+
+import unittest
+from Parser.FieldWriter import FieldTemplate
+
+
+
+class FieldTemplateTests(unittest.TestCase):
+    """
+    Tests the tokenize method.
+    """
+    def testTokenize(self):
+        self.assertEqual(FieldTemplate.tokenize("a{{b}}c"),["a","{{b}}","c"])
+        self.assertEqual(FieldTemplate.tokenize("a\n  {% if b %}\nc\n{% end %}\n"),["a\n","{% if b %}","c\n","{% end %}"])
+        self.assertEqual(FieldTemplate.tokenize("a {% if b %}c{% end %}\n"),["a ","{% if b %}","c","{% end %}","\n"])
+
+    """
+    Tests rendering expressions and control tags.
+    """
+    def testRender(self):
+        template = FieldTemplate.Template("{{name}}:\n" \
+            "{% for value in values %}\n" \
+            "{% set doubled = value * 2 %}\n" \
+            "\t{{doubled}}{% if value == 1 %} one{% elif value == 2 %} two{% else %} many{% end %}\n" \
+            "{% end %}\n",
+            ["name","values"])
+        self.assertEqual(template.render("test",[1,2,3]),"test:\n\t2 one\n\t4 two\n\t6 many\n")
+        self.assertEqual(template.render("test",[]),"test:\n")
+
+    """
+    Tests rendering other templates and names of the namespace.
+    """
+    def testRenderTemplate(self):
+        namespace = {"PREFIX": "item "}
+        namespace["ITEM_TEMPLATE"] = FieldTemplate.Template("{{PREFIX}}{{value}};",["value"],namespace)
+        template = FieldTemplate.Template("[{% for value in values %}{% render ITEM_TEMPLATE(value) %}{% end %}]",["values"],namespace)
+        self.assertEqual(template.render(["a","b"]),"[item a;item b;]")
+
+        # Assert the template can be streamed.
+        parts = []
+        template.stream(parts.append,["a"])
+        self.assertEqual("".join(parts),"[item a;]")
+
+    """
+    Tests invalid templates.
+    """
+    def testInvalidTemplates(self):
+        self.assertRaises(ValueError,FieldTemplate.Template,"{% if a %}")
+        self.assertRaises(ValueError,FieldTemplate.Template,"{% end %}")
+        self.assertRaises(ValueError,FieldTemplate.Template,"{% else %}")
+        self.assertRaises(ValueError,FieldTemplate.Template,"{% unknown %}")
+        self.assertRaises(ValueError,FieldTemplate.Template,"{% render a %}")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Zachary Cook
+
+Tests writing the field files for multiple languages.
+"""
+
+import os
+import tempfile
+import unittest
+from Parser.FieldWriter import FieldWriter, LanguageFieldWriter
+from Parser.XSDParser import XSDVersionDiffer
+
+
+
+"""
+Writer that writes a fixed file.
+"""
+class ExampleWriter(FieldWriter.FieldWriter):
+    def getDisplayName(self):
+        return "Test"
+
+    def getFileName(self):
+        return "Test.txt"
+
+    def getContents(self):
+        return "Test contents"
+
+"""
+Writer that fails to get the contents.
+"""
+class FailingExampleWriter(ExampleWriter):
+    def getDisplayName(self):
+        return "Failing Test"
+
+    def getContents(self):
+        raise ValueError("Test failure")
+
+
+
+class LanguageFieldWriterTests(unittest.TestCase):
+    """
+    Tests writing the field files concurrently.
+    """
+    def testWriteFieldFiles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            outputDirectory = os.path.join(directory,"output") + "/"
+            results = LanguageFieldWriter.writeFieldFiles(XSDVersionDiffer.VersionedXSD(),["8.0"],[ExampleWriter,FailingExampleWriter],outputDirectory)
+
+            # Assert the results are reported separately.
+            self.assertEqual(len(results),2)
+            self.assertEqual(results[0].displayName,"Test")
+            self.assertTrue(results[0].succeeded())
+            self.assertEqual(results[1].displayName,"Failing Test")
+            self.assertFalse(results[1].succeeded())
+            self.assertIn("Test failure",results[1].error)
+
+            # Assert the file was written.
+            with open(outputDirectory + "Test.txt") as file:
+                self.assertEqual(file.read(),"Test contents")
+
+    """
+    Tests writing the field files without a pool.
+    """
+    def testWriteFieldFilesSingleWorker(self):
+        with tempfile.TemporaryDirectory() as directory:
+            outputDirectory = os.path.join(directory,"output","nested") + "/"
+            results = LanguageFieldWriter.writeFieldFiles(XSDVersionDiffer.VersionedXSD(),["8.0"],[ExampleWriter,FailingExampleWriter],outputDirectory,maxWorkers=1)
+            self.assertTrue(results[0].succeeded())
+            self.assertFalse(results[1].succeeded())
+
+            # Assert the existing output directory is written to again.
+            results = LanguageFieldWriter.writeFieldFiles(XSDVersionDiffer.VersionedXSD(),["8.0"],[ExampleWriter],outputDirectory)
+            self.assertTrue(results[0].succeeded())
+
+    """
+    Tests getting the root types of the root type sets.
+    """
+    def testGetRootTypeNames(self):
+        self.assertEqual(LanguageFieldWriter.getRootTypeNames(["online","cnpOnlineRequest","authorization"]),["cnpOnlineRequest","cnpOnlineResponse","authorization"])
+        self.assertRaises(ValueError,LanguageFieldWriter.writeFieldFiles,XSDVersionDiffer.VersionedXSD(),["8.0"],[ExampleWriter],rootNames=["online"])
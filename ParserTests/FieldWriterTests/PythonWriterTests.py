@@ -0,0 +1,119 @@
+"""
+Zachary Cook
+
+Tests the Python writer.
+"""
+
+import types
+import unittest
+from Parser.FieldWriter import PythonWriter
+from Parser.XSDParser import XSDData
+from ParserTests import TestSchemas
+
+
+
+"""
+Creates a versioned XSD and loads the generated Python module.
+"""
+def createModule():
+    # Create the complex types.
+    authentication = XSDData.XSDComplexType("authentication",None)
+    authentication.childItems = [XSDData.XSDChildElement("user","string"),XSDData.XSDChildElement("password","string")]
+    transactionType = XSDData.XSDComplexType("transactionType",None)
+    transactionType.childItems = [XSDData.XSDAttribute("id","string")]
+    transaction = XSDData.XSDComplexType("transaction","transactionType")
+    oldAuthorization = XSDData.XSDComplexType("authorization","transactionType")
+    oldAuthorization.childItems = [XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("allowPartialAuth","boolean")]
+    newAuthorization = XSDData.XSDComplexType("authorization","transactionType")
+    newAuthorization.childItems = [XSDData.XSDChildElement("orderId","string"),XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("allowPartialAuth","boolean"),XSDData.XSDChildElement("newField","string")]
+    oldRequest = XSDData.XSDComplexType("litleOnlineRequest",None)
+    oldRequest.childItems = [XSDData.XSDChildElement("authentication","authentication"),XSDData.XSDChildElement("transaction","transactionType",maxOccurrences=5),XSDData.XSDAttribute("merchantId","string")]
+    newRequest = XSDData.XSDComplexType("cnpOnlineRequest",None)
+    newRequest.childItems = oldRequest.childItems
+
+    # Generate and load the module.
+    xsd = TestSchemas.createVersionedXSD([("12.0",[newRequest,authentication,transactionType,transaction,newAuthorization]),("8.0",[oldRequest,authentication,transactionType,transaction,oldAuthorization])])
+    module = types.ModuleType("XmlFields")
+    exec(PythonWriter.PythonWriter(xsd,xsd.versions,"output/").getContents(),module.__dict__)
+    return module
+
+
+
+class PythonWriterTests(unittest.TestCase):
+    """
+    Tests serializing generated classes for different versions.
+    """
+    def testSerialize(self):
+        XmlFields = createModule()
+        request = XmlFields.cnpOnlineRequest(merchantId="1&2",authentication=XmlFields.authentication(user="user",password="<password>"),
+            transaction=[XmlFields.authorization(id="1",orderId="2",amount=100,allowPartialAuth=True,newField="3")])
+
+        # Assert the versions are serialized correctly.
+        self.assertEqual(XmlFields.serialize(request,"12.0"),"<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\" merchantId=\"1&amp;2\"><authentication><user>user</user><password>&lt;password&gt;</password></authentication>" \
+            "<authorization id=\"1\"><orderId>2</orderId><amount>100</amount><allowPartialAuth>true</allowPartialAuth><newField>3</newField></authorization></cnpOnlineRequest>")
+        self.assertEqual(XmlFields.serialize(request,"8.0"),"<litleOnlineRequest xmlns=\"http://www.litle.com/schema\" merchantId=\"1&amp;2\"><authentication><user>user</user><password>&lt;password&gt;</password></authentication>" \
+            "<authorization id=\"1\"><amount>100</amount><allowPartialAuth>true</allowPartialAuth></authorization></litleOnlineRequest>")
+
+    """
+    Tests parsing generated classes.
+    """
+    def testParse(self):
+        XmlFields = createModule()
+        request = XmlFields.parse("<litleOnlineRequest xmlns=\"http://www.litle.com/schema\" merchantId=\"1&amp;2\"><authentication><user>user</user></authentication>" \
+            "<authorization id=\"1\"><amount>100</amount><allowPartialAuth>1</allowPartialAuth></authorization><transaction id=\"2\"/></litleOnlineRequest>","8.0")
+
+        # Assert the objects are correct.
+        self.assertIsInstance(request,XmlFields.cnpOnlineRequest)
+        self.assertEqual(request.merchantId,"1&2")
+        self.assertEqual(request.authentication.user,"user")
+        self.assertEqual(request.authentication.password,None)
+        self.assertEqual(len(request.transaction),2)
+        self.assertIsInstance(request.transaction[0],XmlFields.authorization)
+        self.assertEqual(request.transaction[0].id,"1")
+        self.assertEqual(request.transaction[0].amount,100)
+        self.assertEqual(request.transaction[0].allowPartialAuth,True)
+        self.assertIsInstance(request.transaction[1],XmlFields.transactionType)
+        self.assertEqual(request.transaction[1].id,"2")
+
+        # Assert the fields use slots.
+        with self.assertRaises(AttributeError):
+            request.unknownField = "value"
+
+    """
+    Tests the per-version field tables.
+    """
+    def testGetFields(self):
+        XmlFields = createModule()
+        self.assertEqual(XmlFields.authorization.getFields("8.0"),[("id","Attribute","id"),("amount","Element","amount"),("allowPartialAuth","Element","allowPartialAuth")])
+        self.assertEqual(XmlFields.cnpOnlineRequest.getName("8.0"),"litleOnlineRequest")
+        self.assertEqual(XmlFields.cnpOnlineRequest.getName("12.0"),"cnpOnlineRequest")
+
+    """
+    Tests children that use a complex type with a different case than
+    the type is declared with.
+    """
+    def testChildTypeCase(self):
+        payPal = XSDData.XSDComplexType("paypal",None)
+        payPal.childItems = [XSDData.XSDChildElement("payerId","string")]
+        sale = XSDData.XSDComplexType("sale",None)
+        sale.childItems = [XSDData.XSDChildElement("paypal","payPal")]
+        xsd = TestSchemas.createVersionedXSD([("12.0",[sale,payPal])])
+        XmlFields = types.ModuleType("XmlFields")
+        exec(PythonWriter.PythonWriter(xsd,xsd.versions,"output/").getContents(),XmlFields.__dict__)
+
+        # Assert the child is serialized and parsed as the complex type.
+        sale = XmlFields.parse("<sale xmlns=\"http://www.vantivcnp.com/schema\"><paypal><payerId>1</payerId></paypal></sale>","12.0")
+        self.assertIsInstance(sale.paypal,XmlFields.paypal)
+        self.assertEqual(sale.paypal.payerId,"1")
+        self.assertEqual(XmlFields.serialize(sale,"12.0"),"<sale xmlns=\"http://www.vantivcnp.com/schema\"><paypal><payerId>1</payerId></paypal></sale>")
+
+    """
+    Tests fields that are attributes in some versions and elements in others.
+    """
+    def testMixedFieldKinds(self):
+        oldAuthorization = XSDData.XSDComplexType("authorization",None)
+        oldAuthorization.childItems = [XSDData.XSDAttribute("reportGroup","string")]
+        newAuthorization = XSDData.XSDComplexType("authorization",None)
+        newAuthorization.childItems = [XSDData.XSDChildElement("reportGroup","string")]
+        xsd = TestSchemas.createVersionedXSD([("12.0",[newAuthorization]),("8.0",[oldAuthorization])])
+        self.assertRaises(ValueError,PythonWriter.PythonWriter(xsd,xsd.versions,"output/").getContents)
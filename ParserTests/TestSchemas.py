@@ -0,0 +1,106 @@
+"""
+Zachary Cook
+
+Creates the versioned XSDs used by the tests, either from the types
+of each version or from the schemas in the XSD directory.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from Parser.XMLTools import CompiledVersion
+from Parser.XSDParser import XSDData, XSDLoader, XSDParser, XSDVersionDiffer
+
+XSD_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),"xsd")
+
+# Versioned XSDs of the schemas that were already loaded.
+loadedXSDs = {}
+
+
+
+"""
+Returns the version numbers of a version for sorting.
+"""
+def getVersionKey(version):
+    return [int(part) for part in version.split(".")]
+
+"""
+Creates a versioned XSD from the types of each version. The types
+are added in the order the versions are given, with the renames of
+the version if there are any, and the versions are merged in order.
+"""
+def createVersionedXSD(typesByVersion,renamesByVersion=None):
+    xsd = XSDVersionDiffer.VersionedXSD()
+    for version,types in typesByVersion:
+        renames = renamesByVersion.get(version) if renamesByVersion is not None else None
+        for type in types:
+            if isinstance(type,XSDData.XSDSimpleType):
+                xsd.addSimpleType(type,version,renames)
+            else:
+                xsd.addComplexType(type,version,renames)
+    xsd.mergeNameVersions(sorted(set(version for version,types in typesByVersion),key=getVersionKey))
+    return xsd
+
+"""
+Creates a compiled version from the types of each version.
+"""
+def createCompiledVersion(typesByVersion,version,renamesByVersion=None):
+    xsd = createVersionedXSD(typesByVersion,renamesByVersion)
+    return CompiledVersion.CompiledVersion(xsd,xsd.versions,version)
+
+"""
+Creates a compiled version from the text of an XSD.
+"""
+def createParsedCompiledVersion(xsdText,version="12.0"):
+    xsd = XSDVersionDiffer.VersionedXSD()
+    xsd.populateFromXSD(XSDParser.createFromString(xsdText),version)
+    xsd.mergeNameVersions([version])
+    return CompiledVersion.CompiledVersion(xsd,[version],version)
+
+"""
+Returns the file of the schema of a version in the XSD directory.
+"""
+def getSchemaFileName(version):
+    return os.path.join(XSD_DIRECTORY,"SchemaCombined_v" + version + ".xsd")
+
+"""
+Loads the versioned XSD of the schemas of the versions in the XSD
+directory. The versioned XSDs are reused by the tests.
+"""
+def loadVersionedXSD(versions):
+    versions = sorted(versions,key=getVersionKey)
+    key = tuple(versions)
+    if key not in loadedXSDs.keys():
+        baseXSDs = [XSDParser.createFromFile(getSchemaFileName(version)) for version in versions]
+        loadedXSDs[key] = XSDLoader.mergeXSDs(baseXSDs,versions,False)
+    return loadedXSDs[key]
+
+"""
+Loads the compiled version of a schema in the XSD directory.
+"""
+def loadCompiledVersion(version,versions=None):
+    if versions is None:
+        versions = [version]
+    xsd = loadVersionedXSD(versions)
+    return CompiledVersion.CompiledVersion(xsd,xsd.versions,version)
+
+"""
+Returns if xmllint can be used to check documents against the schemas.
+"""
+def hasSchemaChecker():
+    return shutil.which("xmllint") is not None
+
+"""
+Checks a document against a schema file with xmllint. Returns the
+errors, or an empty string if the document is valid.
+"""
+def checkDocument(document,schemaFileName):
+    with tempfile.TemporaryDirectory() as directory:
+        fileName = os.path.join(directory,"document.xml")
+        with open(fileName,"w",encoding="utf8") as file:
+            file.write(document)
+        result = subprocess.run(["xmllint","--noout","--schema",schemaFileName,fileName],capture_output=True,text=True)
+    if result.returncode == 0:
+        return ""
+    return result.stderr
@@ -0,0 +1,84 @@
+"""
+Zachary Cook
+
+Tests reading batch files.
+"""
+
+import io
+import unittest
+from Parser.XMLTools import BatchReader, BatchTotals
+from Parser.XSDParser import XSDData
+from ParserTests import TestSchemas
+
+
+
+"""
+Creates a compiled version with a batch request for testing.
+"""
+def createCompiledVersion():
+    # Create the types.
+    transactionType = XSDData.XSDComplexType("transactionType",None)
+    transactionType.childItems = [XSDData.XSDAttribute("id","string")]
+    transaction = XSDData.XSDComplexType("transaction","transactionType")
+    authorization = XSDData.XSDComplexType("authorization","transactionType")
+    authorization.childItems = [XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("allowPartialAuth","boolean")]
+    authReversal = XSDData.XSDComplexType("authReversal","transactionType")
+    authReversal.childItems = [XSDData.XSDChildElement("amount","integer")]
+    giftCardCapture = XSDData.XSDComplexType("giftCardCapture","transactionType")
+    giftCardCapture.childItems = [XSDData.XSDChildElement("captureAmount","integer"),XSDData.XSDChildElement("originalAmount","integer")]
+    batchRequest = XSDData.XSDComplexType("batchRequest",None)
+    batchRequest.childItems = [XSDData.XSDChildElement("transaction","transactionType",maxOccurrences=(2 ** 31) - 1),XSDData.XSDAttribute("id","string")]
+    for attributeName in ["numAuths","authAmount","numAuthReversals","authReversalAmount","numGiftCardCaptures","giftCardCaptureAmount","numExtCaptures"]:
+        batchRequest.childItems.append(XSDData.XSDAttribute(attributeName,"integer",default="0"))
+    request = XSDData.XSDComplexType("cnpRequest",None)
+    request.childItems = [XSDData.XSDChildElement("batchRequest","batchRequest",maxOccurrences=(2 ** 31) - 1),XSDData.XSDAttribute("numBatchRequests","integer")]
+
+    # Compile the types.
+    return TestSchemas.createCompiledVersion([("12.0",[request,batchRequest,transactionType,transaction,authorization,authReversal,giftCardCapture])],"12.0")
+
+
+
+class BatchReaderTests(unittest.TestCase):
+    """
+    Tests determining the batch totals.
+    """
+    def testGetBatchTotals(self):
+        totals = BatchTotals.getBatchTotals(createCompiledVersion())
+        self.assertEqual([(total.attributeName,total.elementName,total.amountField) for total in totals],[
+            ("numAuthReversals","authReversal",None),
+            ("numGiftCardCaptures","giftCardCapture",None),
+            ("numAuths","authorization",None),
+            ("authAmount","authorization","amount"),
+            ("authReversalAmount","authReversal","amount"),
+            ("giftCardCaptureAmount","giftCardCapture","captureAmount"),
+        ])
+
+    """
+    Tests reading a batch file.
+    """
+    def testRead(self):
+        document = "<cnpRequest xmlns=\"http://www.vantivcnp.com/schema\" numBatchRequests=\"2\">" \
+            "<batchRequest id=\"1\" numAuths=\"2\" authAmount=\"300\" numGiftCardCaptures=\"1\" giftCardCaptureAmount=\"5\">" \
+            "<authorization id=\"1\"><amount>100</amount><allowPartialAuth>true</allowPartialAuth></authorization>" \
+            "<authorization id=\"2\"><amount>200</amount></authorization>" \
+            "<giftCardCapture id=\"3\"><captureAmount>4</captureAmount><originalAmount>5</originalAmount></giftCardCapture>" \
+            "</batchRequest></cnpRequest>"
+        reader = BatchReader.BatchReader(createCompiledVersion())
+        records = list(reader.read(io.BytesIO(document.encode("utf8"))))
+
+        # Assert the records are correct.
+        self.assertEqual(len(records),3)
+        self.assertEqual(records[0].batchIndex,0)
+        self.assertEqual(records[0].name,"authorization")
+        self.assertEqual(records[0].values,{"id": "1","amount": 100,"allowPartialAuth": True})
+        self.assertEqual(records[2].name,"giftCardCapture")
+        self.assertEqual(records[2].values,{"id": "3","captureAmount": 4,"originalAmount": 5})
+
+        # Assert the totals are checked.
+        self.assertEqual(len(reader.batches),1)
+        self.assertEqual(reader.batches[0].transactionCount,3)
+        self.assertEqual(reader.batches[0].getMismatches(),[("giftCardCaptureAmount",5,4)])
+        self.assertEqual(reader.getErrors(),[
+            "numBatchRequests is 2 but 1 batches were read",
+            "Batch 0 (id 1): giftCardCaptureAmount is 5 but the transactions total 4",
+        ])
@@ -0,0 +1,129 @@
+"""
+Zachary Cook
+
+Tests splitting and merging batch files.
+"""
+
+import io
+import os
+import tempfile
+import threading
+import unittest
+from xml.etree import ElementTree
+from Parser.XMLTools import BatchReader, BatchSplitter
+from ParserTests.XMLToolsTests import BatchReaderTests
+
+DOCUMENT = "<cnpRequest xmlns=\"http://www.vantivcnp.com/schema\" version=\"12.0\" numBatchRequests=\"1\">" \
+    "<authentication><user>user</user></authentication>" \
+    "<batchRequest id=\"1\" merchantId=\"101\" numAuths=\"3\" authAmount=\"600\" numAuthReversals=\"1\" authReversalAmount=\"7\">" \
+    "<authorization id=\"1\"><amount>100</amount></authorization>" \
+    "<authorization id=\"2\"><amount>200</amount></authorization>" \
+    "<authReversal id=\"3\"><amount>7</amount></authReversal>" \
+    "<authorization id=\"4\"><amount>300</amount></authorization>" \
+    "</batchRequest></cnpRequest>"
+
+
+
+"""
+Reads a batch file and returns the reader and records.
+"""
+def readFile(compiledVersion,fileName):
+    reader = BatchReader.BatchReader(compiledVersion)
+    records = list(reader.read(fileName))
+    return reader,records
+
+
+
+class BatchSplitterTests(unittest.TestCase):
+    """
+    Sets up the test.
+    """
+    def setUp(self):
+        self.compiledVersion = BatchReaderTests.createCompiledVersion()
+        self.splitter = BatchSplitter.BatchSplitter(self.compiledVersion)
+        self.directory = tempfile.TemporaryDirectory()
+
+    """
+    Cleans up the test.
+    """
+    def tearDown(self):
+        self.directory.cleanup()
+
+    """
+    Tests splitting a batch file.
+    """
+    def testSplit(self):
+        fileNames = [os.path.join(self.directory.name,"split_" + str(i) + ".xml") for i in range(0,2)]
+        self.splitter.split(io.BytesIO(DOCUMENT.encode("utf8")),fileNames,self.directory.name)
+
+        # Assert the transactions are spread across the files and the totals are recomputed.
+        reader,records = readFile(self.compiledVersion,fileNames[0])
+        self.assertEqual([record.values["id"] for record in records],["1","3"])
+        self.assertEqual(reader.getErrors(),[])
+        self.assertEqual(reader.batches[0].declaredTotals["numAuths"],1)
+        self.assertEqual(reader.batches[0].declaredTotals["authReversalAmount"],7)
+        reader,records = readFile(self.compiledVersion,fileNames[1])
+        self.assertEqual([record.values["id"] for record in records],["2","4"])
+        self.assertEqual(reader.getErrors(),[])
+        self.assertEqual(reader.batches[0].declaredTotals["authAmount"],500)
+        self.assertEqual(reader.batches[0].declaredTotals["numAuthReversals"],0)
+
+        # Assert the header and the batch attributes are copied.
+        with open(fileNames[1]) as file:
+            contents = file.read()
+        self.assertIn("<cnpRequest version=\"12.0\" numBatchRequests=\"1\" xmlns=\"http://www.vantivcnp.com/schema\"><authentication><user>user</user></authentication>",contents)
+        self.assertIn("<batchRequest id=\"1\" merchantId=\"101\" ",contents)
+
+    """
+    Tests merging batch files.
+    """
+    def testMerge(self):
+        fileNames = [os.path.join(self.directory.name,"split_" + str(i) + ".xml") for i in range(0,3)]
+        mergedFileName = os.path.join(self.directory.name,"merged.xml")
+        self.splitter.split(io.BytesIO(DOCUMENT.encode("utf8")),fileNames,self.directory.name)
+        self.splitter.merge(fileNames,mergedFileName,self.directory.name)
+
+        # Assert the batches are merged and the totals match the original.
+        reader,records = readFile(self.compiledVersion,mergedFileName)
+        self.assertEqual(sorted([record.values["id"] for record in records]),["1","2","3","4"])
+        self.assertEqual(reader.getErrors(),[])
+        self.assertEqual(len(reader.batches),1)
+        self.assertEqual(reader.batches[0].declaredTotals,{"numAuthReversals": 1,"numGiftCardCaptures": 0,"numAuths": 3,"authAmount": 600,"authReversalAmount": 7,"giftCardCaptureAmount": 0})
+
+    """
+    Tests merging batch files with the batches interleaved.
+    """
+    def testMergeInterleaved(self):
+        fileNames = [os.path.join(self.directory.name,"input_" + str(i) + ".xml") for i in range(0,2)]
+        mergedFileName = os.path.join(self.directory.name,"merged.xml")
+        for i in range(0,2):
+            with open(fileNames[i],"w") as file:
+                file.write("<cnpRequest version=\"12.0\" numBatchRequests=\"2\">" \
+                    "<batchRequest merchantId=\"101\"><authorization id=\"" + str(i) + "1\"><amount>100</amount></authorization></batchRequest>" \
+                    "<batchRequest merchantId=\"102\"><authorization id=\"" + str(i) + "2\"><amount>10</amount></authorization></batchRequest>" \
+                    "</cnpRequest>")
+        self.splitter.merge(fileNames,mergedFileName,self.directory.name)
+
+        # Assert the transactions of each batch are kept together.
+        reader,records = readFile(self.compiledVersion,mergedFileName)
+        self.assertEqual([record.values["id"] for record in records],["01","11","02","12"])
+        self.assertEqual(reader.getErrors(),[])
+        self.assertEqual([batch.declaredTotals["authAmount"] for batch in reader.batches],[200,20])
+
+    """
+    Tests splitting a file that can't be parsed stops the writers.
+    """
+    def testSplitInvalidFile(self):
+        threadCount = threading.active_count()
+        fileNames = [os.path.join(self.directory.name,"split_" + str(i) + ".xml") for i in range(0,2)]
+        self.assertRaises(ElementTree.ParseError,self.splitter.split,io.BytesIO(DOCUMENT[0:-40].encode("utf8")),fileNames,self.directory.name)
+        self.assertEqual(threading.active_count(),threadCount)
+        self.assertFalse(os.path.exists(fileNames[0]))
+        self.assertRaises(ElementTree.ParseError,self.splitter.merge,[io.BytesIO(b"<cnpRequest><batchRequest>")],fileNames[0],self.directory.name)
+        self.assertEqual(threading.active_count(),threadCount)
+        self.assertEqual(os.listdir(self.directory.name),[])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
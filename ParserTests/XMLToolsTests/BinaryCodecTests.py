@@ -0,0 +1,191 @@
+"""
+Zachary Cook
+
+Tests the binary codec.
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from Parser.XMLTools import BinaryCodec
+from Parser.XSDParser import XSDData
+from ParserTests import TestSchemas
+from ParserTests.XMLToolsTests import XMLValidatorTests
+
+
+
+"""
+Creates a versioned XSD with two versions for testing. Version 12.1
+is added first if it is included, which adds a type, a child, and an
+enum value.
+"""
+def createVersionedXSD(includeNewVersion=False):
+    # Create the types for both versions.
+    oldEnum = XSDData.XSDSimpleType("orderSourceType","string")
+    oldEnum.addEnumeration("ecommerce")
+    newEnum = XSDData.XSDSimpleType("orderSourceType","string")
+    newEnum.addEnumeration("applepay")
+    newEnum.addEnumeration("ecommerce")
+    transactionType = XSDData.XSDComplexType("transactionType",None)
+    transactionType.childItems = [XSDData.XSDAttribute("id","string")]
+    transaction = XSDData.XSDComplexType("transaction","transactionType")
+    oldAuthorization = XSDData.XSDComplexType("authorization","transactionType")
+    oldAuthorization.childItems = [XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("orderSource","orderSourceType")]
+    newAuthorization = XSDData.XSDComplexType("authorization","transactionType")
+    newAuthorization.childItems = [XSDData.XSDChildElement("newField","string"),XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("orderSource","orderSourceType"),XSDData.XSDChildElement("allowPartialAuth","boolean")]
+    sale = XSDData.XSDComplexType("sale","transactionType")
+    sale.childItems = [XSDData.XSDChildElement("amount","integer")]
+    oldRequest = XSDData.XSDComplexType("litleOnlineRequest",None)
+    oldRequest.childItems = [XSDData.XSDChildElement("transaction","transactionType",maxOccurrences=(2 ** 31) - 1),XSDData.XSDAttribute("version","string")]
+    newRequest = XSDData.XSDComplexType("cnpOnlineRequest",None)
+    newRequest.childItems = oldRequest.childItems + [XSDData.XSDAttribute("merchantId","string")]
+
+    # Create the versioned XSD.
+    typesByVersion = []
+    if includeNewVersion:
+        newestEnum = XSDData.XSDSimpleType("orderSourceType","string")
+        for value in ["androidpay","applepay","ecommerce"]:
+            newestEnum.addEnumeration(value)
+        newestAuthorization = XSDData.XSDComplexType("authorization","transactionType")
+        newestAuthorization.childItems = [XSDData.XSDChildElement("card","string")] + newAuthorization.childItems
+        capture = XSDData.XSDComplexType("capture","transactionType")
+        capture.childItems = [XSDData.XSDChildElement("amount","integer")]
+        typesByVersion.append(("12.1",[newestEnum,newRequest,capture,transactionType,transaction,newestAuthorization,sale]))
+    typesByVersion.append(("12.0",[newEnum,newRequest,transactionType,transaction,newAuthorization,sale]))
+    typesByVersion.append(("8.0",[oldEnum,oldRequest,transactionType,transaction,oldAuthorization,sale]))
+    return TestSchemas.createVersionedXSD(typesByVersion)
+
+
+
+class BinaryCodecTests(unittest.TestCase):
+    """
+    Tests encoding and decoding a document.
+    """
+    def testRoundTrip(self):
+        codec = BinaryCodec.BinaryCodec(createVersionedXSD(),["8.0","12.0"],"12.0")
+        document = "<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\" version=\"12.0\" merchantId=\"a &amp; &quot;b&quot;\">" \
+            "<authorization id=\"1\"><newField>&lt;value&gt;</newField><amount>100</amount><orderSource>applepay</orderSource><allowPartialAuth>true</allowPartialAuth></authorization>" \
+            "<authorization id=\"2\"><amount>-25</amount><orderSource>unknown</orderSource><allowPartialAuth>1</allowPartialAuth></authorization>" \
+            "<sale id=\"3\"><amount>007</amount></sale><sale/></cnpOnlineRequest>"
+        encodedDocument = codec.encodeMessage(document.encode("utf8"))
+        self.assertLess(len(encodedDocument),len(document) // 2)
+        self.assertEqual(codec.decodeMessage(encodedDocument).decode("utf8"),document)
+
+        # Assert documents without the namespace and with text are decoded.
+        document = "<cnpOnlineRequest><sale>\n\t<amount></amount></sale><transaction>text</transaction></cnpOnlineRequest>"
+        self.assertEqual(codec.decodeMessage(codec.encodeMessage(document.encode("utf8"))).decode("utf8"),"<cnpOnlineRequest><sale><amount/></sale><transaction>text</transaction></cnpOnlineRequest>")
+
+    """
+    Tests the tags being the same for every version.
+    """
+    def testStableTags(self):
+        xsd = createVersionedXSD()
+        oldCodec = BinaryCodec.BinaryCodec(xsd,["8.0","12.0"],"8.0")
+        newCodec = BinaryCodec.BinaryCodec(xsd,["8.0","12.0"],"12.0")
+        self.assertEqual(oldCodec.rootTypes["litleOnlineRequest"].typeTag,newCodec.rootTypes["cnpOnlineRequest"].typeTag)
+        for wireName in ["amount","orderSource"]:
+            self.assertEqual(oldCodec.rootTypes["authorization"].children[wireName][0],newCodec.rootTypes["authorization"].children[wireName][0])
+        self.assertEqual(oldCodec.rootTypes["litleOnlineRequest"].children["sale"][0],newCodec.rootTypes["cnpOnlineRequest"].children["sale"][0])
+        self.assertEqual(oldCodec.getEnumValues("orderSourceType"),({"ecommerce": 0},["ecommerce",None]))
+        self.assertEqual(newCodec.getEnumValues("orderSourceType"),({"ecommerce": 0,"applepay": 1},["ecommerce","applepay"]))
+
+        # Assert documents of other versions aren't decoded.
+        document = "<litleOnlineRequest xmlns=\"http://www.litle.com/schema\"><sale id=\"1\"/></litleOnlineRequest>"
+        encodedDocument = oldCodec.encodeMessage(document.encode("utf8"))
+        self.assertEqual(oldCodec.decodeMessage(encodedDocument).decode("utf8"),document)
+        self.assertRaises(ValueError,newCodec.decodeMessage,encodedDocument)
+
+    """
+    Tests decoding documents after a version is added.
+    """
+    def testAddedVersion(self):
+        document = "<cnpOnlineRequest version=\"12.0\"><authorization id=\"1\"><newField>a</newField><amount>100</amount><orderSource>applepay</orderSource></authorization>" \
+            "<sale id=\"2\"><amount>5</amount></sale></cnpOnlineRequest>"
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory,"tags.json")
+            tagTable = BinaryCodec.loadTagTable(fileName)
+            oldCodec = BinaryCodec.BinaryCodec(createVersionedXSD(),["8.0","12.0"],"12.0",tagTable)
+            tagTable.save(fileName)
+            encodedDocument = oldCodec.encodeMessage(document.encode("utf8"))
+            defaultEncodedDocument = BinaryCodec.BinaryCodec(createVersionedXSD(),["8.0","12.0"],"12.0").encodeMessage(document.encode("utf8"))
+
+            # Assert the documents are decoded with the tags of the new version.
+            newXSD = createVersionedXSD(True)
+            tagTable = BinaryCodec.loadTagTable(fileName)
+            newCodec = BinaryCodec.BinaryCodec(newXSD,["8.0","12.0","12.1"],"12.0",tagTable)
+            self.assertTrue(tagTable.changed)
+            self.assertEqual(newCodec.decodeMessage(encodedDocument).decode("utf8"),document)
+            self.assertEqual(BinaryCodec.BinaryCodec(newXSD,["8.0","12.0","12.1"],"12.0").decodeMessage(defaultEncodedDocument).decode("utf8"),document)
+            newestCodec = BinaryCodec.BinaryCodec(newXSD,["8.0","12.0","12.1"],"12.1",tagTable)
+            newestDocument = b"<cnpOnlineRequest><authorization><card>1</card><orderSource>androidpay</orderSource></authorization><capture/></cnpOnlineRequest>"
+            self.assertEqual(newestCodec.decodeMessage(newestCodec.encodeMessage(newestDocument)),newestDocument)
+
+            # Assert documents with other or newer tag tables aren't decoded.
+            self.assertRaisesRegex(ValueError,"tag table",BinaryCodec.BinaryCodec(createVersionedXSD(),["8.0","12.0"],"12.0").decodeMessage,encodedDocument)
+            newTableEncodedDocument = newCodec.encodeMessage(document.encode("utf8"))
+            self.assertRaisesRegex(ValueError,"only has",BinaryCodec.BinaryCodec(createVersionedXSD(),["8.0","12.0"],"12.0",BinaryCodec.loadTagTable(fileName)).decodeMessage,newTableEncodedDocument)
+
+    """
+    Tests encoding invalid documents.
+    """
+    def testInvalidDocuments(self):
+        codec = BinaryCodec.BinaryCodec(createVersionedXSD(),["8.0","12.0"],"12.0")
+        self.assertRaises(ValueError,codec.encodeMessage,b"<unknown/>")
+        self.assertRaises(ValueError,codec.encodeMessage,b"<cnpOnlineRequest><unknown/></cnpOnlineRequest>")
+        self.assertRaises(ValueError,codec.encodeMessage,b"<cnpOnlineRequest unknown=\"1\"/>")
+        self.assertRaises(ValueError,codec.encodeMessage,b"<cnpOnlineRequest><sale><amount id=\"1\">1</amount></sale></cnpOnlineRequest>")
+        self.assertRaises(ValueError,codec.encodeMessage,b"<cnpOnlineRequest xmlns=\"http://www.litle.com/schema\"/>")
+        self.assertRaises(ValueError,codec.decodeMessage,b"<cnpOnlineRequest/>")
+        self.assertRaises(ValueError,codec.decodeMessage,codec.encodeMessage(b"<cnpOnlineRequest><sale/></cnpOnlineRequest>")[0:-2])
+
+    """
+    Tests encoding the namespace declarations and attributes of other
+    namespaces, and the whitespace between the elements.
+    """
+    def testLiteralEntries(self):
+        codec = BinaryCodec.BinaryCodec(createVersionedXSD(),["8.0","12.0"],"12.0")
+        document = "<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\" xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\" xsi:schemaLocation=\"http://www.vantivcnp.com/schema SchemaCombined_v12.0.xsd\" version=\"12.0\">" \
+            "<sale xmlns:ext=\"urn:ext\" ext:source=\"a &amp; &quot;b&quot;\" id=\"1\" xml:lang=\"en\"><amount>5</amount></sale></cnpOnlineRequest>"
+        self.assertEqual(codec.decodeMessage(codec.encodeMessage(document.encode("utf8"))).decode("utf8"),document)
+
+        # Assert the whitespace between the elements isn't stored.
+        indentedDocument = "<cnpOnlineRequest>\n    <sale id=\"1\">\n        <amount>5</amount>\n    </sale>\n    <sale/>\n</cnpOnlineRequest>\n"
+        self.assertEqual(codec.decodeMessage(codec.encodeMessage(indentedDocument.encode("utf8"))).decode("utf8"),"<cnpOnlineRequest><sale id=\"1\"><amount>5</amount></sale><sale/></cnpOnlineRequest>")
+
+        # Assert the literal entries of simple elements aren't supported.
+        self.assertRaisesRegex(ValueError,"attributes of simple element",codec.encodeMessage,b"<cnpOnlineRequest xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\"><sale><amount xsi:nil=\"true\"/></sale></cnpOnlineRequest>")
+        self.assertRaisesRegex(ValueError,"namespace declarations of simple element",codec.encodeMessage,b"<cnpOnlineRequest><sale><amount xmlns:ext=\"urn:ext\">1</amount></sale></cnpOnlineRequest>")
+
+    """
+    Tests encoding a document of a schema in the XSD directory with a type
+    used with a different case than the parser stored it with.
+    """
+    def testMergedTypes(self):
+        codec = BinaryCodec.BinaryCodec(TestSchemas.loadVersionedXSD(["12.0"]),["12.0"],"12.0")
+        document = XMLValidatorTests.PAYPAL_DOCUMENT
+        self.assertEqual(codec.decodeMessage(codec.encodeMessage(document.encode("utf8"))).decode("utf8"),document)
+
+    """
+    Tests streaming a large document and several documents.
+    """
+    def testStreaming(self):
+        codec = BinaryCodec.BinaryCodec(createVersionedXSD(),["8.0","12.0"],"12.0")
+        document = "<cnpOnlineRequest>" + "".join("<sale id=\"" + str(i) + "\"><amount>" + str(i * 1000) + "</amount></sale>" for i in range(0,20000)) + "</cnpOnlineRequest>"
+        encodedOutput = io.BytesIO()
+        codec.encode(io.BytesIO(document.encode("utf8")),encodedOutput)
+        self.assertGreater(len(encodedOutput.getvalue()),BinaryCodec.READ_SIZE)
+        decodedOutput = io.BytesIO()
+        codec.decode(io.BytesIO(encodedOutput.getvalue()),decodedOutput)
+        self.assertEqual(decodedOutput.getvalue().decode("utf8"),document)
+
+        # Assert several documents are written and read.
+        documents = [("<cnpOnlineRequest><sale id=\"" + str(i) + "\"/></cnpOnlineRequest>").encode("utf8") for i in range(0,100)]
+        output = io.BytesIO()
+        codec.writeMessages(documents,output)
+        self.assertEqual(list(codec.readMessages(io.BytesIO(output.getvalue()))),documents)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
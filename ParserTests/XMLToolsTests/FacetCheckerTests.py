@@ -0,0 +1,97 @@
+"""
+Zachary Cook
+
+Tests the facet checker.
+"""
+
+import io
+import unittest
+from Parser.XMLTools import FacetChecker, XMLValidator
+from Parser.XSDParser import XSDData
+from ParserTests import TestSchemas
+
+
+
+"""
+Creates a child element with restrictions.
+"""
+def createChildElement(name,type,restrictions):
+    childElement = XSDData.XSDChildElement(name,type)
+    childElement.restrictions = restrictions
+    return childElement
+
+"""
+Creates a compiled version with facets for testing.
+"""
+def createCompiledVersion(version="12.0"):
+    # Create the types for both versions.
+    oldSale = XSDData.XSDComplexType("sale",None)
+    oldSale.childItems = [createChildElement("orderId","string",{"maxLength": "25","minLength": "1"}),createChildElement("amount","integer",{"totalDigits": "4"})]
+    newSale = XSDData.XSDComplexType("sale",None)
+    newSale.childItems = [createChildElement("orderId","string",{"maxLength": "50","minLength": "1","whiteSpace": "collapse"}),createChildElement("amount","integer",{"totalDigits": "4","minInclusive": "0"}),createChildElement("routingNum","string",{"pattern": "[0-9]{9}"}),createChildElement("type","string",{"fixed": "GC"})]
+    request = XSDData.XSDComplexType("cnpOnlineRequest",None)
+    request.childItems = [XSDData.XSDChildElement("sale","sale",maxOccurrences=2)]
+
+    # Compile the types.
+    return TestSchemas.createCompiledVersion([("11.0",[request,oldSale]),("12.0",[request,newSale])],version)
+
+
+
+class FacetCheckerTests(unittest.TestCase):
+    """
+    Tests the facets of the versions.
+    """
+    def testFacetsForVersions(self):
+        self.assertEqual(createCompiledVersion("11.0").types["sale"].fieldNames["orderId"].facets,{"maxLength": "25","minLength": "1"})
+        self.assertEqual(createCompiledVersion("12.0").types["sale"].fieldNames["orderId"].facets,{"maxLength": "50","minLength": "1","whiteSpace": "collapse"})
+        self.assertEqual(createCompiledVersion("12.0").types["cnpOnlineRequest"].fieldNames["sale"].facets,{})
+
+    """
+    Tests checking values.
+    """
+    def testCheckValue(self):
+        compiledVersion = createCompiledVersion()
+        checker = FacetChecker.FacetChecker(compiledVersion)
+        sale = compiledVersion.types["sale"]
+        self.assertIsNone(checker.checkValue(sale.fieldNames["orderId"],"  order  1 "))
+        self.assertEqual(checker.checkValue(sale.fieldNames["orderId"],"  "),"Invalid value \"  \" for orderId (minLength 1)")
+        self.assertEqual(checker.checkValue(sale.fieldNames["orderId"],"a" * 51),"Invalid value \"" + "a" * 51 + "\" for orderId (maxLength 50)")
+        self.assertIsNone(checker.checkValue(sale.fieldNames["amount"]," 0099.000"))
+        self.assertEqual(checker.checkValue(sale.fieldNames["amount"],"10000"),"Invalid value \"10000\" for amount (totalDigits 4)")
+        self.assertEqual(checker.checkValue(sale.fieldNames["amount"],"-1"),"Invalid value \"-1\" for amount (minInclusive 0)")
+        self.assertEqual(checker.checkValue(sale.fieldNames["amount"],"one"),"Invalid value \"one\" for amount (totalDigits 4)")
+        self.assertIsNone(checker.checkValue(sale.fieldNames["routingNum"],"123456789"))
+        self.assertEqual(checker.checkValue(sale.fieldNames["routingNum"],"1234567890"),"Invalid value \"1234567890\" for routingNum (pattern [0-9]{9})")
+        self.assertIsNone(checker.checkValue(sale.fieldNames["type"],"GC"))
+        self.assertEqual(checker.checkValue(sale.fieldNames["type"],"VI"),"Invalid value \"VI\" for type (fixed GC)")
+
+        # Assert the checkers are shared.
+        self.assertIs(FacetChecker.getChecker("string",{"pattern": "[0-9]{9}"}),FacetChecker.getChecker("string",{"pattern": "[0-9]{9}"}))
+        self.assertIsNone(FacetChecker.getChecker("string",{}))
+
+    """
+    Tests checking several values.
+    """
+    def testCheckValues(self):
+        compiledVersion = createCompiledVersion()
+        checker = FacetChecker.FacetChecker(compiledVersion)
+        self.assertEqual(checker.checkValues(compiledVersion.types["sale"].fieldNames["amount"],["1","-1","12345","9999"]),[(1,"minInclusive"),(2,"totalDigits")])
+        self.assertEqual(checker.checkValues(compiledVersion.types["cnpOnlineRequest"].fieldNames["sale"],["1"]),[])
+        self.assertEqual(checker.checkObject("cnpOnlineRequest",{"sale": [{"orderId": "1","amount": 5},{"amount": 12345,"routingNum": "1"}]}),[
+            "/cnpOnlineRequest/sale: Invalid value \"12345\" for amount (totalDigits 4)",
+            "/cnpOnlineRequest/sale: Invalid value \"1\" for routingNum (pattern [0-9]{9})",
+        ])
+        self.assertRaises(ValueError,checker.checkObject,"unknown",{})
+
+    """
+    Tests the validator checking facets.
+    """
+    def testValidator(self):
+        document = "<cnpOnlineRequest><sale><orderId></orderId><amount>1</amount></sale></cnpOnlineRequest>"
+        self.assertEqual(XMLValidator.XMLValidator(createCompiledVersion()).validate(io.BytesIO(document.encode("utf8"))).errors,[])
+        self.assertEqual(XMLValidator.XMLValidator(createCompiledVersion(),checkFacets=True).validate(io.BytesIO(document.encode("utf8"))).errors,["/cnpOnlineRequest/sale/orderId: Invalid value \"\" for orderId (minLength 1)"])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
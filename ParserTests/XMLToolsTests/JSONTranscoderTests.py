@@ -0,0 +1,111 @@
+"""
+Zachary Cook
+
+Tests the JSON transcoder.
+"""
+
+import io
+import json
+import unittest
+from Parser.XMLTools import JSONTranscoder
+from Parser.XSDParser import XSDData
+from ParserTests import TestSchemas
+from ParserTests.XMLToolsTests import BinaryCodecTests
+
+
+
+class JSONTranscoderTests(unittest.TestCase):
+    """
+    Tests converting JSON to XML and back.
+    """
+    def testConvert(self):
+        xsd = BinaryCodecTests.createVersionedXSD()
+        transcoder = JSONTranscoder.JSONTranscoder(xsd,["8.0","12.0"],"12.0")
+        document = {"cnpOnlineRequest": {
+            "transaction": [
+                {"authorization": {"orderSource": "applepay","amount": 100,"id": "1","allowPartialAuth": True,"newField": "<a & b>"}},
+                {"sale": {"id": "2"}},
+                {"sale": {"amount": -1}},
+            ],
+            "merchantId": "a \"b\"",
+        }}
+        xml = "<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\" merchantId=\"a &quot;b&quot;\">" \
+            "<authorization id=\"1\"><newField>&lt;a &amp; b&gt;</newField><amount>100</amount><orderSource>applepay</orderSource><allowPartialAuth>true</allowPartialAuth></authorization>" \
+            "<sale id=\"2\"/><sale><amount>-1</amount></sale></cnpOnlineRequest>"
+        self.assertEqual(transcoder.toXML(document),xml)
+
+        # Assert the XML is converted back to JSON.
+        self.assertEqual(transcoder.toJSON(xml),{"cnpOnlineRequest": {
+            "merchantId": "a \"b\"",
+            "transaction": [
+                {"authorization": {"id": "1","newField": "<a & b>","amount": 100,"orderSource": "applepay","allowPartialAuth": True}},
+                {"sale": {"id": "2"}},
+                {"sale": {"amount": -1}},
+            ],
+        }})
+        self.assertEqual(transcoder.toJSON("<cnpOnlineRequest><sale><amount>1.5</amount></sale></cnpOnlineRequest>"),{"cnpOnlineRequest": {"transaction": [{"sale": {"amount": "1.5"}}]}})
+
+        # Assert the order of the substituted elements is kept.
+        xml = "<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\"><sale id=\"1\"/><authorization id=\"2\"/><sale id=\"3\"/><transaction id=\"4\"/></cnpOnlineRequest>"
+        self.assertEqual(transcoder.toJSON(xml),{"cnpOnlineRequest": {"transaction": [{"sale": {"id": "1"}},{"authorization": {"id": "2"}},{"sale": {"id": "3"}},{"transactionType": {"id": "4"}}]}})
+        self.assertEqual(transcoder.toXML(transcoder.toJSON(xml)),xml)
+
+        # Assert the names of the older version are used.
+        oldTranscoder = JSONTranscoder.JSONTranscoder(xsd,["8.0","12.0"],"8.0")
+        oldDocument = {"cnpOnlineRequest": {"version": "8.0","transaction": [{"sale": {"amount": 5}}]}}
+        oldXML = "<litleOnlineRequest xmlns=\"http://www.litle.com/schema\" version=\"8.0\"><sale><amount>5</amount></sale></litleOnlineRequest>"
+        self.assertEqual(oldTranscoder.toXML(oldDocument),oldXML)
+        self.assertEqual(oldTranscoder.toJSON(oldXML),oldDocument)
+        self.assertRaises(ValueError,oldTranscoder.toXML,{"cnpOnlineRequest": {"merchantId": "1"}})
+        self.assertRaises(ValueError,oldTranscoder.toXML,{"cnpOnlineRequest": {"transaction": [{"authorization": {"newField": "1"}}]}})
+
+    """
+    Tests the prioritized children being written first.
+    """
+    def testPrioritizedChildren(self):
+        transactionType = XSDData.XSDComplexType("transactionType",None)
+        transactionType.childItems = [XSDData.XSDAttribute("id","string"),XSDData.XSDChildElement("reportGroup","string")]
+        authorization = XSDData.XSDComplexType("authorization","transactionType")
+        authorization.childItems = [XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("orderId","string")]
+        xsd = TestSchemas.createVersionedXSD([("12.0",[transactionType,authorization])])
+
+        # Assert the children are ordered.
+        transcoder = JSONTranscoder.JSONTranscoder(xsd,["12.0"],"12.0")
+        self.assertEqual(transcoder.toXML({"authorization": {"amount": 1,"orderId": "2","reportGroup": "3","id": "4"}}),"<authorization xmlns=\"http://www.vantivcnp.com/schema\" id=\"4\"><reportGroup>3</reportGroup><orderId>2</orderId><amount>1</amount></authorization>")
+
+    """
+    Tests converting invalid documents.
+    """
+    def testInvalidDocuments(self):
+        transcoder = JSONTranscoder.JSONTranscoder(BinaryCodecTests.createVersionedXSD(),["8.0","12.0"],"12.0")
+        self.assertRaises(ValueError,transcoder.toXML,{"unknown": {}})
+        self.assertRaises(ValueError,transcoder.toXML,{"cnpOnlineRequest": {},"sale": {}})
+        self.assertRaises(ValueError,transcoder.toXML,{"cnpOnlineRequest": {"unknown": 1}})
+        self.assertRaises(ValueError,transcoder.toXML,{"cnpOnlineRequest": {"transaction": [{"sale": {"amount": [1,2]}}]}})
+        self.assertRaises(ValueError,transcoder.toXML,{"cnpOnlineRequest": {"transaction": [{"sale": {"amount": {"value": 1}}}]}})
+        self.assertRaises(ValueError,transcoder.toXML,{"cnpOnlineRequest": {"transaction": [{"sale": 1}]}})
+        self.assertRaises(ValueError,transcoder.toXML,{"cnpOnlineRequest": {"sale": {}}})
+        self.assertRaises(ValueError,transcoder.toXML,{"cnpOnlineRequest": {"transaction": [{"unknown": {}}]}})
+        self.assertRaises(ValueError,transcoder.toXML,{"cnpOnlineRequest": {"transaction": [{"sale": {},"authorization": {}}]}})
+        self.assertRaises(ValueError,transcoder.toXML,{"cnpOnlineRequest": {"transaction": [1]}})
+        self.assertRaises(ValueError,transcoder.toJSON,"<unknown/>")
+        self.assertRaises(ValueError,transcoder.toJSON,"<cnpOnlineRequest><unknown/></cnpOnlineRequest>")
+        self.assertRaises(ValueError,transcoder.toJSON,"<cnpOnlineRequest unknown=\"1\"/>")
+
+    """
+    Tests converting documents with one per line.
+    """
+    def testTranscodeLines(self):
+        transcoder = JSONTranscoder.JSONTranscoder(BinaryCodecTests.createVersionedXSD(),["8.0","12.0"],"12.0")
+        lines = [json.dumps({"cnpOnlineRequest": {"transaction": [{"sale": {"id": str(i)}}]}}) for i in range(0,10)]
+        xmlOutput = io.StringIO()
+        self.assertEqual(transcoder.transcodeJSONLines(lines + [""],xmlOutput),10)
+        self.assertEqual(xmlOutput.getvalue().split("\n")[1],"<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\"><sale id=\"1\"/></cnpOnlineRequest>")
+        jsonOutput = io.StringIO()
+        self.assertEqual(transcoder.transcodeXMLLines(io.StringIO(xmlOutput.getvalue()),jsonOutput),10)
+        self.assertEqual([json.loads(line) for line in jsonOutput.getvalue().splitlines()],[json.loads(line) for line in lines])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
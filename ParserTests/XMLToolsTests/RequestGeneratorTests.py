@@ -0,0 +1,171 @@
+"""
+Zachary Cook
+
+Tests generating random requests.
+"""
+
+import io
+import random
+import re
+import unittest
+from Parser.XMLTools import BatchReader, BinaryCodec, FacetChecker, RequestGenerator, XMLValidator
+from xml.etree import ElementTree
+from ParserTests import TestSchemas
+from ParserTests.XMLToolsTests import BatchReaderTests, XMLValidatorTests
+
+XSD_TEXT = "<xs:schema targetNamespace=\"http://www.vantivcnp.com/schema\" xmlns:xp=\"http://www.vantivcnp.com/schema\" xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" elementFormDefault=\"qualified\">" \
+    "<xs:simpleType name=\"txnIdType\"><xs:restriction base=\"xs:long\"><xs:totalDigits value=\"19\"/></xs:restriction></xs:simpleType>" \
+    "<xs:simpleType name=\"orderIdType\"><xs:restriction base=\"xs:string\"><xs:minLength value=\"1\"/><xs:maxLength value=\"25\"/></xs:restriction></xs:simpleType>" \
+    "<xs:simpleType name=\"zipType\"><xs:restriction base=\"xs:string\"><xs:pattern value=\"[0-9]{5}(-[0-9]{4})?\"/></xs:restriction></xs:simpleType>" \
+    "<xs:simpleType name=\"methodType\"><xs:restriction base=\"xs:string\"><xs:enumeration value=\"VI\"/><xs:enumeration value=\"GC\"/></xs:restriction></xs:simpleType>" \
+    "<xs:complexType name=\"transactionType\"><xs:attribute name=\"id\" type=\"xs:string\" use=\"required\"/></xs:complexType>" \
+    "<xs:complexType name=\"cardType\"><xs:sequence><xs:element name=\"type\" type=\"xp:methodType\"/><xs:element name=\"number\" type=\"xs:string\" minOccurs=\"0\"/></xs:sequence></xs:complexType>" \
+    "<xs:complexType name=\"giftCardCardType\"><xs:complexContent><xs:restriction base=\"xp:cardType\"><xs:sequence><xs:element name=\"type\" type=\"xp:methodType\" fixed=\"GC\"/><xs:element name=\"number\" type=\"xs:string\" minOccurs=\"0\"/></xs:sequence></xs:restriction></xs:complexContent></xs:complexType>" \
+    "<xs:complexType name=\"baseSaleType\"><xs:complexContent><xs:extension base=\"xp:transactionType\"><xs:sequence><xs:element name=\"amount\" type=\"xs:integer\"/></xs:sequence></xs:extension></xs:complexContent></xs:complexType>" \
+    "<xs:element name=\"transaction\" type=\"xp:transactionType\" abstract=\"true\"/>" \
+    "<xs:element name=\"sale\" substitutionGroup=\"xp:transaction\"><xs:complexType><xs:complexContent><xs:extension base=\"xp:transactionType\"><xs:sequence>" \
+    "<xs:element name=\"cnpTxnId\" type=\"xp:txnIdType\" minOccurs=\"0\"/><xs:element name=\"orderId\" type=\"xp:orderIdType\"/><xs:element name=\"amount\" type=\"xs:integer\"/>" \
+    "<xs:choice><xs:sequence><xs:element name=\"card\" type=\"xp:cardType\"/><xs:element name=\"zip\" type=\"xp:zipType\" minOccurs=\"0\"/></xs:sequence><xs:sequence><xs:element name=\"zip\" type=\"xp:zipType\"/><xs:element name=\"token\" type=\"xs:string\"/></xs:sequence></xs:choice>" \
+    "</xs:sequence></xs:extension></xs:complexContent></xs:complexType></xs:element>" \
+    "<xs:element name=\"giftCardSale\" substitutionGroup=\"xp:transaction\"><xs:complexType><xs:complexContent><xs:extension base=\"xp:transactionType\"><xs:sequence>" \
+    "<xs:element name=\"orderId\" type=\"xp:orderIdType\"/><xs:element name=\"card\" type=\"xp:giftCardCardType\"/>" \
+    "</xs:sequence></xs:extension></xs:complexContent></xs:complexType></xs:element>" \
+    "<xs:element name=\"cnpOnlineRequest\"><xs:complexType><xs:sequence><xs:element ref=\"xp:transaction\"/></xs:sequence><xs:attribute name=\"version\" type=\"xs:string\" use=\"required\"/></xs:complexType></xs:element>" \
+    "</xs:schema>"
+
+
+class RequestGeneratorTests(unittest.TestCase):
+    """
+    Tests generating online requests.
+    """
+    def testOnlineRequests(self):
+        compiledVersion = XMLValidatorTests.createCompiledVersion()
+        generator = RequestGenerator.RequestGenerator(compiledVersion,seed=1,mix={"authorization": 1})
+        validator = XMLValidator.XMLValidator(compiledVersion,True)
+        for i in range(0,50):
+            request = generator.generateRequest()
+            self.assertTrue(request.startswith("<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\""))
+            self.assertIn("<amount>",request)
+            result = validator.validate(io.BytesIO(request.encode("utf8")),"test.xml")
+            self.assertEqual(result.errors,[])
+
+        # Assert the chunks only depend on the seed.
+        otherGenerator = RequestGenerator.RequestGenerator(compiledVersion,seed=1,mix={"authorization": 1})
+        self.assertEqual(generator.generateChunk(3,10),otherGenerator.generateChunk(3,10))
+        self.assertEqual(len(generator.generateChunk(3,10).splitlines()),10)
+        self.assertNotEqual(generator.generateChunk(3,10),generator.generateChunk(4,10))
+        self.assertNotEqual(generator.generateChunk(3,10),RequestGenerator.RequestGenerator(compiledVersion,seed=2,mix={"authorization": 1}).generateChunk(3,10))
+
+    """
+    Tests generating batch requests with correct totals.
+    """
+    def testBatchRequests(self):
+        compiledVersion = BatchReaderTests.createCompiledVersion()
+        generator = RequestGenerator.RequestGenerator(compiledVersion,seed=1,mix={"authorization": 2,"authReversal": 1,"giftCardCapture": 1},batch=True,batchCount=2,batchSize=20,optionalProbability=0.5)
+        validator = XMLValidator.XMLValidator(compiledVersion)
+        for i in range(0,10):
+            request = generator.generateRequest().encode("utf8")
+            self.assertEqual(validator.validate(io.BytesIO(request),"test.xml").errors,[])
+
+            # Assert the totals are correct.
+            reader = BatchReader.BatchReader(compiledVersion)
+            records = list(reader.read(io.BytesIO(request)))
+            self.assertEqual(len(records),40)
+            self.assertEqual(len(reader.batches),2)
+            self.assertEqual(reader.getErrors(),[])
+
+    """
+    Tests generating requests for a parsed XSD with substitution groups,
+    choices, restrictions, and facets.
+    """
+    def testParsedRequests(self):
+        compiledVersion = TestSchemas.createParsedCompiledVersion(XSD_TEXT)
+        generator = RequestGenerator.RequestGenerator(compiledVersion,seed=1,optionalProbability=0.5)
+        validator = XMLValidator.XMLValidator(compiledVersion,True,True)
+        self.assertEqual(generator.transactionNames,["sale","giftCardSale"])
+        choices = set()
+        for i in range(0,50):
+            request = generator.generateRequest()
+            result = validator.validate(io.BytesIO(request.encode("utf8")),"test.xml")
+            self.assertEqual(result.errors,[])
+            self.assertNotIn("<transaction",request)
+
+            # Assert the children are in the order of the XSD and only one child of the choice is used.
+            if "<sale " in request:
+                self.assertRegex(request,"<sale id=\"[^\"]+\">(<cnpTxnId>[0-9]+</cnpTxnId>)?<orderId>[^<]+</orderId><amount>-?[0-9]+</amount>((<card>.*</card>(<zip>[^<]+</zip>)?)|(<zip>[^<]+</zip><token>[^<]+</token>))</sale>")
+                choices.add("<card>" in request)
+            else:
+                self.assertIn("<card><type>GC</type>",request)
+            for zip in re.findall("<zip>([^<]*)</zip>",request):
+                self.assertRegex(zip,"^[0-9]{5}(-[0-9]{4})?$")
+        self.assertEqual(choices,{True,False})
+
+    """
+    Tests generating requests for the schemas in the XSD directory, which
+    are checked against the schemas and encoded with the binary codec.
+    Elements of the types that are merged because their names only
+    differ in case, like paypal, only have the children of their type.
+    """
+    @unittest.skipUnless(TestSchemas.hasSchemaChecker(),"xmllint isn't installed")
+    def testSchemaRequests(self):
+        for version in ["9.4","12.0"]:
+            compiledVersion = TestSchemas.loadCompiledVersion(version)
+            codec = BinaryCodec.BinaryCodec(TestSchemas.loadVersionedXSD([version]),[version],version)
+            generators = [
+                RequestGenerator.RequestGenerator(compiledVersion,seed=1,optionalProbability=0.7),
+                RequestGenerator.RequestGenerator(compiledVersion,seed=1,batch=True,batchSize=5,optionalProbability=0.7),
+                RequestGenerator.RequestGenerator(compiledVersion,seed=1,mix={"authorization": 1,"sale": 1,"credit": 1},optionalProbability=0.7),
+            ]
+            paypalCount = 0
+            for generator in generators:
+                for i in range(0,20):
+                    request = generator.generateRequest()
+                    paypalCount += request.count("<paypal>")
+                    self.assertEqual(TestSchemas.checkDocument(request,TestSchemas.getSchemaFileName(version)),"",request)
+                    decodedRequest = codec.decodeMessage(codec.encodeMessage(request.encode("utf8"))).decode("utf8")
+                    self.assertEqual(ElementTree.canonicalize(decodedRequest),ElementTree.canonicalize(request))
+            self.assertGreater(paypalCount,0)
+
+    """
+    Tests parsing XSD patterns and creating values that match them.
+    """
+    def testParsePattern(self):
+        self.assertEqual(RequestGenerator.parsePattern("a\\d?"),("group",((("characters","a"),("repeat",0,1,("characters","0123456789"))),)))
+        self.assertEqual(RequestGenerator.parsePattern("[^a-zA-Z]|\\n"),("group",((("characters","0123456789"),),(("characters","\n"),))))
+        for pattern in ["(\\d{1,3}.){3}\\d{1,3}","[-a-zA-Z0-9_]{1,128}","[A-Z,a-z,0-9,/,\\-,_,.]*","[0-9]{6}|0","http.?://.*/.*","((ab|c)+x){2,}"]:
+            checker = FacetChecker.getChecker("string",{"pattern": pattern})
+            for value in RequestGenerator.createValuePool(random.Random(1),"string",{"pattern": pattern}):
+                self.assertIsNone(checker(value),pattern)
+
+        # Assert the syntax that isn't supported isn't parsed.
+        for pattern in ["\\p{L}","[a-z-[aeiou]]","[a-z","(a","a)","*a","a{1,x}"]:
+            self.assertRaises(ValueError,RequestGenerator.parsePattern,pattern)
+
+    """
+    Tests the transaction mixes.
+    """
+    def testMix(self):
+        self.assertEqual(dict(RequestGenerator.parseMix("authorization=5, sale,credit=0.5")),{"authorization": 5.0,"sale": 1.0,"credit": 0.5})
+        compiledVersion = XMLValidatorTests.createCompiledVersion()
+        self.assertRaises(ValueError,RequestGenerator.RequestGenerator,compiledVersion,mix={"sale": 1})
+        self.assertRaises(ValueError,RequestGenerator.RequestGenerator,compiledVersion,mix={"authorization": 0})
+        self.assertRaises(ValueError,RequestGenerator.RequestGenerator,compiledVersion,batch=True)
+
+        # Assert the transactions with no weight aren't generated.
+        generator = RequestGenerator.RequestGenerator(compiledVersion,mix={"authorization": 1,"transaction": 0})
+        self.assertNotIn("<transaction",generator.generateChunk(0,20).decode("utf8"))
+
+    """
+    Tests writing requests to a file.
+    """
+    def testGenerateRequests(self):
+        output = io.BytesIO()
+        RequestGenerator.generateRequests(XMLValidatorTests.createCompiledVersion(),25,output,1,chunkSize=10,seed=1,mix={"authorization": 1})
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines),25)
+        self.assertEqual(len(set(lines)),25)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Zachary Cook
+
+Tests the schema query service.
+"""
+
+import json
+import threading
+import unittest
+import urllib.request
+from Parser.XMLTools import SchemaQueryService
+from Parser.XSDParser import XSDData
+from ParserTests import TestSchemas
+
+
+
+"""
+Creates a schema index with two versions for testing.
+"""
+def createSchemaIndex():
+    # Create the types for both versions.
+    oldEnum = XSDData.XSDSimpleType("orderSourceType","string")
+    oldEnum.addEnumeration("ecommerce")
+    newEnum = XSDData.XSDSimpleType("orderSourceType","string")
+    newEnum.addEnumeration("ecommerce")
+    newEnum.addEnumeration("applepay")
+    transactionType = XSDData.XSDComplexType("transactionType",None)
+    transactionType.childItems = [XSDData.XSDAttribute("id","string")]
+    oldAuthorization = XSDData.XSDComplexType("authorization","transactionType")
+    oldAuthorization.childItems = [XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("orderSource","orderSourceType")]
+    newAuthorization = XSDData.XSDComplexType("authorization","transactionType")
+    newAuthorization.childItems = [XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("orderSource","orderSourceType"),XSDData.XSDChildElement("newField","string")]
+    oldRequest = XSDData.XSDComplexType("litleOnlineRequest",None)
+    oldRequest.childItems = [XSDData.XSDAttribute("version","string")]
+    newRequest = XSDData.XSDComplexType("cnpOnlineRequest",None)
+    newRequest.childItems = [XSDData.XSDAttribute("version","string")]
+
+    # Create the index.
+    xsd = TestSchemas.createVersionedXSD([("12.0",[newEnum,newRequest,transactionType,newAuthorization]),("8.0",[oldEnum,oldRequest,transactionType,oldAuthorization])])
+    return SchemaQueryService.SchemaIndex(xsd,xsd.versions)
+
+
+
+class SchemaQueryServiceTests(unittest.TestCase):
+    """
+    Tests looking up fields.
+    """
+    def testGetField(self):
+        schemaIndex = createSchemaIndex()
+        self.assertEqual(schemaIndex.getField("authorization","amount","8.0").wireName,"amount")
+        self.assertEqual(schemaIndex.getField("authorization","id","12.0").isAttribute,True)
+        self.assertEqual(schemaIndex.getField("authorization","newField","12.0").type,"string")
+        self.assertIsNone(schemaIndex.getField("authorization","newField","8.0"))
+        self.assertIsNone(schemaIndex.getField("unknown","amount","8.0"))
+        self.assertEqual(schemaIndex.getTypeName("cnpOnlineRequest","8.0"),"litleOnlineRequest")
+
+    """
+    Tests checking enum values.
+    """
+    def testIsEnumValue(self):
+        schemaIndex = createSchemaIndex()
+        self.assertTrue(schemaIndex.isEnumValue("orderSourceType","ecommerce","8.0"))
+        self.assertTrue(schemaIndex.isEnumValue("orderSourceType","applepay","12.0"))
+        self.assertFalse(schemaIndex.isEnumValue("orderSourceType","applepay","8.0"))
+
+    """
+    Tests getting the changes between versions.
+    """
+    def testGetChanges(self):
+        changes = createSchemaIndex().getChanges("8.0","12.0")
+        self.assertEqual(changes["addedTypes"],[])
+        self.assertEqual(changes["removedTypes"],[])
+        self.assertEqual(changes["changedTypes"],{
+            "authorization": {"added": ["newField"],"removed": [],"renamed": {}},
+            "cnpOnlineRequest": {"added": [],"removed": [],"renamed": {},"wireName": ["litleOnlineRequest","cnpOnlineRequest"]},
+        })
+
+    """
+    Tests running queries.
+    """
+    def testQuery(self):
+        schemaIndex = createSchemaIndex()
+        self.assertEqual(schemaIndex.query("/enum",{"enum": "orderSourceType","value": "applepay","version": "12.0"}),(200,{"valid": True}))
+        self.assertEqual(schemaIndex.query("/field",{"type": "authorization","child": "newField","version": "8.0"}),(200,{"exists": False}))
+        self.assertEqual(schemaIndex.query("/field",{"type": "authorization","version": "8.0"}),(400,{"error": "Missing parameter 'child'"}))
+        self.assertEqual(schemaIndex.query("/field",{"type": "authorization","child": "amount","version": "1.0"}),(404,{"error": "Unknown version 1.0"}))
+        self.assertEqual(schemaIndex.query("/unknown",{}),(404,{"error": "Unknown query /unknown"}))
+        status,response = schemaIndex.query("/type",{"type": "authorization","version": "12.0"})
+        self.assertEqual(status,200)
+        self.assertEqual([field["name"] for field in response["fields"]],["amount","orderSource","newField","id"])
+
+    """
+    Tests the cached responses can't be changed by the callers.
+    """
+    def testGetResponse(self):
+        schemaIndex = createSchemaIndex()
+        schemaIndex.getTypeFields("authorization","12.0")[0]["name"] = "MUTATED"
+        schemaIndex.getChanges("8.0","12.0")["changedTypes"].clear()
+        self.assertEqual(schemaIndex.getTypeFields("authorization","12.0")[0]["name"],"amount")
+        self.assertEqual(len(schemaIndex.getChanges("8.0","12.0")["changedTypes"]),2)
+
+        # Assert the response bodies are cached.
+        status,body = schemaIndex.getResponse("/diff",{"from": "8.0","to": "12.0"})
+        self.assertEqual(status,200)
+        self.assertEqual(json.loads(body),schemaIndex.getChanges("8.0","12.0"))
+        self.assertIs(schemaIndex.getResponse("/diff",{"to": "12.0","from": "8.0"})[1],body)
+        self.assertEqual(schemaIndex.getResponse("/versions",{}),(200,b'{"versions": ["8.0", "12.0"]}'))
+
+    """
+    Tests running a query over HTTP.
+    """
+    def testServer(self):
+        server = SchemaQueryService.createServer(createSchemaIndex(),port=0)
+        thread = threading.Thread(target=server.serve_forever,daemon=True)
+        thread.start()
+        try:
+            with urllib.request.urlopen("http://127.0.0.1:" + str(server.server_address[1]) + "/field?type=authorization&child=amount&version=12.0") as response:
+                self.assertEqual(json.loads(response.read())["wireName"],"amount")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+
+if __name__ == '__main__':
+    unittest.main()
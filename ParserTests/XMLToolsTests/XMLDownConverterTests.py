@@ -0,0 +1,125 @@
+"""
+Zachary Cook
+
+Tests the XML down converter.
+"""
+
+import io
+import unittest
+from Parser.XMLTools import CompiledVersion, XMLDownConverter
+from Parser.XSDParser import XSDVersionDiffer, XSDData
+from ParserTests import TestSchemas
+
+
+
+"""
+Creates the compiled versions 12.0 and 8.0 for testing. The reportGroup
+attribute of authorization was renamed to customerReportGroup in 12.0.
+"""
+def createCompiledVersions():
+    # Create the types for both versions.
+    oldEnum = XSDData.XSDSimpleType("orderSourceType","string")
+    oldEnum.addEnumeration("ecommerce")
+    newEnum = XSDData.XSDSimpleType("orderSourceType","string")
+    newEnum.addEnumeration("ecommerce")
+    newEnum.addEnumeration("applepay")
+    transactionType = XSDData.XSDComplexType("transactionType",None)
+    transactionType.childItems = [XSDData.XSDAttribute("id","string")]
+    transaction = XSDData.XSDComplexType("transaction","transactionType")
+    oldAuthorization = XSDData.XSDComplexType("authorization","transactionType")
+    oldAuthorization.childItems = [XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("orderSource","orderSourceType"),XSDData.XSDAttribute("reportGroup","string"),XSDData.XSDAttribute("channel","orderSourceType")]
+    newAuthorization = XSDData.XSDComplexType("authorization","transactionType")
+    newAuthorization.childItems = [XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("orderSource","orderSourceType"),XSDData.XSDChildElement("newField","string"),XSDData.XSDAttribute("customerReportGroup","string"),XSDData.XSDAttribute("channel","orderSourceType")]
+    oldRequest = XSDData.XSDComplexType("litleOnlineRequest",None)
+    oldRequest.childItems = [XSDData.XSDChildElement("transaction","transactionType",maxOccurrences=5),XSDData.XSDAttribute("version","string")]
+    newRequest = XSDData.XSDComplexType("cnpOnlineRequest",None)
+    newRequest.childItems = oldRequest.childItems + [XSDData.XSDAttribute("newAttribute","string")]
+
+    # Create the versioned XSD with the renamed attribute.
+    renames = XSDVersionDiffer.RenameMap()
+    renames.childNames[("authorization","reportGroup")] = "customerReportGroup"
+    xsd = TestSchemas.createVersionedXSD([("12.0",[newEnum,newRequest,transactionType,transaction,newAuthorization]),("8.0",[oldEnum,oldRequest,transactionType,transaction,oldAuthorization])],{"8.0": renames})
+    return CompiledVersion.CompiledVersion(xsd,xsd.versions,"12.0"),CompiledVersion.CompiledVersion(xsd,xsd.versions,"8.0")
+
+"""
+Converts a document from 12.0 to 8.0. Returns the converter and the
+converted document without the XML declaration.
+"""
+def convertDocument(document):
+    output = io.BytesIO()
+    sourceVersion,targetVersion = createCompiledVersions()
+    converter = XMLDownConverter.convert(io.BytesIO(document.encode("utf8")),output,sourceVersion,targetVersion)
+    return converter,output.getvalue().decode("utf8").split("\n",1)[1]
+
+
+
+class XMLDownConverterTests(unittest.TestCase):
+    """
+    Tests converting a document to an older version.
+    """
+    def testConvert(self):
+        document = "<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\" version=\"12.0\" newAttribute=\"1\">" \
+            "<authorization id=\"1\"><amount>100</amount><orderSource>ecommerce</orderSource><newField><value>1</value></newField></authorization>" \
+            "<authorization id=\"2\"><amount>200</amount><orderSource>applepay</orderSource></authorization><unknown/></cnpOnlineRequest>"
+        converter,output = convertDocument(document)
+        self.assertEqual(output,"<litleOnlineRequest xmlns=\"http://www.litle.com/schema\" version=\"8.0\">" \
+            "<authorization id=\"1\"><amount>100</amount><orderSource>ecommerce</orderSource></authorization>" \
+            "<authorization id=\"2\"><amount>200</amount></authorization></litleOnlineRequest>")
+        self.assertEqual(converter.droppedElements,2)
+        self.assertEqual(converter.droppedAttributes,1)
+        self.assertEqual(converter.droppedValues,1)
+
+    """
+    Tests dropping enum values that don't exist in the target version.
+    """
+    def testConvertEnumValues(self):
+        document = "<cnpOnlineRequest version=\"12.0\">" \
+            "<authorization id=\"1\" channel=\"applepay\"><orderSource>applepay</orderSource><amount>1</amount></authorization>" \
+            "<authorization id=\"2\" channel=\"ecommerce\"><orderSource>unknown</orderSource></authorization></cnpOnlineRequest>"
+        converter,output = convertDocument(document)
+        self.assertEqual(output,"<litleOnlineRequest version=\"8.0\">" \
+            "<authorization id=\"1\"><amount>1</amount></authorization>" \
+            "<authorization id=\"2\" channel=\"ecommerce\"/></litleOnlineRequest>")
+        self.assertEqual(converter.droppedValues,3)
+        self.assertEqual(converter.droppedElements,0)
+
+    """
+    Tests dropping a removed element with nested children.
+    """
+    def testConvertRemovedNestedElement(self):
+        document = "<cnpOnlineRequest version=\"12.0\"><authorization id=\"1\">" \
+            "<newField><amount>5</amount><newField><orderSource>ecommerce</orderSource></newField>text</newField>" \
+            "<amount>100</amount></authorization></cnpOnlineRequest>"
+        converter,output = convertDocument(document)
+        self.assertEqual(output,"<litleOnlineRequest version=\"8.0\"><authorization id=\"1\"><amount>100</amount></authorization></litleOnlineRequest>")
+        self.assertEqual(converter.droppedElements,1)
+        self.assertEqual(converter.droppedValues,0)
+
+    """
+    Tests converting renamed attributes.
+    """
+    def testConvertRenamedAttributes(self):
+        document = "<cnp:cnpOnlineRequest xmlns:cnp=\"http://www.vantivcnp.com/schema\" version=\"12.0\">" \
+            "<cnp:authorization id=\"1\" customerReportGroup=\"group\" cnp:channel=\"ecommerce\"/></cnp:cnpOnlineRequest>"
+        converter,output = convertDocument(document)
+        self.assertEqual(output,"<cnp:litleOnlineRequest xmlns:cnp=\"http://www.litle.com/schema\" version=\"8.0\">" \
+            "<cnp:authorization id=\"1\" reportGroup=\"group\" cnp:channel=\"ecommerce\"/></cnp:litleOnlineRequest>")
+        self.assertEqual(converter.droppedAttributes,0)
+
+    """
+    Tests keeping the attributes from other namespaces.
+    """
+    def testConvertNamespacedAttributes(self):
+        document = "<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\" xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\" xsi:schemaLocation=\"http://www.vantivcnp.com/schema schema.xsd\" version=\"12.0\">" \
+            "<authorization xmlns:ext=\"urn:extension\" id=\"1\" ext:trace=\"abc\" xml:lang=\"en\"><amount xsi:nil=\"false\">1</amount></authorization>" \
+            "<authorization id=\"2\" newAttribute=\"1\"/></cnpOnlineRequest>"
+        converter,output = convertDocument(document)
+        self.assertEqual(output,"<litleOnlineRequest xmlns=\"http://www.litle.com/schema\" xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\" xsi:schemaLocation=\"http://www.vantivcnp.com/schema schema.xsd\" version=\"8.0\">" \
+            "<authorization xmlns:ext=\"urn:extension\" id=\"1\" ext:trace=\"abc\" xml:lang=\"en\"><amount xsi:nil=\"false\">1</amount></authorization>" \
+            "<authorization id=\"2\"/></litleOnlineRequest>")
+        self.assertEqual(converter.droppedAttributes,1)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
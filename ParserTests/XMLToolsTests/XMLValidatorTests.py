@@ -0,0 +1,114 @@
+"""
+Zachary Cook
+
+Tests the XML validator.
+"""
+
+import io
+import unittest
+from Parser.XMLTools import XMLValidator
+from Parser.XSDParser import XSDData
+from ParserTests import TestSchemas
+
+PAYPAL_DOCUMENT = "<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\" version=\"12.0\" merchantId=\"1\"><authentication><user>user</user><password>password</password></authentication>" \
+    "<authorization id=\"1\" reportGroup=\"group\"><orderId>1</orderId><amount>100</amount><orderSource>ecommerce</orderSource>" \
+    "<paypal><payerId>1</payerId><token>2</token><transactionId>3</transactionId></paypal></authorization></cnpOnlineRequest>"
+
+
+
+"""
+Creates a compiled version for testing.
+"""
+def createCompiledVersion():
+    # Create the types.
+    enum = XSDData.XSDSimpleType("orderSourceType","string")
+    enum.addEnumeration("ecommerce")
+    enum.addEnumeration("recurring")
+    transactionType = XSDData.XSDComplexType("transactionType",None)
+    transactionType.childItems = [XSDData.XSDAttribute("id","string",True)]
+    transaction = XSDData.XSDComplexType("transaction","transactionType")
+    authorization = XSDData.XSDComplexType("authorization","transactionType")
+    authorization.childItems = [XSDData.XSDChildElement("amount","integer",minOccurrences=1),XSDData.XSDChildElement("orderSource","orderSourceType"),XSDData.XSDChildElement("allowPartialAuth","boolean")]
+    request = XSDData.XSDComplexType("cnpOnlineRequest",None)
+    request.childItems = [XSDData.XSDChildElement("transaction","transactionType",maxOccurrences=2),XSDData.XSDAttribute("merchantId","string")]
+
+    # Compile the types.
+    return TestSchemas.createCompiledVersion([("12.0",[enum,request,transactionType,transaction,authorization])],"12.0")
+
+"""
+Validates a document string.
+"""
+def validate(document,checkMinOccurences=False):
+    validator = XMLValidator.XMLValidator(createCompiledVersion(),checkMinOccurences)
+    return validator.validate(io.BytesIO(document.encode("utf8")),"test.xml")
+
+
+
+class XMLValidatorTests(unittest.TestCase):
+    """
+    Tests validating a valid document.
+    """
+    def testValidDocument(self):
+        result = validate("<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\" merchantId=\"1\"><authorization id=\"1\"><amount>100</amount><orderSource>ecommerce</orderSource><allowPartialAuth>true</allowPartialAuth></authorization></cnpOnlineRequest>")
+        self.assertEqual(result.errors,[])
+        self.assertTrue(result.isValid())
+        self.assertEqual(result.elementCount,5)
+
+    """
+    Tests validating the children of a type that is used with a different
+    case than the parser stored it with. The payPal type of
+    authorization/paypal is merged with the paypal element of credit.
+    """
+    def testMergedTypes(self):
+        compiledVersion = TestSchemas.loadCompiledVersion("12.0")
+        self.assertEqual(compiledVersion.types["authorization"].children["paypal"].type,"paypal")
+        self.assertEqual(compiledVersion.getTypeName("payPal"),"paypal")
+        self.assertEqual(compiledVersion.getTypeName("string"),"string")
+
+        # Assert the fields store the types they were declared with.
+        self.assertEqual(compiledVersion.types["authorization"].children["paypal"].declaredType,"payPal")
+        self.assertEqual(compiledVersion.types["credit"].children["paypal"].declaredType,"paypal")
+        self.assertEqual([(field.wireName,field.declarations) for field in compiledVersion.types["paypal"].fields],[("payerId",("paypal","payPal")),("payerEmail",("paypal",)),("token",("payPal",)),("transactionId",("payPal",))])
+
+        # Assert the children of paypal are validated.
+        validator = XMLValidator.XMLValidator(compiledVersion,True,True)
+        invalidDocument = PAYPAL_DOCUMENT.replace("<token>2</token>","<bogus>2</bogus>")
+        self.assertEqual(validator.validate(io.BytesIO(PAYPAL_DOCUMENT.encode("utf8")),"test.xml").errors,[])
+        self.assertEqual(validator.validate(io.BytesIO(invalidDocument.encode("utf8")),"test.xml").errors,["/cnpOnlineRequest/authorization/paypal/bogus: Unknown element bogus in paypal"])
+
+        # Assert the schema agrees if it can be checked.
+        if TestSchemas.hasSchemaChecker():
+            self.assertEqual(TestSchemas.checkDocument(PAYPAL_DOCUMENT,TestSchemas.getSchemaFileName("12.0")),"")
+            self.assertNotEqual(TestSchemas.checkDocument(invalidDocument,TestSchemas.getSchemaFileName("12.0")),"")
+
+    """
+    Tests validating an invalid document.
+    """
+    def testInvalidDocument(self):
+        result = validate("<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\" merchantId=\"1\" unknown=\"2\"><authorization><amount>1a</amount><orderSource>other</orderSource><allowPartialAuth>yes</allowPartialAuth><unknown/></authorization>" \
+            "<transaction id=\"2\"/><transaction id=\"3\"/></cnpOnlineRequest>")
+        self.assertEqual(result.errors,[
+            "/cnpOnlineRequest: Unknown attribute unknown",
+            "/cnpOnlineRequest/authorization: Missing required attribute id",
+            "/cnpOnlineRequest/authorization/amount: Invalid integer \"1a\" for amount",
+            "/cnpOnlineRequest/authorization/orderSource: Invalid value \"other\" for orderSource (orderSourceType)",
+            "/cnpOnlineRequest/authorization/allowPartialAuth: Invalid boolean \"yes\" for allowPartialAuth",
+            "/cnpOnlineRequest/authorization/unknown: Unknown element unknown in authorization",
+            "/cnpOnlineRequest: Too many transaction elements (3 > 2)",
+        ])
+
+    """
+    Tests validating the minimum occurrences.
+    """
+    def testMinOccurences(self):
+        document = "<cnpOnlineRequest xmlns=\"http://www.vantivcnp.com/schema\"><authorization id=\"1\"/></cnpOnlineRequest>"
+        self.assertTrue(validate(document).isValid())
+        self.assertEqual(validate(document,True).errors,["/cnpOnlineRequest/authorization: Too few amount elements (0 < 1)"])
+
+    """
+    Tests validating a document that can't be parsed.
+    """
+    def testUnparsableDocument(self):
+        result = validate("<cnpOnlineRequest>")
+        self.assertFalse(result.isValid())
+        self.assertIn("Unable to parse document",result.errors[0])
@@ -0,0 +1,80 @@
+"""
+Zachary Cook
+
+Tests the presence matrix.
+"""
+
+import importlib.util
+import unittest
+from Parser.XSDParser import PresenceMatrix, XSDData
+from ParserTests import TestSchemas
+
+
+
+"""
+Creates a presence matrix with 3 versions for testing.
+"""
+def createPresenceMatrix():
+    # Create the types.
+    enum1 = XSDData.XSDSimpleType("orderSourceType","string")
+    enum1.addEnumeration("ecommerce")
+    enum1.addEnumeration("telephone")
+    enum2 = XSDData.XSDSimpleType("orderSourceType","string")
+    enum2.addEnumeration("ecommerce")
+    enum2.addEnumeration("applepay")
+    request1 = XSDData.XSDComplexType("litleOnlineRequest",None)
+    request1.childItems = [XSDData.XSDAttribute("version","string"),XSDData.XSDChildElement("oldField","string")]
+    request2 = XSDData.XSDComplexType("cnpOnlineRequest",None)
+    request2.childItems = [XSDData.XSDAttribute("version","string"),XSDData.XSDChildElement("newField","string")]
+
+    # Create the matrix.
+    xsd = TestSchemas.createVersionedXSD([("1.2",[enum2,request2]),("1.1",[enum2,request2]),("1.0",[enum1,request1])])
+    return PresenceMatrix.PresenceMatrix(xsd,xsd.versions)
+
+
+
+class PresenceMatrixTests(unittest.TestCase):
+    """
+    Tests getting the added, removed, and renamed items.
+    """
+    def testGetChanges(self):
+        presenceMatrix = createPresenceMatrix()
+        self.assertEqual(presenceMatrix.getAdded("1.0","1.1"),[("child","cnpOnlineRequest","newField"),("enumValue","orderSourceType","applepay")])
+        self.assertEqual(presenceMatrix.getRemoved("1.0","1.1","child"),[("child","cnpOnlineRequest","oldField")])
+        self.assertEqual(presenceMatrix.getAdded("1.1","1.2"),[])
+        self.assertEqual(presenceMatrix.getRenamed("1.0","1.2"),[(("complexType","cnpOnlineRequest",None),"litleOnlineRequest","cnpOnlineRequest")])
+        self.assertEqual(presenceMatrix.getName(0,"1.0"),"litleOnlineRequest")
+        self.assertEqual(presenceMatrix.getName(3,"1.1"),None)
+
+    """
+    Tests getting the counts of the items.
+    """
+    def testGetCounts(self):
+        presenceMatrix = createPresenceMatrix()
+        self.assertEqual(presenceMatrix.getCounts(),{"1.0": 6,"1.1": 6,"1.2": 6})
+        self.assertEqual(presenceMatrix.getCounts("enumValue"),{"1.0": 2,"1.1": 2,"1.2": 2})
+        self.assertEqual(presenceMatrix.getChangeCounts(),[("1.1",2,2),("1.2",0,0)])
+
+    """
+    Tests getting the items in ranges of versions.
+    """
+    def testGetPresentInRange(self):
+        presenceMatrix = createPresenceMatrix()
+        self.assertEqual(presenceMatrix.getPresentInAll("1.0","1.2","enumValue"),[("enumValue","orderSourceType","ecommerce")])
+        self.assertEqual(presenceMatrix.getPresentInAll("1.1","1.2","enumValue"),[("enumValue","orderSourceType","ecommerce"),("enumValue","orderSourceType","applepay")])
+        self.assertEqual(presenceMatrix.getPresentInAny("1.0","1.2","child"),[("child","cnpOnlineRequest","version"),("child","cnpOnlineRequest","newField"),("child","cnpOnlineRequest","oldField")])
+
+    """
+    Tests exporting the matrix to NumPy.
+    """
+    @unittest.skipUnless(importlib.util.find_spec("numpy"),"NumPy is not installed")
+    def testToNumpy(self):
+        matrix = createPresenceMatrix().toNumpy()
+        self.assertEqual(matrix.shape,(8,3))
+        self.assertEqual(matrix[2].tolist(),[False,True,True])
+        self.assertEqual(matrix[3].tolist(),[True,False,False])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
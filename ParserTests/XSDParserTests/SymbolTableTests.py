@@ -0,0 +1,74 @@
+"""
+Zachary Cook
+
+Tests the symbol table.
+"""
+
+import unittest
+from Parser.XSDParser import SymbolTable, XSDData, XSDParser
+
+
+
+class SymbolTableTests(unittest.TestCase):
+    """
+    Tests getting the ids of names.
+    """
+    def testGetId(self):
+        symbols = SymbolTable.SymbolTable()
+        self.assertEqual(symbols.getId("authorization"),0)
+        self.assertEqual(symbols.getId("sale"),1)
+        self.assertEqual(symbols.getId("authorization"),0)
+        self.assertEqual(symbols.getName(1),"sale")
+        self.assertEqual(len(symbols),2)
+
+        # Assert the names are interned.
+        name = "".join(["author","ization"])
+        self.assertIsNot(name,symbols.getName(0))
+        self.assertIs(symbols.intern(name),symbols.getName(0))
+
+        # Assert names that only differ by case have the same folded id.
+        self.assertEqual(symbols.getFoldedId("PayPal"),symbols.getFoldedId("payPal"))
+        self.assertEqual(symbols.getName(symbols.getFoldedId("PayPal")),"paypal")
+        self.assertNotEqual(symbols.getFoldedId("payPal"),symbols.getFoldedId("sale"))
+
+    """
+    Tests the parsed XSDs sharing the names of a symbol table and looking
+    up the types by id.
+    """
+    def testParsedNames(self):
+        xsdText = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>" \
+                  "<xs:schema targetNamespace=\"http://www.vantivcnp.com/schema\" xmlns:xp=\"http://www.vantivcnp.com/schema\" xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" elementFormDefault=\"qualified\">" \
+                  "    <xs:complexType name=\"customType\">" \
+                  "        <xs:sequence>" \
+                  "            <xs:element name=\"customElement\" type=\"xs:string\" />" \
+                  "        </xs:sequence>" \
+                  "    </xs:complexType>" \
+                  "</xs:schema>"
+
+        # Parse the XSD twice with a table and assert the names are the same objects.
+        symbols = SymbolTable.SymbolTable()
+        xsd1 = XSDParser.processXSD(xsdText,None,None,symbols)
+        symbolCount = len(symbols)
+        xsd2 = XSDParser.processXSD(xsdText,None,None,symbols)
+        self.assertIs(xsd1.symbols,symbols)
+        self.assertIs(xsd1.types[0].name,xsd2.types[0].name)
+        self.assertIs(xsd1.types[0].childItems[0].childItems[0].name,xsd2.types[0].childItems[0].childItems[0].name)
+        self.assertEqual(len(symbols),symbolCount)
+
+        # Assert XSDs parsed without a table don't share one.
+        xsd3 = XSDParser.processXSD(xsdText)
+        self.assertIsNot(xsd3.symbols,symbols)
+        self.assertIsNot(XSDParser.processXSD(xsdText).symbols,xsd3.symbols)
+
+        # Assert the types are found without the case and removed.
+        self.assertIs(xsd1.getType("CUSTOMTYPE"),xsd1.types[0])
+        self.assertIsNone(xsd1.getType("otherType"))
+        xsd1.removeType(xsd1.types[0])
+        self.assertIsNone(xsd1.getType("customType"))
+        xsd1.addType(XSDData.XSDSimpleType("customType","string"))
+        self.assertIsInstance(xsd1.getType("customType"),XSDData.XSDSimpleType)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Zachary Cook
+
+Tests the parser diagnostics.
+"""
+
+import unittest
+from Parser.XSDParser import XSDDiagnostics, XSDParser
+
+
+
+class DiagnosticCollectorTests(unittest.TestCase):
+    """
+    Tests adding and rendering diagnostics.
+    """
+    def testRender(self):
+        # Add the diagnostics.
+        diagnostics = XSDDiagnostics.DiagnosticCollector()
+        self.assertEqual(diagnostics.getSummary(),"No parser diagnostics")
+        diagnostics.add("info","mergedType","test.xsd","payPal",name="payPal")
+        diagnostics.add("warning","unsupportedSchemaTag","test.xsd",tagName="group")
+        diagnostics.add("info","mergedType",name="payPal")
+
+        # Assert the diagnostics are correct.
+        self.assertEqual(diagnostics.getLevelCounts(),{"info": 2,"warning": 1})
+        self.assertEqual(diagnostics.getSummary(),"3 parser diagnostics (2 info, 1 warning): unsupportedSchemaTag x1, mergedType x2")
+        self.assertEqual(diagnostics.render("warning"),"warning [unsupportedSchemaTag] test.xsd: Unsupported tag of group")
+        self.assertEqual(diagnostics.render().split("\n")[0],"info [mergedType] test.xsd (payPal): Basic type already exists; merging payPal")
+        self.assertEqual(diagnostics.diagnostics[2].getLocation(),"<string>")
+
+        # Assert the diagnostics of another collector can be added.
+        otherDiagnostics = XSDDiagnostics.DiagnosticCollector()
+        otherDiagnostics.add("error","unknownElementType")
+        otherDiagnostics.extend(diagnostics)
+        self.assertEqual(len(otherDiagnostics.getDiagnostics("info")),4)
+        self.assertEqual(otherDiagnostics.getLevelCounts(),{"info": 2,"warning": 1,"error": 1})
+
+    """
+    Tests the diagnostics of the parser.
+    """
+    def testParserDiagnostics(self):
+        xsdText = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>" \
+                  "<xs:schema targetNamespace=\"http://www.vantivcnp.com/schema\" xmlns:xp=\"http://www.vantivcnp.com/schema\" xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" elementFormDefault=\"qualified\">" \
+                  "    <xs:complexType name=\"customType\">" \
+                  "        <xs:sequence>" \
+                  "            <xs:any />" \
+                  "        </xs:sequence>" \
+                  "        <xs:attribute name=\"id\" type=\"xs:string\" use=\"prohibited\" />" \
+                  "    </xs:complexType>" \
+                  "    <xs:simpleType name=\"customSimpleType\">" \
+                  "        <xs:restriction base=\"xs:string\" />" \
+                  "    </xs:simpleType>" \
+                  "    <xs:simpleType name=\"customSimpleType\">" \
+                  "        <xs:restriction base=\"xs:string\" />" \
+                  "    </xs:simpleType>" \
+                  "</xs:schema>"
+
+        # Parse the XSD text and assert the diagnostics are correct.
+        diagnostics = XSDDiagnostics.DiagnosticCollector()
+        XSDParser.processXSD(xsdText,diagnostics,"test.xsd")
+        self.assertEqual([(diagnostic.level,diagnostic.code,diagnostic.typeName) for diagnostic in diagnostics.diagnostics],[
+            ("warning","unsupportedTag","customType"),
+            ("warning","unknownAttributeUse","customType"),
+            ("info","mergedType",None),
+        ])
+        self.assertTrue(diagnostics.diagnostics[0].getMessage().startswith("Unable to process \"any\": "))
+        self.assertIn("<xs:any xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" />",diagnostics.diagnostics[0].getMessage())
+        self.assertEqual(diagnostics.diagnostics[1].render(),"warning [unknownAttributeUse] test.xsd (customType): Unknown use attribute: prohibited")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
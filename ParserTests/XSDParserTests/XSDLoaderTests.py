@@ -0,0 +1,121 @@
+"""
+Zachary Cook
+
+Tests loading XSDs from directories and archives.
+"""
+
+import gzip
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from Parser.XSDParser import XSDLoader
+
+
+
+"""
+Returns the text of an XSD with an enum of the values.
+"""
+def createXSDText(values):
+    xsdText = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>" \
+        "<xs:schema targetNamespace=\"http://www.vantivcnp.com/schema\" xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" elementFormDefault=\"qualified\">" \
+        "<xs:simpleType name=\"orderSourceType\"><xs:restriction base=\"xs:string\">"
+    for value in values:
+        xsdText += "<xs:enumeration value=\"" + value + "\" />"
+
+    return xsdText + "</xs:restriction></xs:simpleType></xs:schema>"
+
+XSD_FILES = {
+    "SchemaCombined_v8.0.xsd": createXSDText(["ecommerce"]),
+    "SchemaCombined_v10.0.xsd": createXSDText(["ecommerce","applepay"]),
+    "SchemaCombined_v9.0.xsd": createXSDText(["ecommerce","telephone"]),
+}
+
+
+
+class XSDLoaderTests(unittest.TestCase):
+    """
+    Sets up the test.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    """
+    Cleans up the test.
+    """
+    def tearDown(self):
+        self.directory.cleanup()
+
+    """
+    Asserts the XSDs load correctly from a source.
+    """
+    def assertLoads(self,source):
+        versionedXSD,versions = XSDLoader.loadVersionedXSD(source,False)
+        self.assertEqual(versions,["8.0","9.0","10.0"])
+        self.assertEqual(versionedXSD.at("9.0").getEnumValues("orderSourceType"),frozenset(["ecommerce","telephone"]))
+        self.assertEqual(versionedXSD.at("10.0").getEnumValues("orderSourceType"),frozenset(["ecommerce","applepay"]))
+
+    """
+    Tests loading a directory with plain and gzipped files.
+    """
+    def testLoadDirectory(self):
+        for fileName in XSD_FILES.keys():
+            if fileName == "SchemaCombined_v9.0.xsd":
+                with gzip.open(os.path.join(self.directory.name,fileName + ".gz"),"wt") as file:
+                    file.write(XSD_FILES[fileName])
+            else:
+                with open(os.path.join(self.directory.name,fileName),"w") as file:
+                    file.write(XSD_FILES[fileName])
+        with open(os.path.join(self.directory.name,"README.txt"),"w") as file:
+            file.write("Not a schema")
+        self.assertLoads(self.directory.name)
+
+    """
+    Tests loading a zip archive.
+    """
+    def testLoadZip(self):
+        fileName = os.path.join(self.directory.name,"xsd.zip")
+        with zipfile.ZipFile(fileName,"w",zipfile.ZIP_DEFLATED) as archive:
+            for memberName in XSD_FILES.keys():
+                archive.writestr("xsd/" + memberName,XSD_FILES[memberName])
+        self.assertLoads(fileName)
+
+    """
+    Tests loading a gzipped tar archive.
+    """
+    def testLoadTar(self):
+        fileName = os.path.join(self.directory.name,"xsd.tar.gz")
+        with tarfile.open(fileName,"w:gz") as archive:
+            for memberName in XSD_FILES.keys():
+                contents = XSD_FILES[memberName].encode("utf8")
+                member = tarfile.TarInfo("xsd/" + memberName)
+                member.size = len(contents)
+                archive.addfile(member,io.BytesIO(contents))
+        self.assertLoads(fileName)
+
+    """
+    Tests the versions of a load sharing their names without sharing
+    them with other loads.
+    """
+    def testLoadSymbols(self):
+        for fileName in XSD_FILES.keys():
+            with open(os.path.join(self.directory.name,fileName),"w") as file:
+                file.write(XSD_FILES[fileName])
+        versionedXSD1,versions = XSDLoader.loadVersionedXSD(self.directory.name,False)
+        versionedXSD2,versions = XSDLoader.loadVersionedXSD(self.directory.name,False)
+        value = list(versionedXSD1.at("8.0").getEnumValues("orderSourceType"))[0]
+        self.assertIs([otherValue for otherValue in versionedXSD1.at("10.0").getEnumValues("orderSourceType") if otherValue == value][0],value)
+        self.assertIsNot(list(versionedXSD2.at("8.0").getEnumValues("orderSourceType"))[0],value)
+
+    """
+    Tests loading an unsupported source.
+    """
+    def testLoadUnsupported(self):
+        self.assertRaises(ValueError,XSDLoader.loadVersionedXSD,os.path.join(self.directory.name,"xsd.rar"),False)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -139,13 +139,13 @@ class XSDParserTests(unittest.TestCase):
         self.assertEqual(element.childItems[0].childItems[0].name,"user")
         self.assertEqual(element.childItems[0].childItems[0].type,"string20Type")
         self.assertEqual(element.childItems[0].childItems[0].default,None)
-        self.assertEqual(element.childItems[0].childItems[0].minOccurrences,0)
+        self.assertEqual(element.childItems[0].childItems[0].minOccurrences,1)
         self.assertEqual(element.childItems[0].childItems[0].maxOccurrences,1)
         self.assertIsInstance(element.childItems[0].childItems[1],XSDData.XSDChildElement)
         self.assertEqual(element.childItems[0].childItems[1].name,"password")
         self.assertEqual(element.childItems[0].childItems[1].type,"string20Type")
         self.assertEqual(element.childItems[0].childItems[1].default,None)
-        self.assertEqual(element.childItems[0].childItems[1].minOccurrences,0)
+        self.assertEqual(element.childItems[0].childItems[1].minOccurrences,1)
         self.assertEqual(element.childItems[0].childItems[1].maxOccurrences,1)
 
     """
@@ -237,6 +237,53 @@ class XSDParserTests(unittest.TestCase):
         self.assertEqual(complexType.base,None)
         self.assertEqual(len(complexType.childItems),2)
 
+    """
+    Tests merging complex types with names that only differ in case.
+    """
+    def testMergeComplexTypeDeclarations(self):
+        xsdText = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>" \
+                  "<xs:schema targetNamespace=\"http://www.vantivcnp.com/schema\" xmlns:xp=\"http://www.vantivcnp.com/schema\" xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" elementFormDefault=\"qualified\">" \
+                  "    <xs:element name=\"paypal\">" \
+                  "        <xs:complexType>" \
+                  "            <xs:choice>" \
+                  "                <xs:element name=\"payerId\" type=\"xs:string\" />" \
+                  "                <xs:element name=\"payerEmail\" type=\"xs:string\" />" \
+                  "            </xs:choice>" \
+                  "        </xs:complexType>" \
+                  "    </xs:element>" \
+                  "    <xs:complexType name=\"payPal\">" \
+                  "        <xs:sequence>" \
+                  "            <xs:element name=\"payerId\" type=\"xs:string\" />" \
+                  "            <xs:element name=\"token\" type=\"xs:string\" minOccurs=\"0\" />" \
+                  "        </xs:sequence>" \
+                  "        <xs:attribute name=\"id\" type=\"xs:string\" />" \
+                  "    </xs:complexType>" \
+                  "    <xs:complexType name=\"authentication\">" \
+                  "        <xs:sequence>" \
+                  "            <xs:element name=\"user\" type=\"xs:string\" />" \
+                  "        </xs:sequence>" \
+                  "    </xs:complexType>" \
+                  "    <xs:complexType name=\"authentication\">" \
+                  "        <xs:sequence>" \
+                  "            <xs:element name=\"password\" type=\"xs:string\" />" \
+                  "        </xs:sequence>" \
+                  "    </xs:complexType>" \
+                  "</xs:schema>"
+
+        # Parse the XSD text and assert the children store the names of the types that declare them.
+        # Types that are merged with the same name don't store them.
+        xsd = XSDParser.flattenXSD(XSDParser.processXSD(xsdText))
+        complexType = xsd.getType("payPal")
+        self.assertEqual(complexType.name,"paypal")
+        self.assertEqual([(item.name,item.declarations) for item in complexType.childItems],[
+            ("payerId",("paypal","payPal")),
+            ("payerEmail",("paypal",)),
+            ("token",("payPal",)),
+            ("id",("payPal",)),
+        ])
+        self.assertEqual([(item.minOccurrences,item.choices) for item in complexType.childItems[:3]],[(1,((0,0,0),)),(1,((0,1,1),)),(0,())])
+        self.assertEqual([item.declarations for item in xsd.getType("authentication").childItems],[(),()])
+
     """
     Tests attributes being required and optional.
     """
@@ -306,7 +353,7 @@ class XSDParserTests(unittest.TestCase):
         self.assertEqual(element.childItems[0].childItems[1].name,"password")
         self.assertEqual(element.childItems[0].childItems[1].type,"string20Type")
         self.assertEqual(element.childItems[0].childItems[1].default,None)
-        self.assertEqual(element.childItems[0].childItems[1].minOccurrences,0)
+        self.assertEqual(element.childItems[0].childItems[1].minOccurrences,1)
         self.assertEqual(element.childItems[0].childItems[1].maxOccurrences,(2 ** 31) - 1)
 
     """
@@ -342,7 +389,7 @@ class XSDParserTests(unittest.TestCase):
         self.assertEqual(element.childItems[0].childItems[1].name,"attribute2")
         self.assertEqual(element.childItems[0].childItems[1].type,"string20Type")
         self.assertEqual(element.childItems[0].childItems[1].default,"value2")
-        self.assertEqual(element.childItems[0].childItems[1].minOccurrences,0)
+        self.assertEqual(element.childItems[0].childItems[1].minOccurrences,1)
         self.assertEqual(element.childItems[0].childItems[1].maxOccurrences,1)
 
     """
@@ -405,7 +452,7 @@ class XSDParserTests(unittest.TestCase):
         self.assertEqual(element.childItems[0].childItems[0].name,"customType")
         self.assertEqual(element.childItems[0].childItems[0].type,"customType")
         self.assertEqual(element.childItems[0].childItems[0].default,None)
-        self.assertEqual(element.childItems[0].childItems[0].minOccurrences,0)
+        self.assertEqual(element.childItems[0].childItems[0].minOccurrences,1)
         self.assertEqual(element.childItems[0].childItems[0].maxOccurrences,1)
 
     """
@@ -435,7 +482,7 @@ class XSDParserTests(unittest.TestCase):
         self.assertEqual(element.childItems[0].childItems[0].name,"customSubElement")
         self.assertEqual(element.childItems[0].childItems[0].type,"customSubElement")
         self.assertEqual(element.childItems[0].childItems[0].default,None)
-        self.assertEqual(element.childItems[0].childItems[0].minOccurrences,0)
+        self.assertEqual(element.childItems[0].childItems[0].minOccurrences,1)
         self.assertEqual(element.childItems[0].childItems[0].maxOccurrences,1)
 
     """
@@ -604,6 +651,10 @@ class XSDParserTests(unittest.TestCase):
         self.assertEqual(simpleEnum.childItems[2].type,"integer")
         self.assertEqual(simpleEnum.childItems[3].type,"testSimpleType4")
         self.assertEqual(simpleEnum.childItems[4].type,"testSimpleType5")
+        self.assertEqual(simpleEnum.childItems[0].restrictions,{"minLength": "1"})
+        self.assertEqual(simpleEnum.childItems[2].restrictions,{"minLength": "1"})
+        self.assertEqual(simpleEnum.childItems[3].restrictions,{})
+        self.assertEqual(simpleEnum.childItems[4].restrictions,{})
 
     """
     Tests the compressXSD method with element references.
@@ -651,4 +702,138 @@ class XSDParserTests(unittest.TestCase):
         self.assertEqual(simpleEnum.childItems[0].type,"type1")
         self.assertEqual(simpleEnum.childItems[1].type,"type2")
         self.assertEqual(simpleEnum.childItems[2].type,"type1")
-        self.assertEqual(simpleEnum.childItems[3].type,"type1")
\ No newline at end of file
+        self.assertEqual(simpleEnum.childItems[3].type,"type1")
+
+    """
+    Tests the base of a complex type being the extension before the restriction.
+    """
+    def testComplexTypeBase(self):
+        xsdText = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>" \
+                  "<xs:schema targetNamespace=\"http://www.vantivcnp.com/schema\" xmlns:xp=\"http://www.vantivcnp.com/schema\" xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" elementFormDefault=\"qualified\">" \
+                  "    <xs:complexType name=\"restrictedType\">" \
+                  "        <xs:complexContent>" \
+                  "            <xs:restriction base=\"xp:baseType1\">" \
+                  "                <xs:attribute name=\"id\" type=\"xs:string\" />" \
+                  "            </xs:restriction>" \
+                  "        </xs:complexContent>" \
+                  "    </xs:complexType>" \
+                  "    <xs:complexType name=\"extendedType\">" \
+                  "        <xs:sequence>" \
+                  "            <xs:element name=\"inlineType\">" \
+                  "                <xs:complexType>" \
+                  "                    <xs:complexContent>" \
+                  "                        <xs:extension base=\"xp:baseType3\" />" \
+                  "                    </xs:complexContent>" \
+                  "                </xs:complexType>" \
+                  "            </xs:element>" \
+                  "        </xs:sequence>" \
+                  "        <xs:complexContent>" \
+                  "            <xs:restriction base=\"xp:baseType1\" />" \
+                  "        </xs:complexContent>" \
+                  "        <xs:complexContent>" \
+                  "            <xs:extension base=\"xp:baseType2\">" \
+                  "                <xs:attribute name=\"id\" type=\"xs:string\" />" \
+                  "            </xs:extension>" \
+                  "        </xs:complexContent>" \
+                  "    </xs:complexType>" \
+                  "</xs:schema>"
+
+        # Parse the XSD text and assert the bases are correct.
+        xsd = XSDParser.processXSD(xsdText)
+        self.assertEqual(xsd.getType("restrictedType").base,"baseType1")
+        self.assertEqual(xsd.getType("restrictedType").childItems[0].name,"id")
+        self.assertEqual(xsd.getType("extendedType").base,"baseType2")
+        self.assertEqual(xsd.getType("inlineType").base,"baseType3")
+        self.assertEqual([type(item) for item in xsd.getType("extendedType").childItems],[XSDData.XSDGroup,XSDData.XSDAttribute])
+
+    """
+    Tests flattening the elements of choices and optional groups.
+    """
+    def testFlattenOptionalGroups(self):
+        xsdText = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>" \
+                  "<xs:schema targetNamespace=\"http://www.vantivcnp.com/schema\" xmlns:xp=\"http://www.vantivcnp.com/schema\" xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" elementFormDefault=\"qualified\">" \
+                  "    <xs:complexType name=\"customType\">" \
+                  "        <xs:sequence>" \
+                  "            <xs:element name=\"element1\" type=\"xs:string\"/>" \
+                  "            <xs:choice>" \
+                  "                <xs:element name=\"element2\" type=\"xs:string\"/>" \
+                  "                <xs:sequence>" \
+                  "                    <xs:element name=\"element3\" type=\"xs:string\" minOccurs=\"2\"/>" \
+                  "                </xs:sequence>" \
+                  "            </xs:choice>" \
+                  "            <xs:choice>" \
+                  "                <xs:element name=\"element4\" type=\"xs:string\"/>" \
+                  "            </xs:choice>" \
+                  "            <xs:sequence minOccurs=\"0\">" \
+                  "                <xs:element name=\"element5\" type=\"xs:string\" maxOccurs=\"3\"/>" \
+                  "            </xs:sequence>" \
+                  "            <xs:choice>" \
+                  "                <xs:sequence>" \
+                  "                    <xs:element name=\"element6\" type=\"xs:string\"/>" \
+                  "                    <xs:element name=\"element7\" type=\"xs:string\"/>" \
+                  "                </xs:sequence>" \
+                  "                <xs:sequence>" \
+                  "                    <xs:element name=\"element7\" type=\"xs:string\"/>" \
+                  "                    <xs:element name=\"element6\" type=\"xs:string\"/>" \
+                  "                </xs:sequence>" \
+                  "            </xs:choice>" \
+                  "        </xs:sequence>" \
+                  "    </xs:complexType>" \
+                  "</xs:schema>"
+
+        # Parse the XSD text and assert the optional elements and choices are stored.
+        # Elements in several children of a choice are stored with the positions in each child.
+        xsd = XSDParser.processXSD(xsdText)
+        self.assertEqual(xsd.getType("customType").childItems[0].childItems[1].childItems[1].childItems[0].choices,())
+        complexType = XSDParser.flattenXSD(xsd).getType("customType")
+        self.assertEqual([(item.name,item.minOccurrences,item.maxOccurrences,item.choices) for item in complexType.childItems],[
+            ("element1",1,1,()),
+            ("element2",1,1,((0,0,0),)),
+            ("element3",2,1,((0,1,1),)),
+            ("element4",1,1,()),
+            ("element5",0,3,()),
+            ("element6",1,1,((1,0,3),(1,1,6))),
+            ("element7",1,1,((1,0,4),(1,1,5))),
+        ])
+
+    """
+    Tests parsing the substitution groups and fixed values of elements.
+    """
+    def testSubstitutionGroups(self):
+        xsdText = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>" \
+                  "<xs:schema targetNamespace=\"http://www.vantivcnp.com/schema\" xmlns:xp=\"http://www.vantivcnp.com/schema\" xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" elementFormDefault=\"qualified\">" \
+                  "    <xs:element name=\"cardOrToken\" abstract=\"true\"/>" \
+                  "    <xs:element name=\"card\" substitutionGroup=\"xp:cardOrToken\" type=\"xp:cardType\"/>" \
+                  "    <xs:complexType name=\"cardType\">" \
+                  "        <xs:sequence>" \
+                  "            <xs:element name=\"type\" type=\"xs:string\" fixed=\"GC\"/>" \
+                  "        </xs:sequence>" \
+                  "        <xs:attribute name=\"id\" type=\"xs:string\" fixed=\"1\"/>" \
+                  "    </xs:complexType>" \
+                  "</xs:schema>"
+
+        # Parse the XSD text and assert the substitution groups and fixed values are stored.
+        xsd = XSDParser.compressXSD(XSDParser.flattenXSD(XSDParser.processXSD(xsdText)))
+        self.assertEqual((xsd.getElement("cardOrToken").substitutionGroup,xsd.getElement("cardOrToken").abstract),(None,True))
+        self.assertEqual((xsd.getElement("card").substitutionGroup,xsd.getElement("card").abstract),("cardOrToken",False))
+        self.assertEqual([item.restrictions for item in xsd.getType("cardType").childItems],[{"fixed": "GC"},{"fixed": "1"}])
+
+    """
+    Tests deeply nested groups, which are deeper than the recursion limit.
+    """
+    def testDeeplyNestedGroups(self):
+        depth = 5000
+        xsdText = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>" \
+                  "<xs:schema targetNamespace=\"http://www.vantivcnp.com/schema\" xmlns:xp=\"http://www.vantivcnp.com/schema\" xmlns:xs=\"http://www.w3.org/2001/XMLSchema\" elementFormDefault=\"qualified\">" \
+                  "    <xs:complexType name=\"nestedType\">" + \
+                  ("<xs:sequence><xs:element name=\"element\" type=\"xs:string\" /><xs:choice>" * depth) + \
+                  ("</xs:choice></xs:sequence>" * depth) + \
+                  "    </xs:complexType>" \
+                  "</xs:schema>"
+
+        # Parse the XSD text and assert all of the children are found.
+        xsd = XSDParser.processXSD(xsdText)
+        group = xsd.getType("nestedType").childItems[0]
+        self.assertEqual(group.type,"sequence")
+        self.assertEqual(len(list(group.getAllChildren())),depth)
+        self.assertEqual(len(xsd.getType("nestedType").flatten().childItems),1)
\ No newline at end of file
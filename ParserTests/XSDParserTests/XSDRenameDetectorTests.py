@@ -0,0 +1,121 @@
+"""
+Zachary Cook
+
+Tests detecting renames between versions.
+"""
+
+import unittest
+from Parser.XSDParser import XSDData, XSDLoader, XSDParser, XSDRenameDetector
+
+
+
+"""
+Creates a parsed XSD of the types.
+"""
+def createXSD(types):
+    xsd = XSDParser.XSD()
+    for xsdType in types:
+        xsd.addType(xsdType)
+
+    return xsd
+
+"""
+Creates a complex type with the children.
+"""
+def createComplexType(name,childItems,base=None):
+    complexType = XSDData.XSDComplexType(name,base)
+    complexType.childItems = childItems
+    return complexType
+
+"""
+Creates an enum with the values.
+"""
+def createEnum(name,values):
+    enum = XSDData.XSDSimpleType(name,"string")
+    for value in values:
+        enum.addEnumeration(value)
+
+    return enum
+
+"""
+Creates the parsed XSDs of three versions with renames.
+"""
+def createXSDs():
+    oldXSD = createXSD([
+        createEnum("methodType",["MC","VI","MasterCard"]),
+        createComplexType("tokenType",[XSDData.XSDChildElement("litleTokenNumber","string"),XSDData.XSDChildElement("expDate","string"),XSDData.XSDChildElement("cardValidationNum","string"),XSDData.XSDChildElement("type","methodType")]),
+        createComplexType("sale",[XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("token","tokenType"),XSDData.XSDAttribute("id","string")]),
+    ])
+    middleXSD = createXSD([
+        createEnum("methodType",["MC","VI","Mastercard"]),
+        createComplexType("cardTokenType",[XSDData.XSDChildElement("litleTokenNumber","string"),XSDData.XSDChildElement("expDate","string"),XSDData.XSDChildElement("cardValidationNum","string"),XSDData.XSDChildElement("type","methodType")]),
+        createComplexType("sale",[XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("token","cardTokenType"),XSDData.XSDAttribute("id","string")]),
+    ])
+    newXSD = createXSD([
+        createEnum("methodType",["MC","VI","Mastercard"]),
+        createComplexType("cardTokenType",[XSDData.XSDChildElement("cnpTokenNumber","string"),XSDData.XSDChildElement("expDate","string"),XSDData.XSDChildElement("cardValidationNum","string"),XSDData.XSDChildElement("type","methodType")]),
+        createComplexType("sale",[XSDData.XSDChildElement("amount","integer"),XSDData.XSDChildElement("token","cardTokenType"),XSDData.XSDAttribute("transactionId","string")]),
+    ])
+    return [oldXSD,middleXSD,newXSD]
+
+
+
+class XSDRenameDetectorTests(unittest.TestCase):
+    """
+    Tests matching the removed items to the added items.
+    """
+    def testFindMatches(self):
+        detector = XSDRenameDetector.RenameDetector(0.3)
+        removedItems = [("type1","orderId",XSDRenameDetector.getNameFeatures("orderId")),("type1","litleSessionId",XSDRenameDetector.getNameFeatures("litleSessionId")),("type2","amount",XSDRenameDetector.getNameFeatures("amount"))]
+        addedItems = [("type1","cnpSessionId",XSDRenameDetector.getNameFeatures("cnpSessionId")),("type1","orderIds",XSDRenameDetector.getNameFeatures("orderIds")),("type1","orderIdentifier",XSDRenameDetector.getNameFeatures("orderIdentifier")),("type1","amount",XSDRenameDetector.getNameFeatures("amount"))]
+        self.assertEqual([match[0:3] for match in detector.findMatches(removedItems,addedItems)],[("type1","orderId","orderIds"),("type1","litleSessionId","cnpSessionId")])
+        self.assertEqual(detector.findMatches(removedItems,[]),[])
+
+    """
+    Tests detecting the renames between two versions.
+    """
+    def testDetectRenames(self):
+        oldXSD,middleXSD,newXSD = createXSDs()
+        detector = XSDRenameDetector.RenameDetector(applyThreshold=0.6)
+        newRenames = detector.detectRenames(middleXSD,newXSD,"2.0","3.0")
+        self.assertEqual(newRenames.typeNames,{})
+        self.assertEqual(newRenames.childNames,{})
+        newRenames.childNames[("cardTokenType","litleTokenNumber")] = "cnpTokenNumber"
+        oldRenames = detector.detectRenames(oldXSD,middleXSD,"1.0","2.0",newRenames)
+        self.assertEqual(oldRenames.typeNames,{"tokenType": "cardTokenType"})
+        self.assertEqual(oldRenames.childNames,{("cardTokenType","litleTokenNumber"): "cnpTokenNumber"})
+        self.assertEqual(oldRenames.enumValues,{("methodType","MasterCard"): "Mastercard"})
+
+        # Assert the renames below the apply threshold are only suggested.
+        self.assertEqual([suggestion.getDescription() for suggestion in detector.suggestions],[
+            "2.0 -> 3.0: child cardTokenType.litleTokenNumber -> cnpTokenNumber (0.57)",
+            "1.0 -> 2.0: complexType tokenType -> cardTokenType (0.74) (applied)",
+            "1.0 -> 2.0: enumValue methodType.MasterCard -> Mastercard (1.0) (applied)",
+        ])
+
+    """
+    Tests merging the versions with the renames.
+    """
+    def testMergeXSDs(self):
+        versionedXSD = XSDLoader.mergeXSDs(createXSDs(),["1.0","2.0","3.0"],False,XSDRenameDetector.RenameDetector(applyThreshold=0.55))
+        self.assertEqual(sorted(versionedXSD.complexTypes.keys()),["cardTokenType","sale"])
+        self.assertEqual([(name.name,name.start,name.end) for name in versionedXSD.complexTypes["cardTokenType"].names],[("tokenType","1.0","1.0"),("cardTokenType","2.0","3.0")])
+        self.assertEqual([(name.name,name.start,name.end) for name in versionedXSD.complexTypes["cardTokenType"].childItems["cnpTokenNumber"].names],[("litleTokenNumber","1.0","2.0"),("cnpTokenNumber","3.0","3.0")])
+        self.assertEqual(versionedXSD.complexTypes["sale"].childItems["token"].type,"cardTokenType")
+        self.assertIn("id",versionedXSD.complexTypes["sale"].childItems.keys())
+        self.assertEqual(versionedXSD.at("1.0").getEnumValues("methodType"),frozenset(["MC","VI","MasterCard"]))
+        self.assertEqual(sorted(versionedXSD.enums["methodType"].childItems.keys()),["MC","Mastercard","VI"])
+        self.assertEqual([change.getDescription() for change in versionedXSD.getChanges("1.0","3.0") if change.change == "renamed"],[
+            "renamed complexType cardTokenType (tokenType -> cardTokenType)",
+            "renamed element cardTokenType.cnpTokenNumber (litleTokenNumber -> cnpTokenNumber)",
+            "renamed enumValue methodType.Mastercard (MasterCard -> Mastercard)",
+        ])
+
+        # Assert the versions aren't merged without the detector.
+        versionedXSD = XSDLoader.mergeXSDs(createXSDs(),["1.0","2.0","3.0"],False)
+        self.assertEqual(sorted(versionedXSD.complexTypes.keys()),["cardTokenType","sale","tokenType"])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
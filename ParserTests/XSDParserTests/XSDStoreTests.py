@@ -0,0 +1,133 @@
+"""
+Zachary Cook
+
+Tests storing versioned XSDs in a database.
+"""
+
+import os
+import pickle
+import tempfile
+import unittest
+from Parser.XSDParser import XSDData, XSDStore, XSDVersionDiffer
+from ParserTests import TestSchemas
+
+
+
+"""
+Creates a child element with restrictions.
+"""
+def createChildElement(name,type,restrictions=None):
+    childElement = XSDData.XSDChildElement(name,type)
+    if restrictions is not None:
+        childElement.restrictions = restrictions
+    return childElement
+
+"""
+Creates a versioned XSD for testing.
+"""
+def createVersionedXSD(amountType="integer"):
+    # Create the types of both versions.
+    enum = XSDData.XSDSimpleType("methodType","string")
+    enum.addEnumeration("MC")
+    enum.addEnumeration("VI")
+    oldSale = XSDData.XSDComplexType("sale",None)
+    oldSale.childItems = [createChildElement("litleTxnId","string",{"maxLength": "19"}),createChildElement("amount","integer"),createChildElement("type","methodType")]
+    newSale = XSDData.XSDComplexType("sale",None)
+    newSale.childItems = [createChildElement("cnpTxnId","string",{"maxLength": "25"}),createChildElement("amount",amountType),createChildElement("type","methodType")]
+    capture = XSDData.XSDComplexType("capture",None)
+    capture.childItems = [createChildElement("amount","integer")]
+    capture.childItems[0].choices = ((0,1,0),)
+    capture.childItems[0].declarations = ("capture","Capture")
+    capture.substitutionGroup = "transaction"
+    giftCardCapture = XSDData.XSDComplexType("giftCardCapture","capture")
+    giftCardCapture.childItems = [createChildElement("amount","integer",{"fixed": "0"})]
+
+    # Create the versioned XSD with the renamed child.
+    renames = XSDVersionDiffer.RenameMap()
+    renames.childNames[("sale","litleTxnId")] = "cnpTxnId"
+    return TestSchemas.createVersionedXSD([("12.0",[enum,newSale,capture,giftCardCapture]),("11.0",[enum,oldSale])],{"11.0": renames})
+
+
+
+class XSDStoreTests(unittest.TestCase):
+    """
+    Tests storing and loading a versioned XSD.
+    """
+    def testSaveAndLoad(self):
+        xsd = createVersionedXSD()
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory,"store.db")
+            self.assertEqual(XSDStore.saveVersionedXSD(xsd,fileName),(4,0))
+            storedXSD = XSDStore.StoredVersionedXSD(fileName)
+
+            # Assert the items are loaded when accessed.
+            self.assertEqual(storedXSD.versions,["11.0","12.0"])
+            self.assertEqual(list(storedXSD.complexTypes.keys()),list(xsd.complexTypes.keys()))
+            self.assertIn("methodType",storedXSD.enums)
+            self.assertNotIn("unknown",storedXSD.complexTypes)
+            self.assertEqual(storedXSD.complexTypes.items,{})
+            self.assertRaises(KeyError,storedXSD.complexTypes.__getitem__,"unknown")
+
+            # Assert the items are the same as the stored items.
+            for category in XSDStore.CATEGORY_CLASSES.keys():
+                items = XSDStore.getCategoryItems(xsd,category)
+                storedItems = XSDStore.getCategoryItems(storedXSD,category)
+                for name in items.keys():
+                    self.assertEqual(storedItems[name].getState(),items[name].getState())
+                    self.assertEqual(XSDStore.getStoredState(storedItems[name]),XSDStore.getStoredState(items[name]))
+            sale = storedXSD.complexTypes["sale"]
+            self.assertEqual(list(sale.childItems.keys()),list(xsd.complexTypes["sale"].childItems.keys()))
+            self.assertEqual([(name.name,name.start,name.end) for name in sale.childItems["cnpTxnId"].names],[("litleTxnId","11.0","11.0"),("cnpTxnId","12.0","12.0")])
+            self.assertEqual(sale.childItems["cnpTxnId"].getNameForVersion(1,storedXSD.versionIndexes).name,"cnpTxnId")
+            self.assertEqual(sale.childItems["cnpTxnId"].getFacetsForVersion(0,storedXSD.versionIndexes),{"maxLength": "19"})
+            self.assertEqual(sale.childItems["cnpTxnId"].getFacetsForVersion(1,storedXSD.versionIndexes),{"maxLength": "25"})
+            self.assertEqual(storedXSD.at("11.0").getEnumValues("methodType"),frozenset(["MC","VI"]))
+
+            # Assert the choices, declarations, substitution groups, and redeclared children are loaded.
+            capture = storedXSD.complexTypes["capture"]
+            self.assertEqual(capture.childItems["amount"].getChoicesForVersion(1,storedXSD.versionIndexes),((0,1,0),))
+            self.assertEqual(capture.childItems["amount"].getDeclarationsForVersion(1,storedXSD.versionIndexes),("capture","Capture"))
+            self.assertEqual(capture.getSubstitutionGroupForVersion(1,storedXSD.versionIndexes),"transaction")
+            self.assertEqual(list(storedXSD.complexTypes["giftCardCapture"].childItems.keys()),[])
+            self.assertEqual(storedXSD.complexTypes["giftCardCapture"].redeclaredChildItems["amount"].getFacetsForVersion(1,storedXSD.versionIndexes),{"fixed": "0"})
+
+            # Assert the fingerprints and names are read without loading the items.
+            storedXSD = XSDStore.StoredVersionedXSD(fileName)
+            self.assertEqual(storedXSD.getFingerprints(),xsd.getFingerprints())
+            self.assertEqual(storedXSD.findItemsWithName("cnpTxnId"),[("child","sale","cnpTxnId")])
+            self.assertEqual(storedXSD.findItemsWithName("litleTxnId"),[("child","sale","cnpTxnId")])
+            self.assertEqual(storedXSD.findItemsWithName("amount"),[("child","capture","amount"),("child","sale","amount")])
+            self.assertEqual(storedXSD.complexTypes.items,{})
+
+            # Assert pickling only stores the file name.
+            unpickledXSD = pickle.loads(pickle.dumps(storedXSD))
+            self.assertEqual(unpickledXSD.complexTypes["capture"].getState(),xsd.complexTypes["capture"].getState())
+            storedXSD.close()
+            unpickledXSD.close()
+
+    """
+    Tests only writing the items that changed.
+    """
+    def testIncrementalSave(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory,"store.db")
+            self.assertEqual(XSDStore.saveVersionedXSD(createVersionedXSD(),fileName),(4,0))
+            self.assertEqual(XSDStore.saveVersionedXSD(createVersionedXSD(),fileName),(0,0))
+
+            # Change and remove items.
+            xsd = createVersionedXSD("decimal")
+            del xsd.complexTypes["capture"]
+            self.assertEqual(XSDStore.saveVersionedXSD(xsd,fileName),(1,1))
+            storedXSD = XSDStore.StoredVersionedXSD(fileName)
+            self.assertEqual(list(storedXSD.complexTypes.keys()),["sale","giftCardCapture"])
+            self.assertEqual(storedXSD.complexTypes["sale"].getState(),xsd.complexTypes["sale"].getState())
+            self.assertEqual(storedXSD.findItemsWithName("amount"),[("child","sale","amount")])
+            storedXSD.close()
+
+            # Assert a missing store can't be opened.
+            self.assertRaises(ValueError,XSDStore.StoredVersionedXSD,os.path.join(directory,"missing.db"))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -113,6 +113,56 @@ class VersionedItemTests(unittest.TestCase):
         self.assertEqual(item.names[1].end,"8.5")
         self.assertEqual(item.names[1].type,"Element")
 
+    """
+    Tests the getNameForVersion method.
+    """
+    def testGetNameForVersion(self):
+        # Create a versioned item with a gap and a rename.
+        versions = ["8.0","8.1","8.2","8.3","8.4"]
+        versionIndexes = {"8.0": 0,"8.1": 1,"8.2": 2,"8.3": 3,"8.4": 4}
+        item = XSDVersionDiffer.VersionedItem("type")
+        item.addNameForVersion("TestName2","8.4")
+        item.addNameForVersion("TestName1","8.2")
+        item.addNameForVersion("TestName1","8.1")
+        item.mergeNameVersions(versions)
+
+        # Assert the names are correct.
+        self.assertEqual(item.getNameForVersion(0,versionIndexes),None)
+        self.assertEqual(item.getNameForVersion(1,versionIndexes).name,"TestName1")
+        self.assertEqual(item.getNameForVersion(2,versionIndexes).name,"TestName1")
+        self.assertEqual(item.getNameForVersion(3,versionIndexes),None)
+        self.assertEqual(item.getNameForVersion(4,versionIndexes).name,"TestName2")
+
+        # Assert adding a name updates the lookup.
+        item.addNameForVersion("TestName0","8.0")
+        self.assertEqual(item.getNameForVersion(0,versionIndexes).name,"TestName0")
+
+    """
+    Tests the facets being stored for versions.
+    """
+    def testGetFacetsForVersion(self):
+        # Create a versioned item with facets that change.
+        versions = ["8.0","8.1","8.2","8.3"]
+        versionIndexes = {"8.0": 0,"8.1": 1,"8.2": 2,"8.3": 3}
+        item = XSDVersionDiffer.VersionedItem("string")
+        for version in versions[0:2]:
+            item.addFacetsForVersion({"maxLength": "25","minLength": "1"},version)
+            item.addNameForVersion("TestName",version)
+        item.addFacetsForVersion({"maxLength": "50"},"8.2")
+        item.addNameForVersion("TestName","8.2")
+        item.addFacetsForVersion({},"8.3")
+        item.addNameForVersion("TestName","8.3")
+        item.addFacetsForVersion({"maxLength": "1"},"8.3")
+        item.mergeNameVersions(versions)
+
+        # Assert the facets are merged into ranges.
+        self.assertEqual(len(item.facetVersions.names),2)
+        self.assertEqual(item.facetVersions.names[0].start,"8.0")
+        self.assertEqual(item.facetVersions.names[0].end,"8.1")
+        self.assertEqual(item.getFacetsForVersion(1,versionIndexes),{"maxLength": "25","minLength": "1"})
+        self.assertEqual(item.getFacetsForVersion(2,versionIndexes),{"maxLength": "50"})
+        self.assertEqual(item.getFacetsForVersion(3,versionIndexes),{})
+
 
 
 class VersionedCompositeTests(unittest.TestCase):
@@ -469,4 +519,220 @@ class VersionedXSDTests(unittest.TestCase):
         self.assertEqual(xsd.complexTypes["cnpRequest3"].childItems["Test2"].names[0].start,"1.2")
         self.assertEqual(xsd.complexTypes["cnpRequest3"].childItems["Test2"].names[0].end,"1.2")
         self.assertEqual(xsd.complexTypes["cnpRequest3"].childItems["Test2"].names[0].name,"Test2")
-        self.assertEqual(xsd.complexTypes["cnpRequest3"].childItems["Test2"].names[0].type,"Element")
\ No newline at end of file
+        self.assertEqual(xsd.complexTypes["cnpRequest3"].childItems["Test2"].names[0].type,"Element")
+
+    """
+    Tests merging superclass items that are declared again in different versions.
+    """
+    def testMergingRedeclaredSuperclassItems(self):
+        # Create the complex types, with the child declared again by the derived type in the second version.
+        baseChildElement = XSDData.XSDChildElement("Test","string",None,1,1)
+        derivedChildElement = XSDData.XSDChildElement("Test","string",None,0,3)
+        derivedChildElement.choices = ((0,1,1),)
+        derivedChildElement.declarations = ("derivedType",)
+        baseElement = XSDData.XSDComplexType("baseType",None)
+        baseElement.childItems = [baseChildElement]
+        derivedElement = XSDData.XSDComplexType("derivedType","baseType")
+        derivedElement.childItems = [XSDData.XSDChildElement("Other","string"),derivedChildElement]
+
+        # Create the versioned XSD and merge the versions.
+        xsd = XSDVersionDiffer.VersionedXSD()
+        xsd.addComplexType(baseElement,"1.0")
+        xsd.addComplexType(derivedElement,"1.1")
+        xsd.mergeNameVersions(["1.0","1.1"])
+
+        # Assert the values of the derived type are stored for the version in the base.
+        child = xsd.complexTypes["baseType"].childItems["Test"]
+        self.assertEqual(list(xsd.complexTypes["derivedType"].redeclaredChildItems.keys()),["Test"])
+        self.assertEqual((child.minOccurences,child.maxOccurences),(1,1))
+        self.assertEqual([child.getMinOccurencesForVersion(index,xsd.versionIndexes) for index in range(0,2)],[1,0])
+        self.assertEqual([child.getChoicesForVersion(index,xsd.versionIndexes) for index in range(0,2)],[(),((0,1,1),)])
+        self.assertEqual([child.getPositionForVersion(index,xsd.versionIndexes) for index in range(0,2)],[0,1])
+        self.assertEqual([child.getDeclarationsForVersion(index,xsd.versionIndexes) for index in range(0,2)],[(),("derivedType",)])
+
+    """
+    Tests the at method.
+    """
+    def testAt(self):
+        # Create the XSD with 2 versions.
+        oldEnum = XSDData.XSDSimpleType("orderSourceType","string")
+        oldEnum.addEnumeration("ecommerce")
+        newEnum = XSDData.XSDSimpleType("orderSourceType","string")
+        newEnum.addEnumeration("ecommerce")
+        newEnum.addEnumeration("applepay")
+        oldRequest = XSDData.XSDComplexType("litleOnlineRequest",None)
+        oldRequest.childItems = [XSDData.XSDAttribute("version","string"),XSDData.XSDChildElement("token","tokenType",minOccurrences=1)]
+        newRequest = XSDData.XSDComplexType("cnpOnlineRequest",None)
+        newRequest.childItems = [XSDData.XSDAttribute("version","string"),XSDData.XSDChildElement("newField","string"),XSDData.XSDChildElement("token","cardTokenType")]
+        newType = XSDData.XSDComplexType("newType",None)
+        xsd = XSDVersionDiffer.VersionedXSD()
+        xsd.addSimpleType(newEnum,"1.1")
+        xsd.addComplexType(newRequest,"1.1")
+        xsd.addComplexType(newType,"1.1")
+        xsd.addSimpleType(oldEnum,"1.0")
+        xsd.addComplexType(oldRequest,"1.0")
+        xsd.mergeNameVersions(["1.0","1.1"])
+
+        # Assert the old version is correct.
+        view = xsd.at("1.0")
+        self.assertIs(xsd.at("1.0"),view)
+        self.assertEqual(list(view.complexTypes.keys()),["cnpOnlineRequest"])
+        self.assertFalse("newType" in view.complexTypes)
+        self.assertEqual(view.complexTypes["cnpOnlineRequest"].name,"litleOnlineRequest")
+        self.assertEqual(list(view.complexTypes["cnpOnlineRequest"].childItems.keys()),["version","token"])
+        self.assertTrue(view.complexTypes["cnpOnlineRequest"].childItems["version"].isAttribute())
+        self.assertEqual(view.complexTypes["cnpOnlineRequest"].childItems["token"].type,"tokenType")
+        self.assertEqual(view.complexTypes["cnpOnlineRequest"].childItems["token"].minOccurences,1)
+        self.assertEqual(view.getEnumValues("orderSourceType"),frozenset(["ecommerce"]))
+        self.assertRaises(KeyError,lambda: view.complexTypes["newType"])
+
+        # Assert the new version is correct.
+        view = xsd.at("1.1")
+        self.assertEqual(len(view.complexTypes),2)
+        self.assertEqual(view.complexTypes["cnpOnlineRequest"].name,"cnpOnlineRequest")
+        self.assertEqual(view.complexTypes["cnpOnlineRequest"].childItems["newField"].type,"string")
+        self.assertEqual(view.complexTypes["cnpOnlineRequest"].childItems["token"].type,"cardTokenType")
+        self.assertEqual(view.complexTypes["cnpOnlineRequest"].childItems["token"].minOccurences,0)
+        self.assertEqual(view.getEnumValues("orderSourceType"),frozenset(["ecommerce","applepay"]))
+        self.assertRaises(ValueError,xsd.at,"2.0")
+
+    """
+    Tests the getChanges and getChangelog methods.
+    """
+    def testGetChanges(self):
+        # Create the XSD with 3 versions.
+        enum1 = XSDData.XSDSimpleType("orderSourceType","string")
+        enum1.addEnumeration("ecommerce")
+        enum1.addEnumeration("telephone")
+        enum2 = XSDData.XSDSimpleType("orderSourceType","string")
+        enum2.addEnumeration("ecommerce")
+        request1 = XSDData.XSDComplexType("litleOnlineRequest",None)
+        request1.childItems = [XSDData.XSDChildElement("version","string"),XSDData.XSDChildElement("id","string")]
+        request2 = XSDData.XSDComplexType("cnpOnlineRequest",None)
+        request2.childItems = [XSDData.XSDAttribute("version","string"),XSDData.XSDChildElement("id","idType")]
+        request3 = XSDData.XSDComplexType("cnpOnlineRequest",None)
+        request3.childItems = [XSDData.XSDAttribute("version","string"),XSDData.XSDChildElement("id","idType"),XSDData.XSDChildElement("newField","string")]
+        xsd = XSDVersionDiffer.VersionedXSD()
+        xsd.addSimpleType(enum2,"1.2")
+        xsd.addComplexType(request3,"1.2")
+        xsd.addSimpleType(enum2,"1.1")
+        xsd.addComplexType(request2,"1.1")
+        xsd.addSimpleType(enum1,"1.0")
+        xsd.addComplexType(request1,"1.0")
+        xsd.mergeNameVersions(["1.0","1.1","1.2"])
+
+        # Assert the changes between the versions are correct.
+        self.assertEqual([change.getDescription() for change in xsd.getChanges("1.0","1.1")],[
+            "renamed complexType cnpOnlineRequest (litleOnlineRequest -> cnpOnlineRequest)",
+            "removed element cnpOnlineRequest.version",
+            "added attribute cnpOnlineRequest.version",
+            "retyped element cnpOnlineRequest.id (string -> idType)",
+            "removed enumValue orderSourceType.telephone",
+        ])
+        self.assertEqual([change.getDescription() for change in xsd.getChanges("1.2","1.0")][-1],"added enumValue orderSourceType.telephone")
+
+        # Assert the changelog is correct.
+        changelog = xsd.getChangelog()
+        self.assertEqual([version for version,changes in changelog],["1.1","1.2"])
+        self.assertEqual(len(changelog[0][1]),5)
+        self.assertEqual([change.getDescription() for change in changelog[1][1]],["added element cnpOnlineRequest.newField"])
+        self.assertEqual(changelog[1][1][0].fromVersion,"1.1")
+        self.assertRaises(ValueError,xsd.getChanges,"1.0","2.0")
+
+    """
+    Tests the getFingerprints and getChangedItems methods.
+    """
+    def testGetChangedItems(self):
+        # Create the XSD.
+        enum = XSDData.XSDSimpleType("orderSourceType","string")
+        enum.addEnumeration("ecommerce")
+        request = XSDData.XSDComplexType("cnpOnlineRequest",None)
+        request.childItems = [XSDData.XSDAttribute("version","string"),XSDData.XSDChildElement("id","string")]
+        xsd = XSDVersionDiffer.VersionedXSD()
+        xsd.addSimpleType(enum,"1.0")
+        xsd.addComplexType(request,"1.0")
+        xsd.mergeNameVersions(["1.0"])
+
+        # Assert the fingerprints are stable.
+        fingerprints = xsd.getFingerprints()
+        self.assertEqual(sorted(fingerprints.keys()),[("complexType","cnpOnlineRequest"),("enum","orderSourceType")])
+        self.assertEqual(xsd.getChangedItems(fingerprints),set())
+        self.assertEqual(xsd.getChangedItems({}),set(fingerprints.keys()))
+
+        # Assert changing a child changes the fingerprint of the type.
+        xsd.complexTypes["cnpOnlineRequest"].childItems["id"].default = "1"
+        self.assertEqual(xsd.getChangedItems(fingerprints),{("complexType","cnpOnlineRequest")})
+
+        # Assert removed items are changed.
+        xsd.enums.pop("orderSourceType")
+        self.assertEqual(xsd.getChangedItems(fingerprints),{("complexType","cnpOnlineRequest"),("enum","orderSourceType")})
+
+    """
+    Tests getting the types that can be reached from root types and pruning the rest.
+    """
+    def testGetReachableTypes(self):
+        # Create the types of both versions.
+        enum = XSDData.XSDSimpleType("orderSourceType","string")
+        enum.addEnumeration("ecommerce")
+        transactionType = XSDData.XSDComplexType("transactionType",None)
+        transactionType.childItems = [XSDData.XSDAttribute("id","string")]
+        transaction = XSDData.XSDComplexType("transaction","transactionType")
+        authorization = XSDData.XSDComplexType("authorization","transactionType")
+        authorization.childItems = [XSDData.XSDChildElement("orderSource","orderSourceType")]
+        oldSale = XSDData.XSDComplexType("sale","transactionType")
+        oldSale.childItems = [XSDData.XSDChildElement("card","cardType")]
+        newSale = XSDData.XSDComplexType("sale","transactionType")
+        newSale.childItems = [XSDData.XSDChildElement("card","newCardType")]
+        cardType = XSDData.XSDComplexType("cardType",None)
+        newCardType = XSDData.XSDComplexType("newCardType",None)
+        onlineRequest = XSDData.XSDComplexType("cnpOnlineRequest",None)
+        onlineRequest.childItems = [XSDData.XSDChildElement("transaction","transactionType")]
+        batchRequest = XSDData.XSDComplexType("batchRequest",None)
+        batchRequest.childItems = [XSDData.XSDChildElement("sale","sale",maxOccurrences=10)]
+        request = XSDData.XSDComplexType("cnpRequest",None)
+        request.childItems = [XSDData.XSDChildElement("batchRequest","batchRequest")]
+
+        # Create the versioned XSD.
+        xsd = XSDVersionDiffer.VersionedXSD()
+        xsd.addSimpleType(enum,"1.0")
+        for complexType in [onlineRequest,request,batchRequest,transactionType,transaction,authorization,oldSale,cardType]:
+            xsd.addComplexType(complexType,"1.0")
+        xsd.addSimpleType(enum,"2.0")
+        for complexType in [onlineRequest,request,batchRequest,transactionType,transaction,authorization,newSale,cardType,newCardType]:
+            xsd.addComplexType(complexType,"2.0")
+        xsd.mergeNameVersions(["1.0","2.0"])
+
+        # Assert the reachable types are correct.
+        self.assertEqual(xsd.getReachableTypes(["cnpOnlineRequest"]),{"cnpOnlineRequest","transactionType","transaction","authorization","sale","orderSourceType","cardType","newCardType"})
+        self.assertEqual(xsd.getReachableTypes(["cnpRequest"]),{"cnpRequest","batchRequest","sale","transactionType","cardType","newCardType"})
+        self.assertRaises(ValueError,xsd.getReachableTypes,["unknown"])
+
+        # Assert the pruned XSD only has the reachable types in the same order.
+        prunedXSD = xsd.createPrunedXSD(["cnpRequest"])
+        self.assertEqual(list(prunedXSD.complexTypes.keys()),["cnpRequest","batchRequest","transactionType","sale","cardType","newCardType"])
+        self.assertEqual(prunedXSD.enums,{})
+        self.assertIs(prunedXSD.complexTypes["sale"],xsd.complexTypes["sale"])
+        self.assertEqual(prunedXSD.versions,["1.0","2.0"])
+        self.assertEqual(prunedXSD.at("1.0").complexTypes["sale"].childItems["card"].type,"cardType")
+
+    """
+    Tests the types derived over several levels from the type of a
+    substitution group being reachable when some of them were already
+    reached through other children.
+    """
+    def testGetReachableDerivedTypes(self):
+        # Create the types, with authorization derived from transactionType through baseTransactionType.
+        transactionType = XSDData.XSDComplexType("transactionType",None)
+        transaction = XSDData.XSDComplexType("transaction","transactionType")
+        baseTransactionType = XSDData.XSDComplexType("baseTransactionType","transactionType")
+        authorization = XSDData.XSDComplexType("authorization","baseTransactionType")
+        tokenAuthorization = XSDData.XSDComplexType("tokenAuthorization","authorization")
+        onlineRequest = XSDData.XSDComplexType("cnpOnlineRequest",None)
+        onlineRequest.childItems = [XSDData.XSDChildElement("authorization","authorization"),XSDData.XSDChildElement("transaction","transactionType")]
+
+        # Create the versioned XSD and assert all the levels are reachable.
+        xsd = XSDVersionDiffer.VersionedXSD()
+        for complexType in [onlineRequest,transactionType,transaction,baseTransactionType,authorization,tokenAuthorization]:
+            xsd.addComplexType(complexType,"1.0")
+        xsd.mergeNameVersions(["1.0"])
+        self.assertEqual(xsd.getReachableTypes(["cnpOnlineRequest"]),{"cnpOnlineRequest","transactionType","transaction","baseTransactionType","authorization","tokenAuthorization"})
@@ -0,0 +1,161 @@
+"""
+Zachary Cook
+
+Tests watching a directory of XSDs.
+"""
+
+import os
+import tempfile
+import unittest
+from Parser.FieldWriter import FieldWriter
+from Parser.XSDParser import XSDWatcher
+from ParserTests.XSDParserTests import XSDLoaderTests
+
+
+
+"""
+Writer that writes the enum values of the newest version.
+"""
+class EnumExampleWriter(FieldWriter.FieldWriter):
+    def getDisplayName(self):
+        return "Enums"
+
+    def getFileName(self):
+        return "Enums.txt"
+
+    def getContents(self):
+        return ",".join(sorted(self.xsd.at(self.versions[-1]).getEnumValues("orderSourceType")))
+
+"""
+Writer that writes the versions.
+"""
+class VersionExampleWriter(FieldWriter.FieldWriter):
+    def getDisplayName(self):
+        return "Versions"
+
+    def getFileName(self):
+        return "Versions.txt"
+
+    def getContents(self):
+        return ",".join(self.versions)
+
+"""
+Writer that writes a header and the enum values of the newest version
+from fragments.
+"""
+class FragmentExampleWriter(FieldWriter.FieldWriter):
+    def getDisplayName(self):
+        return "Fragments"
+
+    def getFileName(self):
+        return "Fragments.txt"
+
+    def getContents(self):
+        self.startFragments()
+        header = self.getFragment("header",[],lambda: "Enums:")
+        return header + self.getItemFragment("enum","enum","orderSourceType",lambda name: ",".join(sorted(self.xsd.at(self.versions[-1]).getEnumValues(name))))
+
+
+
+class XSDWatcherTests(unittest.TestCase):
+    """
+    Sets up the test.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.xsdDirectory = os.path.join(self.directory.name,"xsd")
+        self.outputDirectory = os.path.join(self.directory.name,"output") + "/"
+        os.mkdir(self.xsdDirectory)
+        for fileName in XSDLoaderTests.XSD_FILES.keys():
+            self.writeXSD(fileName,XSDLoaderTests.XSD_FILES[fileName])
+
+    """
+    Cleans up the test.
+    """
+    def tearDown(self):
+        self.directory.cleanup()
+
+    """
+    Writes an XSD file with a new modification time.
+    """
+    def writeXSD(self,fileName,contents):
+        fileName = os.path.join(self.xsdDirectory,fileName)
+        modifiedTime = os.stat(fileName).st_mtime_ns + 1000000000 if os.path.exists(fileName) else None
+        with open(fileName,"w") as file:
+            file.write(contents)
+        if modifiedTime is not None:
+            os.utime(fileName,ns=(modifiedTime,modifiedTime))
+
+    """
+    Returns the contents of an output file.
+    """
+    def readOutput(self,fileName):
+        with open(self.outputDirectory + fileName) as file:
+            return file.read()
+
+    """
+    Tests updating the files when the XSDs change.
+    """
+    def testUpdate(self):
+        watcher = XSDWatcher.XSDWatcher(self.xsdDirectory,[EnumExampleWriter,VersionExampleWriter],self.outputDirectory)
+        self.assertTrue(watcher.update())
+        self.assertEqual(self.readOutput("Enums.txt"),"applepay,ecommerce")
+        self.assertEqual(self.readOutput("Versions.txt"),"8.0,9.0,10.0")
+        self.assertFalse(watcher.update())
+
+        # Change the newest version and assert only the changed file is written.
+        os.remove(self.outputDirectory + "Versions.txt")
+        self.writeXSD("SchemaCombined_v10.0.xsd",XSDLoaderTests.createXSDText(["ecommerce","googlepay"]))
+        self.assertTrue(watcher.update())
+        self.assertEqual(self.readOutput("Enums.txt"),"ecommerce,googlepay")
+        self.assertFalse(os.path.exists(self.outputDirectory + "Versions.txt"))
+
+        # Assert invalid files keep the last parsed version.
+        self.writeXSD("SchemaCombined_v10.0.xsd","<broken")
+        self.assertFalse(watcher.update())
+        self.assertEqual(self.readOutput("Enums.txt"),"ecommerce,googlepay")
+
+        # Remove a version and assert the files are updated.
+        os.remove(os.path.join(self.xsdDirectory,"SchemaCombined_v10.0.xsd"))
+        self.assertTrue(watcher.update())
+        self.assertEqual(self.readOutput("Enums.txt"),"ecommerce,telephone")
+        self.assertEqual(self.readOutput("Versions.txt"),"8.0,9.0")
+
+        # Assert the writers aren't run if no items changed.
+        watcher.writtenContents = {}
+        os.remove(self.outputDirectory + "Enums.txt")
+        self.writeXSD("SchemaCombined_v9.0.xsd",XSDLoaderTests.XSD_FILES["SchemaCombined_v9.0.xsd"])
+        self.assertTrue(watcher.update())
+        self.assertFalse(os.path.exists(self.outputDirectory + "Enums.txt"))
+
+    """
+    Tests the fragment caches being kept between the writes.
+    """
+    def testFragmentCaches(self):
+        watcher = XSDWatcher.XSDWatcher(self.xsdDirectory,[FragmentExampleWriter],self.outputDirectory)
+        self.assertTrue(watcher.update())
+        fragmentCache = watcher.fragmentCaches[FragmentExampleWriter]
+        self.assertEqual(self.readOutput("Fragments.txt"),"Enums:applepay,ecommerce")
+        self.assertEqual(fragmentCache.createdCount,2)
+
+        # Change the enum and assert only its fragment is created again.
+        self.writeXSD("SchemaCombined_v10.0.xsd",XSDLoaderTests.createXSDText(["ecommerce","googlepay"]))
+        self.assertTrue(watcher.update())
+        self.assertEqual(self.readOutput("Fragments.txt"),"Enums:ecommerce,googlepay")
+        self.assertIs(watcher.fragmentCaches[FragmentExampleWriter],fragmentCache)
+        self.assertEqual((fragmentCache.createdCount,fragmentCache.reusedCount),(1,1))
+
+    """
+    Tests updating with root types that don't exist.
+    """
+    def testUpdateUnknownRoots(self):
+        watcher = XSDWatcher.XSDWatcher(self.xsdDirectory,[VersionExampleWriter],self.outputDirectory,["unknownType"])
+        self.assertFalse(watcher.update())
+        self.assertIsNone(watcher.versionedXSD)
+        self.assertEqual(watcher.versions,[])
+        self.assertFalse(os.path.exists(self.outputDirectory + "Versions.txt"))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
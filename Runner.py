@@ -5,43 +5,71 @@ Runs the program and creates the program XML fields.
 """
 
 from Parser.FieldWriter import LanguageFieldWriter
-from Parser.XSDParser import XSDParser, XSDVersionDiffer
-from functools import cmp_to_key
+from Parser.XSDParser import XSDDiagnostics, XSDLoader, XSDRenameDetector, XSDStore, XSDWatcher
+import argparse
 import os
+import sys
 
 XSD_DIRECTORY = "xsd/"
 
 
 
 if __name__ == '__main__':
-    # Get the files to read and sort them.
-    filesToRead = os.listdir(XSD_DIRECTORY)
-    filesToRead = sorted(filesToRead,key=cmp_to_key(XSDVersionDiffer.compareVersionNames))
-
-    # Get the list of versions
-    versions = []
-    for fileName in filesToRead:
-        majorVersion,minorVersion = XSDVersionDiffer.getVersionFromName(fileName)
-        versions.append(str(majorVersion) + "." + str(minorVersion))
-
-    # Parse the XSD objects.
-    baseXSDs = []
-    for fileName in filesToRead:
-        print("Reading " + XSD_DIRECTORY + fileName)
-        baseXSDs.append(XSDParser.createFromFile(XSD_DIRECTORY + fileName))
-
-    # Merge the XSDs together.
-    versionedXSD = XSDVersionDiffer.VersionedXSD()
-    for i in range(0,len(versions)):
-        i = len(versions) - 1 - i
-        version = versions[i]
-        xsd = baseXSDs[i]
-
-        print("Merging version " + version)
-        versionedXSD.populateFromXSD(xsd,version)
-
-    # Merge the versions.
-    versionedXSD.mergeNameVersions(versions)
-
-    # Write the files.
-    LanguageFieldWriter.writeFieldFiles(versionedXSD,versions)
\ No newline at end of file
+    # Parse the arguments.
+    parser = argparse.ArgumentParser(description="Creates the XML fields from the XSD versions.")
+    parser.add_argument("source",nargs="?",default=XSD_DIRECTORY,help="Directory or archive of the XSD files.")
+    parser.add_argument("--watch",action="store_true",help="Keep running and regenerate the fields when the XSD files in the directory change.")
+    parser.add_argument("--diagnostics",choices=XSDDiagnostics.LEVELS,help="Print the parser diagnostics of the level and above.")
+    parser.add_argument("--roots",nargs="+",help="Only write the types reachable from these root types, or from the \"online\" or \"batch\" root types.")
+    parser.add_argument("--rename-threshold",type=float,help="Merge the types, children, and enum values detected as renamed between versions with a similarity of at least this (0 to 1).")
+    parser.add_argument("--store",help="Write the merged XSD to this SQLite database. Only the items that changed since the last write are written.")
+    parser.add_argument("--from-store",help="Write the fields from this SQLite database instead of reading and merging the XSDs.")
+    arguments = parser.parse_args()
+
+    if arguments.watch:
+        # Watch the directory.
+        if not os.path.isdir(arguments.source):
+            print("Only directories can be watched: " + arguments.source)
+            sys.exit(2)
+        rootNames = LanguageFieldWriter.getRootTypeNames(arguments.roots) if arguments.roots is not None else None
+        XSDWatcher.XSDWatcher(arguments.source,LanguageFieldWriter.SUPPORTED_LANGUAGES,LanguageFieldWriter.FILE_OUTPUT_LOCATION,rootNames,arguments.rename_threshold).run()
+    elif arguments.from_store is not None:
+        # Write the files from the store.
+        try:
+            versionedXSD = XSDStore.StoredVersionedXSD(arguments.from_store)
+            results = LanguageFieldWriter.writeFieldFiles(versionedXSD,versionedXSD.versions,rootNames=arguments.roots)
+        except ValueError as error:
+            print(str(error))
+            sys.exit(2)
+        if not all(result.succeeded() for result in results):
+            sys.exit(1)
+    else:
+        # Read and merge the XSDs.
+        diagnostics = XSDDiagnostics.DiagnosticCollector()
+        renameDetector = XSDRenameDetector.RenameDetector(applyThreshold=arguments.rename_threshold) if arguments.rename_threshold is not None else None
+        versionedXSD,versions = XSDLoader.loadVersionedXSD(arguments.source,True,diagnostics,renameDetector)
+
+        # Print the renames that were merged.
+        if renameDetector is not None:
+            for suggestion in renameDetector.suggestions:
+                if suggestion.applied:
+                    print("Merged rename " + suggestion.getDescription())
+
+        # Print the diagnostics.
+        if arguments.diagnostics is not None and len(diagnostics.getDiagnostics(arguments.diagnostics)) > 0:
+            print(diagnostics.render(arguments.diagnostics))
+        print(diagnostics.getSummary())
+
+        # Write the store.
+        if arguments.store is not None:
+            writtenCount,removedCount = XSDStore.saveVersionedXSD(versionedXSD,arguments.store)
+            print("Stored " + str(writtenCount) + " changed items and removed " + str(removedCount) + " items in " + arguments.store)
+
+        # Write the files.
+        try:
+            results = LanguageFieldWriter.writeFieldFiles(versionedXSD,versions,rootNames=arguments.roots)
+        except ValueError as error:
+            print(str(error))
+            sys.exit(2)
+        if not all(result.succeeded() for result in results):
+            sys.exit(1)